@@ -9,7 +9,8 @@ from services.zodiac_service import get_zodiac_traits
 from transit_engine import get_current_positions, get_all_planets_next_12
 from life_tools_report import life_tools_bp
 from routes.generate_report import generate_report_bp
-from openai import OpenAI
+from services.llm_executor import get_llm_client
+from modules.auth.id_token_verifier import get_id_token_verifier
 import os
 from dotenv import load_dotenv
 load_dotenv()
@@ -66,7 +67,8 @@ CORS(app, resources={r"/*": {"origins": "*"}}, supports_credentials=True)
 migrate = Migrate(app, db)
 app.register_blueprint(life_tools_bp)
 app.register_blueprint(generate_report_bp)
-openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+openai_client = get_llm_client()
+get_id_token_verifier().start()  # prefetch Firebase signing certs before the first sign-in
 app.register_blueprint(admin_orders_bp)
 app.register_blueprint(routes_reconciliation)
 app.register_blueprint(routes_metrics)
@@ -22,27 +22,12 @@ from services.rajya_sambandh_rajyog import evaluate_rajya_sambandh_rajyog
 from services.shubh_kartari_yog import evaluate_shubh_kartari_yog
 from services.vipreet_rajyog import evaluate_vipreet_rajyog
 from services.gemstone_recommender import recommend_gemstone_from_lagna_9th
-from modules.models_user import UserDashaTimeline
-from extensions import db
+from services.dasha_db_filler import insert_dasha_timeline
+from services.dasha_timeline import ANTARDASHA, DASHA_SEQUENCE, DASHA_YEARS, DashaTimeline
 
 def save_dasha_to_db(user_id, mahadashas):
-    # duplicate avoid
-    exists = UserDashaTimeline.query.filter_by(user_id=user_id).first()
-    if exists:
-        return
-
-    for md in mahadashas:
-        for ad in md["antardashas"]:
-            row = UserDashaTimeline(
-                user_id=user_id,
-                mahadasha=md["mahadasha"],
-                antardasha=ad["planet"],
-                start_date=ad["start"],
-                end_date=ad["end"]
-            )
-            db.session.add(row)
-
-    db.session.commit()
+    # duplicate avoid + one multi-row insert (services/dasha_db_filler.py)
+    insert_dasha_timeline(user_id, mahadashas)
 
 
 import json
@@ -64,11 +49,8 @@ NAKSHATRAS = [
     "Purva Bhadrapada", "Uttara Bhadrapada", "Revati"
 ]
 
-DASHA_SEQUENCE = ['Ketu', 'Venus', 'Sun', 'Moon', 'Mars', 'Rahu', 'Jupiter', 'Saturn', 'Mercury']
-DASHA_YEARS = {
-    'Ketu': 7, 'Venus': 20, 'Sun': 6, 'Moon': 10,
-    'Mars': 7, 'Rahu': 18, 'Jupiter': 16, 'Saturn': 19, 'Mercury': 17
-}
+# DASHA_SEQUENCE / DASHA_YEARS now live in services/dasha_timeline.py
+# (imported above, still importable from here)
 
 # ----------------- HELPER FUNCTIONS -----------------
 def get_nakshatra_pada(degree):
@@ -216,32 +198,13 @@ def calculate_antardashas(maha_lord, maha_start, maha_years):
     return antardashas
 
 def calculate_vimshottari_dasha(moon_deg, birth_date):
-    nakshatra_size = 13 + 1/3
-    nakshatra_index = int(moon_deg // nakshatra_size)
-    dasha_lord = DASHA_SEQUENCE[nakshatra_index % 9]
-    fraction_passed = (moon_deg % nakshatra_size) / nakshatra_size
-    total_years = DASHA_YEARS[dasha_lord]
-    elapsed_days = fraction_passed * total_years * 365.25
-    start_date = birth_date - timedelta(days=elapsed_days)
-
-    mahadashas = []
-    current_index = DASHA_SEQUENCE.index(dasha_lord)
-    md_start = start_date
-    for i in range(9):
-        lord = DASHA_SEQUENCE[(current_index + i) % 9]
-        years = DASHA_YEARS[lord]
-        md_end = md_start + timedelta(days=years * 365.25)
-        antardashas = calculate_antardashas(lord, md_start, DASHA_YEARS[lord])
-        mahadashas.append({
-            'mahadasha': lord,
-            'start': md_start.strftime('%Y-%m-%d'),
-            'end': md_end.strftime('%Y-%m-%d'),
-            'antardashas': antardashas
-        })
-        md_start = md_end
-    return mahadashas
+    # Full 9 x 9 dict table; callers that only need "which dasha when"
+    # should query DashaTimeline directly (services/dasha_timeline.py).
+    return DashaTimeline.from_moon(moon_deg, birth_date).to_mahadashas()
 
 def get_current_dasha(mahadashas):
+    # For callers holding only the dicts; calculate_full_kundali() uses
+    # DashaTimeline.current_indices() instead of parsing them back.
     today = datetime.now().date()
     current_maha = None
     for md in mahadashas:
@@ -285,8 +248,14 @@ def calculate_full_kundali(name, dob, tob, lat, lon, user_id=None, language='en'
 
     moon_deg = get_moon_longitude_lahiri(dob, tob, lat, lon)
     birth_date = datetime.strptime(f"{dob} {tob}", "%Y-%m-%d %H:%M")
-    mahadashas = calculate_vimshottari_dasha(moon_deg, birth_date)
-    current_maha, current_antar = get_current_dasha(mahadashas)
+    timeline = DashaTimeline.from_moon(moon_deg, birth_date)
+    mahadashas = timeline.to_mahadashas()
+    maha_index, antar_index = timeline.current_indices(datetime.now().date())
+    current_maha = mahadashas[maha_index]
+    current_antar = current_maha["antardashas"][antar_index % 9]
+    next_antar = (
+        timeline.period_dict(ANTARDASHA, antar_index + 1) if antar_index + 1 < 81 else None
+    )
 
     if user_id:
         save_dasha_to_db(user_id, mahadashas)
@@ -379,6 +348,7 @@ def calculate_full_kundali(name, dob, tob, lat, lon, user_id=None, language='en'
         "Mahadasha": mahadashas,
         "current_mahadasha": current_maha,
         "current_antardasha": current_antar,
+        "next_antardasha": next_antar,
         "moon_traits": moon_traits,
         "lagna_trait": lagna_trait_text,  
         "grah_dasha_block": grah_dasha,
@@ -0,0 +1,29 @@
+"""add user_dasha_timeline.user_id index
+
+Revision ID: a6c3e8d1f4b7
+Revises: f2b7d4a8c6e1
+Create Date: 2026-10-19
+
+The bulk Vimshottari backfill (services/dasha_db_filler.py) selects
+"users with no timeline" with a NOT EXISTS anti-join on
+user_dasha_timeline.user_id, and every write path checks the same
+predicate before inserting. user_id had a foreign key but no index, so
+each probe was a scan of the whole table.
+
+Purely additive -- one index, no column or data changed.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'a6c3e8d1f4b7'
+down_revision = 'f2b7d4a8c6e1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_user_dasha_timeline_user_id', 'user_dasha_timeline', ['user_id'])
+
+
+def downgrade():
+    op.drop_index('ix_user_dasha_timeline_user_id', table_name='user_dasha_timeline')
@@ -0,0 +1,37 @@
+"""add ai_reports last_read_at and pregeneration_claimed_at
+
+Revision ID: a9c4e7f2d1b6
+Revises: d7f2b5e8a1c3
+Create Date: 2026-10-19
+
+Background pre-generation (modules/ai_report_engine/pregeneration_scheduler.py):
+  - last_read_at: the last user read through ReportLifecycleManager,
+    so rows nobody reads any more stop being regenerated. Existing rows
+    are backfilled with generated_at -- generation was always lazy, on
+    a read -- so they stay eligible until the activity window passes.
+  - pregeneration_claimed_at: a per-row claim, replacing the job-wide
+    advisory lock, so overlapping hourly runs split the due rows
+    instead of the later run doing nothing.
+
+Two nullable columns; no index -- the job's scan is already bounded by
+ix_ai_reports_expires_at.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'a9c4e7f2d1b6'
+down_revision = 'd7f2b5e8a1c3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('ai_reports', sa.Column('last_read_at', sa.DateTime(), nullable=True))
+    op.add_column('ai_reports', sa.Column('pregeneration_claimed_at', sa.DateTime(), nullable=True))
+    op.execute("UPDATE ai_reports SET last_read_at = generated_at")
+
+
+def downgrade():
+    op.drop_column('ai_reports', 'pregeneration_claimed_at')
+    op.drop_column('ai_reports', 'last_read_at')
@@ -0,0 +1,41 @@
+"""add report_stage_artifacts table
+
+Revision ID: b6d3e9a2f4c7
+Revises: d7e1b4c9f2a5
+Create Date: 2026-10-19
+
+Staged report pipeline (report_pipeline.py): one row per completed
+stage (compute / llm / render / deliver) of one Order, so a failed or
+abandoned report resumes from the first stage without a row instead
+of re-running -- and re-paying for -- everything before it.
+
+Purely additive -- one new table, no existing table altered. Orders
+with no rows (every order before this migration) simply run all four
+stages, exactly as the old single-thread pipeline did.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'b6d3e9a2f4c7'
+down_revision = 'd7e1b4c9f2a5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'report_stage_artifacts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('order_id', sa.Integer(), nullable=False),
+        sa.Column('stage', sa.String(length=16), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('completed_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['order_id'], ['orders.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('order_id', 'stage', name='uq_report_stage_artifacts_order_stage'),
+    )
+
+
+def downgrade():
+    op.drop_table('report_stage_artifacts')
@@ -0,0 +1,49 @@
+"""add llm_response_cache table
+
+Revision ID: c3f8a1d6e2b9
+Revises: b6d3e9a2f4c7
+Create Date: 2026-10-19
+
+Content-addressed LLM response cache (services/llm_response_cache.py):
+one row per (model, normalized prompt hash, prompt_version), consulted
+by OpenAIExecutor and the report pipeline's llm stage before any
+OpenAI call, so identical prompts built for users with the same chart
+features are answered once and served from here afterwards.
+
+Purely additive -- one new table, no existing table altered. An empty
+table simply means every call is a miss, exactly the pre-cache
+behaviour.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'c3f8a1d6e2b9'
+down_revision = 'b6d3e9a2f4c7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'llm_response_cache',
+        sa.Column('cache_key', sa.String(length=64), nullable=False),
+        sa.Column('model', sa.String(length=100), nullable=False),
+        sa.Column('prompt_version', sa.String(length=100), nullable=False),
+        sa.Column('prompt_hash', sa.String(length=64), nullable=False),
+        sa.Column('response_text', sa.Text(), nullable=False),
+        sa.Column('raw_response', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('last_used_at', sa.DateTime(), nullable=False),
+        sa.Column('hit_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('cache_key'),
+    )
+    op.create_index('ix_llm_response_cache_last_used_at', 'llm_response_cache', ['last_used_at'])
+    op.create_index('ix_llm_response_cache_expires_at', 'llm_response_cache', ['expires_at'])
+
+
+def downgrade():
+    op.drop_index('ix_llm_response_cache_expires_at', table_name='llm_response_cache')
+    op.drop_index('ix_llm_response_cache_last_used_at', table_name='llm_response_cache')
+    op.drop_table('llm_response_cache')
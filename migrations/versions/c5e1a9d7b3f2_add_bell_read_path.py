@@ -0,0 +1,115 @@
+"""add Bell read-path indexes and user_notification_counters
+
+Revision ID: c5e1a9d7b3f2
+Revises: a6c3e8d1f4b7
+Create Date: 2026-10-19
+
+The Bell badge and list (notifications/user_notification_routes.py)
+run on every app open:
+
+  - app_users.firebase_uid had no index, so resolving the JWT user to
+    its profile scanned app_users;
+  - user_notifications had only single-column indexes, so the list and
+    the unread count filtered every row of the user (or worse).
+
+Adds ix_app_users_firebase_uid, (user_id, created_at) for the
+newest-first list, a partial (user_id, expires_at) WHERE NOT is_read
+for the unread recompute, and user_notification_counters, a per-user
+unread counter kept by triggers on user_notifications (see
+notifications/notification_models.py::UserNotificationCounter). Counter
+rows are created stale by the triggers or notifications/bell_inbox.py
+on first use, so no seed.
+
+Additive -- one table, three indexes, two functions, two triggers.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'c5e1a9d7b3f2'
+down_revision = 'a6c3e8d1f4b7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_app_users_firebase_uid', 'app_users', ['firebase_uid'])
+    op.create_index('ix_user_notifications_user_created', 'user_notifications', ['user_id', 'created_at'])
+    op.create_index(
+        'ix_user_notifications_unread', 'user_notifications', ['user_id', 'expires_at'],
+        postgresql_where=sa.text('is_read = false'),
+    )
+
+    op.create_table(
+        'user_notification_counters',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('unread_count', sa.Integer(), nullable=False),
+        sa.Column('valid_until', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION user_notification_counters_add(uid integer, expiry timestamp, delta integer)
+        RETURNS void AS $$
+        BEGIN
+            -- A missing row is created stale (valid_until in the past), so the
+            -- row lock is taken either way and the next read recomputes.
+            IF delta > 0 THEN
+                INSERT INTO user_notification_counters AS c (user_id, unread_count, valid_until)
+                VALUES (uid, 0, TIMESTAMP '1970-01-01')
+                ON CONFLICT (user_id) DO UPDATE
+                SET unread_count = c.unread_count + 1,
+                    valid_until = CASE
+                        WHEN expiry IS NULL THEN c.valid_until
+                        WHEN c.valid_until IS NULL THEN expiry
+                        ELSE LEAST(c.valid_until, expiry)
+                    END;
+            ELSE
+                INSERT INTO user_notification_counters AS c (user_id, unread_count, valid_until)
+                VALUES (uid, 0, TIMESTAMP '1970-01-01')
+                ON CONFLICT (user_id) DO UPDATE
+                SET unread_count = c.unread_count - 1
+                WHERE expiry IS NULL OR (c.valid_until IS NOT NULL AND expiry >= c.valid_until);
+            END IF;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION user_notification_counters_apply() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') AND NOT OLD.is_read THEN
+                PERFORM user_notification_counters_add(OLD.user_id, OLD.expires_at, -1);
+            END IF;
+            IF TG_OP IN ('UPDATE', 'INSERT') AND NOT NEW.is_read THEN
+                PERFORM user_notification_counters_add(NEW.user_id, NEW.expires_at, 1);
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_user_notifications_counter_insert_delete
+        AFTER INSERT OR DELETE ON user_notifications
+        FOR EACH ROW EXECUTE FUNCTION user_notification_counters_apply()
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_user_notifications_counter_update
+        AFTER UPDATE OF is_read, expires_at, user_id ON user_notifications
+        FOR EACH ROW WHEN (
+            OLD.is_read IS DISTINCT FROM NEW.is_read
+            OR OLD.expires_at IS DISTINCT FROM NEW.expires_at
+            OR OLD.user_id IS DISTINCT FROM NEW.user_id
+        )
+        EXECUTE FUNCTION user_notification_counters_apply()
+    """)
+
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS trg_user_notifications_counter_update ON user_notifications")
+    op.execute("DROP TRIGGER IF EXISTS trg_user_notifications_counter_insert_delete ON user_notifications")
+    op.execute("DROP FUNCTION IF EXISTS user_notification_counters_apply()")
+    op.execute("DROP FUNCTION IF EXISTS user_notification_counters_add(integer, timestamp, integer)")
+    op.drop_table('user_notification_counters')
+    op.drop_index('ix_user_notifications_unread', table_name='user_notifications')
+    op.drop_index('ix_user_notifications_user_created', table_name='user_notifications')
+    op.drop_index('ix_app_users_firebase_uid', table_name='app_users')
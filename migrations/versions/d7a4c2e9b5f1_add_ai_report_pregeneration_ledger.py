@@ -0,0 +1,37 @@
+"""add ai_report_pregeneration_ledger table
+
+Revision ID: d7a4c2e9b5f1
+Revises: c3f8a1d6e2b9
+Create Date: 2026-10-19
+
+Background pre-generation of expiring AI reports
+(modules/ai_report_engine/pregeneration_scheduler.py): one row per UTC
+day holding the LLM tokens the job has spent, so its daily token budget
+holds across the many separate runs of one day.
+
+Purely additive -- one new table, no existing table altered. No row for
+a day simply means nothing has been spent yet.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'd7a4c2e9b5f1'
+down_revision = 'c3f8a1d6e2b9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'ai_report_pregeneration_ledger',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('tokens_used', sa.BigInteger(), nullable=False),
+        sa.Column('reports_regenerated', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('day'),
+    )
+
+
+def downgrade():
+    op.drop_table('ai_report_pregeneration_ledger')
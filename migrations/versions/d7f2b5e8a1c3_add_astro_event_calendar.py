@@ -0,0 +1,78 @@
+"""add astro_events calendar columns, indexes and version row
+
+Revision ID: d7f2b5e8a1c3
+Revises: c5e1a9d7b3f2
+Create Date: 2026-10-19
+
+astro_events is read by day from the scheduler, the notification
+engine and the cards (services/event_calendar.py). It had no index but
+the primary key, notification_engine scanned the whole table for the
+notify_before_days pre-events, and every reader dug planet / rashi /
+slug / type out of the untyped meta JSON.
+
+Adds:
+  - planet, rashi, slug, sub_type: STORED generated columns copying
+    meta ->> 'planet' / 'rashi' / 'slug' / 'type' (NULL when the key is
+    missing or JSON null), filled for existing rows by the ALTER
+    itself;
+  - ix_astro_events_date_type (date, type) and ix_astro_events_notify_on
+    on (date - notify_before_days);
+  - astro_event_calendar_version, one row bumped to txid_current() by a
+    statement-level trigger on astro_events, which the calendar's
+    in-process today/tomorrow cache checks (see
+    models.AstroEventCalendarVersion).
+
+Adding generated columns rewrites astro_events once; the table holds a
+few rows per day, so this is quick.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'd7f2b5e8a1c3'
+down_revision = 'c5e1a9d7b3f2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('astro_events', sa.Column('planet', sa.Text(), sa.Computed("meta ->> 'planet'", persisted=True)))
+    op.add_column('astro_events', sa.Column('rashi', sa.Text(), sa.Computed("meta ->> 'rashi'", persisted=True)))
+    op.add_column('astro_events', sa.Column('slug', sa.Text(), sa.Computed("meta ->> 'slug'", persisted=True)))
+    op.add_column('astro_events', sa.Column('sub_type', sa.Text(), sa.Computed("meta ->> 'type'", persisted=True)))
+
+    op.create_index('ix_astro_events_date_type', 'astro_events', ['date', 'type'])
+    op.create_index('ix_astro_events_notify_on', 'astro_events', [sa.text('(date - notify_before_days)')])
+
+    op.create_table(
+        'astro_event_calendar_version',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.execute("INSERT INTO astro_event_calendar_version (id, version) VALUES (1, 0) ON CONFLICT (id) DO NOTHING")
+    op.execute("""
+        CREATE OR REPLACE FUNCTION astro_event_calendar_bump() RETURNS trigger AS $$
+        BEGIN
+            UPDATE astro_event_calendar_version SET version = txid_current() WHERE id = 1;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_astro_events_calendar_version
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON astro_events
+        FOR EACH STATEMENT EXECUTE FUNCTION astro_event_calendar_bump()
+    """)
+
+
+def downgrade():
+    op.execute("DROP TRIGGER IF EXISTS trg_astro_events_calendar_version ON astro_events")
+    op.execute("DROP FUNCTION IF EXISTS astro_event_calendar_bump()")
+    op.drop_table('astro_event_calendar_version')
+    op.drop_index('ix_astro_events_notify_on', table_name='astro_events')
+    op.drop_index('ix_astro_events_date_type', table_name='astro_events')
+    op.drop_column('astro_events', 'sub_type')
+    op.drop_column('astro_events', 'slug')
+    op.drop_column('astro_events', 'rashi')
+    op.drop_column('astro_events', 'planet')
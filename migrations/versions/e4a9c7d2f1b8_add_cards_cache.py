@@ -0,0 +1,48 @@
+"""add cards_cache table
+
+Revision ID: e4a9c7d2f1b8
+Revises: d7a4c2e9b5f1
+Create Date: 2026-10-19
+
+Location-bucketed cache for /api/cards (services/cards_cache.py): one
+row per (IST date, lat/lng grid cell, language) holding the
+today/tomorrow panchang pair, so the route stops running two
+calculate_panchang() calls per request. Rows expire at the next IST
+midnight.
+
+Purely additive -- one new table, no existing table altered. An empty
+table simply means every request computes, exactly the pre-cache
+behaviour.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'e4a9c7d2f1b8'
+down_revision = 'd7a4c2e9b5f1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'cards_cache',
+        sa.Column('cache_key', sa.String(length=120), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('lat', sa.Float(), nullable=False),
+        sa.Column('lng', sa.Float(), nullable=False),
+        sa.Column('language', sa.String(length=10), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('hit_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('cache_key'),
+    )
+    op.create_index('ix_cards_cache_expires_at', 'cards_cache', ['expires_at'])
+    op.create_index('ix_cards_cache_created_at', 'cards_cache', ['created_at'])
+
+
+def downgrade():
+    op.drop_index('ix_cards_cache_created_at', table_name='cards_cache')
+    op.drop_index('ix_cards_cache_expires_at', table_name='cards_cache')
+    op.drop_table('cards_cache')
@@ -0,0 +1,30 @@
+"""add audience resolution indexes
+
+Revision ID: f2b7d4a8c6e1
+Revises: e4a9c7d2f1b8
+Create Date: 2026-10-19
+
+Index behind services/personalization_engine.py's audience resolver,
+which now selects a dasha-change audience with one query per run
+instead of loading every user_dasha_timeline row:
+
+  - ix_user_dasha_timeline_start_date: dasha-change audiences
+    (start_date = today + N).
+
+Purely additive -- index only, no column or data changed.
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'f2b7d4a8c6e1'
+down_revision = 'e4a9c7d2f1b8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_user_dasha_timeline_start_date', 'user_dasha_timeline', ['start_date'])
+
+
+def downgrade():
+    op.drop_index('ix_user_dasha_timeline_start_date', table_name='user_dasha_timeline')
@@ -1,5 +1,6 @@
 from extensions import db
 from datetime import datetime
+from sqlalchemy import DDL, event
 
 class Order(db.Model):
     __tablename__ = 'orders'
@@ -26,6 +27,99 @@ class Order(db.Model):
     longitude = db.Column(db.String)
     partner_payload = db.Column(db.JSON, nullable=True)
 
+
+class ReportStageArtifact(db.Model):
+    """
+    One completed stage of the staged report pipeline (report_pipeline.py)
+    for one Order -- compute / llm / render / deliver. A row exists ONLY
+    once its stage finished successfully, so "resume from the last
+    completed stage" is simply "run every stage that has no row yet":
+    a render failure resumes at render with the already-paid-for GPT
+    response read back from the llm row, never a second OpenAI call.
+
+    `payload` is that stage's JSON output (summary blocks + prompt +
+    chart inputs, GPT text, PDF path, delivery receipt) -- see
+    report_pipeline.py for each stage's exact shape.
+    """
+    __tablename__ = "report_stage_artifacts"
+
+    id = db.Column(db.Integer, primary_key=True)
+    order_id = db.Column(db.Integer, db.ForeignKey("orders.id"), nullable=False)
+    stage = db.Column(db.String(16), nullable=False)
+    payload = db.Column(db.JSON, nullable=False)
+    completed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Backing index also serves the per-order lookup (order_id leads).
+        db.UniqueConstraint("order_id", "stage", name="uq_report_stage_artifacts_order_stage"),
+    )
+
+
+class LLMResponseCacheEntry(db.Model):
+    """
+    One cached LLM completion, content-addressed by
+    (model, normalized prompt hash, prompt_version) -- see
+    services/llm_response_cache.py, the only module that reads or writes
+    this table. Unlike `ai_reports` (one row per profile/segment/
+    report_type/language), a row here is shared by EVERY caller that
+    sends the byte-for-byte same normalized prompt to the same model
+    under the same prompt version, whoever they are.
+
+    `cache_key` is sha256(model | prompt_version | prompt_hash); the
+    three parts are also stored on their own for inspection/bulk
+    invalidation (e.g. delete every row of a retired prompt_version).
+    `last_used_at` drives size-bounded eviction (least recently used
+    goes first); `hit_count` is the persisted, cross-worker hit tally
+    reported by /admin/api/metrics/llm-cache.
+    """
+    __tablename__ = "llm_response_cache"
+
+    cache_key = db.Column(db.String(64), primary_key=True)
+    model = db.Column(db.String(100), nullable=False)
+    prompt_version = db.Column(db.String(100), nullable=False, default="")
+    prompt_hash = db.Column(db.String(64), nullable=False)
+    response_text = db.Column(db.Text, nullable=False)
+    raw_response = db.Column(db.JSON, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False)
+    last_used_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    hit_count = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.Index("ix_llm_response_cache_last_used_at", "last_used_at"),
+        db.Index("ix_llm_response_cache_expires_at", "expires_at"),
+    )
+
+class CardsCacheEntry(db.Model):
+    """
+    One cached /api/cards panchang pair -- see services/cards_cache.py,
+    the only module that reads or writes this table. A row holds the
+    today/tomorrow panchang the route used to compute per request, for
+    one (IST date, grid cell, language); events and cards are built per
+    request on top of it.
+
+    `lat`/`lng` are the grid-cell centre the pair was computed at, not
+    any caller's coordinates. `expires_at` is the next IST midnight after
+    the row was written, so nothing outlives its date; `hit_count` is the
+    persisted, cross-worker hit tally.
+    """
+    __tablename__ = "cards_cache"
+
+    cache_key = db.Column(db.String(120), primary_key=True)
+    day = db.Column(db.Date, nullable=False)
+    lat = db.Column(db.Float, nullable=False)
+    lng = db.Column(db.Float, nullable=False)
+    language = db.Column(db.String(10), nullable=False)
+    payload = db.Column(db.JSON, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False)
+    hit_count = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.Index("ix_cards_cache_expires_at", "expires_at"),
+        db.Index("ix_cards_cache_created_at", "created_at"),
+    )
+
 class AstroEvent(db.Model):
     __tablename__ = "astro_events"
 
@@ -38,4 +132,69 @@ class AstroEvent(db.Model):
     notify_same_day = db.Column(db.Boolean, default=True)
     notify_time = db.Column(db.Time)
     meta = db.Column(db.JSON)
-    created_at = db.Column(db.DateTime, default=datetime.now)
\ No newline at end of file
+    created_at = db.Column(db.DateTime, default=datetime.now)
+
+    # Typed copies of the meta keys the readers filter / route on, kept
+    # by Postgres itself (generated columns), so no writer can forget
+    # them: transits carry planet + rashi (personalization_engine),
+    # festivals / vrats slug + their sub-type (event_resolver).
+    planet = db.Column(db.Text, db.Computed("meta ->> 'planet'", persisted=True))
+    rashi = db.Column(db.Text, db.Computed("meta ->> 'rashi'", persisted=True))
+    slug = db.Column(db.Text, db.Computed("meta ->> 'slug'", persisted=True))
+    sub_type = db.Column(db.Text, db.Computed("meta ->> 'type'", persisted=True))
+
+    # services/event_calendar.py: day / day-range lookups by (date, type),
+    # and "which events announce themselves on this day" -- the
+    # notify_before_days pre-events -- by the day they notify on.
+    __table_args__ = (
+        db.Index("ix_astro_events_date_type", "date", "type"),
+        db.Index("ix_astro_events_notify_on", date - notify_before_days),
+    )
+
+
+class AstroEventCalendarVersion(db.Model):
+    """
+    One row (id 1) whose `version` changes whenever astro_events does:
+    a statement-level trigger sets it to the writing transaction's id,
+    so every writer -- event_master.save_events_to_db() from
+    event_generator and event_scheduler, a manual fix, raw SQL -- moves
+    it, and a rolled-back write can never leave behind a version someone
+    else will commit later. services/event_calendar.py compares it
+    before serving its in-process today/tomorrow cache.
+    """
+    __tablename__ = "astro_event_calendar_version"
+
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+
+
+ASTRO_EVENT_CALENDAR_VERSION_DDL = (
+    "INSERT INTO astro_event_calendar_version (id, version) VALUES (1, 0) ON CONFLICT (id) DO NOTHING",
+    """
+    CREATE OR REPLACE FUNCTION astro_event_calendar_bump() RETURNS trigger AS $$
+    BEGIN
+        UPDATE astro_event_calendar_version SET version = txid_current() WHERE id = 1;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER trg_astro_events_calendar_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON astro_events
+    FOR EACH STATEMENT EXECUTE FUNCTION astro_event_calendar_bump()
+    """,
+)
+
+ASTRO_EVENT_CALENDAR_VERSION_DROP_DDL = (
+    "DROP TRIGGER IF EXISTS trg_astro_events_calendar_version ON astro_events",
+    "DROP FUNCTION IF EXISTS astro_event_calendar_bump()",
+)
+
+# create_all() / drop_all() (tests, fresh databases) get the trigger too;
+# production gets it from migration d7f2b5e8a1c3. The table must come
+# after `astro_events` for that.
+AstroEventCalendarVersion.__table__.add_is_dependent_on(AstroEvent.__table__)
+for _statement in ASTRO_EVENT_CALENDAR_VERSION_DDL:
+    event.listen(AstroEventCalendarVersion.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+for _statement in ASTRO_EVENT_CALENDAR_VERSION_DROP_DDL:
+    event.listen(AstroEventCalendarVersion.__table__, "before_drop", DDL(_statement).execute_if(dialect="postgresql"))
@@ -31,8 +31,18 @@ and optionally override two narrow hooks:
                                    which defers to the Lifecycle
                                    Manager's generic report_type-based
                                    fallback (see lifecycle_manager.py).
-    - PROMPT_VERSION / GENERATOR_VERSION class attributes -- provenance
-      only, no behavior depends on them in this phase.
+    - PROMPT_VERSION / GENERATOR_VERSION class attributes -- provenance,
+      and PROMPT_VERSION is also part of OpenAIExecutor's response-cache
+      key (services/llm_response_cache.py): bumping it is how a prompt
+      revision stops serving completions written for the old prompt.
+
+REQUEST-SCOPED ASTRO CONTEXT: generate() creates one AstroContext
+(services/ai_prediction_lab/astro_context.py) per call -- or uses the
+one the caller passes in, to share it across several report_types of
+the same profile -- and hands it to build_context() and
+compute_expires_at(). The kundali, the "now" transit snapshot and each
+planet's upcoming rashi segments are then computed at most once per
+generation, however many Lab builders read them.
 
 This class contains NO segment-specific logic, and NO OpenAI
 client/model construction -- both of those are reused from elsewhere
@@ -50,6 +60,7 @@ from modules.ai_report_engine.generator_interface import GeneratedReport, Report
 from modules.ai_report_engine.openai_executor import OpenAIExecutor
 from modules.ai_report_engine.output_validator import OutputValidator
 from modules.ai_report_engine.response_builder import ResponseBuilder
+from services.ai_prediction_lab.astro_context import AstroContext
 
 
 class BaseAIGenerator(ReportGenerator):
@@ -81,16 +92,22 @@ class BaseAIGenerator(ReportGenerator):
         profile_id: int,
         report_type: str,
         language: str,
+        astro_context: Optional[AstroContext] = None,
     ) -> GeneratedReport:
+        astro_context = astro_context or AstroContext()
+
         context = self.build_context(
             profile_id=profile_id, report_type=report_type, language=language,
+            astro_context=astro_context,
         )
 
         prompt = self.build_prompt(
             context=context, report_type=report_type, language=language,
         )
 
-        text, raw_openai_response = self._executor.run(prompt)
+        # PROMPT_VERSION is read AFTER build_context(): generators with
+        # per-report_type prompt versions resolve it there.
+        text, raw_openai_response = self._executor.run(prompt, prompt_version=self.PROMPT_VERSION)
 
         # P0 fix -- report_type/language are passed through so
         # OutputValidator can apply its structural (Section B) and
@@ -102,7 +119,9 @@ class BaseAIGenerator(ReportGenerator):
             text, report_type=report_type, language=language,
         )
 
-        expires_at = self.compute_expires_at(context=context, report_type=report_type)
+        expires_at = self.compute_expires_at(
+            context=context, report_type=report_type, astro_context=astro_context,
+        )
 
         return self._response_builder.build(
             text=validated_text,
@@ -110,6 +129,7 @@ class BaseAIGenerator(ReportGenerator):
             prompt_version=self.PROMPT_VERSION,
             generator_version=self.GENERATOR_VERSION or type(self).__name__,
             expires_at=expires_at,
+            token_usage=(raw_openai_response.get("usage") or {}).get("total_tokens"),
         )
 
     # ------------------------------------------------------------
@@ -122,12 +142,17 @@ class BaseAIGenerator(ReportGenerator):
         profile_id: int,
         report_type: str,
         language: str,
+        astro_context: AstroContext,
     ) -> Dict[str, Any]:
         """
         Gather and shape whatever backend data this report needs.
         Must reuse existing backend services/context builders -- this
         pipeline does not calculate anything itself. Returns a plain
         dict; the base class treats it as opaque.
+
+        `astro_context` is this generation's AstroContext -- the kundali
+        and every transit lookup should go through it (and be passed on
+        to the Lab builders) so nothing is computed twice.
         """
         raise NotImplementedError
 
@@ -157,5 +182,6 @@ class BaseAIGenerator(ReportGenerator):
         *,
         context: Dict[str, Any],
         report_type: str,
+        astro_context: Optional[AstroContext] = None,
     ) -> Optional[datetime]:
         return None
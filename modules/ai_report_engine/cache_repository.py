@@ -22,11 +22,14 @@ propagate as an unhandled exception. No schema change, no lock, no
 change to LifecycleManager -- this is the smallest fix that makes the
 existing constraint's own guarantee (at most one row per key) behave
 gracefully under the race it was always meant to prevent.
+
+`record_read()` stamps AIReport.last_read_at for user reads, so the
+background pre-generation job can skip rows nobody reads any more.
 """
 
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any, Dict, Optional
 
 from sqlalchemy.exc import IntegrityError
@@ -34,6 +37,8 @@ from sqlalchemy.exc import IntegrityError
 from extensions import db
 from modules.models_ai_reports import AIReport
 
+READ_TOUCH_INTERVAL = timedelta(hours=1)
+
 
 class ReportCacheRepository:
     def read_cache(
@@ -133,6 +138,16 @@ class ReportCacheRepository:
         db.session.commit()
         return row
 
+    def record_read(self, row: AIReport, now: Optional[datetime] = None) -> None:
+        """Stamps a user read on the row (AIReport.last_read_at) -- at
+        most once per READ_TOUCH_INTERVAL, so a hot report costs one
+        extra UPDATE an hour, not one per read."""
+        now = now or datetime.utcnow()
+        if row.last_read_at is not None and now - row.last_read_at < READ_TOUCH_INTERVAL:
+            return
+        row.last_read_at = now
+        db.session.commit()
+
     def mark_failed(self, row: AIReport) -> AIReport:
         """Records that the most recent generation attempt for this row
         failed, without touching whatever `content_json` it may already
@@ -48,6 +48,13 @@ class GeneratedReport:
     prompt_version: Optional[str] = None
     generator_version: Optional[str] = None
 
+    # Total LLM tokens this generation actually spent (OpenAI's
+    # `usage.total_tokens`), or None when unknown / nothing was spent
+    # (e.g. an LLM response-cache hit). Never persisted -- read only by
+    # callers that meter spend, e.g. the pre-generation scheduler's
+    # daily token budget (pregeneration_scheduler.py).
+    token_usage: Optional[int] = None
+
 
 class ReportGenerator(ABC):
     """
@@ -65,15 +65,21 @@ class ReportLifecycleManager:
         self,
         generators: Dict[str, ReportGenerator],
         repository: Optional[ReportCacheRepository] = None,
+        record_reads: bool = True,
     ):
         """
         `generators` maps segment string -> ReportGenerator instance,
         e.g. {"LOVE": LoveGenerator(), "CAREER": CareerGenerator(), ...}.
         This manager only ever uses `segment` as a dict key into this
         mapping -- it assigns no meaning to the string itself.
+
+        `record_reads` stamps AIReport.last_read_at on every report
+        returned; the background pre-generation job passes False so its
+        own refreshes never count as a user reading the report.
         """
         self._generators = generators
         self._repository = repository or ReportCacheRepository()
+        self._record_reads = record_reads
 
     # ------------------------------------------------------------
     # Public entry point
@@ -99,6 +105,8 @@ class ReportLifecycleManager:
         )
 
         if cache_row is not None and not self._determine_regeneration(cache_row, report_type):
+            if self._record_reads:
+                self._repository.record_read(cache_row)
             return cache_row.to_dict()
 
         generator = self._resolve_generator(segment)
@@ -145,6 +153,8 @@ class ReportLifecycleManager:
                 generator_version=result.generator_version,
             )
 
+        if self._record_reads:
+            self._repository.record_read(row)
         return row.to_dict()
 
     # ------------------------------------------------------------
@@ -11,27 +11,59 @@ already owns client construction/model selection (see that module).
 Every future generator (Love, Career, Finance, Health, Family, Alerts)
 goes through this one executor, so there is exactly one OpenAI call
 site for the whole Premium AI Report Engine.
+
+Response cache: before calling OpenAI, the executor consults the
+content-addressed LLM response cache (services/llm_response_cache.py),
+keyed on (model, normalized prompt hash, prompt_version). Two profiles
+whose chart features render the same prompt under the same
+PROMPT_VERSION get the same stored completion instead of a second paid
+call; a miss calls OpenAI exactly as before and stores the result. The
+cache is constructor-injected (default: the process-wide
+get_llm_response_cache()), and a cache failure never fails the run --
+it just falls through to the live call.
 """
 
 from __future__ import annotations
 
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, Optional, Tuple
 
 from services.ai_prediction_lab import openai_client
+from services.llm_response_cache import LLMResponseCache, get_llm_response_cache
 
 from modules.ai_report_engine.exceptions import OpenAICallError
 
 
 class OpenAIExecutor:
-    def run(self, prompt: str) -> Tuple[str, Dict[str, Any]]:
+    def __init__(self, cache: Optional[LLMResponseCache] = None):
+        self._cache = cache
+
+    def run(self, prompt: str, *, prompt_version: Optional[str] = None) -> Tuple[str, Dict[str, Any]]:
         """
         Returns (text, raw_openai_response). `raw_openai_response` is the
         full API response dict (from `generate_with_raw`), which already
         contains OpenAI's own `model` field -- used by the Base AI
         Generator to record `model_version` without this pipeline having
-        to know or duplicate which model string the Lab client uses.
+        to know or duplicate which model string the Lab client uses. On
+        a cache hit it is the stored dict of the call that produced the
+        text, so provenance is unchanged -- minus its `usage` block: a
+        hit spent no tokens, and GeneratedReport.token_usage (metered by
+        the pre-generation scheduler's daily budget) must say so.
+
+        `prompt_version` is part of the cache key (the generator's
+        PROMPT_VERSION), so a prompt revision never serves text written
+        for the previous one.
         """
-        try:
-            return openai_client.generate_with_raw(prompt)
-        except Exception as exc:
-            raise OpenAICallError("OpenAI call failed") from exc
+        cache = self._cache or get_llm_response_cache()
+
+        def call():
+            try:
+                return openai_client.generate_with_raw(prompt)
+            except Exception as exc:
+                raise OpenAICallError("OpenAI call failed") from exc
+
+        text, raw, hit = cache.fetch(
+            model=openai_client._MODEL, prompt=prompt, prompt_version=prompt_version, call=call,
+        )
+        if hit:
+            raw = {key: value for key, value in raw.items() if key != "usage"}
+        return text, raw
@@ -0,0 +1,394 @@
+# modules/ai_report_engine/pregeneration_scheduler.py
+
+"""
+Background pre-generation of expiring AI reports.
+
+`run_report_pregeneration_job()` regenerates cached `ai_reports` rows
+at the moment they expire, for profiles that are still entitled to
+them, so the user's next read is served from a warm cache instead of
+waiting for the full generation pipeline inside
+ReportLifecycleManager.get_report().
+
+==================================================
+WHY AT EXPIRY, NOT BEFORE IT
+==================================================
+Every refreshable report's `expires_at` already marks exactly when its
+content stops being true -- compute_current_timing_expiry() (a fast
+planet's sign change / 24h), next_phase_change (the next relevant
+ingress or Antardasha boundary), DAILY_INSIGHT's one-day rule. The
+generators read the live sky and the current dasha at generation time
+(transit_engine / full_kundali_api have no "as of" input), so a report
+regenerated BEFORE that instant would describe the old phase again and
+get the same expiry back. The job therefore scans rows expiring within
+the next `horizon_hours` (plus any that expired within the last
+`lookback_hours` and have not been read since), and hands each one to
+the worker pool just after its own `expires_at` (+ GRACE_SECONDS).
+Started once per horizon (see .github/workflows/ai_report_pregeneration.yml),
+every expiry is covered as it happens, and the only cold reads left are
+the few seconds between an expiry and its regeneration. Because a run
+sleeps through its horizon, consecutive runs overlap -- see OVERLAPPING
+RUNS below.
+
+Regeneration goes through the existing stack unchanged:
+ReportLifecycleManager.get_report() with the GeneratorRegistry's own
+generators. At due time the row IS expired, so the manager's own
+regeneration policy decides to regenerate and UPDATEs the same row; if
+a user read already refreshed it in the meantime, the manager simply
+returns the fresh row and nothing is spent (`already_fresh`).
+
+==================================================
+WHICH ROWS
+==================================================
+  - status READY and report_type in REFRESHABLE_REPORT_TYPES (DNA never
+    expires; PENDING/FAILED rows are left to the user-triggered path).
+  - The profile must still have access to the row's segment according
+    to EntitlementService (the same read PremiumReportService's gate
+    uses), checked once per profile per run, BEFORE any generation.
+    Lapsed trials and expired subscriptions are never regenerated.
+  - Someone must still be reading it: AIReport.last_read_at (stamped by
+    ReportLifecycleManager on user reads, never by this job) within the
+    last `active_days` (AI_REPORT_PREGEN_ACTIVE_DAYS, default 7).
+    Otherwise a DAILY_INSIGHT would be regenerated every day, forever,
+    for a user who stopped opening the app; such rows regenerate lazily
+    on their next read instead.
+
+==================================================
+CONCURRENCY CAP AND DAILY TOKEN BUDGET
+==================================================
+  - At most `workers` (AI_REPORT_PREGEN_WORKERS, default 4)
+    regenerations run at once, on a thread pool -- each in its own app
+    context (so its own DB session) and with its own shallow copy of
+    the registry's generator, since generators keep per-call state
+    (e.g. _current_prompt_version). The shared LLM executor's own
+    concurrency bound applies on top.
+  - Tokens actually spent (GeneratedReport.token_usage, i.e. OpenAI's
+    usage.total_tokens; an LLM response-cache hit spends none) are
+    added to today's AIReportPregenerationLedger row. Before each
+    regeneration starts, the job checks that row against
+    AI_REPORT_PREGEN_DAILY_TOKEN_BUDGET (default 2,000,000); once it is
+    spent, every remaining due row is skipped (`budget_skipped`) and
+    left to lazy regeneration. At most `workers` regenerations already
+    in flight can overshoot the budget.
+
+==================================================
+OVERLAPPING RUNS
+==================================================
+There is no job-wide lock: a run that held one while sleeping towards
+its last expiry would turn the next scheduled run into a no-op. Instead
+each run CLAIMS its rows -- one UPDATE ... WHERE id IN (SELECT ... FOR
+UPDATE SKIP LOCKED) setting AIReport.pregeneration_claimed_at -- and
+only rows with no live claim are eligible. Overlapping runs therefore
+split the work, never double it. A claim is released as soon as its row
+is handled (regenerated, fresh, skipped or failed), so the next expiry
+of the same row is claimable again; a claim older than the claiming
+run's horizon + grace + CLAIM_SLACK_SECONDS is treated as abandoned (the
+run died) and can be re-claimed.
+"""
+
+from __future__ import annotations
+
+import copy
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from flask import current_app
+from sqlalchemy import or_, select, update
+
+from extensions import db
+from modules.ai_report_engine.generator_interface import GeneratedReport, ReportGenerator
+from modules.ai_report_engine.generator_registry import GeneratorRegistry, get_default_registry
+from modules.ai_report_engine.lifecycle_manager import ReportLifecycleManager
+from modules.entitlement.entitlement_service import EntitlementService
+from modules.models_ai_reports import AIReport, AIReportPregenerationLedger
+
+REFRESHABLE_REPORT_TYPES = ("CURRENT_PHASE", "CURRENT_TIMING", "DAILY_INSIGHT")
+
+DEFAULT_HORIZON_HOURS = 1.0
+DEFAULT_LOOKBACK_HOURS = 24.0
+DEFAULT_ACTIVE_DAYS = 7.0
+DEFAULT_WORKERS = 4
+DEFAULT_DAILY_TOKEN_BUDGET = 2_000_000
+
+# Regenerate this long AFTER expires_at, so the manager sees the row as
+# expired and the generators see the new phase.
+GRACE_SECONDS = 60
+
+# How long past horizon + grace a run may still be working through its
+# claimed rows (queued behind `workers`) before its claims are presumed
+# abandoned.
+CLAIM_SLACK_SECONDS = 30 * 60
+
+
+def _env_number(name: str, default, cast):
+    raw = (os.getenv(name) or "").strip()
+    if not raw:
+        return default
+    try:
+        return cast(raw)
+    except ValueError:
+        return default
+
+
+@dataclass
+class DueReport:
+    profile_id: int
+    segment: str
+    report_type: str
+    language: str
+    expires_at: datetime
+    report_id: int
+
+
+@dataclass
+class PregenerationJobSummary:
+    """Aggregate counts only -- never report content or birth data."""
+
+    rows_scanned: int = 0
+    entitlement_skipped: int = 0
+    regenerated: int = 0
+    already_fresh: int = 0
+    budget_skipped: int = 0
+    failures: int = 0
+    tokens_used: int = 0
+    duration_seconds: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "rows_scanned": self.rows_scanned,
+            "entitlement_skipped": self.entitlement_skipped,
+            "regenerated": self.regenerated,
+            "already_fresh": self.already_fresh,
+            "budget_skipped": self.budget_skipped,
+            "failures": self.failures,
+            "tokens_used": self.tokens_used,
+            "duration_seconds": round(self.duration_seconds, 3),
+        }
+
+
+class PregenerationBudget:
+    """Today's background token spend, persisted in
+    AIReportPregenerationLedger so every run of the day shares it."""
+
+    def __init__(self, daily_tokens: Optional[int] = None):
+        self.daily_tokens = daily_tokens or _env_number(
+            "AI_REPORT_PREGEN_DAILY_TOKEN_BUDGET", DEFAULT_DAILY_TOKEN_BUDGET, int,
+        )
+
+    def spent(self, day: date) -> int:
+        row = db.session.get(AIReportPregenerationLedger, day)
+        return int(row.tokens_used) if row is not None else 0
+
+    def exhausted(self, day: date) -> bool:
+        return self.spent(day) >= self.daily_tokens
+
+    def charge(self, day: date, tokens: int) -> None:
+        from sqlalchemy.dialects.postgresql import insert
+
+        table = AIReportPregenerationLedger.__table__
+        statement = insert(table).values(
+            day=day, tokens_used=tokens, reports_regenerated=1, updated_at=datetime.utcnow(),
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.day],
+            set_={
+                "tokens_used": table.c.tokens_used + statement.excluded.tokens_used,
+                "reports_regenerated": table.c.reports_regenerated + 1,
+                "updated_at": statement.excluded.updated_at,
+            },
+        )
+        db.session.execute(statement)
+        db.session.commit()
+
+
+class _MeteredGenerator(ReportGenerator):
+    """Delegates to the registry's generator and remembers whether a
+    generation ran and what it spent -- the lifecycle manager itself
+    returns only the stored row."""
+
+    def __init__(self, generator: ReportGenerator):
+        self._generator = generator
+        self.generated = False
+        self.token_usage = 0
+
+    def generate(self, *, profile_id: int, report_type: str, language: str) -> GeneratedReport:
+        result = self._generator.generate(profile_id=profile_id, report_type=report_type, language=language)
+        self.generated = True
+        self.token_usage = result.token_usage or 0
+        return result
+
+
+def claim_due_reports(
+    *,
+    now: datetime,
+    horizon_hours: float,
+    lookback_hours: float,
+    active_days: float,
+    claim_timeout: timedelta,
+) -> List[DueReport]:
+    """Claims (pregeneration_claimed_at = now) and returns the READY
+    refreshable rows read within the last `active_days` whose expires_at
+    falls in [now - lookback, now + horizon] and that no other run holds
+    -- no claim, or one older than `claim_timeout`. Soonest first.
+    Commits, so the claims are visible to other runs at once."""
+    candidates = (
+        select(AIReport.id)
+        .where(
+            AIReport.status == "READY",
+            AIReport.report_type.in_(REFRESHABLE_REPORT_TYPES),
+            AIReport.expires_at.isnot(None),
+            AIReport.expires_at >= now - timedelta(hours=lookback_hours),
+            AIReport.expires_at <= now + timedelta(hours=horizon_hours),
+            AIReport.last_read_at >= now - timedelta(days=active_days),
+            or_(
+                AIReport.pregeneration_claimed_at.is_(None),
+                AIReport.pregeneration_claimed_at < now - claim_timeout,
+            ),
+        )
+        .with_for_update(skip_locked=True)
+    )
+    rows = db.session.execute(
+        update(AIReport)
+        .where(AIReport.id.in_(candidates.scalar_subquery()))
+        .values(pregeneration_claimed_at=now)
+        .returning(
+            AIReport.profile_id, AIReport.segment, AIReport.report_type,
+            AIReport.language, AIReport.expires_at, AIReport.id,
+        )
+        .execution_options(synchronize_session=False)
+    ).all()
+    db.session.commit()
+    return sorted((DueReport(*row) for row in rows), key=lambda due: due.expires_at)
+
+
+def release_claims(report_ids: List[int], claimed_at: datetime) -> None:
+    """Clears this run's claims -- only where the claim is still the one
+    it made at `claimed_at`, never one another run took over."""
+    if not report_ids:
+        return
+    db.session.execute(
+        update(AIReport)
+        .where(AIReport.id.in_(report_ids), AIReport.pregeneration_claimed_at == claimed_at)
+        .values(pregeneration_claimed_at=None)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+
+
+def run_report_pregeneration_job(
+    *,
+    registry: Optional[GeneratorRegistry] = None,
+    entitlement_service: Optional[EntitlementService] = None,
+    budget: Optional[PregenerationBudget] = None,
+    horizon_hours: Optional[float] = None,
+    lookback_hours: Optional[float] = None,
+    active_days: Optional[float] = None,
+    workers: Optional[int] = None,
+    grace_seconds: float = GRACE_SECONDS,
+    now_fn: Optional[Callable[[], datetime]] = None,
+    sleep_fn: Optional[Callable[[float], None]] = None,
+) -> PregenerationJobSummary:
+    """
+    The job's single entry point; must be called inside an app context.
+    Returns once every due row in the horizon has been handled. Safe to
+    re-run, and to run alongside another run: rows are claimed per run,
+    and a refreshed row is no longer expired, so the lifecycle manager
+    just returns it.
+    """
+    started = time.monotonic()
+    now_fn = now_fn or datetime.utcnow
+    sleep_fn = sleep_fn or time.sleep
+    summary = PregenerationJobSummary()
+
+    registry = registry or get_default_registry()
+    entitlement_service = entitlement_service or EntitlementService()
+    budget = budget or PregenerationBudget()
+    horizon_hours = horizon_hours if horizon_hours is not None else _env_number(
+        "AI_REPORT_PREGEN_HORIZON_HOURS", DEFAULT_HORIZON_HOURS, float,
+    )
+    lookback_hours = lookback_hours if lookback_hours is not None else _env_number(
+        "AI_REPORT_PREGEN_LOOKBACK_HOURS", DEFAULT_LOOKBACK_HOURS, float,
+    )
+    active_days = active_days if active_days is not None else _env_number(
+        "AI_REPORT_PREGEN_ACTIVE_DAYS", DEFAULT_ACTIVE_DAYS, float,
+    )
+    workers = max(1, workers or _env_number("AI_REPORT_PREGEN_WORKERS", DEFAULT_WORKERS, int))
+
+    app = current_app._get_current_object()
+    counters_lock = threading.Lock()
+
+    def count(name: str, amount: int = 1) -> None:
+        with counters_lock:
+            setattr(summary, name, getattr(summary, name) + amount)
+
+    def regenerate(due: DueReport, claimed_at: datetime) -> None:
+        with app.app_context():
+            try:
+                today = now_fn().date()
+                if budget.exhausted(today):
+                    count("budget_skipped")
+                    return
+                metered = _MeteredGenerator(copy.copy(registry.resolve(due.segment)))
+                manager = ReportLifecycleManager(generators={due.segment: metered}, record_reads=False)
+                manager.get_report(
+                    profile_id=due.profile_id, segment=due.segment,
+                    report_type=due.report_type, language=due.language,
+                )
+                if not metered.generated:
+                    count("already_fresh")
+                    return
+                budget.charge(today, metered.token_usage)
+                count("regenerated")
+                count("tokens_used", metered.token_usage)
+            except Exception as exc:
+                db.session.rollback()
+                count("failures")
+                print(
+                    f"[Pregeneration] ❌ profile_id={due.profile_id} {due.segment}/"
+                    f"{due.report_type}/{due.language}: {type(exc).__name__}: {exc}"
+                )
+            finally:
+                try:
+                    release_claims([due.report_id], claimed_at)
+                except Exception as exc:
+                    db.session.rollback()
+                    print(f"[Pregeneration] ⚠️ could not release claim on report {due.report_id}: {exc}")
+
+    claimed_at = now_fn()
+    claim_timeout = timedelta(hours=horizon_hours, seconds=grace_seconds + CLAIM_SLACK_SECONDS)
+    due_rows = claim_due_reports(
+        now=claimed_at, horizon_hours=horizon_hours, lookback_hours=lookback_hours,
+        active_days=active_days, claim_timeout=claim_timeout,
+    )
+    summary.rows_scanned = len(due_rows)
+
+    access: Dict[int, frozenset] = {}
+    eligible = []
+    skipped_ids = []
+    for due in due_rows:
+        if due.profile_id not in access:
+            snapshot = entitlement_service.get_current_entitlement(due.profile_id)
+            access[due.profile_id] = frozenset(snapshot.accessible_segments)
+        if due.segment in access[due.profile_id]:
+            eligible.append(due)
+        else:
+            summary.entitlement_skipped += 1
+            skipped_ids.append(due.report_id)
+    # Entitlement reads are done; don't hold this thread's transaction
+    # open while it sleeps towards the next expiry.
+    release_claims(skipped_ids, claimed_at)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="report-pregen") as pool:
+        for due in eligible:
+            wait = (due.expires_at + timedelta(seconds=grace_seconds) - now_fn()).total_seconds()
+            if wait > 0:
+                sleep_fn(wait)
+            pool.submit(regenerate, due, claimed_at)
+
+    summary.duration_seconds = time.monotonic() - started
+    print(f"[Pregeneration] {summary.to_dict()}")
+    return summary
@@ -29,6 +29,7 @@ class ResponseBuilder:
         prompt_version: Optional[str],
         generator_version: Optional[str],
         expires_at: Optional[datetime],
+        token_usage: Optional[int] = None,
     ) -> GeneratedReport:
         content_json: Dict[str, Any] = {"content": text}
 
@@ -38,4 +39,5 @@ class ResponseBuilder:
             model_version=model_version,
             prompt_version=prompt_version,
             generator_version=generator_version,
+            token_usage=token_usage,
         )
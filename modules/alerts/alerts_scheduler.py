@@ -66,6 +66,33 @@ BEFORE AppUser is even loaded, and definitely before
 full_kundali_api.calculate_full_kundali()/ProfileDetectionService are
 ever reached.
 
+==================================================
+PARALLEL MODE (optional worker pool)
+==================================================
+Per-profile work is dominated by ephemeris CPU (sunrise boundary,
+calculate_full_kundali(), PlanningWindowEngine.plan()) -- none of
+which touches the database. With `workers` > 1 (argument, or the
+ALERTS_JOB_WORKERS env var; "auto" means os.cpu_count()), each batch
+is split in two:
+
+    parent:  entitlement gate -> AppUser/token checks -> birth details
+    pool:    profile_detection_service.detect_profile_events() (pure)
+    parent:  persist_detection() -> selection -> delivery
+
+Only the pure stage crosses the process boundary -- plain dicts in,
+frozen dataclasses out -- so every DB read/write, the advisory lock,
+and all FCM sends stay in the parent, on the same session and in the
+same per-profile order the sequential path uses. A worker exception
+(including a crashed pool) is attributed to that one profile exactly
+like the sequential path's per-profile try/except, never to the batch.
+The pool uses the "spawn" start method so no worker ever inherits the
+parent's open Postgres connections (including the lock connection).
+
+The default (workers=1) is the original sequential loop, unchanged --
+and is also what runs whenever a non-ProfileDetectionService
+detection_service is injected (e.g. test spies), since the split
+stages only exist on the real service.
+
 ==================================================
 NOT enabled for production scheduling by this phase
 ==================================================
@@ -78,10 +105,13 @@ Readiness, Migration Reconciliation & Controlled Activation").
 
 from __future__ import annotations
 
+import multiprocessing
+import os
 import time
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from sqlalchemy import text
 
@@ -96,10 +126,13 @@ from modules.alerts.alert_delivery_service import deliver_alert
 from modules.alerts.entitlement_gate import has_alerts_access
 from modules.alerts.notification_content_adapter import AlertContentError, build_alert_notification_content
 from modules.alerts.persistence_repository import AlertPersistenceRepository
+from modules.alerts.planning_window_engine import PlanningWindowEngine
 from modules.alerts.profile_detection_service import (
     DetectionRunFailedError,
     ProfileDataError,
+    ProfileDetection,
     ProfileDetectionService,
+    detect_profile_events,
 )
 from modules.alerts.sunrise_boundary import SunriseResolutionError
 from modules.alerts.user_alert_selection_service import get_user_facing_alerts_for_profile
@@ -120,6 +153,26 @@ _ADVISORY_LOCK_OBJECT_ID = 1
 # already uses (BATCH_SIZE = 500) -- reused, not reinvented.
 BATCH_SIZE = 500
 
+# Parallel mode knob -- see this module's "PARALLEL MODE" docstring
+# section. Unset/"1" keeps the original sequential loop.
+_WORKERS_ENV_VAR = "ALERTS_JOB_WORKERS"
+
+
+def resolve_worker_count(workers: Optional[int] = None) -> int:
+    """`workers` if given, else ALERTS_JOB_WORKERS ("auto" ->
+    os.cpu_count()), else 1. Never less than 1; an unparseable env
+    value falls back to 1 (sequential) rather than failing the job."""
+    if workers is None:
+        raw = (os.getenv(_WORKERS_ENV_VAR) or "").strip().lower()
+        if raw == "auto":
+            workers = os.cpu_count() or 1
+        else:
+            try:
+                workers = int(raw) if raw else 1
+            except ValueError:
+                workers = 1
+    return max(1, workers)
+
 
 @dataclass
 class AlertsJobSummary:
@@ -196,13 +249,14 @@ def run_daily_alerts_job(
     repository: Optional[AlertPersistenceRepository] = None,
     batch_size: int = BATCH_SIZE,
     now: Optional[datetime] = None,
+    workers: Optional[int] = None,
 ) -> AlertsJobSummary:
     """
     The Alerts job's single entry point. Safe to call repeatedly
     (sequential reruns) and safe to call concurrently (a second
     overlapping call returns immediately, having done nothing, if a
     first call is still running) -- see this module's own docstring
-    for both guarantees.
+    for both guarantees. `workers` -- see "PARALLEL MODE" there.
     """
     started = time.monotonic()
     now = now or datetime.utcnow()
@@ -212,7 +266,11 @@ def run_daily_alerts_job(
     detection_service = detection_service or ProfileDetectionService()
     repository = repository or AlertPersistenceRepository()
 
+    workers = resolve_worker_count(workers)
+    parallel = workers > 1 and isinstance(detection_service, ProfileDetectionService)
+
     lock_conn = db.engine.connect()
+    pool: Optional[ProcessPoolExecutor] = None
     try:
         got_lock = lock_conn.execute(
             text("SELECT pg_try_advisory_lock(:classid, :objid)"),
@@ -225,25 +283,47 @@ def run_daily_alerts_job(
             summary.duration_seconds = time.monotonic() - started
             return summary
 
+        if parallel:
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_detection_worker,
+                initargs=(detection_service.planning_engine,),
+            )
+
         offset = 0
         while True:
             profile_ids = _fetch_candidate_profile_ids(batch_size=batch_size, offset=offset)
             if not profile_ids:
                 break
 
-            for profile_id in profile_ids:
-                summary.profiles_scanned += 1
-                _process_one_profile(
-                    profile_id=profile_id,
+            if pool is not None:
+                summary.profiles_scanned += len(profile_ids)
+                _process_batch_parallel(
+                    profile_ids=profile_ids,
+                    pool=pool,
                     now=now,
                     entitlement_service=entitlement_service,
                     detection_service=detection_service,
                     repository=repository,
                     summary=summary,
                 )
+            else:
+                for profile_id in profile_ids:
+                    summary.profiles_scanned += 1
+                    _process_one_profile(
+                        profile_id=profile_id,
+                        now=now,
+                        entitlement_service=entitlement_service,
+                        detection_service=detection_service,
+                        repository=repository,
+                        summary=summary,
+                    )
 
             offset += batch_size
     finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
         if summary.lock_acquired:
             lock_conn.execute(
                 text("SELECT pg_advisory_unlock(:classid, :objid)"),
@@ -295,30 +375,19 @@ def _process_one_profile(
     independently in earlier phases.
     """
     try:
-        # ---- 1. Entitlement gate -- BEFORE any astrology or even
-        # loading the AppUser row. ----
-        entitlement = has_alerts_access(profile_id, entitlement_service=entitlement_service)
-        if not entitlement.entitled:
-            summary.entitlement_skipped += 1
-            return
-
-        # ---- 2/3. Cheap profile checks BEFORE expensive astrology ----
-        user = AppUser.query.get(profile_id)
-        if user is None:
-            summary.invalid_profile_skipped += 1
-            return
-
-        fcm_token = getattr(user, "fcm_token", None)
-        if not fcm_token:
-            summary.missing_token_skipped += 1
+        prefiltered = _prefilter_profile(
+            profile_id=profile_id, entitlement_service=entitlement_service, summary=summary,
+        )
+        if prefiltered is None:
             return
+        user, fcm_token = prefiltered
 
         # ---- 4. Detection (ProfileDetectionService, unmodified) ----
         try:
             result = detection_service.evaluate_profile(profile_id)
         except ProfileDataError:
             # Missing/invalid birth data -- ProfileDetectionService's
-            # own _load_birth_details() already checks this BEFORE
+            # own load_birth_details() already checks this BEFORE
             # calling calculate_full_kundali(), so no expensive
             # astrology ran for this profile either way.
             summary.invalid_profile_skipped += 1
@@ -330,154 +399,299 @@ def _process_one_profile(
         summary.profiles_evaluated += 1
         summary.alerts_detected += result.events_detected
 
-        # ---- 5. Fetch persisted active alerts (Phase 1, unmodified) --
-        # needed below to count alerts that fail the pre-existing
-        # eligibility gate for the (unchanged-meaning)
-        # cooldown_or_eligibility_skipped counter. ----
-        active_alerts = repository.fetch_active_for_profile(profile_id=profile_id)
-
-        # ---- 5b. User Alert Selection Layer (Alerts Product Hardening)
-        # -- narrows the full active-alert set down to the small,
-        # non-contradictory, non-redundant user-facing subset (normally
-        # 1, at most MAX_USER_FACING_ALERTS) BEFORE any delivery is
-        # attempted. THE SAME function a future Alerts app API endpoint
-        # must also call (see user_alert_selection_service.py's own
-        # docstring) -- one selection authority for both push and any
-        # future in-app list. Internally reuses the EXISTING, unmodified
-        # Phase 4 eligibility/cooldown gate -- this layer only narrows
-        # further for product exposure, never overrides that decision.
-        selection = get_user_facing_alerts_for_profile(
-            profile_id, now=now, repository=repository, lat=user.lat, lon=user.lng,
+        _deliver_for_profile(
+            profile_id=profile_id,
+            user=user,
+            fcm_token=fcm_token,
+            now=now,
+            entitlement_service=entitlement_service,
+            repository=repository,
+            summary=summary,
         )
 
-        # ---- Architectural gate: AI generation happens HERE, ONLY for
-        # the FINAL selected set -- never for the raw detected events
-        # above. See ensure_ai_content_for_selected_rows()'s own
-        # docstring. Runs before BOTH the push (attemptable_rows) and
-        # Bell-only (bell_only_rows) branches below, since both are
-        # subsets of selection.selected and either channel needs the
-        # content ready before building notification content. ----
-        ensure_ai_content_for_selected_rows(selection.selected)
-
-        selected_event_ids = {r.event_id for r in selection.selected}
-
-        # Pre-existing meaning preserved: alerts that failed the Phase 4
-        # confidence/cooldown gate entirely (never even reached
-        # selection) still count here, exactly as before this change.
-        summary.cooldown_or_eligibility_skipped += len(active_alerts) - selection.eligible_count
-        # New: alerts that PASSED that gate but were not chosen by the
-        # selection layer (conflict/similarity suppression, category
-        # diversity, or the daily cap).
-        summary.selection_suppressed += selection.eligible_count - len(selection.selected)
-
-        # ---- N4 (Global User Attention Policy) -- BEFORE attempting
-        # delivery, narrow Alerts' own already-selected set (at most
-        # MAX_USER_FACING_ALERTS, unchanged) against the user's GLOBAL
-        # remaining daily push budget, shared with
-        # services/event_scheduler.py's pipeline via the same persisted
-        # signal (services/attention_policy.py::count_pushes_sent_today()
-        # -- re-read fresh here, every call, so this can never see a
-        # stale count from an earlier run). This does NOT touch Alerts'
-        # own eligibility, confidence, cooldown, or selection algorithm
-        # (user_alert_selection.py, unmodified) -- it only decides, of
-        # the alerts Alerts already wants to send, how many actually fit
-        # in what's left of today's budget. If only one slot remains and
-        # two were selected, the higher-severity one is attempted first
-        # (Alerts' own config-driven severity -- see
-        # severity_cooldown_registry.py -- not re-derived here).
-        global_remaining = max(
-            0, DAILY_PUSH_CAP - count_pushes_sent_today(profile_id, now=now)
-        )
-        selected_rows = sorted(
-            (r for r in active_alerts if r.event_id in selected_event_ids),
-            key=lambda r: tier_for_alert_severity(r.severity),
-        )
-        attemptable_rows = selected_rows[:global_remaining]
-        bell_only_rows = selected_rows[global_remaining:]
-        summary.global_cap_suppressed += len(bell_only_rows)
-
-        # ---- N5 -- Bell-only fallback for the rest. Every row here
-        # ALREADY passed Alerts' own hardened eligibility + selection
-        # (user_alert_selection.py, unmodified) in this exact run -- the
-        # only reason it isn't being pushed is that today's global
-        # budget ran out. A genuinely useful, already-vetted Alert
-        # should not vanish completely just because the push slot was
-        # spent elsewhere; see persistence_repository.py::
-        # record_bell_only()'s own docstring for why this can never
-        # touch cooldown/dedup or be mistaken for a real delivery. Never
-        # attempted for a row that failed eligibility or was excluded by
-        # Alerts' own selection -- bell_only_rows is a strict suffix of
-        # selected_rows, both already-vetted sets.
-        for alert_row in bell_only_rows:
+    except Exception as exc:
+        _record_unexpected_failure(profile_id, exc, summary)
+
+
+def _process_batch_parallel(
+    *,
+    profile_ids: List[int],
+    pool: ProcessPoolExecutor,
+    now: datetime,
+    entitlement_service: EntitlementService,
+    detection_service: ProfileDetectionService,
+    repository: AlertPersistenceRepository,
+    summary: AlertsJobSummary,
+) -> None:
+    """
+    Parallel-mode counterpart of calling _process_one_profile() for
+    each id in `profile_ids` -- same steps, same counters, same
+    per-profile isolation. Phase A (parent) gates every profile and
+    submits the pure astrology stage to `pool`; phase B (parent)
+    consumes results in SUBMISSION order, so persistence and delivery
+    happen in the same profile order the sequential path uses.
+    """
+    pending: List[Tuple[int, object, str, Future]] = []
+
+    for profile_id in profile_ids:
+        try:
+            prefiltered = _prefilter_profile(
+                profile_id=profile_id, entitlement_service=entitlement_service, summary=summary,
+            )
+            if prefiltered is None:
+                continue
+            user, fcm_token = prefiltered
+
             try:
-                content = build_alert_notification_content(
-                    event_id=alert_row.event_id,
-                    category=alert_row.category,
-                    severity=alert_row.severity,
-                    ai_insight=alert_row.ai_insight,
-                    ai_action=alert_row.ai_action,
-                )
-            except AlertContentError:
-                continue  # same defensive posture as deliver_alert()'s own content stage
+                birth_details = detection_service.load_birth_details(profile_id)
+            except ProfileDataError:
+                summary.invalid_profile_skipped += 1
+                continue
 
-            bell_row = repository.record_bell_only(
-                profile_id=profile_id,
-                event_id=alert_row.event_id,
-                notification_title=content["title"],
-                notification_body=content["body"],
-                notification_data=content["data"],
-                active_until=alert_row.active_until,
-                now=now,
+            future = pool.submit(_detect_in_worker, birth_details, profile_id)
+            pending.append((profile_id, user, fcm_token, future))
+        except Exception as exc:
+            _record_unexpected_failure(profile_id, exc, summary)
+
+    for profile_id, user, fcm_token, future in pending:
+        try:
+            evaluated_at = datetime.utcnow()
+            started = time.monotonic()
+            try:
+                detection = future.result()
+            except (DetectionRunFailedError, SunriseResolutionError):
+                summary.failures += 1
+                continue
+
+            result = detection_service.persist_detection(
+                profile_id, detection, evaluated_at=evaluated_at, started=started,
             )
-            if bell_row is not None:
-                summary.alerts_bell_only += 1
-
-        # ---- 6/7. Deliver each SELECTED-AND-GLOBALLY-BUDGETED alert --
-        # deliver_alert() (Phase 4/5, unmodified) remains the SOLE
-        # eligibility/cooldown authority for the actual send; nothing
-        # here re-checks or duplicates that decision, it only decides
-        # WHICH event_ids reach this call at all. ----
-        for alert_row in attemptable_rows:
-            summary.alerts_attempted += 1
-            delivery = deliver_alert(
+            summary.profiles_evaluated += 1
+            summary.alerts_detected += result.events_detected
+
+            _deliver_for_profile(
                 profile_id=profile_id,
-                event_id=alert_row.event_id,
+                user=user,
                 fcm_token=fcm_token,
                 now=now,
                 entitlement_service=entitlement_service,
                 repository=repository,
+                summary=summary,
             )
-            # NOTE: branch on `delivery.stage`, NOT `delivery.sent` --
-            # AlertDeliveryResult.sent is True for BOTH stage=="delivered"
-            # (fully successful) AND stage=="finalization_failed" (FCM
-            # physically succeeded, but the DB bookkeeping did not --
-            # see alert_delivery_service.py's own docstring). Using
-            # `sent` alone would silently miscount a finalization
-            # failure as a clean delivery in this job's own operational
-            # summary.
-            if delivery.stage == "delivered":
-                summary.alerts_delivered += 1
-            elif delivery.stage == "eligibility":
-                summary.cooldown_or_eligibility_skipped += 1
-            elif delivery.stage in ("entitlement", "load", "content"):
-                # Should be rare here (entitlement was just confirmed
-                # and the row was just fetched) but is not a hard
-                # failure -- simply not delivered this run.
-                summary.cooldown_or_eligibility_skipped += 1
-            else:  # "send" failed, or "finalization_failed"
-                # A "finalization_failed" outcome means FCM already
-                # succeeded -- deliver_alert() itself does not retry
-                # the send (see its own docstring), and neither does
-                # this loop: each active alert is attempted exactly
-                # ONCE per job run, so a blind duplicate send can never
-                # happen here.
-                summary.failures += 1
+        except Exception as exc:
+            _record_unexpected_failure(profile_id, exc, summary)
 
-    except Exception as exc:
-        db.session.rollback()
-        summary.failures += 1
-        # profile_id (a plain integer) is safe to log; the exception
-        # TYPE only is printed, never its message or any profile
-        # content, per this phase's "do not log sensitive profile
-        # content" requirement.
-        print(f"Alerts job: profile_id={profile_id} failed with {type(exc).__name__} -- skipped, continuing.")
+
+# Set once per worker process by _init_detection_worker() -- the
+# engine (and its RuleEvaluationCache) then lives for the worker's
+# whole lifetime instead of being re-pickled with every task, so
+# equivalent chart signatures are evaluated once per worker.
+_worker_planning_engine: Optional[PlanningWindowEngine] = None
+
+
+def _init_detection_worker(planning_engine: PlanningWindowEngine) -> None:
+    global _worker_planning_engine
+    _worker_planning_engine = planning_engine
+
+
+def _detect_in_worker(birth_details: dict, profile_id: int) -> ProfileDetection:
+    return detect_profile_events(birth_details, _worker_planning_engine, profile_id=profile_id)
+
+
+def _prefilter_profile(
+    *,
+    profile_id: int,
+    entitlement_service: EntitlementService,
+    summary: AlertsJobSummary,
+) -> Optional[Tuple[AppUser, str]]:
+    """
+    Steps 1-3 -- everything that must happen BEFORE any astrology.
+    Returns (user, fcm_token) for a profile that should be evaluated,
+    or None after incrementing the matching skip counter.
+    """
+    # ---- 1. Entitlement gate -- BEFORE any astrology or even
+    # loading the AppUser row. ----
+    entitlement = has_alerts_access(profile_id, entitlement_service=entitlement_service)
+    if not entitlement.entitled:
+        summary.entitlement_skipped += 1
+        return None
+
+    # ---- 2/3. Cheap profile checks BEFORE expensive astrology ----
+    user = AppUser.query.get(profile_id)
+    if user is None:
+        summary.invalid_profile_skipped += 1
+        return None
+
+    fcm_token = getattr(user, "fcm_token", None)
+    if not fcm_token:
+        summary.missing_token_skipped += 1
+        return None
+
+    return user, fcm_token
+
+
+def _record_unexpected_failure(profile_id: int, exc: Exception, summary: AlertsJobSummary) -> None:
+    db.session.rollback()
+    summary.failures += 1
+    # profile_id (a plain integer) is safe to log; the exception
+    # TYPE only is printed, never its message or any profile
+    # content, per this phase's "do not log sensitive profile
+    # content" requirement.
+    print(f"Alerts job: profile_id={profile_id} failed with {type(exc).__name__} -- skipped, continuing.")
+
+
+def _deliver_for_profile(
+    *,
+    profile_id: int,
+    user: AppUser,
+    fcm_token: str,
+    now: datetime,
+    entitlement_service: EntitlementService,
+    repository: AlertPersistenceRepository,
+    summary: AlertsJobSummary,
+) -> None:
+    """Steps 5-7 -- selection, Bell-only fallback and delivery for a
+    profile whose detection has already been persisted. Exceptions
+    propagate to the caller's per-profile isolation boundary."""
+    # ---- 5. Fetch persisted active alerts (Phase 1, unmodified) --
+    # needed below to count alerts that fail the pre-existing
+    # eligibility gate for the (unchanged-meaning)
+    # cooldown_or_eligibility_skipped counter. ----
+    active_alerts = repository.fetch_active_for_profile(profile_id=profile_id)
+
+    # ---- 5b. User Alert Selection Layer (Alerts Product Hardening)
+    # -- narrows the full active-alert set down to the small,
+    # non-contradictory, non-redundant user-facing subset (normally
+    # 1, at most MAX_USER_FACING_ALERTS) BEFORE any delivery is
+    # attempted. THE SAME function a future Alerts app API endpoint
+    # must also call (see user_alert_selection_service.py's own
+    # docstring) -- one selection authority for both push and any
+    # future in-app list. Internally reuses the EXISTING, unmodified
+    # Phase 4 eligibility/cooldown gate -- this layer only narrows
+    # further for product exposure, never overrides that decision.
+    selection = get_user_facing_alerts_for_profile(
+        profile_id, now=now, repository=repository, lat=user.lat, lon=user.lng,
+    )
+
+    # ---- Architectural gate: AI generation happens HERE, ONLY for
+    # the FINAL selected set -- never for the raw detected events
+    # above. See ensure_ai_content_for_selected_rows()'s own
+    # docstring. Runs before BOTH the push (attemptable_rows) and
+    # Bell-only (bell_only_rows) branches below, since both are
+    # subsets of selection.selected and either channel needs the
+    # content ready before building notification content. ----
+    ensure_ai_content_for_selected_rows(selection.selected)
+
+    selected_event_ids = {r.event_id for r in selection.selected}
+
+    # Pre-existing meaning preserved: alerts that failed the Phase 4
+    # confidence/cooldown gate entirely (never even reached
+    # selection) still count here, exactly as before this change.
+    summary.cooldown_or_eligibility_skipped += len(active_alerts) - selection.eligible_count
+    # New: alerts that PASSED that gate but were not chosen by the
+    # selection layer (conflict/similarity suppression, category
+    # diversity, or the daily cap).
+    summary.selection_suppressed += selection.eligible_count - len(selection.selected)
+
+    # ---- N4 (Global User Attention Policy) -- BEFORE attempting
+    # delivery, narrow Alerts' own already-selected set (at most
+    # MAX_USER_FACING_ALERTS, unchanged) against the user's GLOBAL
+    # remaining daily push budget, shared with
+    # services/event_scheduler.py's pipeline via the same persisted
+    # signal (services/attention_policy.py::count_pushes_sent_today()
+    # -- re-read fresh here, every call, so this can never see a
+    # stale count from an earlier run). This does NOT touch Alerts'
+    # own eligibility, confidence, cooldown, or selection algorithm
+    # (user_alert_selection.py, unmodified) -- it only decides, of
+    # the alerts Alerts already wants to send, how many actually fit
+    # in what's left of today's budget. If only one slot remains and
+    # two were selected, the higher-severity one is attempted first
+    # (Alerts' own config-driven severity -- see
+    # severity_cooldown_registry.py -- not re-derived here).
+    global_remaining = max(
+        0, DAILY_PUSH_CAP - count_pushes_sent_today(profile_id, now=now)
+    )
+    selected_rows = sorted(
+        (r for r in active_alerts if r.event_id in selected_event_ids),
+        key=lambda r: tier_for_alert_severity(r.severity),
+    )
+    attemptable_rows = selected_rows[:global_remaining]
+    bell_only_rows = selected_rows[global_remaining:]
+    summary.global_cap_suppressed += len(bell_only_rows)
+
+    # ---- N5 -- Bell-only fallback for the rest. Every row here
+    # ALREADY passed Alerts' own hardened eligibility + selection
+    # (user_alert_selection.py, unmodified) in this exact run -- the
+    # only reason it isn't being pushed is that today's global
+    # budget ran out. A genuinely useful, already-vetted Alert
+    # should not vanish completely just because the push slot was
+    # spent elsewhere; see persistence_repository.py::
+    # record_bell_only()'s own docstring for why this can never
+    # touch cooldown/dedup or be mistaken for a real delivery. Never
+    # attempted for a row that failed eligibility or was excluded by
+    # Alerts' own selection -- bell_only_rows is a strict suffix of
+    # selected_rows, both already-vetted sets.
+    for alert_row in bell_only_rows:
+        try:
+            content = build_alert_notification_content(
+                event_id=alert_row.event_id,
+                category=alert_row.category,
+                severity=alert_row.severity,
+                ai_insight=alert_row.ai_insight,
+                ai_action=alert_row.ai_action,
+            )
+        except AlertContentError:
+            continue  # same defensive posture as deliver_alert()'s own content stage
+
+        bell_row = repository.record_bell_only(
+            profile_id=profile_id,
+            event_id=alert_row.event_id,
+            notification_title=content["title"],
+            notification_body=content["body"],
+            notification_data=content["data"],
+            active_until=alert_row.active_until,
+            now=now,
+        )
+        if bell_row is not None:
+            summary.alerts_bell_only += 1
+
+    # ---- 6/7. Deliver each SELECTED-AND-GLOBALLY-BUDGETED alert --
+    # deliver_alert() (Phase 4/5, unmodified) remains the SOLE
+    # eligibility/cooldown authority for the actual send; nothing
+    # here re-checks or duplicates that decision, it only decides
+    # WHICH event_ids reach this call at all. ----
+    for alert_row in attemptable_rows:
+        summary.alerts_attempted += 1
+        delivery = deliver_alert(
+            profile_id=profile_id,
+            event_id=alert_row.event_id,
+            fcm_token=fcm_token,
+            now=now,
+            entitlement_service=entitlement_service,
+            repository=repository,
+        )
+        # NOTE: branch on `delivery.stage`, NOT `delivery.sent` --
+        # AlertDeliveryResult.sent is True for BOTH stage=="delivered"
+        # (fully successful) AND stage=="finalization_failed" (FCM
+        # physically succeeded, but the DB bookkeeping did not --
+        # see alert_delivery_service.py's own docstring). Using
+        # `sent` alone would silently miscount a finalization
+        # failure as a clean delivery in this job's own operational
+        # summary.
+        if delivery.stage == "delivered":
+            summary.alerts_delivered += 1
+        elif delivery.stage == "eligibility":
+            summary.cooldown_or_eligibility_skipped += 1
+        elif delivery.stage in ("entitlement", "load", "content"):
+            # Should be rare here (entitlement was just confirmed
+            # and the row was just fetched) but is not a hard
+            # failure -- simply not delivered this run.
+            summary.cooldown_or_eligibility_skipped += 1
+        else:  # "send" failed, or "finalization_failed"
+            # A "finalization_failed" outcome means FCM already
+            # succeeded -- deliver_alert() itself does not retry
+            # the send (see its own docstring), and neither does
+            # this loop: each active alert is attempted exactly
+            # ONCE per job run, so a blind duplicate send can never
+            # happen here.
+            summary.failures += 1
@@ -74,10 +74,12 @@ persistence-only Phase 1.
 
 from __future__ import annotations
 
+import json
 from dataclasses import dataclass
 from datetime import date, datetime
 from typing import Any, Dict, List, Optional
 
+from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError
 
 from extensions import db
@@ -104,6 +106,120 @@ class SyncCounts:
     expired: int
 
 
+# ------------------------------------------------------------
+# Set-based synchronize_profile_events() -- see that method's
+# "SET-BASED SYNC" section. The detected set travels as ONE JSON bind
+# parameter, expanded server-side by json_to_recordset(), so the
+# statement text is identical for every profile and every batch size.
+# ------------------------------------------------------------
+
+# Keys a detected_events dict MAY omit. On the UPDATE path each one is
+# only overwritten when the caller actually supplied it (explicit None
+# included) -- carried per row as a `has_<key>` flag, because ON
+# CONFLICT's EXCLUDED row cannot tell "omitted" from "NULL".
+_OPTIONAL_SYNC_KEYS = ("severity", "triggered_facts", "ai_insight", "ai_action", "ai_generated_at")
+
+_INCOMING_RECORD = (
+    "event_id text, category text, state text, confidence double precision, "
+    "priority text, severity text, triggered_facts json, ai_insight text, "
+    "ai_action text, ai_generated_at timestamp, active_from date, active_until date, "
+    + ", ".join(f"has_{key} boolean" for key in _OPTIONAL_SYNC_KEYS)
+)
+
+_OPTIONAL_SYNC_ASSIGNMENTS = ",\n        ".join(
+    f"{key} = CASE WHEN (SELECT i.has_{key} FROM incoming i WHERE i.event_id = EXCLUDED.event_id) "
+    f"THEN EXCLUDED.{key} ELSE m.{key} END"
+    for key in _OPTIONAL_SYNC_KEYS
+)
+
+# One statement: upsert every detected event, and report each row's
+# PRIOR state (NULL = created, EXPIRED = reactivated, else updated).
+# `prior` reads the pre-statement snapshot -- every CTE of a single
+# Postgres statement sees the same snapshot, so it never observes the
+# upsert's own writes. first_detected_at and last_delivered_at are
+# absent from the DO UPDATE SET list on purpose (REAPPEARANCE POLICY
+# and the last_delivered_at contract below); category is insert-only,
+# exactly as the original ORM path never rewrote it.
+_UPSERT_DETECTED_SQL = text(f"""
+WITH incoming AS (
+    SELECT * FROM json_to_recordset(CAST(:rows AS json)) AS r({_INCOMING_RECORD})
+),
+prior AS (
+    SELECT event_id, state
+    FROM alert_micro_events
+    WHERE profile_id = :profile_id
+      AND event_id IN (SELECT event_id FROM incoming)
+),
+upserted AS (
+    INSERT INTO alert_micro_events AS m (
+        profile_id, event_id, category, state, confidence, priority,
+        severity, triggered_facts, ai_insight, ai_action, ai_generated_at,
+        active_from, active_until, first_detected_at, last_evaluated_at,
+        created_at, updated_at
+    )
+    SELECT :profile_id, event_id, category, state, confidence, priority,
+           severity, triggered_facts, ai_insight, ai_action, ai_generated_at,
+           active_from, active_until, :evaluated_at, :evaluated_at,
+           :written_at, :written_at
+    FROM incoming
+    ON CONFLICT (profile_id, event_id) DO UPDATE SET
+        state = EXCLUDED.state,
+        confidence = EXCLUDED.confidence,
+        priority = EXCLUDED.priority,
+        {_OPTIONAL_SYNC_ASSIGNMENTS},
+        active_from = EXCLUDED.active_from,
+        active_until = EXCLUDED.active_until,
+        last_evaluated_at = EXCLUDED.last_evaluated_at,
+        updated_at = EXCLUDED.updated_at
+    RETURNING m.event_id
+)
+SELECT upserted.event_id, prior.state AS prior_state
+FROM upserted
+LEFT JOIN prior ON prior.event_id = upserted.event_id
+""")
+
+# One statement: expire every NEW/ACTIVE row of this profile that was
+# not detected this run. Already-EXPIRED rows are excluded by the
+# WHERE clause itself, so they are never rewritten.
+_EXPIRE_UNDETECTED_SQL = text("""
+UPDATE alert_micro_events
+SET state = 'EXPIRED',
+    last_evaluated_at = :evaluated_at,
+    updated_at = :written_at
+WHERE profile_id = :profile_id
+  AND state <> 'EXPIRED'
+  AND event_id NOT IN (
+      SELECT event_id FROM json_to_recordset(CAST(:rows AS json)) AS r(event_id text)
+  )
+RETURNING event_id
+""")
+
+
+def _sync_rows_json(detected_events: List[Dict[str, Any]]) -> str:
+    rows = []
+    for detected in detected_events:
+        row = {
+            "event_id": detected["event_id"],
+            "category": detected["category"],
+            "state": detected["state"],
+            "confidence": detected["confidence"],
+            "priority": detected["priority"],
+            "active_from": detected["active_from"],
+            "active_until": detected["active_until"],
+        }
+        for key in _OPTIONAL_SYNC_KEYS:
+            row[key] = detected.get(key)
+            row[f"has_{key}"] = key in detected
+        rows.append(row)
+    return json.dumps(rows, default=_json_default)
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
 class AlertPersistenceRepository:
     # ------------------------------------------------------------
     # Read
@@ -346,10 +462,31 @@ class AlertPersistenceRepository:
         after N months") would need a schema change (e.g. a separate
         occurrences table) -- out of scope here.
 
+        ==================================================
+        SET-BASED SYNC
+        ==================================================
+        The reconciliation above runs as TWO statements per profile
+        rather than one ORM object per row:
+
+            1. INSERT ... ON CONFLICT (profile_id, event_id) DO UPDATE
+               for the whole detected set (_UPSERT_DETECTED_SQL);
+            2. UPDATE ... SET state = 'EXPIRED' WHERE event_id NOT IN
+               (detected set) AND state <> 'EXPIRED'
+               (_EXPIRE_UNDETECTED_SQL).
+
+        SyncCounts comes straight from their RETURNING rows: statement
+        1 returns each upserted event_id with its pre-statement state
+        (NULL -> created, EXPIRED -> reactivated, otherwise updated),
+        statement 2 returns one row per expired event. The existing
+        rows are never loaded into the session at all. The optional
+        keys keep their "only touched when supplied" contract through
+        per-row has_<key> flags (see _OPTIONAL_SYNC_KEYS). Postgres-
+        only SQL, like the advisory lock in alerts_scheduler.py.
+
         ==================================================
         ATOMICITY
         ==================================================
-        Every mutation below is staged on the SAME db.session and
+        Both statements run on the SAME db.session transaction,
         committed EXACTLY ONCE, at the end. If anything fails partway
         through (including a duplicate-key race from a genuinely
         concurrent evaluation of the SAME profile), the ENTIRE batch is
@@ -369,96 +506,27 @@ class AlertPersistenceRepository:
         this after `.plan()` has already returned successfully.
         """
         evaluated_at = evaluated_at or datetime.utcnow()
-
-        existing_by_event_id: Dict[str, AlertMicroEvent] = {
-            row.event_id: row
-            for row in AlertMicroEvent.query.filter_by(profile_id=profile_id).all()
+        params = {
+            "profile_id": profile_id,
+            "rows": _sync_rows_json(detected_events),
+            "evaluated_at": evaluated_at,
+            "written_at": datetime.utcnow(),
         }
 
         created = updated = reactivated = expired = 0
-        detected_ids = set()
-
-        for detected in detected_events:
-            event_id = detected["event_id"]
-            detected_ids.add(event_id)
-            existing = existing_by_event_id.get(event_id)
-
-            if existing is None:
-                db.session.add(AlertMicroEvent(
-                    profile_id=profile_id,
-                    event_id=event_id,
-                    category=detected["category"],
-                    state=detected["state"],
-                    confidence=detected["confidence"],
-                    priority=detected["priority"],
-                    severity=detected.get("severity"),  # Phase 4, optional; None if caller omits it
-                    # AI-Written Personalized Alert Content addition --
-                    # optional, same "None if caller omits it" contract
-                    # as severity above. profile_detection_service.py
-                    # supplies triggered_facts (cheap, every detected
-                    # event); ai_insight/ai_action/ai_generated_at are
-                    # supplied only by
-                    # alert_ai_content_service.ensure_ai_content_for_selected_rows()
-                    # writing directly to an already-persisted row, NOT
-                    # through this method -- kept accepted here too for
-                    # symmetry/generality, simply unexercised by that
-                    # caller.
-                    triggered_facts=detected.get("triggered_facts"),
-                    ai_insight=detected.get("ai_insight"),
-                    ai_action=detected.get("ai_action"),
-                    ai_generated_at=detected.get("ai_generated_at"),
-                    active_from=detected["active_from"],
-                    active_until=detected["active_until"],
-                    first_detected_at=evaluated_at,
-                    last_evaluated_at=evaluated_at,
-                    # last_delivered_at intentionally omitted -- defaults to
-                    # NULL (column default); never set here, see docstring.
-                ))
-                created += 1
-            else:
-                was_expired = existing.state == "EXPIRED"
-                existing.state = detected["state"]
-                existing.confidence = detected["confidence"]
-                existing.priority = detected["priority"]
-                if "severity" in detected:
-                    existing.severity = detected["severity"]  # Phase 4; only touched when supplied
-                # AI-Written Personalized Alert Content addition -- same
-                # "only touched when supplied" contract as severity.
-                # The caller (profile_detection_service.py) omits these
-                # keys entirely for an ordinary continuing/"updated" row
-                # (see its own _should_generate_ai_content()), so an
-                # existing row's already-generated content -- or its
-                # still-NULL state after a prior failed attempt -- is
-                # never overwritten here.
-                if "triggered_facts" in detected:
-                    existing.triggered_facts = detected["triggered_facts"]
-                if "ai_insight" in detected:
-                    existing.ai_insight = detected["ai_insight"]
-                if "ai_action" in detected:
-                    existing.ai_action = detected["ai_action"]
-                if "ai_generated_at" in detected:
-                    existing.ai_generated_at = detected["ai_generated_at"]
-                existing.active_from = detected["active_from"]
-                existing.active_until = detected["active_until"]
-                existing.last_evaluated_at = evaluated_at
-                # first_detected_at AND last_delivered_at intentionally
-                # untouched -- see "REAPPEARANCE POLICY" above and this
-                # method's own docstring on last_delivered_at.
-                if was_expired:
-                    reactivated += 1
-                else:
-                    updated += 1
-
-        for event_id, row in existing_by_event_id.items():
-            if event_id in detected_ids:
-                continue
-            if row.state == "EXPIRED":
-                continue  # already correct, no-op
-            row.state = "EXPIRED"
-            row.last_evaluated_at = evaluated_at
-            expired += 1
 
         try:
+            if detected_events:
+                for _event_id, prior_state in db.session.execute(_UPSERT_DETECTED_SQL, params):
+                    if prior_state is None:
+                        created += 1
+                    elif prior_state == "EXPIRED":
+                        reactivated += 1
+                    else:
+                        updated += 1
+
+            expired = len(db.session.execute(_EXPIRE_UNDETECTED_SQL, params).fetchall())
+
             db.session.commit()
         except Exception as exc:
             db.session.rollback()
@@ -25,6 +25,11 @@ redesign of it:
     separate layer, per the task's own instruction.
   - Stable Phase fallback is reused as-is (EventRegistry.fallback_events()),
     evaluated only if the whole window produced nothing.
+  - Each (event, day) evaluation goes through this engine's
+    RuleEvaluationCache (rule_evaluation_cache.py), keyed on the day
+    context's values for exactly the facts the catalog's rules read --
+    profiles agreeing on those on a day are evaluated once and the
+    result is fanned out. Same result, fewer evaluations.
 
 No OpenAI call, no prompt, no natural-language generation anywhere in
 this file.
@@ -35,7 +40,7 @@ from __future__ import annotations
 import datetime
 import json
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Hashable, List, Optional, Tuple
 
 import pytz
 
@@ -48,7 +53,9 @@ from modules.alerts.evaluation_context import _active_yogas, _natal_planets_by_n
 from modules.alerts.event_state import DayResult, summarize
 from modules.alerts.future_planet_data import build_planet_snapshots_for_day
 from modules.alerts.planning_models import PlannedMicroEvent
+from modules.alerts.rule_evaluation_cache import RuleEvaluationCache, catalog_reads, context_signature
 from modules.alerts.rule_evaluator import evaluate_event_rules
+from modules.alerts.rule_interface import Read
 
 _DEFAULT_WINDOW_CONFIG_PATH = os.path.join(
     os.path.dirname(__file__), "config", "planning_window.json"
@@ -78,11 +85,31 @@ class PlanningWindowEngine:
         self,
         registry: Optional[EventRegistry] = None,
         window_days: Optional[int] = None,
+        evaluation_cache: Optional[RuleEvaluationCache] = None,
     ):
         # Same constructor-injection pattern as MicroEventEngine/every
         # Premium Generator -- sensible default, swappable for tests.
         self._registry = registry or get_default_registry()
         self._window_days = window_days or load_default_window_days()
+        # One cache per engine, i.e. per registry -- event_id alone is
+        # then enough to identify a definition inside the cache key.
+        self._evaluation_cache = evaluation_cache or RuleEvaluationCache()
+        self._signature_reads: Optional[Tuple[Read, ...]] = None
+
+    @property
+    def signature_reads(self) -> Tuple[Read, ...]:
+        """rule_evaluation_cache.catalog_reads() of every event this
+        engine can plan (fallbacks included). Computed once per engine."""
+        if self._signature_reads is None:
+            self._signature_reads = catalog_reads(self._registry.all_events() + self._registry.fallback_events())
+        return self._signature_reads
+
+    def context_signature(self, context: EvaluationContext) -> Hashable:
+        return context_signature(context, self.signature_reads)
+
+    @property
+    def evaluation_cache(self) -> RuleEvaluationCache:
+        return self._evaluation_cache
 
     @property
     def window_days(self) -> int:
@@ -92,6 +119,7 @@ class PlanningWindowEngine:
         self,
         kundali: Dict[str, Any],
         day_anchors: Optional[List[datetime.datetime]] = None,
+        contexts_by_day: Optional[List[EvaluationContext]] = None,
     ) -> List[PlannedMicroEvent]:
         """Simulates `self.window_days` days starting today (day_offset
         0) and returns one PlannedMicroEvent per event that is NEW or
@@ -111,7 +139,13 @@ class PlanningWindowEngine:
         including test_alerts_planning_window.py), falls back to the
         ORIGINAL Phase 1/2 behavior -- consecutive IST midnights,
         computed by _default_day_anchors() below -- entirely unchanged,
-        so no existing caller or test needs to change."""
+        so no existing caller or test needs to change.
+
+        `contexts_by_day` (optional): build_daily_contexts()'s output
+        for these same `day_anchors`, when the caller already built it
+        (profile_detection_service.py also reads day 0 for triggered
+        facts) -- avoids recomputing every day's planet snapshots a
+        second time."""
         if day_anchors is not None and len(day_anchors) != self._window_days:
             raise ValueError(
                 f"day_anchors must have exactly window_days={self._window_days} "
@@ -119,7 +153,8 @@ class PlanningWindowEngine:
             )
         anchors = day_anchors if day_anchors is not None else self._default_day_anchors()
 
-        contexts_by_day = self._build_daily_contexts(kundali, anchors)
+        if contexts_by_day is None:
+            contexts_by_day = self._build_daily_contexts(kundali, anchors)
 
         planned = self._plan_from(self._registry.all_events(), contexts_by_day, anchors)
         if planned:
@@ -151,6 +186,16 @@ class PlanningWindowEngine:
         anchors = day_anchors if day_anchors is not None else self._default_day_anchors()
         return self._build_daily_contexts(kundali, anchors)[0]
 
+    def build_daily_contexts(
+        self, kundali: Dict[str, Any], day_anchors: Optional[List[datetime.datetime]] = None,
+    ) -> List[EvaluationContext]:
+        """Public form of _build_daily_contexts() -- one
+        EvaluationContext per window day, for a caller that needs the
+        whole window (plan(contexts_by_day=...), then day 0 for its own
+        use) rather than only day 0 (build_evaluation_context())."""
+        anchors = day_anchors if day_anchors is not None else self._default_day_anchors()
+        return self._build_daily_contexts(kundali, anchors)
+
     def _default_day_anchors(self) -> List[datetime.datetime]:
         """Backward-compatible fallback -- the ORIGINAL Phase 1/2 day
         boundary (IST midnight, +1 day each), byte-for-byte unchanged,
@@ -203,6 +248,7 @@ class PlanningWindowEngine:
         self, events, contexts_by_day: List[EvaluationContext], day_anchors: List[datetime.datetime],
     ) -> List[PlannedMicroEvent]:
         thresholds = self._registry.priority_thresholds
+        signatures = [self.context_signature(context) for context in contexts_by_day]
 
         planned: List[PlannedMicroEvent] = []
         for event in events:
@@ -210,8 +256,11 @@ class PlanningWindowEngine:
             for day_offset, context in enumerate(contexts_by_day):
                 date_str = day_anchors[day_offset].strftime("%Y-%m-%d")
 
-                matched_rules = evaluate_event_rules(event, context)
-                confidence = confidence_engine.score(event, matched_rules)  # Rule Engine, unmodified
+                cached_rules, confidence = self._evaluation_cache.get_or_evaluate(
+                    signatures[day_offset], event.event_id,
+                    lambda: self._evaluate(event, context),
+                )
+                matched_rules = list(cached_rules)  # never share the cached list itself
 
                 if confidence is None:
                     day_results.append(DayResult(
@@ -233,6 +282,11 @@ class PlanningWindowEngine:
         planned.sort(key=lambda e: e.confidence, reverse=True)
         return planned
 
+    @staticmethod
+    def _evaluate(event, context: EvaluationContext):
+        matched_rules = evaluate_event_rules(event, context)
+        return tuple(matched_rules), confidence_engine.score(event, matched_rules)  # Rule Engine, unmodified
+
     def plan_as_dicts(self, kundali: Dict[str, Any]) -> List[Dict[str, Any]]:
         return [event.to_dict() for event in self.plan(kundali)]
 
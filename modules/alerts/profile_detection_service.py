@@ -16,7 +16,7 @@ Engine, Confidence Engine, and Event Registry are never imported here
 directly -- only through PlanningWindowEngine, exactly as the
 architecture rule requires.
 
-`_load_birth_details()` is this service's own copy, not shared with
+`load_birth_details()` is this service's own copy, not shared with
 the Premium Generators or modules/alerts/planet_data.py -- same
 reasoning already documented in every one of those files: each
 consumer owns its own thin adapter rather than introducing a new
@@ -42,6 +42,7 @@ from modules.alerts.persistence_repository import (
     AlertPersistenceRepository,
     SyncCounts,
 )
+from modules.alerts.planning_models import PlannedMicroEvent
 from modules.alerts.planning_window_engine import PlanningWindowEngine
 from modules.alerts.severity_cooldown_registry import (
     SeverityCooldownRegistry,
@@ -136,69 +137,37 @@ class ProfileDetectionService:
         started = time.monotonic()
         evaluated_at = datetime.utcnow()
 
-        birth_details = self._load_birth_details(profile_id)
-
-        # ---- Phase 3: sunrise-to-sunrise alert-day boundary ----
-        # Resolved from the SAME lat/lng _load_birth_details() already
-        # validated, BEFORE the kundali/planning call. A failure here
-        # (SunriseResolutionError) has exactly the same safety property
-        # as a planning failure below: nothing has been persisted yet,
-        # and self._repository.synchronize_profile_events() is never
-        # reached, so no existing alert for this profile can be falsely
-        # expired by an untrustworthy day boundary. Never caught and
-        # silently defaulted here -- see sunrise_boundary.py's own
-        # docstring for why.
-        day_anchors = resolve_alert_day_sequence(
-            lat=birth_details["lat"],
-            lon=birth_details["lon"],
-            count=self._planning_engine.window_days,
+        birth_details = self.load_birth_details(profile_id)
+        detection = detect_profile_events(birth_details, self._planning_engine, profile_id=profile_id)
+        return self.persist_detection(
+            profile_id, detection, evaluated_at=evaluated_at, started=started,
         )
 
-        kundali = calculate_full_kundali(
-            name=birth_details["name"],
-            dob=birth_details["dob"],
-            tob=birth_details["tob"],
-            lat=birth_details["lat"],
-            lon=birth_details["lon"],
-            user_id=None,  # guest mode -- same convention every Premium Generator and
-                            # modules/alerts/*'s own test scripts already use; introduces
-                            # no new write to UserDashaTimeline or any other table.
-            language="en",
-        )
-
-        # ---- THE transaction-safety boundary ----
-        # PlanningWindowEngine.plan() (existing logic, additively
-        # extended in Phase 3 with an optional day_anchors parameter --
-        # see planning_window_engine.py) runs to completion FIRST.
-        # Persistence is not touched until this succeeds -- if it
-        # raises, we propagate immediately and
-        # synchronize_profile_events() is never called, so no existing
-        # row for this profile can be incorrectly expired by a failed
-        # run.
-        try:
-            planned_events = self._planning_engine.plan(kundali, day_anchors=day_anchors)
-        except Exception as exc:
-            raise DetectionRunFailedError(
-                f"PlanningWindowEngine.plan() failed for profile_id={profile_id}: {exc}"
-            ) from exc
-
-        # AI-Written Personalized Alert Content addition -- the SAME
-        # "today" natal/transit/dasha/yoga facts plan() itself already
-        # computed internally, exposed via the small additive accessor
-        # above (no new astrology calculation). Built once per profile
-        # evaluation. Used ONLY to derive cheap, plain-English
-        # triggered_facts below -- NEVER to call OpenAI here. See
-        # modules/alerts/alert_ai_content_service.py's own module
-        # docstring for the architectural gate this enforces: AI
-        # generation happens ONLY later, for the FINAL selected
-        # alert(s), via ensure_ai_content_for_selected_rows() -- never
-        # here, for every raw detected event.
-        evaluation_context = self._planning_engine.build_evaluation_context(
-            kundali, day_anchors=day_anchors,
-        )
+    def persist_detection(
+        self,
+        profile_id: int,
+        detection: "ProfileDetection",
+        *,
+        evaluated_at: datetime,
+        started: Optional[float] = None,
+    ) -> ProfileEvaluationResult:
+        """
+        The persistence half of evaluate_profile(), split out so
+        modules/alerts/alerts_scheduler.py's parallel mode can run
+        detect_profile_events() in a worker process and still hand the
+        result to the SAME synchronization path, in the parent process
+        (which owns the DB session). Never called with a partial
+        detection -- detect_profile_events() either returns a complete
+        ProfileDetection or raises, so the "failed run never expires
+        existing alerts" guarantee is unchanged.
+
+        `started` is a time.monotonic() reading for duration_seconds;
+        omitted, the duration covers persistence only.
+        """
+        started = started if started is not None else time.monotonic()
 
         detected_events: List[Dict[str, Any]] = []
-        for event in planned_events:
+        for event in detection.planned_events:
             entry: Dict[str, Any] = {
                 "event_id": event.event_id,
                 "category": event.category,
@@ -216,13 +185,7 @@ class ProfileDetectionService:
                 "active_until": _parse_iso_date(event.active_until),
             }
 
-            # Cheap, no OpenAI call, no cost -- computed for EVERY
-            # detected event regardless of whether it will later be
-            # selected. This is what lets generation happen LATER
-            # (after selection, in a separate call/request) without
-            # needing to recompute detection facts at that point -- see
-            # describe_triggered_facts()'s own docstring.
-            facts = describe_triggered_facts(event, evaluation_context)
+            facts = detection.triggered_facts.get(event.event_id)
             if facts:
                 entry["triggered_facts"] = facts
 
@@ -238,7 +201,7 @@ class ProfileDetectionService:
         return ProfileEvaluationResult(
             profile_id=profile_id,
             events_evaluated=len(self._registry),
-            events_detected=len(planned_events),
+            events_detected=len(detection.planned_events),
             created=counts.created,
             updated=counts.updated,
             reactivated=counts.reactivated,
@@ -247,13 +210,20 @@ class ProfileDetectionService:
             evaluated_at=evaluated_at,
         )
 
+    @property
+    def planning_engine(self) -> PlanningWindowEngine:
+        return self._planning_engine
+
     # ------------------------------------------------------------
     # Thin adapter -- own copy, not shared (see module docstring).
     # ------------------------------------------------------------
-    def _load_birth_details(self, profile_id: int) -> Dict[str, Any]:
+    def load_birth_details(self, profile_id: int) -> Dict[str, Any]:
         """profile_id IS AppUser.id (same architecture convention every
         Premium Generator already uses). Reads the existing AppUser
-        row -- does not create or modify it."""
+        row -- does not create or modify it. Public (rather than
+        underscore-private) only so the scheduler's parallel mode can
+        do this DB read in the parent before shipping the plain dict to
+        a worker process."""
         user = AppUser.query.get(profile_id)
         if user is None:
             raise ProfileDataError(f"No AppUser found for profile_id={profile_id}")
@@ -277,6 +247,100 @@ class ProfileDetectionService:
         }
 
 
+@dataclass(frozen=True)
+class ProfileDetection:
+    """Output of the pure astrology stage (detect_profile_events()) --
+    plain, picklable values only (frozen dataclasses, lists, dicts,
+    strings), so it can cross a process boundary unchanged.
+    `triggered_facts` maps event_id -> describe_triggered_facts()'s
+    output for that event; events with no describable facts are simply
+    absent."""
+
+    planned_events: List[PlannedMicroEvent]
+    triggered_facts: Dict[str, List[str]]
+
+
+def detect_profile_events(
+    birth_details: Dict[str, Any],
+    planning_engine: Optional[PlanningWindowEngine] = None,
+    *,
+    profile_id: Optional[int] = None,
+) -> ProfileDetection:
+    """
+    The pure astrology stage of evaluate_profile(): sunrise boundary
+    -> calculate_full_kundali() -> PlanningWindowEngine.plan() ->
+    triggered facts. No database access and no Flask app context
+    needed, so modules/alerts/alerts_scheduler.py can run it in a
+    worker process. `birth_details` is load_birth_details()'s own
+    return dict. `profile_id` is used for error messages only.
+
+    Raises SunriseResolutionError or DetectionRunFailedError exactly
+    as evaluate_profile() always has -- nothing is persisted either
+    way, since persistence is a separate step
+    (ProfileDetectionService.persist_detection()).
+    """
+    planning_engine = planning_engine or PlanningWindowEngine()
+
+    # ---- Phase 3: sunrise-to-sunrise alert-day boundary ----
+    # Resolved from the SAME lat/lng load_birth_details() already
+    # validated, BEFORE the kundali/planning call. A failure here
+    # (SunriseResolutionError) has exactly the same safety property
+    # as a planning failure below: nothing has been persisted yet,
+    # and synchronize_profile_events() is never reached, so no
+    # existing alert for this profile can be falsely expired by an
+    # untrustworthy day boundary. Never caught and silently defaulted
+    # here -- see sunrise_boundary.py's own docstring for why.
+    day_anchors = resolve_alert_day_sequence(
+        lat=birth_details["lat"],
+        lon=birth_details["lon"],
+        count=planning_engine.window_days,
+    )
+
+    kundali = calculate_full_kundali(
+        name=birth_details["name"],
+        dob=birth_details["dob"],
+        tob=birth_details["tob"],
+        lat=birth_details["lat"],
+        lon=birth_details["lon"],
+        user_id=None,  # guest mode -- same convention every Premium Generator and
+                        # modules/alerts/*'s own test scripts already use; introduces
+                        # no new write to UserDashaTimeline or any other table.
+        language="en",
+    )
+
+    # ---- THE transaction-safety boundary ----
+    # PlanningWindowEngine.plan() runs to completion FIRST. If it
+    # raises, we propagate immediately and persistence is never
+    # reached, so no existing row for this profile can be incorrectly
+    # expired by a failed run.
+    try:
+        contexts_by_day = planning_engine.build_daily_contexts(kundali, day_anchors=day_anchors)
+        planned_events = planning_engine.plan(
+            kundali, day_anchors=day_anchors, contexts_by_day=contexts_by_day,
+        )
+    except Exception as exc:
+        raise DetectionRunFailedError(
+            f"PlanningWindowEngine.plan() failed for profile_id={profile_id}: {exc}"
+        ) from exc
+
+    # AI-Written Personalized Alert Content addition -- the SAME
+    # "today" (day_offset 0) natal/transit/dasha/yoga facts plan()
+    # itself just evaluated. Used ONLY to derive cheap, plain-English
+    # triggered_facts below -- NEVER to call OpenAI here. See
+    # modules/alerts/alert_ai_content_service.py's own module
+    # docstring: AI generation happens ONLY later, for the FINAL
+    # selected alert(s), via ensure_ai_content_for_selected_rows().
+    evaluation_context = contexts_by_day[0]
+
+    triggered_facts: Dict[str, List[str]] = {}
+    for event in planned_events:
+        facts = describe_triggered_facts(event, evaluation_context)
+        if facts:
+            triggered_facts[event.event_id] = facts
+
+    return ProfileDetection(planned_events=list(planned_events), triggered_facts=triggered_facts)
+
+
 def _parse_iso_date(value: str) -> date:
     """PlannedMicroEvent.active_from/active_until are ISO date strings
     (YYYY-MM-DD) -- see modules/alerts/planning_models.py's own
@@ -0,0 +1,97 @@
+# modules/alerts/rule_evaluation_cache.py
+
+"""
+Rule Evaluation Cache -- equivalence-class evaluation for the Rule
+Engine. Many profiles produce IDENTICAL rule inputs on a given day:
+the same Lagna (so the same transit houses), the same Mahadasha/
+Antardasha lords, the same active yogas, the same natal aspects on
+the same house lords. Every rule in config/micro_events.json reads
+ONLY those facts (see rule_interface.py's handlers), so two such
+profiles always get the same matched rules and the same confidence
+for every event -- re-running evaluate_event_rules() for the second
+one is pure repetition.
+
+    EvaluationContext -> context_signature() -> (signature, event_id)
+        -> cached (matched_rules, confidence)  [or evaluate once, store]
+
+`context_signature()` keys a context by the facts the LOADED CATALOG's
+rules read -- catalog_reads() collects them from the rule definitions
+through rule_interface.rule_inputs() -- and nothing else: a transit
+planet's house but not its nakshatra when only house rules mention it,
+a house lord only where a natal_lord_* rule names that house, only the
+aspecting planets a rule lists. It is still exact, not a coarse bucket:
+every rule's answer is a function of its own reads, so a cache hit can
+never change a detection result, only skip recomputing it. A new
+condition type declares its reads next to its handler
+(rule_interface._CONDITION_INPUTS).
+
+Cost then scales with the number of distinct chart signatures per day
+anchor, not the number of profiles. Owned per PlanningWindowEngine
+instance (one registry, so event_id alone identifies a definition);
+in modules/alerts/alerts_scheduler.py's parallel mode each worker
+process holds one engine for its whole lifetime, so the cache is
+shared across every profile that worker evaluates.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from modules.alerts.event_models import EvaluationContext, MicroEventDefinition, TriggeredRule
+from modules.alerts.rule_interface import Read, read_input, rule_inputs
+
+# One (signature, event_id) entry is a small tuple of TriggeredRule
+# references; 50k entries covers every distinct signature of a large
+# nightly run (catalog size x window days x distinct charts) with room
+# to spare, while still bounding a long-lived worker's memory.
+DEFAULT_MAX_ENTRIES = 50_000
+
+Evaluation = Tuple[Tuple[TriggeredRule, ...], Optional[float]]
+
+
+def catalog_reads(events: Iterable[MicroEventDefinition]) -> Tuple[Read, ...]:
+    """Every context fact any rule of `events` reads, deduplicated and
+    in a stable order."""
+    return tuple(sorted({read for event in events for rule in event.rules for read in rule_inputs(rule)}, key=repr))
+
+
+def context_signature(context: EvaluationContext, reads: Tuple[Read, ...]) -> Hashable:
+    """The values of `reads` (catalog_reads()) in `context`, as a
+    hashable tuple."""
+    return tuple(read_input(context, read) for read in reads)
+
+
+class RuleEvaluationCache:
+    """Bounded LRU of (signature, event_id) -> (matched_rules,
+    confidence). Not thread-safe -- the Alerts job is single-threaded
+    per process."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[Hashable, str], Evaluation]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_evaluate(
+        self, signature: Hashable, event_id: str, evaluate: Callable[[], Evaluation],
+    ) -> Evaluation:
+        key = (signature, event_id)
+        cached = self._entries.get(key)
+        if cached is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        result = evaluate()
+        self._entries[key] = result
+        if len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        return result
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
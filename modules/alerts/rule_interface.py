@@ -24,7 +24,7 @@ performs a new astrology calculation.
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Callable, Dict
+from typing import Any, Callable, Dict, Tuple
 
 from modules.alerts.event_models import EvaluationContext, RuleDefinition
 from modules.alerts.exceptions import InvalidRuleValueError, UnsupportedConditionError
@@ -178,6 +178,75 @@ _CONDITION_HANDLERS: Dict[str, Callable[[EvaluationContext, RuleDefinition], boo
 }
 
 
+# ------------------------------------------------------------
+# Rule inputs -- for each condition type, exactly which EvaluationContext
+# facts its handler above reads for a given rule, as hashable "reads".
+# rule_evaluation_cache.py builds its equivalence-class signature from
+# the reads of the loaded catalog's rules only, so two contexts that
+# agree on every read are guaranteed to give every rule the same
+# answer. Same keys as _CONDITION_HANDLERS: a new condition type needs
+# its reads declared here too, or it cannot be loaded (see
+# validate_rule_condition()).
+#
+# A read is ("transit", planet, field), ("mahadasha_lord",),
+# ("antardasha_lord",), ("yoga", yoga_key), ("lord_transit_house",
+# natal_house) or ("lord_aspected_by", natal_house, planets).
+# ------------------------------------------------------------
+
+Read = Tuple[Any, ...]
+
+
+def _transit_read(field_name: str) -> Callable[[RuleDefinition], Tuple[Read, ...]]:
+    return lambda rule: (("transit", rule.planet, field_name),)
+
+
+_CONDITION_INPUTS: Dict[str, Callable[[RuleDefinition], Tuple[Read, ...]]] = {
+    "house_in": _transit_read("house"),
+    "house_not_in": _transit_read("house"),
+    "motion_equals": _transit_read("motion"),
+    "sign_in": _transit_read("sign"),
+    "nakshatra_in": _transit_read("nakshatra"),
+    "conjunction_with": lambda rule: (("transit", rule.planet, "house"), ("transit", rule.value, "house")),
+    "mahadasha_lord_in": lambda rule: (("mahadasha_lord",),),
+    "antardasha_lord_in": lambda rule: (("antardasha_lord",),),
+    "yoga_active": lambda rule: (("yoga", rule.value),),
+    "natal_lord_house_in": lambda rule: (("lord_transit_house", rule.value["natal_house"]),),
+    "natal_lord_aspected_by": lambda rule: (
+        ("lord_aspected_by", rule.value["natal_house"], tuple(sorted(set(rule.value["aspected_by_any"])))),
+    ),
+}
+
+
+def rule_inputs(rule: RuleDefinition) -> Tuple[Read, ...]:
+    """The context facts `rule`'s handler reads (see _CONDITION_INPUTS)."""
+    return _CONDITION_INPUTS[rule.condition](rule)
+
+
+def read_input(context: EvaluationContext, read: Read) -> Any:
+    """The value of one read in `context` -- everything the matching
+    handler looks at for it, and nothing more."""
+    kind = read[0]
+    if kind == "transit":
+        snapshot = context.planet_snapshots.get(read[1])
+        return None if snapshot is None else getattr(snapshot, read[2])
+    if kind == "mahadasha_lord":
+        return context.mahadasha_lord
+    if kind == "antardasha_lord":
+        return context.antardasha_lord
+    if kind == "yoga":
+        return bool(context.active_yogas.get(read[1], False))
+
+    lord_name = context.house_lords.get(f"{read[1]}_house_lord")
+    if kind == "lord_transit_house":
+        snapshot = context.planet_snapshots.get(lord_name) if lord_name else None
+        return None if snapshot is None else snapshot.house
+    if kind == "lord_aspected_by":
+        natal_lord = context.natal_planets_by_name.get(lord_name) if lord_name else None
+        aspected_by = (natal_lord or {}).get("aspected_by") or ()
+        return tuple(planet for planet in read[2] if planet in aspected_by)
+    raise ValueError(f"Unknown rule input {read!r}")
+
+
 # ------------------------------------------------------------
 # Startup validation -- checks a rule's `value` payload is
 # STRUCTURALLY shaped the way its `condition` type's handler above
@@ -300,6 +369,10 @@ def validate_rule_condition(rule: RuleDefinition) -> None:
         validator(rule.value)
     except InvalidRuleValueError as exc:
         raise InvalidRuleValueError(f"Rule {rule.rule_id!r}: {exc}") from exc
+    if rule.condition not in _CONDITION_INPUTS:
+        raise UnsupportedConditionError(
+            f"Rule {rule.rule_id!r}: condition {rule.condition!r} declares no rule inputs"
+        )
 
 
 class ConfigRuleCondition(RuleCondition):
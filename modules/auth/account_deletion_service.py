@@ -110,7 +110,8 @@ from modules.models_free_daily import FreeDailyQuestion
 # See "GATE 1 FINDING" above -- the live, actually-imported module, not
 # modules/models_notification.py or the root-level models_notification_log.py
 # (both confirmed dead/unimported anywhere in this codebase).
-from notifications.notification_models import NotificationLog, UserNotification
+from notifications.bell_inbox import forget_app_user_id
+from notifications.notification_models import NotificationLog, UserNotification, UserNotificationCounter
 
 
 class AccountDeletionError(Exception):
@@ -203,6 +204,7 @@ _PERSONAL_CHILD_LOOKUPS = [
     (AlertMicroEvent, "profile_id"),      # FK -> app_users.id
     (AIReport, "profile_id"),             # FK -> app_users.id
     (UserNotification, "user_id"),        # no FK; app_users.id by convention
+    (UserNotificationCounter, "user_id"), # Bell badge counter (notifications/bell_inbox.py); no FK
     (NotificationLog, "user_id"),         # no FK; app_users.id by convention
     (DailyPersonalizedCache, "profile_id"),  # carries BOTH user_id (users.id) and profile_id (app_users.id) as separate columns -- profile_id is the one that matches app_users.id
     (FreeDailyQuestion, "user_id"),       # no FK; app_users.id by convention
@@ -307,6 +309,9 @@ def delete_account_data(resolved_identity: ResolvedIdentity) -> DeletionResult:
             user_deleted = True
 
         db.session.commit()
+        if user_deleted:
+            # this worker's Bell identity cache; others expire within its TTL
+            forget_app_user_id(users_id)
 
     except Exception as exc:
         db.session.rollback()
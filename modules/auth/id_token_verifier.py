@@ -0,0 +1,337 @@
+# modules/auth/id_token_verifier.py
+
+"""
+Firebase ID-token verification for the Bearer-token routes
+(routes/routes_auth.py register / backend-token, routes/routes_user.py,
+routes/routes_profile_bootstrap.py, modules/auth/routes_profile.py
+update-fcm).
+
+Every one of those requests used to call firebase_auth.verify_id_token()
+directly. The app sends the SAME ID token (Firebase refreshes it about
+once an hour) on every call, so each request re-did identical work:
+parse the Google x509 certs, check the RS256 signature, check the claims
+-- and, whenever the SDK's HTTP cache of those certs had expired, fetch
+them from Google inside the request.
+
+IdTokenVerifier wraps that call:
+
+  CLAIMS CACHE
+      A successful verification is remembered -- keyed by the SHA-256 of
+      the token, never the token itself -- until the token's own `exp`.
+      A later call with the same token gets a copy of the same claims
+      without any crypto. This returns exactly what re-verifying would:
+      the signature and claims of an unchanged token cannot change, and
+      verify_id_token() is called without check_revoked here, so it never
+      consulted revocation either. Failures are never cached, nor claims
+      without a numeric `exp`. Bounded LRU (ID_TOKEN_CACHE_MAX_ENTRIES,
+      default 10000; 0 disables the cache).
+
+  CERT REFRESH
+      A daemon thread, started per process on first use (and again
+      after a fork, like services/llm_executor.py's loop), asks the
+      backend to prefetch the signing certs every
+      ID_TOKEN_CERT_REFRESH_SECONDS (default 300; 0 disables it). For
+      Firebase that goes through the SDK's own cache-controlled
+      transport, so when Google rotates keys and the cached response
+      expires, the refetch happens on this thread, not inside a request.
+      A failed refresh is only counted; verification then fetches on
+      demand exactly as before.
+
+  LATENCY
+      `verifications`, `hits`, `verify_seconds_total` / `_max` and the
+      refresh counters are plain attributes; stats() returns them
+      together with the average per verification.
+
+BACKENDS: anything with `verify(id_token) -> claims` (raising on an
+invalid token), optionally with `prefetch_certs()`.
+FirebaseIdTokenBackend is the default. It resolves
+firebase_admin.auth.verify_id_token on every call, so the existing
+route tests that monkeypatch it keep working unchanged. FakeIdTokenIssuer
+is a local issuer for tests: it mints RS256 tokens with its own key and
+verifies them through google.auth.jwt, the same library the SDK uses. It
+is deliberately NOT selectable by an environment variable, unlike
+LLM_BACKEND=stub: a fake issuer in production would let anyone mint a
+valid login. Tests inject it through the constructor.
+
+account-deletion re-authentication (routes_auth.py::delete_account())
+still calls firebase_auth.verify_id_token() directly. It is rare, so
+there is nothing to save there, and it is the one route that asks for
+a fresh sign-in.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from firebase_admin import auth as firebase_auth
+
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_CERT_REFRESH_SECONDS = 300
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _token_key(id_token) -> str:
+    if isinstance(id_token, str):
+        id_token = id_token.encode("utf-8")
+    return hashlib.sha256(id_token).hexdigest()
+
+
+# ------------------------------------------------------------
+# Backends
+# ------------------------------------------------------------
+class FirebaseIdTokenBackend:
+    def verify(self, id_token) -> Dict[str, Any]:
+        return firebase_auth.verify_id_token(id_token)
+
+    def prefetch_certs(self) -> bool:
+        import firebase_admin
+        if not firebase_admin._apps:
+            return False
+        import google.oauth2.id_token
+        from firebase_admin import _token_gen
+
+        # The SDK's own CertificateFetchRequest (a CacheControl session),
+        # so the response lands in the cache verify_id_token() reads.
+        request = firebase_auth._get_client(None)._token_verifier.request
+        google.oauth2.id_token._fetch_certs(request, _token_gen.ID_TOKEN_CERT_URI)
+        return True
+
+
+class FakeIdTokenIssuer:
+    """Local Firebase-shaped issuer: RS256 tokens signed with a key
+    generated per instance, verified like the SDK verifies real ones
+    (kid lookup, signature, aud / iss / exp), raising the SDK's own
+    InvalidIdTokenError / ExpiredIdTokenError."""
+
+    def __init__(self, project_id: str = "fake-project"):
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import rsa
+        from google.auth import crypt
+
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        private_pem = key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+        self.project_id = project_id
+        self.issuer = f"https://securetoken.google.com/{project_id}"
+        self.kid = uuid.uuid4().hex
+        self._signer = crypt.RSASigner.from_string(private_pem, key_id=self.kid)
+        self._certs = {
+            self.kid: key.public_key().public_bytes(
+                serialization.Encoding.PEM,
+                serialization.PublicFormat.SubjectPublicKeyInfo,
+            ).decode("ascii"),
+        }
+        self.verify_calls = 0
+        self.cert_fetches = 0
+
+    def issue(self, uid: str, ttl_seconds: int = 3600, **claims) -> str:
+        from google.auth import jwt
+
+        now = int(time.time())
+        payload = {
+            "iss": self.issuer,
+            "aud": self.project_id,
+            "sub": uid,
+            "auth_time": now,
+            "iat": now,
+            "exp": now + ttl_seconds,
+        }
+        payload.update(claims)
+        return jwt.encode(self._signer, payload).decode("ascii")
+
+    def verify(self, id_token) -> Dict[str, Any]:
+        from google.auth import jwt
+
+        self.verify_calls += 1
+        try:
+            claims = jwt.decode(id_token, certs=self._certs, audience=self.project_id)
+        except ValueError as exc:
+            if "Token expired" in str(exc):
+                raise firebase_auth.ExpiredIdTokenError(str(exc), cause=exc)
+            raise firebase_auth.InvalidIdTokenError(str(exc), cause=exc)
+        if claims.get("iss") != self.issuer or not claims.get("sub"):
+            raise firebase_auth.InvalidIdTokenError("Fake ID token has an incorrect iss / sub claim")
+        claims["uid"] = claims["sub"]
+        return claims
+
+    def prefetch_certs(self) -> bool:
+        self.cert_fetches += 1
+        return True
+
+
+# ------------------------------------------------------------
+# Verifier
+# ------------------------------------------------------------
+class IdTokenVerifier:
+    def __init__(
+        self,
+        backend=None,
+        *,
+        max_entries: Optional[int] = None,
+        cert_refresh_seconds: Optional[float] = None,
+        now_fn: Optional[Callable[[], float]] = None,
+    ):
+        self.backend = backend or FirebaseIdTokenBackend()
+        self.max_entries = max_entries if max_entries is not None else _env_int(
+            "ID_TOKEN_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES
+        )
+        self.cert_refresh_seconds = cert_refresh_seconds if cert_refresh_seconds is not None else _env_int(
+            "ID_TOKEN_CERT_REFRESH_SECONDS", DEFAULT_CERT_REFRESH_SECONDS
+        )
+        self._now_fn = now_fn or time.time
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._start_lock = threading.Lock()
+        self._pid: Optional[int] = None
+        self._stop: Optional[threading.Event] = None
+        self._thread: Optional[threading.Thread] = None
+
+        # Observability -- read by tests and by anyone sizing the cache.
+        self.hits = 0
+        self.verifications = 0
+        self.verify_seconds_total = 0.0
+        self.verify_seconds_max = 0.0
+        self.cert_refreshes = 0
+        self.cert_refresh_failures = 0
+
+    # -------------------- verification --------------------
+    def verify(self, id_token) -> Dict[str, Any]:
+        """Decoded claims for `id_token`; raises whatever the backend
+        raises for an invalid or expired token."""
+        if self._pid != os.getpid():
+            self.start()
+
+        key = _token_key(id_token)
+        claims = self._cached(key)
+        if claims is not None:
+            return dict(claims)
+
+        started = time.perf_counter()
+        try:
+            claims = self.backend.verify(id_token)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.verifications += 1
+                self.verify_seconds_total += elapsed
+                self.verify_seconds_max = max(self.verify_seconds_max, elapsed)
+
+        self._store(key, claims)
+        return dict(claims)
+
+    def _cached(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, claims = entry
+            if self._now_fn() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return claims
+
+    def _store(self, key: str, claims: Dict[str, Any]) -> None:
+        expires_at = claims.get("exp")
+        if self.max_entries <= 0 or isinstance(expires_at, bool) or not isinstance(expires_at, (int, float)):
+            return
+        if self._now_fn() >= expires_at:
+            return
+        with self._lock:
+            self._entries[key] = (expires_at, dict(claims))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "cached_tokens": len(self._entries),
+                "hits": self.hits,
+                "verifications": self.verifications,
+                "verify_seconds_avg": self.verify_seconds_total / self.verifications if self.verifications else 0.0,
+                "verify_seconds_max": self.verify_seconds_max,
+                "cert_refreshes": self.cert_refreshes,
+                "cert_refresh_failures": self.cert_refresh_failures,
+            }
+
+    # -------------------- cert refresh --------------------
+    def start(self) -> None:
+        """Starts this process's cert-refresh thread (idempotent; again
+        in a forked child, which inherits the object but not the thread)."""
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            if self.cert_refresh_seconds <= 0 or not hasattr(self.backend, "prefetch_certs"):
+                return
+            self._stop = threading.Event()
+            self._thread = threading.Thread(
+                target=self._refresh_loop, args=(self._stop,), name="id-token-certs", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        with self._start_lock:
+            if self._stop is not None:
+                self._stop.set()
+            if self._thread is not None:
+                self._thread.join(5)
+            self._stop = self._thread = self._pid = None
+
+    def refresh_certs(self) -> bool:
+        try:
+            fetched = self.backend.prefetch_certs()
+        except Exception as exc:
+            self.cert_refresh_failures += 1
+            print(f"[ID TOKEN] cert refresh failed: {exc!r}")
+            return False
+        if fetched:
+            self.cert_refreshes += 1
+        return bool(fetched)
+
+    def _refresh_loop(self, stop: threading.Event) -> None:
+        while True:
+            self.refresh_certs()
+            if stop.wait(self.cert_refresh_seconds):
+                return
+
+
+_verifier: Optional[IdTokenVerifier] = None
+_verifier_lock = threading.Lock()
+
+
+def get_id_token_verifier() -> IdTokenVerifier:
+    global _verifier
+    if _verifier is None:
+        with _verifier_lock:
+            if _verifier is None:
+                _verifier = IdTokenVerifier()
+    return _verifier
+
+
+def verify_firebase_id_token(id_token) -> Dict[str, Any]:
+    """Drop-in for firebase_auth.verify_id_token(id_token) on the
+    Bearer-token routes."""
+    return get_id_token_verifier().verify(id_token)
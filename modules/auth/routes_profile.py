@@ -3,7 +3,8 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from extensions import db
 from modules.auth.models import User
 from modules.subscription.utils import subscription_required
-from firebase_admin import auth as firebase_auth
+from firebase_admin import auth as firebase_auth  # patched by tests; the verifier resolves it per call
+from modules.auth.id_token_verifier import verify_firebase_id_token
 from modules.user_service import get_or_create_app_user
 
 
@@ -379,7 +380,7 @@ def update_fcm_token():
     id_token = auth_header.replace("Bearer ", "").strip()
 
     try:
-        decoded = firebase_auth.verify_id_token(id_token)
+        decoded = verify_firebase_id_token(id_token)
         firebase_uid = decoded.get("uid")
 
         if not firebase_uid:
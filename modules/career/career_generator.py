@@ -37,7 +37,6 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any, Dict, Optional
 
-from full_kundali_api import calculate_full_kundali
 from modules.models_user import AppUser
 
 from services.ai_prediction_lab.career_context_builder import build_career_profile_context
@@ -51,6 +50,7 @@ from services.ai_prediction_lab.current_career_timing_prompt_builder import buil
 from services.ai_prediction_lab.current_timing_expiry import compute_current_timing_expiry
 
 from modules.ai_report_engine.base_generator import BaseAIGenerator
+from services.ai_prediction_lab.astro_context import AstroContext
 from modules.ai_report_engine.cache_repository import ReportCacheRepository
 from modules.ai_report_engine.exceptions import ContextBuildError, PromptBuildError
 
@@ -99,6 +99,7 @@ class CareerGenerator(BaseAIGenerator):
         profile_id: int,
         report_type: str,
         language: str,
+        astro_context: AstroContext,
     ) -> Dict[str, Any]:
         self._current_prompt_version = self._PROMPT_VERSIONS.get(report_type)
 
@@ -108,7 +109,11 @@ class CareerGenerator(BaseAIGenerator):
         # the existing backend/Lab functions -- user_id=None (guest mode)
         # so this generator introduces no new write to UserDashaTimeline
         # or any other existing table, same as LoveGenerator.
-        kundali = calculate_full_kundali(
+        # The kundali goes through this generation's AstroContext
+        # (memoized calculate_full_kundali(), see
+        # services/ai_prediction_lab/astro_context.py), which is also
+        # handed to every transit-reading Lab builder below.
+        kundali = astro_context.kundali(
             name=birth_details["name"],
             dob=birth_details["dob"],
             tob=birth_details["tob"],
@@ -128,7 +133,7 @@ class CareerGenerator(BaseAIGenerator):
             career_dna_text = self._read_upstream_text(
                 profile_id=profile_id, report_type="DNA", language=language,
             )
-            phase_context = build_current_career_phase_context(kundali, career_summary)  # existing Lab context builder
+            phase_context = build_current_career_phase_context(kundali, career_summary, astro=astro_context)  # existing Lab context builder
             return {
                 "birth_details": birth_details,
                 "career_dna": career_dna_text,
@@ -142,7 +147,7 @@ class CareerGenerator(BaseAIGenerator):
             current_career_phase_text = self._read_upstream_text(
                 profile_id=profile_id, report_type="CURRENT_PHASE", language=language,
             )
-            career_action_ctx = build_career_action_context(kundali)  # existing Lab context builder
+            career_action_ctx = build_career_action_context(kundali, astro=astro_context)  # existing Lab context builder
             return {
                 "career_dna": career_dna_text,
                 "current_career_phase": current_career_phase_text,
@@ -153,7 +158,7 @@ class CareerGenerator(BaseAIGenerator):
             current_career_phase_text = self._read_upstream_text(
                 profile_id=profile_id, report_type="CURRENT_PHASE", language=language,
             )
-            timing_context = build_current_career_timing_context(kundali)  # existing Lab context builder
+            timing_context = build_current_career_timing_context(kundali, career_summary, astro=astro_context)  # existing Lab context builder
             return {
                 "current_career_phase": current_career_phase_text,
                 "timing_context": timing_context,
@@ -216,13 +221,14 @@ class CareerGenerator(BaseAIGenerator):
         *,
         context: Dict[str, Any],
         report_type: str,
+        astro_context: Optional[AstroContext] = None,
     ) -> Optional[datetime]:
         if report_type == "CURRENT_TIMING":
             # Own expiry policy -- earliest of a relevant fast-moving
             # planet's sign change, or 24 hours. Never None (see
             # current_timing_expiry.py), so this never falls back to
             # the Lifecycle Manager's generic report_type policy.
-            return compute_current_timing_expiry(SEGMENT)
+            return compute_current_timing_expiry(SEGMENT, astro=astro_context)
 
         if report_type != "CURRENT_PHASE":
             return None
@@ -37,7 +37,6 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any, Dict, Optional
 
-from full_kundali_api import calculate_full_kundali
 from modules.models_user import AppUser
 
 from services.ai_prediction_lab.finance_context_builder import build_finance_profile_context
@@ -51,6 +50,7 @@ from services.ai_prediction_lab.current_finance_timing_prompt_builder import bui
 from services.ai_prediction_lab.current_timing_expiry import compute_current_timing_expiry
 
 from modules.ai_report_engine.base_generator import BaseAIGenerator
+from services.ai_prediction_lab.astro_context import AstroContext
 from modules.ai_report_engine.cache_repository import ReportCacheRepository
 from modules.ai_report_engine.exceptions import ContextBuildError, PromptBuildError
 
@@ -100,6 +100,7 @@ class FinanceGenerator(BaseAIGenerator):
         profile_id: int,
         report_type: str,
         language: str,
+        astro_context: AstroContext,
     ) -> Dict[str, Any]:
         self._current_prompt_version = self._PROMPT_VERSIONS.get(report_type)
 
@@ -110,7 +111,11 @@ class FinanceGenerator(BaseAIGenerator):
         # mode) so this generator introduces no new write to
         # UserDashaTimeline or any other existing table, same as
         # LoveGenerator/CareerGenerator.
-        kundali = calculate_full_kundali(
+        # The kundali goes through this generation's AstroContext
+        # (memoized calculate_full_kundali(), see
+        # services/ai_prediction_lab/astro_context.py), which is also
+        # handed to every transit-reading Lab builder below.
+        kundali = astro_context.kundali(
             name=birth_details["name"],
             dob=birth_details["dob"],
             tob=birth_details["tob"],
@@ -130,7 +135,7 @@ class FinanceGenerator(BaseAIGenerator):
             financial_dna_text = self._read_upstream_text(
                 profile_id=profile_id, report_type="DNA", language=language,
             )
-            phase_context = build_current_finance_phase_context(kundali, finance_summary)  # existing Lab context builder
+            phase_context = build_current_finance_phase_context(kundali, finance_summary, astro=astro_context)  # existing Lab context builder
             return {
                 "birth_details": birth_details,
                 "financial_dna": financial_dna_text,
@@ -144,7 +149,7 @@ class FinanceGenerator(BaseAIGenerator):
             current_finance_phase_text = self._read_upstream_text(
                 profile_id=profile_id, report_type="CURRENT_PHASE", language=language,
             )
-            finance_action_ctx = build_finance_action_context(kundali)  # existing Lab context builder
+            finance_action_ctx = build_finance_action_context(kundali, astro=astro_context)  # existing Lab context builder
             return {
                 "financial_dna": financial_dna_text,
                 "current_finance_phase": current_finance_phase_text,
@@ -155,7 +160,7 @@ class FinanceGenerator(BaseAIGenerator):
             current_finance_phase_text = self._read_upstream_text(
                 profile_id=profile_id, report_type="CURRENT_PHASE", language=language,
             )
-            timing_context = build_current_finance_timing_context(kundali)  # existing Lab context builder
+            timing_context = build_current_finance_timing_context(kundali, finance_summary, astro=astro_context)  # existing Lab context builder
             return {
                 "current_finance_phase": current_finance_phase_text,
                 "timing_context": timing_context,
@@ -218,13 +223,14 @@ class FinanceGenerator(BaseAIGenerator):
         *,
         context: Dict[str, Any],
         report_type: str,
+        astro_context: Optional[AstroContext] = None,
     ) -> Optional[datetime]:
         if report_type == "CURRENT_TIMING":
             # Own expiry policy -- earliest of a relevant fast-moving
             # planet's sign change, or 24 hours. Never None (see
             # current_timing_expiry.py), so this never falls back to
             # the Lifecycle Manager's generic report_type policy.
-            return compute_current_timing_expiry(SEGMENT)
+            return compute_current_timing_expiry(SEGMENT, astro=astro_context)
 
         if report_type != "CURRENT_PHASE":
             return None
@@ -47,7 +47,6 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any, Dict, Optional
 
-from full_kundali_api import calculate_full_kundali
 from modules.models_user import AppUser
 
 from services.ai_prediction_lab.health_context_builder import build_health_profile_context
@@ -61,6 +60,7 @@ from services.ai_prediction_lab.current_health_timing_prompt_builder import buil
 from services.ai_prediction_lab.current_timing_expiry import compute_current_timing_expiry
 
 from modules.ai_report_engine.base_generator import BaseAIGenerator
+from services.ai_prediction_lab.astro_context import AstroContext
 from modules.ai_report_engine.cache_repository import ReportCacheRepository
 from modules.ai_report_engine.exceptions import ContextBuildError, PromptBuildError
 
@@ -110,6 +110,7 @@ class HealthGenerator(BaseAIGenerator):
         profile_id: int,
         report_type: str,
         language: str,
+        astro_context: AstroContext,
     ) -> Dict[str, Any]:
         self._current_prompt_version = self._PROMPT_VERSIONS.get(report_type)
 
@@ -120,7 +121,11 @@ class HealthGenerator(BaseAIGenerator):
         # so this generator introduces no new write to UserDashaTimeline
         # or any other existing table, same as LoveGenerator/
         # CareerGenerator/FinanceGenerator.
-        kundali = calculate_full_kundali(
+        # The kundali goes through this generation's AstroContext
+        # (memoized calculate_full_kundali(), see
+        # services/ai_prediction_lab/astro_context.py), which is also
+        # handed to every transit-reading Lab builder below.
+        kundali = astro_context.kundali(
             name=birth_details["name"],
             dob=birth_details["dob"],
             tob=birth_details["tob"],
@@ -140,7 +145,7 @@ class HealthGenerator(BaseAIGenerator):
             health_dna_text = self._read_upstream_text(
                 profile_id=profile_id, report_type="DNA", language=language,
             )
-            phase_context = build_current_health_phase_context(kundali, health_summary)  # existing Lab context builder
+            phase_context = build_current_health_phase_context(kundali, health_summary, astro=astro_context)  # existing Lab context builder
             return {
                 "birth_details": birth_details,
                 "health_dna": health_dna_text,
@@ -154,7 +159,7 @@ class HealthGenerator(BaseAIGenerator):
             current_health_phase_text = self._read_upstream_text(
                 profile_id=profile_id, report_type="CURRENT_PHASE", language=language,
             )
-            health_action_ctx = build_health_action_context(kundali)  # existing Lab context builder
+            health_action_ctx = build_health_action_context(kundali, astro=astro_context)  # existing Lab context builder
             return {
                 "health_dna": health_dna_text,
                 "current_health_phase": current_health_phase_text,
@@ -165,7 +170,7 @@ class HealthGenerator(BaseAIGenerator):
             current_health_phase_text = self._read_upstream_text(
                 profile_id=profile_id, report_type="CURRENT_PHASE", language=language,
             )
-            timing_context = build_current_health_timing_context(kundali)  # existing Lab context builder
+            timing_context = build_current_health_timing_context(kundali, health_summary, astro=astro_context)  # existing Lab context builder
             return {
                 "current_health_phase": current_health_phase_text,
                 "timing_context": timing_context,
@@ -228,13 +233,14 @@ class HealthGenerator(BaseAIGenerator):
         *,
         context: Dict[str, Any],
         report_type: str,
+        astro_context: Optional[AstroContext] = None,
     ) -> Optional[datetime]:
         if report_type == "CURRENT_TIMING":
             # Own expiry policy -- earliest of a relevant fast-moving
             # planet's sign change, or 24 hours. Never None (see
             # current_timing_expiry.py), so this never falls back to
             # the Lifecycle Manager's generic report_type policy.
-            return compute_current_timing_expiry(SEGMENT)
+            return compute_current_timing_expiry(SEGMENT, astro=astro_context)
 
         if report_type != "CURRENT_PHASE":
             return None
@@ -0,0 +1,225 @@
+# ashtakoot_matrix.py
+"""
+Precomputed Ashtakoot tables + bulk match search.
+
+compute_ashtakoot() (ashtakoot_love.py) scores ONE pair with dict and
+string logic per koota -- fine for a compatibility report, far too slow
+to rank one chart against thousands of candidates. But every koota
+depends only on a tiny key of each Moon:
+
+    tara, yoni, gana, nadi (dosha)  ->  nakshatra pair      (27 x 27)
+    varna, graha maitri, bhakoot,
+    nadi cancellation               ->  rashi pair          (12 x 12)
+    vashya                          ->  vashya-group pair   (5 x 5)
+
+So the whole Ashtakoot is a handful of small tables, built ONCE at
+import by calling the koota functions in ashtakoot_love.py themselves
+(still the single source of truth -- nothing is re-derived here) and
+stored as flat `bytes` in HALF-points (every koota score is a multiple
+of 0.5). Scoring a pair is then a few byte lookups; search_matches()
+slices the seeker's rows out once and scores every candidate against
+them, and only the top-k get the full compute_ashtakoot() breakdown.
+
+A NumPy array would be the textbook layout, but NumPy is not a
+dependency of this backend and the tables are 729 / 144 / 25 bytes --
+stdlib bytes indexing is already O(1) per koota.
+
+A Moon is encoded as a MoonKey (nakshatra, rashi, vashya group) by
+moon_key(); the vashya group needs `degree` only for Sagittarius /
+Capricorn, exactly like vashya_koota(). A Moon that cannot be encoded
+(missing/unknown nakshatra or rashi, Sagittarius/Capricorn without a
+degree) would score "invalid" kootas per pair -- search_matches()
+skips such candidates instead of ranking partial scores.
+"""
+
+from __future__ import annotations
+
+import heapq
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from modules.love.ashtakoot_love import (
+    NAK_INDEX,
+    NAKSHATRAS_27,
+    RASHI_INDEX,
+    RASHI_TO_VASHYA,
+    RASHIS,
+    VASHYA_SCORE_MATRIX,
+    _resolve_sagittarius_capricorn_group,
+    bhakoot_koota,
+    compute_ashtakoot,
+    gana_koota,
+    graha_maitri_koota,
+    nadi_koota,
+    tara_koota,
+    varna_koota,
+    yoni_koota,
+)
+
+VASHYA_GROUPS = ("Chatushpada", "Nara", "Jalchar", "Vanacara", "Keeta")
+VASHYA_INDEX = {g: i for i, g in enumerate(VASHYA_GROUPS)}
+
+_N_NAK = len(NAKSHATRAS_27)
+_N_RASHI = len(RASHIS)
+_N_VASHYA = len(VASHYA_GROUPS)
+
+
+class MoonKey(NamedTuple):
+    nakshatra: int
+    rashi: int
+    vashya: int
+
+
+def moon_key(moon: Dict[str, Any]) -> Optional[MoonKey]:
+    """Encode a compute_ashtakoot()-style moon dict ({rashi, nakshatra,
+    degree}); None if it cannot be fully resolved."""
+    nak = NAK_INDEX.get(moon.get("nakshatra"))
+    rashi = moon.get("rashi")
+    if nak is None or rashi not in RASHI_INDEX:
+        return None
+    if rashi in ("Sagittarius", "Capricorn"):
+        if moon.get("degree") is None:
+            return None
+        group = _resolve_sagittarius_capricorn_group(rashi, float(moon["degree"]))
+    else:
+        group = RASHI_TO_VASHYA[rashi]
+    return MoonKey(nak, RASHI_INDEX[rashi], VASHYA_INDEX[group])
+
+
+# ============================================================
+# TABLES (bride index * n + groom index, half-points)
+# ============================================================
+
+def _half(score) -> int:
+    return int(round(float(score) * 2))
+
+
+def _build_nak_tables():
+    kootas = bytearray(_N_NAK * _N_NAK)   # tara + yoni + gana
+    nadi_dosha = bytearray(_N_NAK * _N_NAK)
+    for b, b_nak in enumerate(NAKSHATRAS_27):
+        for g, g_nak in enumerate(NAKSHATRAS_27):
+            bride, groom = {"nakshatra": b_nak}, {"nakshatra": g_nak}
+            kootas[b * _N_NAK + g] = (
+                _half(tara_koota(bride, groom)["score"])
+                + _half(yoni_koota(bride, groom)["score"])
+                + _half(gana_koota(bride, groom)["score"])
+            )
+            # Without rashis nadi_koota can't cancel, so 0 == same nadi.
+            nadi_dosha[b * _N_NAK + g] = nadi_koota(bride, groom)["score"] == 0
+    return bytes(kootas), bytes(nadi_dosha)
+
+
+def _build_rashi_tables():
+    boy_groom = bytearray(_N_RASHI * _N_RASHI)  # varna + maitri + bhakoot
+    boy_bride = bytearray(_N_RASHI * _N_RASHI)
+    nadi_cancel = bytearray(_N_RASHI * _N_RASHI)
+    same_nak = NAKSHATRAS_27[0]
+    for b, b_rashi in enumerate(RASHIS):
+        for g, g_rashi in enumerate(RASHIS):
+            bride, groom = {"rashi": b_rashi}, {"rashi": g_rashi}
+            shared = (
+                _half(graha_maitri_koota(bride, groom)["score"])
+                + _half(bhakoot_koota(bride, groom)["score"])
+            )
+            # Varna is the only direction-sensitive koota (boy, girl).
+            boy_groom[b * _N_RASHI + g] = shared + _half(varna_koota(groom, bride)["score"])
+            boy_bride[b * _N_RASHI + g] = shared + _half(varna_koota(bride, groom)["score"])
+            nadi_cancel[b * _N_RASHI + g] = nadi_koota(
+                {"nakshatra": same_nak, "rashi": b_rashi}, {"nakshatra": same_nak, "rashi": g_rashi},
+            )["score"] == 8
+    return bytes(boy_groom), bytes(boy_bride), bytes(nadi_cancel)
+
+
+def _build_vashya_table():
+    return bytes(
+        _half(VASHYA_SCORE_MATRIX[b][g]) for b in VASHYA_GROUPS for g in VASHYA_GROUPS
+    )
+
+
+_NAK_KOOTAS, _NADI_DOSHA = _build_nak_tables()
+_RASHI_KOOTAS_BOY_GROOM, _RASHI_KOOTAS_BOY_BRIDE, _NADI_CANCEL = _build_rashi_tables()
+_VASHYA = _build_vashya_table()
+_NADI_FULL = _half(8)
+
+
+def score_pair(bride: MoonKey, groom: MoonKey, *, boy_is_groom: bool = True) -> float:
+    """Same total_score as compute_ashtakoot() for two encodable Moons."""
+    rashi_table = _RASHI_KOOTAS_BOY_GROOM if boy_is_groom else _RASHI_KOOTAS_BOY_BRIDE
+    nak = bride.nakshatra * _N_NAK + groom.nakshatra
+    rashi = bride.rashi * _N_RASHI + groom.rashi
+    half_points = (
+        _NAK_KOOTAS[nak]
+        + rashi_table[rashi]
+        + _VASHYA[bride.vashya * _N_VASHYA + groom.vashya]
+        + (_NADI_FULL if not _NADI_DOSHA[nak] or _NADI_CANCEL[rashi] else 0)
+    )
+    return half_points / 2
+
+
+# ============================================================
+# BULK SEARCH
+# ============================================================
+
+def _seeker_row(table: bytes, n: int, seeker: int, seeker_is_bride: bool) -> bytes:
+    """The seeker's slice of a bride x groom table, indexed by the
+    candidate's side."""
+    if seeker_is_bride:
+        return table[seeker * n:(seeker + 1) * n]
+    return table[seeker::n]
+
+
+def search_matches(
+    seeker_moon: Dict[str, Any],
+    candidates: Iterable[Dict[str, Any]],
+    *,
+    seeker_is_bride: bool,
+    boy_is_groom: bool = True,
+    top_k: int = 10,
+    min_score: float = 0.0,
+) -> Dict[str, Any]:
+    """
+    Rank `candidates` (compute_ashtakoot()-style moon dicts; any extra
+    keys such as "id" are passed through as `candidate`) by Ashtakoot
+    total against `seeker_moon`, and return the best `top_k` scoring at
+    least `min_score`, each with the full compute_ashtakoot() result.
+    Ties keep input order. Raises ValueError if the seeker's own Moon
+    cannot be encoded.
+    """
+    seeker = moon_key(seeker_moon)
+    if seeker is None:
+        raise ValueError("Seeker moon needs a known nakshatra and rashi (and degree for Sagittarius/Capricorn)")
+
+    rashi_table = _RASHI_KOOTAS_BOY_GROOM if boy_is_groom else _RASHI_KOOTAS_BOY_BRIDE
+    nak_row = _seeker_row(_NAK_KOOTAS, _N_NAK, seeker.nakshatra, seeker_is_bride)
+    dosha_row = _seeker_row(_NADI_DOSHA, _N_NAK, seeker.nakshatra, seeker_is_bride)
+    rashi_row = _seeker_row(rashi_table, _N_RASHI, seeker.rashi, seeker_is_bride)
+    cancel_row = _seeker_row(_NADI_CANCEL, _N_RASHI, seeker.rashi, seeker_is_bride)
+    vashya_row = _seeker_row(_VASHYA, _N_VASHYA, seeker.vashya, seeker_is_bride)
+    min_half = _half(min_score)
+
+    pool = []
+    scanned = skipped = 0
+    for position, candidate in enumerate(candidates):
+        scanned += 1
+        key = moon_key(candidate)
+        if key is None:
+            skipped += 1
+            continue
+        nak, rashi = key.nakshatra, key.rashi
+        half_points = nak_row[nak] + rashi_row[rashi] + vashya_row[key.vashya]
+        if not dosha_row[nak] or cancel_row[rashi]:
+            half_points += _NADI_FULL
+        if half_points >= min_half:
+            pool.append((half_points, -position, candidate))
+
+    results: List[Dict[str, Any]] = []
+    for half_points, neg_position, candidate in heapq.nlargest(top_k, pool, key=lambda item: item[:2]):
+        bride, groom = (seeker_moon, candidate) if seeker_is_bride else (candidate, seeker_moon)
+        results.append({
+            "index": -neg_position,
+            "candidate": candidate,
+            "total_score": half_points / 2,
+            "ashtakoot": compute_ashtakoot(bride, groom, boy_is_groom=boy_is_groom),
+        })
+
+    return {"scanned": scanned, "skipped": skipped, "matches": results}
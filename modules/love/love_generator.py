@@ -29,7 +29,6 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any, Dict, Optional
 
-from full_kundali_api import calculate_full_kundali
 from modules.models_user import AppUser
 
 from services.ai_prediction_lab.context_builder import build_love_profile_context
@@ -43,6 +42,7 @@ from services.ai_prediction_lab.current_love_timing_prompt_builder import build_
 from services.ai_prediction_lab.current_timing_expiry import compute_current_timing_expiry
 
 from modules.ai_report_engine.base_generator import BaseAIGenerator
+from services.ai_prediction_lab.astro_context import AstroContext
 from modules.ai_report_engine.cache_repository import ReportCacheRepository
 from modules.ai_report_engine.exceptions import ContextBuildError, PromptBuildError
 
@@ -87,6 +87,7 @@ class LoveGenerator(BaseAIGenerator):
         profile_id: int,
         report_type: str,
         language: str,
+        astro_context: AstroContext,
     ) -> Dict[str, Any]:
         self._current_prompt_version = self._PROMPT_VERSIONS.get(report_type)
 
@@ -97,7 +98,11 @@ class LoveGenerator(BaseAIGenerator):
         # test_love.py already calls them -- user_id=None (guest mode)
         # so this generator introduces no new write to UserDashaTimeline
         # or any other existing table (see report's "assumptions" note).
-        kundali = calculate_full_kundali(
+        # The kundali goes through this generation's AstroContext
+        # (memoized calculate_full_kundali(), see
+        # services/ai_prediction_lab/astro_context.py), which is also
+        # handed to every transit-reading Lab builder below.
+        kundali = astro_context.kundali(
             name=birth_details["name"],
             dob=birth_details["dob"],
             tob=birth_details["tob"],
@@ -117,7 +122,7 @@ class LoveGenerator(BaseAIGenerator):
             relationship_dna_text = self._read_upstream_text(
                 profile_id=profile_id, report_type="DNA", language=language,
             )
-            phase_context = build_current_love_phase_context(kundali, birth_summary)  # existing Lab context builder
+            phase_context = build_current_love_phase_context(kundali, birth_summary, astro=astro_context)  # existing Lab context builder
             return {
                 "birth_details": birth_details,
                 "relationship_dna": relationship_dna_text,
@@ -131,7 +136,7 @@ class LoveGenerator(BaseAIGenerator):
             current_love_phase_text = self._read_upstream_text(
                 profile_id=profile_id, report_type="CURRENT_PHASE", language=language,
             )
-            daily_transit_context = build_daily_transit_context(kundali)  # existing Lab context builder
+            daily_transit_context = build_daily_transit_context(kundali, astro=astro_context)  # existing Lab context builder
             return {
                 "relationship_dna": relationship_dna_text,
                 "current_love_phase": current_love_phase_text,
@@ -142,7 +147,7 @@ class LoveGenerator(BaseAIGenerator):
             current_love_phase_text = self._read_upstream_text(
                 profile_id=profile_id, report_type="CURRENT_PHASE", language=language,
             )
-            timing_context = build_current_love_timing_context(kundali)  # existing Lab context builder
+            timing_context = build_current_love_timing_context(kundali, birth_summary, astro=astro_context)  # existing Lab context builder
             return {
                 "current_love_phase": current_love_phase_text,
                 "timing_context": timing_context,
@@ -204,13 +209,14 @@ class LoveGenerator(BaseAIGenerator):
         *,
         context: Dict[str, Any],
         report_type: str,
+        astro_context: Optional[AstroContext] = None,
     ) -> Optional[datetime]:
         if report_type == "CURRENT_TIMING":
             # Own expiry policy -- earliest of a relevant fast-moving
             # planet's sign change, or 24 hours. Never None (see
             # current_timing_expiry.py), so this never falls back to
             # the Lifecycle Manager's generic report_type policy.
-            return compute_current_timing_expiry(SEGMENT)
+            return compute_current_timing_expiry(SEGMENT, astro=astro_context)
 
         if report_type != "CURRENT_PHASE":
             return None
@@ -9,7 +9,7 @@ import traceback
 from datetime import datetime
 from dotenv import load_dotenv
 
-from openai import OpenAI
+from services.llm_executor import get_llm_client
 
 from full_kundali_api import calculate_full_kundali
 from transit_engine import get_current_positions
@@ -26,7 +26,7 @@ from modules.love.love_prompt_builder import build_love_premium_prompt
 
 load_dotenv()
 
-openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+openai_client = get_llm_client()
 
 
 def generate_love_premium_report(order_id: int):
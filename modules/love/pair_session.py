@@ -0,0 +1,204 @@
+# pair_session.py
+"""
+Love pair sessions: compute each chart of a (user, partner) pair once
+and share it across every love endpoint.
+
+The app typically calls several love tools in a row for the SAME pair
+(/api/love/compatibility, /report, /truth-or-dare,
+/love-marriage-probability), and each of those used to run
+calculate_full_kundali() for both people again -- /report even twice
+for the user (once inside run_love_compatibility(), once for the
+compiler payload). A full kundali is by far the most expensive step of
+every love request.
+
+A LovePairSession is keyed by a fingerprint of both people's birth data
+(pair_fingerprint()) and memoizes, on first use:
+
+    kundali(side, language)       calculate_full_kundali() for "user" /
+                                  "partner" ({} when that person has no
+                                  full birth details, as the routes did)
+    compatibility(boy_is_user)    run_love_compatibility(), incl. the
+                                  ashtakoot result, fed from the same
+                                  charts
+    mangal_dosh(boy_is_user, language)
+                                  compare_mangal_dosh() for the pair
+
+Every getter returns a deep copy -- run_love_compatibility() and the
+compilers (love_report_compiler, truth_or_dare_compiler,
+love_marriage_probability_compiler, mangal_dosh_comparator) are free to
+mutate what they are handed without corrupting the session.
+
+Sessions live in an in-process LovePairSessionStore with TTL eviction
+(LOVE_PAIR_SESSION_TTL_SECONDS, default 15 min -- a kundali's
+current-dasha fields are "as of now", so sessions stay short-lived) and
+a size bound (oldest session dropped first). Computation is
+single-flight per session: concurrent requests for the same pair wait
+for one calculation instead of each running their own.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from full_kundali_api import calculate_full_kundali
+from modules.love.mangal_dosh_comparator import compare_mangal_dosh
+from modules.love.service_love import (
+    has_full_birth_details,
+    run_love_compatibility,
+    validate_compatibility_inputs,
+)
+
+DEFAULT_TTL_SECONDS = 15 * 60
+DEFAULT_MAX_SESSIONS = 512
+
+_BIRTH_FIELDS = ("name", "dob", "tob", "lat", "lng")
+# run_love_compatibility() also reads each person's own "language".
+_IDENTITY_FIELDS = _BIRTH_FIELDS + ("language",)
+
+
+def _birth_identity(person: Dict[str, Any]) -> list:
+    identity = []
+    for field in _IDENTITY_FIELDS:
+        value = person.get(field)
+        if field in ("lat", "lng") and value is not None:
+            try:
+                value = round(float(value), 4)
+            except (TypeError, ValueError):
+                pass
+        elif isinstance(value, str):
+            value = value.strip()
+        identity.append(value)
+    return identity
+
+
+def pair_fingerprint(user: Dict[str, Any], partner: Dict[str, Any]) -> str:
+    """Stable key for a pair: both people's birth fields (coordinates
+    rounded to ~10 m) and their own "language" -- nothing else from the
+    request."""
+    raw = json.dumps([_birth_identity(user), _birth_identity(partner)], ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LovePairSession:
+    def __init__(self, user: Dict[str, Any], partner: Dict[str, Any]):
+        self.user = copy.deepcopy(user)
+        self.partner = copy.deepcopy(partner)
+        self._lock = threading.RLock()
+        self._memo: Dict[tuple, Any] = {}
+        self.computations = 0
+
+    def _memoized(self, key: tuple, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key not in self._memo:
+                self._memo[key] = compute()
+                self.computations += 1
+            return copy.deepcopy(self._memo[key])
+
+    def kundali(self, side: str, language: str = "en") -> Dict[str, Any]:
+        person = self.user if side == "user" else self.partner
+
+        def compute():
+            if not has_full_birth_details(person):
+                return {}
+            return calculate_full_kundali(
+                name=person["name"],
+                dob=person["dob"],
+                tob=person["tob"],
+                lat=person["lat"],
+                lon=person["lng"],
+                language=language,
+            )
+
+        return self._memoized(("kundali", side, language), compute)
+
+    def compatibility(self, *, boy_is_user: bool = True) -> Dict[str, Any]:
+        """run_love_compatibility() for this pair, fed from this
+        session's charts. Its input checks (LoveServiceError) run on
+        every call, so an incomplete pair never reaches the memo."""
+        validate_compatibility_inputs(self.user, self.partner)
+
+        def compute():
+            partner_kundali = None
+            if has_full_birth_details(self.partner):
+                partner_kundali = self.kundali("partner", self.partner.get("language", "en"))
+            return run_love_compatibility(
+                user=self.user,
+                partner=self.partner,
+                boy_is_user=boy_is_user,
+                user_kundali=self.kundali("user", self.user.get("language", "en")),
+                partner_kundali=partner_kundali,
+            )
+
+        return self._memoized(("compatibility", bool(boy_is_user)), compute)
+
+    def mangal_dosh(self, *, boy_is_user: bool = True, language: str = "en") -> Optional[Dict[str, Any]]:
+        """compare_mangal_dosh(boy, girl) when both full charts exist,
+        else None -- exactly what /api/love/report computed."""
+        def compute():
+            kundali_user = self.kundali("user", language)
+            kundali_partner = self.kundali("partner", language)
+            if not (kundali_user and kundali_partner):
+                return None
+            boy, girl = (kundali_user, kundali_partner) if boy_is_user else (kundali_partner, kundali_user)
+            return compare_mangal_dosh(boy, girl, language=language)
+
+        return self._memoized(("mangal_dosh", bool(boy_is_user), language), compute)
+
+
+class LovePairSessionStore:
+    def __init__(
+        self,
+        *,
+        ttl_seconds: Optional[float] = None,
+        max_sessions: Optional[int] = None,
+        now_fn: Optional[Callable[[], float]] = None,
+    ):
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(
+            os.getenv("LOVE_PAIR_SESSION_TTL_SECONDS") or DEFAULT_TTL_SECONDS
+        )
+        self.max_sessions = max_sessions or DEFAULT_MAX_SESSIONS
+        self._now_fn = now_fn or time.monotonic
+        self._lock = threading.Lock()
+        self._sessions: "OrderedDict[str, tuple]" = OrderedDict()  # fingerprint -> (expires_at, session)
+        self.hits = 0
+        self.misses = 0
+
+    def session(self, user: Dict[str, Any], partner: Dict[str, Any]) -> LovePairSession:
+        key = pair_fingerprint(user, partner)
+        now = self._now_fn()
+        with self._lock:
+            for stale in [k for k, (expires_at, _) in self._sessions.items() if expires_at <= now]:
+                del self._sessions[stale]
+            entry = self._sessions.get(key)
+            if entry is not None:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            session = LovePairSession(user, partner)
+            self._sessions[key] = (now + self.ttl_seconds, session)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+            return session
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+_store: Optional[LovePairSessionStore] = None
+_store_lock = threading.Lock()
+
+
+def get_pair_session_store() -> LovePairSessionStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = LovePairSessionStore()
+    return _store
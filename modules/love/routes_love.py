@@ -2,12 +2,11 @@ from __future__ import annotations
 
 from flask import Blueprint, request, jsonify
 
-from modules.love.service_love import run_love_compatibility, LoveServiceError
+from modules.love.service_love import LoveServiceError
 from modules.love.love_report_compiler import compile_love_report
 from modules.love.truth_or_dare_compiler import compile_truth_or_dare
-from full_kundali_api import calculate_full_kundali
 from modules.love.love_marriage_probability_compiler import compile_love_marriage_probability
-from modules.love.mangal_dosh_comparator import compare_mangal_dosh
+from modules.love.pair_session import get_pair_session_store
 
 
 
@@ -34,11 +33,10 @@ def love_compatibility():
         }), 400
 
     try:
-        result = run_love_compatibility(
-            user=user,
-            partner=partner,
-            boy_is_user=payload.get("boy_is_user", True),
-        )
+        # Charts + ashtakoot are shared with the other love tools for the
+        # same pair (modules/love/pair_session.py).
+        session = get_pair_session_store().session(user, partner)
+        result = session.compatibility(boy_is_user=payload.get("boy_is_user", True))
 
         return jsonify({
             "ok": True,
@@ -80,58 +78,27 @@ def love_report():
         }), 400
 
     try:
-        # 1️⃣ Base compatibility (data only)
-        base_result = run_love_compatibility(
-            user=user,
-            partner=partner,
-            boy_is_user=payload.get("boy_is_user", True),
-        )
+        # 1️⃣ Base compatibility (data only) -- both charts come from the
+        # pair session, shared with the other love tools for this pair.
+        session = get_pair_session_store().session(user, partner)
+        boy_is_user = payload.get("boy_is_user", True)
+        base_result = session.compatibility(boy_is_user=boy_is_user)
 
         lang = payload.get("language", "en")
 
-        kundali_boy = {}
-        kundali_girl = {}
-
-        # build kundali ONLY if full birth details exist
-        if user.get("tob") and user.get("lat") is not None and user.get("lng") is not None:
-            kundali_user = calculate_full_kundali(
-                name=user["name"],
-                dob=user["dob"],
-                tob=user["tob"],
-                lat=user["lat"],
-                lon=user["lng"],
-                language=lang,
-            )
-        else:
-            kundali_user = {}
-
-        if partner.get("tob") and partner.get("lat") is not None and partner.get("lng") is not None:
-            kundali_partner = calculate_full_kundali(
-                name=partner["name"],
-                dob=partner["dob"],
-                tob=partner["tob"],
-                lat=partner["lat"],
-                lon=partner["lng"],
-                language=lang,
-            )
-        else:
-            kundali_partner = {}
+        # kundali is {} unless that person has full birth details
+        kundali_user = session.kundali("user", lang)
+        kundali_partner = session.kundali("partner", lang)
 
         # assign boy / girl correctly
-        if payload.get("boy_is_user", True):
+        if boy_is_user:
             kundali_boy = kundali_user
             kundali_girl = kundali_partner
         else:
             kundali_boy = kundali_partner
             kundali_girl = kundali_user
 
-        mangal_dosh = None
-        if kundali_boy and kundali_girl:
-            mangal_dosh = compare_mangal_dosh(
-                kundali_boy,
-                kundali_girl,
-                language=lang,
-            )
+        mangal_dosh = session.mangal_dosh(boy_is_user=boy_is_user, language=lang)
 
         # 2️⃣ Compiler payload (LOCKED structure)
         report_payload = {
@@ -190,44 +157,17 @@ def love_truth_or_dare():
         # ------------------------------------------------
         # 1) Reuse existing love compatibility logic
         # ------------------------------------------------
-        base_result = run_love_compatibility(
-            user=user,
-            partner=partner,
-            boy_is_user=payload.get("boy_is_user", True),
-        )
+        session = get_pair_session_store().session(user, partner)
+        base_result = session.compatibility(boy_is_user=payload.get("boy_is_user", True))
 
         case = base_result.get("case")
 
         # ------------------------------------------------
-        # 2) Build kundali payloads (as available)
+        # 2) Kundali payloads (as available) from the pair session
         # ------------------------------------------------
-        kundali_user = {}
-
-        # Build full kundali ONLY if full birth details are available
-        if (
-            user.get("tob")
-            and user.get("lat") is not None
-            and user.get("lng") is not None
-        ):
-            kundali_user = calculate_full_kundali(
-                name=user["name"],
-                dob=user["dob"],
-                tob=user["tob"],
-                lat=user["lat"],
-                lon=user["lng"],
-                language=payload.get("language", "en"),
-            )
-
-        kundali_partner = {}
-        if case == "A_FULL_DUAL":
-            kundali_partner = calculate_full_kundali(
-                name=partner["name"],
-                dob=partner["dob"],
-                tob=partner.get("tob"),
-                lat=partner.get("lat"),
-                lon=partner.get("lng"),
-                language=payload.get("language", "en"),
-            )
+        language = payload.get("language", "en")
+        kundali_user = session.kundali("user", language)
+        kundali_partner = session.kundali("partner", language) if case == "A_FULL_DUAL" else {}
 
         # ------------------------------------------------
         # 3) Compiler payload (LOCKED)
@@ -280,28 +220,9 @@ def love_marriage_probability():
     try:
         lang = payload.get("language", "en")
 
-        kundali_user = {}
-        kundali_partner = {}
-
-        if user.get("tob") and user.get("lat") is not None and user.get("lng") is not None:
-            kundali_user = calculate_full_kundali(
-                name=user["name"],
-                dob=user["dob"],
-                tob=user["tob"],
-                lat=user["lat"],
-                lon=user["lng"],
-                language=lang,
-            )
-
-        if partner.get("tob") and partner.get("lat") is not None and partner.get("lng") is not None:
-            kundali_partner = calculate_full_kundali(
-                name=partner["name"],
-                dob=partner["dob"],
-                tob=partner["tob"],
-                lat=partner["lat"],
-                lon=partner["lng"],
-                language=lang,
-            )
+        session = get_pair_session_store().session(user, partner)
+        kundali_user = session.kundali("user", lang)
+        kundali_partner = session.kundali("partner", lang)
 
         case = "A_FULL_DUAL" if (kundali_user and kundali_partner) else "B_DOB_ONLY_HYBRID"
 
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from full_kundali_api import calculate_full_kundali
 from modules.love.ashtakoot_love import compute_ashtakoot
@@ -16,14 +16,18 @@ class LoveServiceError(Exception):
     pass
 
 
-def detect_case(partner: Dict[str, Any]) -> str:
-    has_full = (
-        partner.get("dob")
-        and partner.get("tob")
-        and partner.get("lat") is not None
-        and partner.get("lng") is not None
+def has_full_birth_details(person: Dict[str, Any]) -> bool:
+    """dob + tob + coordinates -- enough for calculate_full_kundali()."""
+    return bool(
+        person.get("dob")
+        and person.get("tob")
+        and person.get("lat") is not None
+        and person.get("lng") is not None
     )
-    return CASE_A_FULL_DUAL if has_full else CASE_B_DOB_ONLY_HYBRID
+
+
+def detect_case(partner: Dict[str, Any]) -> str:
+    return CASE_A_FULL_DUAL if has_full_birth_details(partner) else CASE_B_DOB_ONLY_HYBRID
 
 
 def _require(payload: Dict[str, Any], fields: tuple, label: str) -> None:
@@ -47,27 +51,39 @@ def _extract_moon(kundali: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+def validate_compatibility_inputs(user: Dict[str, Any], partner: Dict[str, Any]) -> None:
+    _require(user, ("name", "dob", "tob", "lat", "lng"), "User")
+    _require(partner, ("name", "dob"), "Partner")
+
+
 def run_love_compatibility(
     user: Dict[str, Any],
     partner: Dict[str, Any],
     *,
     boy_is_user: bool = True,
+    user_kundali: Optional[Dict[str, Any]] = None,
+    partner_kundali: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
+    """
+    `user_kundali` / `partner_kundali` let a caller that already holds
+    the charts (modules/love/pair_session.py) skip recomputing them;
+    when omitted they are calculated here exactly as before.
+    """
 
-    _require(user, ("name", "dob", "tob", "lat", "lng"), "User")
-    _require(partner, ("name", "dob"), "Partner")
+    validate_compatibility_inputs(user, partner)
 
     case = detect_case(partner)
 
     # -------- User kundali (always full) --------
-    user_kundali = calculate_full_kundali(
-        name=user["name"],
-        dob=user["dob"],
-        tob=user["tob"],
-        lat=user["lat"],
-        lon=user["lng"],
-        language=user.get("language", "en"),
-    )
+    if user_kundali is None:
+        user_kundali = calculate_full_kundali(
+            name=user["name"],
+            dob=user["dob"],
+            tob=user["tob"],
+            lat=user["lat"],
+            lon=user["lng"],
+            language=user.get("language", "en"),
+        )
 
     user_moon = _extract_moon(user_kundali)
 
@@ -87,14 +103,15 @@ def run_love_compatibility(
     # CASE A — Full Dual Kundali
     # ======================================================
     if case == CASE_A_FULL_DUAL:
-        partner_kundali = calculate_full_kundali(
-            name=partner["name"],
-            dob=partner["dob"],
-            tob=partner["tob"],
-            lat=partner["lat"],
-            lon=partner["lng"],
-            language=partner.get("language", "en"),
-        )
+        if partner_kundali is None:
+            partner_kundali = calculate_full_kundali(
+                name=partner["name"],
+                dob=partner["dob"],
+                tob=partner["tob"],
+                lat=partner["lat"],
+                lon=partner["lng"],
+                language=partner.get("language", "en"),
+            )
 
         partner_moon = _extract_moon(partner_kundali)
 
@@ -130,6 +130,19 @@ class AIReport(db.Model):
     generated_at = db.Column(db.DateTime, nullable=True)
     expires_at = db.Column(db.DateTime, nullable=True, index=True)
 
+    # Background pre-generation bookkeeping
+    # (modules/ai_report_engine/pregeneration_scheduler.py), never part
+    # of the report itself:
+    #   last_read_at -- the last USER read served through
+    #     ReportLifecycleManager.get_report() (recorded at most once per
+    #     READ_TOUCH_INTERVAL). Rows nobody has read lately are left to
+    #     lazy regeneration instead of being refreshed forever.
+    #   pregeneration_claimed_at -- set while one job run holds the row
+    #     (claimed with FOR UPDATE SKIP LOCKED), so overlapping runs
+    #     never regenerate the same row twice; cleared once handled.
+    last_read_at = db.Column(db.DateTime, nullable=True)
+    pregeneration_claimed_at = db.Column(db.DateTime, nullable=True)
+
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
 
     profile = db.relationship("AppUser", backref="ai_reports")
@@ -171,3 +184,25 @@ class AIReport(db.Model):
             f"segment={self.segment} type={self.report_type} "
             f"lang={self.language} status={self.status}>"
         )
+
+
+class AIReportPregenerationLedger(db.Model):
+    """
+    One row per UTC day: how many LLM tokens the background
+    pre-generation job (modules/ai_report_engine/pregeneration_scheduler.py)
+    has spent regenerating `ai_reports` rows that day. The job runs many
+    times a day, in separate processes, so its daily token budget can
+    only be enforced against a shared, persisted tally -- this row.
+    Incremented atomically (UPDATE ... SET tokens_used = tokens_used + n),
+    never read-modify-written.
+
+    Only background spend is counted here; a user-triggered lazy
+    regeneration (ReportLifecycleManager.get_report() on an expired row)
+    is never metered or blocked by it.
+    """
+    __tablename__ = "ai_report_pregeneration_ledger"
+
+    day = db.Column(db.Date, primary_key=True)
+    tokens_used = db.Column(db.BigInteger, nullable=False, default=0)
+    reports_regenerated = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
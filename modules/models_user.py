@@ -55,6 +55,12 @@ class AppUser(db.Model):
         default=lambda: datetime.now(timezone.utc)
     )
 
+    __table_args__ = (
+        # JWT identity -> profile resolution (users.firebase_uid ->
+        # app_users.firebase_uid) on every Bell / app-open request.
+        db.Index("ix_app_users_firebase_uid", "firebase_uid"),
+    )
+
     def to_dict(self) -> dict:
         return {
             "id": self.id,
@@ -100,3 +106,11 @@ class UserDashaTimeline(db.Model):
     )
 
     user = db.relationship("AppUser", backref="dasha_timeline")
+
+    __table_args__ = (
+        # Dasha-change audiences (start_date == day) -- see
+        # services/personalization_engine.py.
+        db.Index("ix_user_dasha_timeline_start_date", "start_date"),
+        # "users without a timeline" anti-join (services/dasha_db_filler.py)
+        db.Index("ix_user_dasha_timeline_user_id", "user_id"),
+    )
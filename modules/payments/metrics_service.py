@@ -3,14 +3,16 @@
 """
 MetricsService -- backend observability for the payment/report
 lifecycle (Payment Hardening Phase 8). Read-only: every method here
-issues plain SQL COUNT/MIN/ORDER-BY queries against the two tables
-this whole engagement already established --
+reads the two tables this whole engagement already established --
 modules/models_processed_payments.py::ProcessedPayment and
-models.py::Order -- and computes nothing that requires a background
-job, a cache, or a new column. Nothing here is invoked anywhere else
-in the codebase; it exists purely to be read by the two new
-/admin/api/metrics/* routes (routes/routes_metrics.py) or a future
-operator running it directly in a shell.
+models.py::Order -- with ONE aggregate query per table (COUNT ...
+FILTER, the payload check evaluated on the jsonb side), instead of the
+five separate COUNTs on orders and the Python loop over every
+response_payload full_snapshot() used to run on each /metrics hit. The
+full snapshot is reused for a short TTL per worker. Nothing here
+is invoked anywhere else in the codebase; it exists purely to be read
+by the /admin/api/metrics/* routes (routes/routes_metrics.py) or a
+future operator running it directly in a shell.
 
 Why some MINIMUM METRICS come back as None, not a number
 ----------------------------------------------------------
@@ -50,12 +52,15 @@ authoritative but isn't.
 
 from __future__ import annotations
 
+import os
+import threading
+import time
 from datetime import datetime, timezone
-from typing import List
+from typing import Callable, List, Optional
+
+from sqlalchemy import text
 
 from extensions import db
-from models import Order
-from modules.models_processed_payments import ProcessedPayment
 from modules.payments.metrics_models import (
     GeneralMetrics,
     MetricsLimitation,
@@ -67,22 +72,107 @@ from modules.payments.metrics_models import (
 
 _KNOWN_REPORT_STAGES = ("Pending", "Processing", "Ready", "Failed")
 
+DEFAULT_SNAPSHOT_TTL_SECONDS = 15.0
+
+# Python truthiness of the decoded response_payload, evaluated on the
+# jsonb side: SQL NULL, a JSON `null` literal and every empty / zero /
+# false JSON value count as "not finalized" -- see payments_metrics().
+_PAYLOAD_FINALIZED = """
+    response_payload IS NOT NULL AND CASE jsonb_typeof(response_payload::jsonb)
+        WHEN 'object' THEN response_payload::jsonb <> '{}'::jsonb
+        WHEN 'array' THEN response_payload::jsonb <> '[]'::jsonb
+        WHEN 'string' THEN response_payload::jsonb <> '""'::jsonb
+        WHEN 'number' THEN response_payload::jsonb <> '0'::jsonb
+        WHEN 'boolean' THEN response_payload::jsonb = 'true'::jsonb
+        ELSE false
+    END
+"""
+
+_PAYMENTS_AGGREGATE = text(f"""
+    SELECT count(*) AS total,
+           count(*) FILTER (WHERE {_PAYLOAD_FINALIZED}) AS successful
+    FROM processed_payments
+""")
+
+# One pass over `orders`: the stage counts plus the oldest Processing
+# order (created_at ascending, NULLs last -- what the old
+# `.order_by(created_at.asc()).first()` returned).
+_ORDERS_AGGREGATE = text("""
+    SELECT count(*) AS total,
+           count(*) FILTER (WHERE report_stage = 'Pending') AS pending,
+           count(*) FILTER (WHERE report_stage = 'Processing') AS processing,
+           count(*) FILTER (WHERE report_stage = 'Ready') AS ready,
+           count(*) FILTER (WHERE report_stage = 'Failed') AS failed,
+           (array_agg(id ORDER BY created_at, id) FILTER (WHERE report_stage = 'Processing'))[1]
+               AS oldest_processing_id,
+           min(created_at) FILTER (WHERE report_stage = 'Processing') AS oldest_processing_created_at
+    FROM orders
+""")
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+class _SnapshotCache:
+    """Last full_snapshot() for this worker, reused for `ttl` seconds."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.snapshot: Optional[PaymentSystemMetricsSnapshot] = None
+        self.expires_at = 0.0
+
+
+_snapshot_cache = _SnapshotCache()
+
 
 class MetricsService:
-    def payments_metrics(self) -> PaymentMetrics:
-        total = ProcessedPayment.query.count()
-        # Deliberately NOT `.filter(response_payload.isnot(None))`: the
-        # JSON column type defaults to none_as_null=False, so a claim
-        # row that ever had response_payload explicitly assigned None
-        # (rather than simply left unset) is stored as a JSON `null`
-        # literal, not SQL NULL -- `IS NOT NULL` would then wrongly
-        # count it as finalized/successful. Checking truthiness in
-        # Python after fetching just this one column is correct
-        # regardless of which of the two ways "empty" ended up stored.
-        successful = sum(
-            1 for (payload,) in db.session.query(ProcessedPayment.response_payload).all()
-            if payload
+    """
+    Every section is one aggregate query per table: processed_payments
+    (COUNT with a FILTER on the jsonb payload) and orders (one pass with a
+    FILTER per stage plus the oldest Processing order). full_snapshot()
+    runs exactly those two and is then reused for `ttl_seconds`
+    (PAYMENT_METRICS_TTL_SECONDS, default 15; 0 disables) per worker.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[float] = None,
+        cache: Optional[_SnapshotCache] = None,
+        now_fn: Optional[Callable[[], float]] = None,
+    ):
+        self.ttl_seconds = (
+            ttl_seconds if ttl_seconds is not None
+            else _env_float("PAYMENT_METRICS_TTL_SECONDS", DEFAULT_SNAPSHOT_TTL_SECONDS)
         )
+        self._cache = cache or _snapshot_cache
+        self._now_fn = now_fn or time.monotonic
+
+    # ------------------------------------------------------------
+    # One query per table
+    # ------------------------------------------------------------
+    def _payments_row(self):
+        return db.session.execute(_PAYMENTS_AGGREGATE).mappings().one()
+
+    def _orders_row(self):
+        return db.session.execute(_ORDERS_AGGREGATE).mappings().one()
+
+    # ------------------------------------------------------------
+    # Sections
+    # ------------------------------------------------------------
+    def payments_metrics(self, row=None) -> PaymentMetrics:
+        # Deliberately NOT `response_payload IS NOT NULL`: the JSON
+        # column type defaults to none_as_null=False, so a claim row
+        # that ever had response_payload explicitly assigned None (rather
+        # than simply left unset) is stored as a JSON `null` literal, not
+        # SQL NULL -- `IS NOT NULL` would then wrongly count it as
+        # finalized/successful. _PAYLOAD_FINALIZED applies Python's
+        # truthiness to the jsonb value instead, so both ways "empty" can
+        # be stored are handled without fetching a single payload.
+        row = row if row is not None else self._payments_row()
+        total, successful = row["total"], row["successful"]
         return PaymentMetrics(
             total_payments=total,
             successful_payments=successful,
@@ -90,12 +180,10 @@ class MetricsService:
             duplicate_payment_attempts=None,
         )
 
-    def report_metrics(self) -> ReportMetrics:
-        total = Order.query.count()
-        pending = Order.query.filter_by(report_stage="Pending").count()
-        processing = Order.query.filter_by(report_stage="Processing").count()
-        ready = Order.query.filter_by(report_stage="Ready").count()
-        failed = Order.query.filter_by(report_stage="Failed").count()
+    def report_metrics(self, row=None) -> ReportMetrics:
+        row = row if row is not None else self._orders_row()
+        pending, processing = row["pending"], row["processing"]
+        ready, failed, total = row["ready"], row["failed"], row["total"]
         other = total - (pending + processing + ready + failed)
         return ReportMetrics(
             pending=pending, processing=processing, ready=ready,
@@ -109,17 +197,13 @@ class MetricsService:
             rejected_resumes=None,
         )
 
-    def general_metrics(self) -> GeneralMetrics:
-        oldest_processing = (
-            Order.query.filter_by(report_stage="Processing")
-            .order_by(Order.created_at.asc())
-            .first()
-        )
+    def general_metrics(self, row=None) -> GeneralMetrics:
+        row = row if row is not None else self._orders_row()
         oldest_id = None
         oldest_age_seconds = None
-        if oldest_processing is not None and oldest_processing.created_at is not None:
-            oldest_id = oldest_processing.id
-            created_at = oldest_processing.created_at
+        created_at = row["oldest_processing_created_at"]
+        if created_at is not None:
+            oldest_id = row["oldest_processing_id"]
             if created_at.tzinfo is None:
                 created_at = created_at.replace(tzinfo=timezone.utc)
             oldest_age_seconds = (datetime.now(timezone.utc) - created_at).total_seconds()
@@ -130,15 +214,27 @@ class MetricsService:
             oldest_processing_age_seconds=oldest_age_seconds,
         )
 
-    def full_snapshot(self) -> PaymentSystemMetricsSnapshot:
-        return PaymentSystemMetricsSnapshot(
-            generated_at=datetime.now(timezone.utc).isoformat(),
-            payments=self.payments_metrics(),
-            reports=self.report_metrics(),
-            retries=self.retry_metrics(),
-            general=self.general_metrics(),
-            limitations=self._limitations(),
-        )
+    def full_snapshot(self, fresh: bool = False) -> PaymentSystemMetricsSnapshot:
+        """Cached for ttl_seconds; `fresh` recomputes regardless."""
+        cache = self._cache
+        with cache.lock:
+            now = self._now_fn()
+            if not fresh and cache.snapshot is not None and now < cache.expires_at:
+                return cache.snapshot
+
+            orders = self._orders_row()
+            snapshot = PaymentSystemMetricsSnapshot(
+                generated_at=datetime.now(timezone.utc).isoformat(),
+                payments=self.payments_metrics(self._payments_row()),
+                reports=self.report_metrics(orders),
+                retries=self.retry_metrics(),
+                general=self.general_metrics(orders),
+                limitations=self._limitations(),
+            )
+            if self.ttl_seconds > 0:
+                cache.snapshot = snapshot
+                cache.expires_at = now + self.ttl_seconds
+            return snapshot
 
     def _limitations(self) -> List[MetricsLimitation]:
         return [
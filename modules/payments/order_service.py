@@ -40,11 +40,17 @@ additive:
       ever called by PaymentService for a payment that was already
       verified and whose Order was already created, when that Order's
       report_stage shows the pipeline never reached "Ready".
+
+Staged report pipeline: thread mode (USE_CELERY=False) no longer
+starts one bare daemon threading.Thread per order -- it submits the
+order to report_pipeline.get_report_queue(), which runs compute / llm
+/ render / deliver on bounded per-stage pools. Celery mode still calls
+tasks.generate_and_send_report.delay(). Either way a redispatched
+Order resumes at its first stage without a stored artifact.
 """
 
 from __future__ import annotations
 
-import threading
 from dataclasses import dataclass
 from typing import Any, Dict, Optional
 
@@ -147,13 +153,14 @@ class OrderService:
 
     def _dispatch_report_generation(self, order_id: int) -> Optional[str]:
         from app_config import USE_CELERY
-        from tasks import generate_and_send_report
 
         if USE_CELERY:
+            from tasks import generate_and_send_report
             task = generate_and_send_report.delay(order_id)
             return task.id
         else:
-            threading.Thread(
-                target=generate_and_send_report, args=(order_id,), daemon=True,
-            ).start()
+            # Thread mode: bounded per-stage worker pools instead of one
+            # bare daemon thread per order -- see report_pipeline.py.
+            from report_pipeline import get_report_queue
+            get_report_queue().submit(order_id)
             return None
@@ -30,6 +30,11 @@ class ReconciliationAction:
                               duplicate GPT call/PDF write/email send.
         ALREADY_COMPLETED  -- report_stage is "Ready"; the pipeline
                               already fully succeeded. Nothing to do.
+                              (A "Ready" Order whose email was never
+                              delivered is RESUME_ALLOWED -- or
+                              ALREADY_RUNNING while its deliver stage
+                              may still be queued -- instead; see
+                              reconciliation_service.py.)
         INVALID_STATE      -- no Order exists for the given id, or its
                               report_stage is not one of the four
                               recognized values (e.g. missing, or the
@@ -60,8 +65,15 @@ class ReconciliationResumeResult:
     """Outcome of actually attempting a resume. resumed=False covers
     every non-action case (already running/completed/invalid state, or
     a concurrent request already won ownership) -- the decision field
-    always explains why."""
+    always explains why.
+
+    resume_stage (staged report pipeline) is the first report_pipeline
+    stage without a stored artifact -- where the resumed run picks up,
+    e.g. "render" when only the PDF failed and the paid-for GPT
+    response is reused. None when nothing was resumed, or for a love
+    premium order (its own task, not staged)."""
     order_id: Optional[int]
     resumed: bool
     decision: ReconciliationDecision
     task_id: Optional[str] = None
+    resume_stage: Optional[str] = None
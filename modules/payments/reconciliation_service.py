@@ -111,6 +111,24 @@ the stated constraints, this is the closest a checkpoint-based
 heuristic can get without adding infrastructure -- and resume() still
 requires an explicit, deliberate call; nothing auto-triggers it.
 
+Staged report pipeline: resume() still only redispatches the
+existing Order, but report_pipeline.py now persists each stage's
+output (compute / llm / render / deliver), so the redispatched run
+restarts at the first stage WITHOUT a stored artifact -- a failed PDF
+render is re-rendered from the stored GPT response instead of paying
+for a second OpenAI call. resume() reports that stage back as
+ReconciliationResumeResult.resume_stage.
+
+Undelivered "Ready" orders: a delivery failure after render leaves the
+Order "Ready" (the PDF exists) with no deliver artifact. inspect()
+reports such an Order RESUME_ALLOWED once processing_started_at -- the
+last heartbeat before render -- is older than the abandonment
+threshold (ALREADY_RUNNING before that: the deliver stage may simply
+still be queued), and resume() re-runs the deliver stage alone. Its
+claim is the same one-row conditional UPDATE, bumping
+processing_started_at but leaving report_stage "Ready", so two callers
+can never both send the email.
+
 Deliberately NOT included here (out of scope per this phase's own
 instructions): no Admin UI, no dashboard, no scheduler/cron sweep of
 stuck orders, no change to any existing API contract, no change to
@@ -131,6 +149,7 @@ from modules.payments.reconciliation_models import (
     ReconciliationDecision,
     ReconciliationResumeResult,
 )
+from report_pipeline import LOVE_PREMIUM_PRODUCT, next_pending_stage
 
 
 class ReconciliationService:
@@ -198,6 +217,29 @@ class ReconciliationService:
             )
 
         if order.report_stage == "Ready":
+            if self._delivery_pending(order):
+                age = self._processing_age_seconds(order)
+                if age is not None and age >= self.ABANDONED_PROCESSING_THRESHOLD_SECONDS:
+                    return ReconciliationDecision(
+                        order_id=order_id,
+                        report_stage="Ready",
+                        action=ReconciliationAction.RESUME_ALLOWED,
+                        reason=(
+                            "The PDF was rendered but the email was never "
+                            "delivered (no deliver artifact); safe to "
+                            "resume the deliver stage for the existing Order."
+                        ),
+                    )
+                return ReconciliationDecision(
+                    order_id=order_id,
+                    report_stage="Ready",
+                    action=ReconciliationAction.ALREADY_RUNNING,
+                    reason=(
+                        "The PDF was rendered too recently to presume the "
+                        "deliver stage abandoned; resuming now would risk "
+                        "a duplicate email send."
+                    ),
+                )
             return ReconciliationDecision(
                 order_id=order_id,
                 report_stage="Ready",
@@ -227,6 +269,14 @@ class ReconciliationService:
             ),
         )
 
+    def _delivery_pending(self, order: Order) -> bool:
+        """A "Ready" Order whose only missing artifact is deliver --
+        orders rendered before the staged pipeline have no artifacts at
+        all and stay ALREADY_COMPLETED."""
+        if order.product == LOVE_PREMIUM_PRODUCT:
+            return False
+        return next_pending_stage(order.id) == "deliver"
+
     def _processing_age_seconds(self, order: Order) -> Optional[float]:
         """
         None (rather than 0) whenever age genuinely can't be
@@ -249,13 +299,18 @@ class ReconciliationService:
                 order_id=order_id, resumed=False, decision=decision,
             )
 
-        if not self._try_acquire_resume_ownership(order_id):
+        delivery_only = decision.report_stage == "Ready"
+        claim = (
+            self._try_acquire_delivery_ownership if delivery_only
+            else self._try_acquire_resume_ownership
+        )
+        if not claim(order_id):
             # Lost the race to a concurrent caller -- another
             # reconciliation request, or an automatic webhook retry,
             # already claimed this Order for resume a moment earlier.
             lost_decision = ReconciliationDecision(
                 order_id=order_id,
-                report_stage="Processing",
+                report_stage="Ready" if delivery_only else "Processing",
                 action=ReconciliationAction.ALREADY_RUNNING,
                 reason=(
                     "Another request already claimed this Order for "
@@ -266,14 +321,26 @@ class ReconciliationService:
                 order_id=order_id, resumed=False, decision=lost_decision,
             )
 
+        resume_stage = self._resume_stage(order_id)
         resumed_order = self._order_service.redispatch_report_generation(order_id)
         return ReconciliationResumeResult(
             order_id=order_id,
             resumed=True,
             decision=decision,
             task_id=resumed_order.task_id,
+            resume_stage=resume_stage,
         )
 
+    def _resume_stage(self, order_id: int) -> Optional[str]:
+        """Where the redispatched run will pick up -- read BEFORE
+        dispatch, since a thread-mode run may start immediately. The
+        pipeline itself decides this again on entry; this is only
+        reported back to the caller."""
+        order = Order.query.get(order_id)
+        if order is None or order.product == LOVE_PREMIUM_PRODUCT:
+            return None
+        return next_pending_stage(order_id)
+
     def _try_acquire_resume_ownership(self, order_id: int) -> bool:
         """
         Same atomic compare-and-swap idiom as
@@ -308,3 +375,27 @@ class ReconciliationService:
         )
         db.session.commit()
         return rows_updated == 1
+
+    def _try_acquire_delivery_ownership(self, order_id: int) -> bool:
+        """
+        The deliver-only counterpart of _try_acquire_resume_ownership():
+        one conditional UPDATE matching a "Ready" Order whose
+        processing_started_at is older than the abandonment threshold.
+        report_stage stays "Ready" (the PDF exists); the claim resets
+        processing_started_at to now(), so a second caller no longer
+        matches and the resumed delivery gets its own full window.
+        """
+        cutoff = datetime.utcnow() - timedelta(
+            seconds=self.ABANDONED_PROCESSING_THRESHOLD_SECONDS
+        )
+        rows_updated = Order.query.filter(
+            Order.id == order_id,
+            Order.report_stage == "Ready",
+            Order.processing_started_at.isnot(None),
+            Order.processing_started_at < cutoff,
+        ).update(
+            {"processing_started_at": datetime.utcnow()},
+            synchronize_session=False,
+        )
+        db.session.commit()
+        return rows_updated == 1
@@ -13,18 +13,23 @@ This engine:
 
 Used by:
 - routes_chat.py (free + pack)
+
+Streaming: chat_engine() is prepare_chat() (kundali, transits, dasha,
+prompt) + one blocking LLM call + chat_result(). The streaming endpoints
+call prepare_chat(), forward stream_chat_answer()'s text deltas as they
+arrive, and build the very same result dict with chat_result() once the
+answer is complete (see services/chat_streaming.py).
 """
 
 from datetime import date
-from openai import OpenAI
-import os
+from services.llm_executor import get_llm_client
 from services.full_kundali_service import generate_full_kundali_payload
 from services.personalization_engine import calculate_house
 from transit_engine import get_current_positions
 
 
-# Initialize OpenAI client once
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Shared LLM client -- every call goes through services/llm_executor.py
+client = get_llm_client()
 
 # Model identifier verified from this same repo's existing, already-live
 # Premium AI Report integration (services/ai_prediction_lab/openai_client.py)
@@ -49,7 +54,16 @@ def _find_next_antardasha(dasha: dict, current_maha: dict, current_antar: dict):
     Returns (planet_name, start_date) or (None, None) when it cannot be
     safely identified from existing data -- never guessed, never
     recomputed here.
+
+    Payloads built by calculate_full_kundali() already carry
+    `next_antardasha` (a DashaTimeline lookup, services/dasha_timeline.py);
+    it is read as-is when it follows the current antardasha. The scan
+    below is kept for payloads cached before that field existed.
     """
+    known = dasha.get("next_antardasha") or {}
+    if known.get("planet") and known.get("start") and known.get("start") == current_antar.get("end"):
+        return known["planet"], known["start"]
+
     antardashas = current_maha.get("antardashas") or []
     current_planet = current_antar.get("planet")
     current_start = current_antar.get("start")
@@ -217,7 +231,7 @@ def _format_current_transits(transit: dict, lagna_sign) -> str:
     for each planet adds the Lagna-relative transit house via
     `services/personalization_engine.py::calculate_house()` -- the exact
     function already live in production for the Alerts personalization
-    pipeline (`get_users_for_transit()`). No new astrology calculation:
+    pipeline (`house_by_lagna()`). No new astrology calculation:
     `calculate_house()` is pure sign-index arithmetic
     ((rashi_index - lagna_index) % 12 + 1). Verified compatible (audited
     from source, not assumed): both `lagna_sign` and transit `rashi` are
@@ -278,6 +292,13 @@ def _format_current_transits(transit: dict, lagna_sign) -> str:
     return "\n".join(lines) if lines else str(transit)
 
 
+def _chat_messages(prompt: str) -> list:
+    return [
+        {"role": "system", "content": "You are a senior Vedic astrologer."},
+        {"role": "user", "content": prompt}
+    ]
+
+
 def chat_engine(birth_data: dict, question: str) -> dict:
     """
     Core chat engine used by BOTH:
@@ -304,6 +325,49 @@ def chat_engine(birth_data: dict, question: str) -> dict:
         "transit_preview": ...
     }
     """
+    # -----------------------------
+    # 1-4) Kundali, transits, dasha, prompt -- see prepare_chat()
+    # -----------------------------
+    context = prepare_chat(birth_data, question)
+
+    # -----------------------------
+    # 5) GPT Call
+    # -----------------------------
+    try:
+        response = client.chat.completions.create(
+            model=_MODEL,
+            messages=_chat_messages(context["prompt"]),
+        )
+        answer = response.choices[0].message.content.strip()
+    except Exception as e:
+        answer = f"AI temporarily unavailable. Error: {e}"
+
+    return chat_result(context, answer)
+
+
+def stream_chat_answer(context: dict):
+    """
+    Streaming twin of chat_engine()'s GPT call: yields the answer text
+    in pieces as the model writes them, already `.strip()`-ed as a whole
+    (services/chat_streaming.strip_stream). Unlike chat_engine(), an LLM
+    failure is RAISED rather than turned into an answer string, so the
+    caller can skip the quota commit and report the error.
+    """
+    from services.chat_streaming import completion_deltas, strip_stream
+
+    chunks = client.chat.completions.create(
+        model=_MODEL,
+        messages=_chat_messages(context["prompt"]),
+        stream=True,
+    )
+    return strip_stream(completion_deltas(chunks))
+
+
+def prepare_chat(birth_data: dict, question: str) -> dict:
+    """
+    Steps 1-4 of chat_engine() -- everything before the GPT call.
+    Returns {"prompt", "kundali", "dasha", "transit"}.
+    """
 
     # -----------------------------
     # 1) Generate full kundali
@@ -407,28 +471,15 @@ USER QUESTION
 {question}
 """
 
-    # -----------------------------
-    # 5) GPT Call
-    # -----------------------------
-    try:
-        response = client.chat.completions.create(
-            model=_MODEL,
-            messages=[
-                {"role": "system", "content": "You are a senior Vedic astrologer."},
-                {"role": "user", "content": prompt}
-            ],
-        )
-        answer = response.choices[0].message.content.strip()
-    except Exception as e:
-        answer = f"AI temporarily unavailable. Error: {e}"
+    return {"prompt": prompt, "kundali": kundali, "dasha": dasha, "transit": transit}
 
-    # -----------------------------
-    # 6) Return final JSON
-    # -----------------------------
+
+def chat_result(context: dict, answer: str) -> dict:
+    """Step 6 of chat_engine() -- the final JSON for a finished answer."""
     return {
         "answer": answer,
-        "kundali_preview": kundali.get("chart_data", {}).get("ascendant"),
-        "dasha_preview": dasha,
-        "transit_preview": transit,
+        "kundali_preview": context["kundali"].get("chart_data", {}).get("ascendant"),
+        "dasha_preview": context["dasha"],
+        "transit_preview": context["transit"],
         "disclaimer": "This answer is for astrological guidance only.",
     }
@@ -87,15 +87,21 @@ def verify_chatpack_payment(order_id, payment_id, user_id):
 # ----------------------------------------------------------
 # 3) GET ACTIVE PACK
 # ----------------------------------------------------------
-def get_active_pack(user_id):
+def get_active_pack(user_id, for_update=False):
     """
     Returns the latest active pack (if any).
     Active = status=success AND remaining_questions > 0
+
+    for_update=True locks the user's packs (SELECT ... FOR UPDATE) until
+    the caller commits -- deduct_question() uses it.
     """
-    packs = ChatPack.query.filter_by(
+    query = ChatPack.query.filter_by(
         user_id=user_id,
         status="success"
-    ).order_by(ChatPack.id.desc()).all()
+    ).order_by(ChatPack.id.desc())
+    if for_update:
+        query = query.with_for_update()
+    packs = query.all()
 
     for p in packs:
         if p.remaining_questions() > 0:
@@ -111,13 +117,18 @@ def deduct_question(user_id):
     """
     Deduct 1 question from active pack.
     Returns dict with success status + remaining questions.
+
+    The packs stay row-locked from the check to the commit, so parallel
+    requests cannot both spend the last question.
     """
-    pack = get_active_pack(user_id)
+    pack = get_active_pack(user_id, for_update=True)
 
     if not pack:
+        db.session.commit()
         return {"success": False, "message": "No active ChatPack 51 remaining"}
 
     if pack.remaining_questions() <= 0:
+        db.session.commit()
         return {"success": False, "message": "No remaining questions in pack"}
 
     pack.questions_used += 1
@@ -131,6 +142,17 @@ def deduct_question(user_id):
     }
 
 
+def refund_question(pack_id):
+    """
+    Gives back one question taken by deduct_question() whose answer was
+    never delivered (streaming chat: LLM failure or client disconnect).
+    """
+    ChatPack.query.filter(
+        ChatPack.id == pack_id, ChatPack.questions_used > 0
+    ).update({"questions_used": ChatPack.questions_used - 1}, synchronize_session=False)
+    db.session.commit()
+
+
 # ----------------------------------------------------------
 # 5) STATUS FOR POSTMAN TEST
 # ----------------------------------------------------------
@@ -1,12 +1,11 @@
 # modules/services/chat_requirement_engine.py
 
-import os
 import json
-from openai import OpenAI
+from services.llm_executor import get_llm_client
 
 print("🔥 chat_requirement_engine imported")
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+client = get_llm_client()
 
 
 def get_required_data(question: str):
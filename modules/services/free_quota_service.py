@@ -7,6 +7,7 @@ Handles:
 - Checking if user already used today's free question
 - Creating entry if user has no record
 - Marking today's free question as used
+- Claiming (and refunding) it atomically for the streaming chat endpoint
 
 Depends on:
 - modules/models_free_daily.py → FreeDailyQuestion table
@@ -61,6 +62,39 @@ def use_free_quota(user_id):
     return record
 
 
+def claim_free_quota(user_id):
+    """
+    Atomically marks today's free question as used.
+    Returns True if this call claimed it, False if it was already used.
+
+    The check-and-set is ONE conditional UPDATE, so two parallel
+    requests can never both claim the same day's question: the second
+    waits on the first's row lock and then no longer matches. (A
+    locking re-SELECT would not do -- it hands back the object already
+    in the session's identity map, with the pre-lock last_used_date.)
+    """
+    get_free_record(user_id)
+    today = _today_str()
+    claimed = FreeDailyQuestion.query.filter(
+        FreeDailyQuestion.user_id == user_id,
+        FreeDailyQuestion.last_used_date.is_distinct_from(today),
+    ).update({"last_used_date": today}, synchronize_session=False)
+    db.session.commit()
+    return claimed > 0
+
+
+def refund_free_quota(user_id):
+    """
+    Gives back today's free question claimed with claim_free_quota()
+    when the answer was never delivered. last_used_date is only ever
+    compared with today, so clearing it restores the quota.
+    """
+    FreeDailyQuestion.query.filter_by(
+        user_id=user_id, last_used_date=_today_str()
+    ).update({"last_used_date": None}, synchronize_session=False)
+    db.session.commit()
+
+
 def get_free_quota_status(user_id):
     """
     Helper for Postman tests:
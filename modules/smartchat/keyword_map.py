@@ -482,16 +482,111 @@ HOUSE_KEYWORDS = {
 
 }
 
-def detect_house(question: str) -> int:
-    """Return house number based on matched keyword, else 0."""
+# --------------------------------------------------------------
+# Compiled matcher
+# --------------------------------------------------------------
+# detect_house() runs on every /api/smartchat request. It used to walk
+# HOUSE_KEYWORDS with a nested loop -- one `w.lower() in q` substring
+# scan per keyword (~900 of them) -- and return the FIRST house with any
+# hit, so the answer depended on dict order and a tiny house-1 keyword
+# like "me" (inside "time", "meri", ...) shadowed every later house.
+#
+# Instead, every keyword is compiled ONCE, at import, into a single
+# Aho-Corasick automaton. One pass over the lowercased question reports
+# every keyword it contains (same substring semantics as before,
+# overlaps included), and the houses are scored from that.
+
+
+class _KeywordAutomaton:
+    """Aho-Corasick automaton: goto/fail transitions over characters,
+    each state carrying every keyword that ends there (its own plus
+    those reachable through fail links, merged at build time)."""
+
+    def __init__(self, keywords):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+
+        for keyword in keywords:
+            state = 0
+            for ch in keyword:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = nxt
+            if keyword not in self._out[state]:
+                self._out[state] = self._out[state] + (keyword,)
+
+        # Breadth-first, so a state's fail target is always finished
+        # before the state itself.
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find_all(self, text):
+        """Every distinct keyword occurring anywhere in `text`."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+
+def _index_keywords(house_keywords):
+    houses_by_keyword = {}
+    for house, words in house_keywords.items():
+        for w in words:
+            keyword = w.lower()
+            if keyword and house not in houses_by_keyword.setdefault(keyword, ()):
+                houses_by_keyword[keyword] += (house,)
+    return houses_by_keyword
+
+
+_HOUSES_BY_KEYWORD = _index_keywords(HOUSE_KEYWORDS)
+_AUTOMATON = _KeywordAutomaton(_HOUSES_BY_KEYWORD)
+# Tie-break: the house listed first in HOUSE_KEYWORDS wins, exactly as
+# the old first-match loop preferred it.
+_HOUSE_RANK = {house: rank for rank, house in enumerate(HOUSE_KEYWORDS)}
+
+
+def match_houses(question: str) -> dict:
+    """{house: score} for every house with at least one keyword in the
+    question. A house's score is the total length of its distinct
+    matched keywords, so specific phrases ("job change", "शादी कब
+    होगी") outweigh short incidental hits ("me")."""
     if not question:
-        return 0
+        return {}
 
-    q = question.lower()
+    scores = {}
+    for keyword in _AUTOMATON.find_all(question.lower()):
+        for house in _HOUSES_BY_KEYWORD[keyword]:
+            scores[house] = scores.get(house, 0) + len(keyword)
+    return scores
 
-    for house, words in HOUSE_KEYWORDS.items():
-        for w in words:
-            if w.lower() in q:
-                return house
 
-    return 0
\ No newline at end of file
+def detect_house(question: str) -> int:
+    """Return the best-scoring house (see match_houses()), else 0.
+
+    House 0 (general / unclear) only wins when no specific house 1-12
+    matched; ties go to the house listed first in HOUSE_KEYWORDS."""
+    scores = match_houses(question)
+    specific = [house for house in scores if house != 0]
+    if not specific:
+        return 0
+    return max(specific, key=lambda house: (scores[house], -_HOUSE_RANK[house]))
@@ -3,10 +3,14 @@ SmartChat Engine (FINAL CLEAN OUTPUT)
 -------------------------------------
 GPT ko poora data milta rahega, 
 BUT frontend ko sirf clean answer milega.
+
+Streaming mode (routes/routes_smartchat.py, services/chat_streaming.py):
+prepare_smartchat_prompt() + stream_smartchat_answer(), which runs
+clean_answer() incrementally through AnswerCleaner -- the streamed text
+joined together is exactly clean_answer() of the full completion.
 """
 
-import os
-from openai import OpenAI
+from services.llm_executor import get_llm_client
 
 from services.full_kundali_service import generate_full_kundali_payload
 from modules.smartchat.keyword_map import detect_house
@@ -16,26 +20,30 @@ from transit_engine import get_current_positions
 
 
 # ----------------------------------------------------------
-# Initialize OpenAI client
+# Shared LLM client -- every call goes through services/llm_executor.py
 # ----------------------------------------------------------
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+client = get_llm_client()
+
+_MODEL = "gpt-4o-mini"
+_TEMPERATURE = 0.55
 
 
 # ----------------------------------------------------------
 # CLEAN ONLY ANSWER
 # ----------------------------------------------------------
+_BANNED_LINE_PREFIXES = (
+    "Ascendant", "Lagna",
+    "Dasha", "Mahadasha", "Antardasha",
+    "Transit", "Chart", "Preview",
+    "house", "detected", "debug", "{", "}"
+)
+
+
 def clean_answer(text: str) -> str:
     """
     Removes preview/debug/dasha/chart lines and keeps only GPT’s
     final astrology answer.
     """
-    banned_keywords = [
-        "Ascendant", "Lagna",
-        "Dasha", "Mahadasha", "Antardasha",
-        "Transit", "Chart", "Preview",
-        "house", "detected", "debug", "{", "}"
-    ]
-
     cleaned = []
     for line in text.split("\n"):
         s = line.strip()
@@ -43,7 +51,7 @@ def clean_answer(text: str) -> str:
             continue
 
         # skip unwanted info lines
-        if any(s.startswith(b) for b in banned_keywords):
+        if any(s.startswith(b) for b in _BANNED_LINE_PREFIXES):
             continue
 
         cleaned.append(s)
@@ -51,6 +59,68 @@ def clean_answer(text: str) -> str:
     return "\n".join(cleaned)
 
 
+class AnswerCleaner:
+    """
+    clean_answer(), one streamed delta at a time, holding back as little
+    as possible: a line is buffered only until its (left-stripped) start
+    either matches a banned prefix (-> the whole line is dropped) or can
+    no longer become one (-> it streams from then on, with trailing
+    whitespace held back because clean_answer() strips it).
+    "".join(feed(d) for d in deltas) + finish() == clean_answer(full_text).
+    """
+
+    def __init__(self):
+        self._emitted_any = False
+        self._reset_line()
+
+    def _reset_line(self):
+        self._mode = "deciding"   # -> "pass" | "drop"
+        self._head = ""
+        self._pending_ws = ""
+
+    def _start_output_line(self, text: str) -> str:
+        prefix = "\n" if self._emitted_any else ""
+        self._emitted_any = True
+        return prefix + text
+
+    def _end_line(self) -> str:
+        out = ""
+        if self._mode == "deciding":
+            s = self._head.strip()
+            if s and not any(s.startswith(b) for b in _BANNED_LINE_PREFIXES):
+                out = self._start_output_line(s)
+        self._reset_line()
+        return out
+
+    def feed(self, delta: str) -> str:
+        out = []
+        for ch in delta:
+            if ch == "\n":
+                out.append(self._end_line())
+            elif self._mode == "pass":
+                if ch.isspace():
+                    self._pending_ws += ch
+                else:
+                    out.append(self._pending_ws + ch)
+                    self._pending_ws = ""
+            elif self._mode == "deciding":
+                self._head += ch
+                s = self._head.lstrip()
+                if not s:
+                    continue
+                if any(s.startswith(b) for b in _BANNED_LINE_PREFIXES):
+                    self._mode = "drop"
+                elif not any(b.startswith(s) for b in _BANNED_LINE_PREFIXES):
+                    self._mode = "pass"
+                    body = s.rstrip()
+                    self._pending_ws = s[len(body):]
+                    out.append(self._start_output_line(body))
+        return "".join(out)
+
+    def finish(self) -> str:
+        return self._end_line()
+
+
 # ----------------------------------------------------------
 # MAIN ENGINE
 # ----------------------------------------------------------
@@ -60,6 +130,63 @@ def run_smartchat(birth: dict, question: str) -> dict:
     Backend still uses full kundali + transit for GPT.
     """
 
+    # 1-5) House, kundali, transit, summary, prompt
+    gpt_prompt = prepare_smartchat_prompt(birth, question)
+
+    # 6) GPT Call
+    try:
+        response = client.chat.completions.create(
+            model=_MODEL,
+            messages=_smartchat_messages(gpt_prompt),
+            temperature=_TEMPERATURE,
+        )
+
+        raw_answer = response.choices[0].message.content.strip()
+        answer = clean_answer(raw_answer)
+
+    except Exception as e:
+        answer = f"AI temporarily unavailable. Error: {e}"
+
+    # 7) Return ONLY answer
+    return {
+        "answer": answer
+    }
+
+
+def stream_smartchat_answer(gpt_prompt: str):
+    """
+    Streaming twin of run_smartchat()'s GPT call: yields cleaned answer
+    text as it arrives. LLM failures are raised (not turned into an
+    answer string) so the route can report them as an error event.
+    """
+    from services.chat_streaming import completion_deltas
+
+    chunks = client.chat.completions.create(
+        model=_MODEL,
+        messages=_smartchat_messages(gpt_prompt),
+        temperature=_TEMPERATURE,
+        stream=True,
+    )
+    cleaner = AnswerCleaner()
+    for delta in completion_deltas(chunks):
+        piece = cleaner.feed(delta)
+        if piece:
+            yield piece
+    tail = cleaner.finish()
+    if tail:
+        yield tail
+
+
+def _smartchat_messages(gpt_prompt: str) -> list:
+    return [
+        {"role": "system", "content": "You are a senior Vedic astrologer."},
+        {"role": "user", "content": gpt_prompt}
+    ]
+
+
+def prepare_smartchat_prompt(birth: dict, question: str) -> str:
+    """Steps 1-5 of run_smartchat() -- everything before the GPT call."""
+
     # 1) Detect house
     house_number = detect_house(question)
 
@@ -95,24 +222,4 @@ def run_smartchat(birth: dict, question: str) -> dict:
         chart=chart_summary
     )
 
-    # 6) GPT Call
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are a senior Vedic astrologer."},
-                {"role": "user", "content": gpt_prompt}
-            ],
-            temperature=0.55,
-        )
-
-        raw_answer = response.choices[0].message.content.strip()
-        answer = clean_answer(raw_answer)
-
-    except Exception as e:
-        answer = f"AI temporarily unavailable. Error: {e}"
-
-    # 7) Return ONLY answer
-    return {
-        "answer": answer
-    }
+    return gpt_prompt
@@ -0,0 +1,209 @@
+# notifications/bell_inbox.py
+
+"""
+Bell read path -- what notifications/user_notification_routes.py runs on
+every app open.
+
+Before, every Bell request (1) loaded the auth `users` row, (2) looked up
+its AppUser by firebase_uid -- an unindexed column -- and (3) counted the
+user's unread, unexpired notifications over single-column indexes. All
+three grew with table size.
+
+Now:
+
+  resolve_app_user_id(identity)
+      JWT identity (users.id) -> app_users.id, one join query on
+      ix_app_users_firebase_uid, then remembered in-process (TTL
+      BELL_USER_ID_TTL_SECONDS, default 300; LRU-capped). A users.id ->
+      profile pairing never changes -- the firebase_uid re-link in
+      routes_auth.py keeps both ids -- so only account deletion needs
+      to forget it (forget_app_user_id()); other workers' entries age
+      out within the TTL, by which point the profile's notifications
+      are already gone.
+
+  unread_count(user_id)
+      One primary-key read of user_notification_counters, which the
+      triggers on user_notifications keep current in the same
+      transaction as every insert / mark-read / delete. The badge counts
+      only unexpired rows, and rows expire with no write at all, so the
+      counter carries `valid_until` -- the earliest expiry among the rows
+      it counts. Before that instant the counter is exact; at or after
+      it (or when the user has no counter row yet) it is recomputed from
+      the partial index ix_user_notifications_unread and stored again.
+
+The unread condition is unchanged: is_read == False AND (expires_at IS
+NULL OR expires_at > now), `now` naive UTC like the rest of the Bell
+code (services/notification_lifecycle.py).
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from extensions import db
+from modules.auth.models import User
+from modules.models_user import AppUser
+from notifications.notification_models import UserNotification, UserNotificationCounter
+
+DEFAULT_USER_ID_TTL_SECONDS = 300
+DEFAULT_USER_ID_MAX_ENTRIES = 50000
+
+# A counter row created for a recompute starts out already stale, so a
+# concurrent reader never trusts it before the recompute has committed.
+_STALE = datetime(1970, 1, 1)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+# ===============================
+# JWT identity -> app_users.id
+# ===============================
+class AppUserIdCache:
+    """users.id -> app_users.id for this worker; only hits are stored."""
+
+    def __init__(self, ttl_seconds: Optional[int] = None, max_entries: Optional[int] = None, now_fn=None):
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else _env_int(
+            "BELL_USER_ID_TTL_SECONDS", DEFAULT_USER_ID_TTL_SECONDS
+        )
+        self.max_entries = max(1, max_entries or _env_int("BELL_USER_ID_MAX_ENTRIES", DEFAULT_USER_ID_MAX_ENTRIES))
+        self._now_fn = now_fn or datetime.utcnow
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, identity: int) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(identity)
+            if entry is None:
+                return None
+            app_user_id, stored_at = entry
+            if (self._now_fn() - stored_at).total_seconds() >= self.ttl_seconds:
+                del self._entries[identity]
+                return None
+            self._entries.move_to_end(identity)
+            return app_user_id
+
+    def put(self, identity: int, app_user_id: int) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[identity] = (app_user_id, self._now_fn())
+            self._entries.move_to_end(identity)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def forget(self, identity: int) -> None:
+        with self._lock:
+            self._entries.pop(identity, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_app_user_ids = AppUserIdCache()
+
+
+def get_app_user_id_cache() -> AppUserIdCache:
+    return _app_user_ids
+
+
+def resolve_app_user_id(identity, cache: Optional[AppUserIdCache] = None) -> Optional[int]:
+    """
+    app_users.id for a JWT identity, or None. Same pairing the routes
+    used to make in two queries (users row, then the first AppUser with
+    its firebase_uid) -- except a `users` row with no firebase_uid no
+    longer matches an arbitrary AppUser whose firebase_uid is also NULL.
+    """
+    cache = cache or _app_user_ids
+    identity = int(identity)
+    app_user_id = cache.get(identity)
+    if app_user_id is not None:
+        return app_user_id
+
+    app_user_id = db.session.execute(
+        select(AppUser.id)
+        .join(User, User.firebase_uid == AppUser.firebase_uid)
+        .where(User.id == identity)
+        .order_by(AppUser.id)
+        .limit(1)
+    ).scalar()
+    if app_user_id is not None:
+        cache.put(identity, app_user_id)
+    return app_user_id
+
+
+def forget_app_user_id(identity) -> None:
+    _app_user_ids.forget(int(identity))
+
+
+# ===============================
+# Unread count
+# ===============================
+def _unread_filter(user_id: int, now: datetime):
+    return (
+        UserNotification.user_id == user_id,
+        UserNotification.is_read == False,  # noqa: E712
+        or_(UserNotification.expires_at.is_(None), UserNotification.expires_at > now),
+    )
+
+
+def recompute_unread_count(user_id: int, now: Optional[datetime] = None) -> int:
+    """
+    Counts from the partial index and stores count + earliest expiry.
+
+    The counter row is made to exist (stale) and committed first, then
+    locked FOR UPDATE before counting. Every trigger write upserts that
+    same row and holds its lock until its transaction ends, so a
+    concurrent insert / delete either committed before the lock (the
+    count sees it) or waits on the lock and applies its +1 / -1 to the
+    freshly stored count after -- never lost, never counted twice. That
+    holds even when no counter row existed yet: the trigger's own
+    (stale) insert makes this one wait for it.
+    """
+    now = now or datetime.utcnow()
+    db.session.execute(
+        pg_insert(UserNotificationCounter)
+        .values(user_id=user_id, unread_count=0, valid_until=_STALE)
+        .on_conflict_do_nothing(index_elements=["user_id"])
+    )
+    db.session.commit()
+
+    db.session.execute(
+        select(UserNotificationCounter.user_id)
+        .where(UserNotificationCounter.user_id == user_id)
+        .with_for_update()
+    )
+    count, valid_until = db.session.execute(
+        select(func.count(), func.min(UserNotification.expires_at)).where(*_unread_filter(user_id, now))
+    ).one()
+    db.session.execute(
+        update(UserNotificationCounter)
+        .where(UserNotificationCounter.user_id == user_id)
+        .values(unread_count=count, valid_until=valid_until)
+    )
+    db.session.commit()
+    return count
+
+
+def unread_count(user_id: int, now: Optional[datetime] = None) -> int:
+    now = now or datetime.utcnow()
+    row = db.session.execute(
+        select(UserNotificationCounter.unread_count, UserNotificationCounter.valid_until)
+        .where(UserNotificationCounter.user_id == user_id)
+    ).first()
+    if row is not None and (row.valid_until is None or now < row.valid_until):
+        return row.unread_count
+    return recompute_unread_count(user_id, now)
+
@@ -12,6 +12,7 @@ NOTE:
 """
 
 from datetime import datetime, timezone
+from sqlalchemy import DDL, event
 from sqlalchemy.dialects.postgresql import JSON
 from extensions import db
 
@@ -143,12 +144,125 @@ class UserNotification(db.Model):
     # NULL means "never auto-expires".
     expires_at = db.Column(db.DateTime, nullable=True)
 
+    # Bell read path (notifications/bell_inbox.py): the list walks
+    # (user_id, created_at) newest-first and stops after 10 rows; the
+    # unread-count recompute reads only this user's unread rows, with
+    # expires_at in the index so it never touches the heap.
+    __table_args__ = (
+        db.Index("ix_user_notifications_user_created", "user_id", "created_at"),
+        db.Index(
+            "ix_user_notifications_unread",
+            "user_id",
+            "expires_at",
+            postgresql_where=db.text("is_read = false"),
+        ),
+    )
+
     # ===============================
     # HELPER METHODS
     # ===============================
     def mark_read(self):
         self.is_read = True
         self.read_at = datetime.now(timezone.utc)
+
+
+# ===============================
+# BELL UNREAD COUNTER
+# ===============================
+class UserNotificationCounter(db.Model):
+    """
+    Per-user Bell badge: `unread_count` unread, unexpired notifications,
+    exact for every instant before `valid_until` (NULL = no counted
+    notification ever expires). Kept by the triggers below in the same
+    transaction as every INSERT / DELETE / is_read / expires_at change
+    on user_notifications -- event_scheduler, the alert repository, the
+    mark-read routes and account deletion alike.
+
+    A trigger that finds no row for the user creates one already stale
+    (valid_until 1970-01-01), so it always holds the row lock until its
+    transaction ends; notifications/bell_inbox.py::unread_count()
+    recomputes a stale or missing row. Counted unread rows are exactly
+    those with expires_at NULL or >= valid_until, which is how a
+    decrement knows whether the row it loses was counted.
+    """
+    __tablename__ = "user_notification_counters"
+
+    user_id = db.Column(db.Integer, primary_key=True)
+    unread_count = db.Column(db.Integer, nullable=False, default=0)
+    valid_until = db.Column(db.DateTime, nullable=True)
+
+
+USER_NOTIFICATION_COUNTER_DDL = (
+    """
+    CREATE OR REPLACE FUNCTION user_notification_counters_add(uid integer, expiry timestamp, delta integer)
+    RETURNS void AS $$
+    BEGIN
+        -- A missing row is created stale (valid_until in the past), so the
+        -- row lock is taken either way and the next read recomputes.
+        IF delta > 0 THEN
+            INSERT INTO user_notification_counters AS c (user_id, unread_count, valid_until)
+            VALUES (uid, 0, TIMESTAMP '1970-01-01')
+            ON CONFLICT (user_id) DO UPDATE
+            SET unread_count = c.unread_count + 1,
+                valid_until = CASE
+                    WHEN expiry IS NULL THEN c.valid_until
+                    WHEN c.valid_until IS NULL THEN expiry
+                    ELSE LEAST(c.valid_until, expiry)
+                END;
+        ELSE
+            INSERT INTO user_notification_counters AS c (user_id, unread_count, valid_until)
+            VALUES (uid, 0, TIMESTAMP '1970-01-01')
+            ON CONFLICT (user_id) DO UPDATE
+            SET unread_count = c.unread_count - 1
+            WHERE expiry IS NULL OR (c.valid_until IS NOT NULL AND expiry >= c.valid_until);
+        END IF;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION user_notification_counters_apply() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') AND NOT OLD.is_read THEN
+            PERFORM user_notification_counters_add(OLD.user_id, OLD.expires_at, -1);
+        END IF;
+        IF TG_OP IN ('UPDATE', 'INSERT') AND NOT NEW.is_read THEN
+            PERFORM user_notification_counters_add(NEW.user_id, NEW.expires_at, 1);
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER trg_user_notifications_counter_insert_delete
+    AFTER INSERT OR DELETE ON user_notifications
+    FOR EACH ROW EXECUTE FUNCTION user_notification_counters_apply()
+    """,
+    """
+    CREATE TRIGGER trg_user_notifications_counter_update
+    AFTER UPDATE OF is_read, expires_at, user_id ON user_notifications
+    FOR EACH ROW WHEN (
+        OLD.is_read IS DISTINCT FROM NEW.is_read
+        OR OLD.expires_at IS DISTINCT FROM NEW.expires_at
+        OR OLD.user_id IS DISTINCT FROM NEW.user_id
+    )
+    EXECUTE FUNCTION user_notification_counters_apply()
+    """,
+)
+
+USER_NOTIFICATION_COUNTER_DROP_DDL = (
+    "DROP TRIGGER IF EXISTS trg_user_notifications_counter_update ON user_notifications",
+    "DROP TRIGGER IF EXISTS trg_user_notifications_counter_insert_delete ON user_notifications",
+    "DROP FUNCTION IF EXISTS user_notification_counters_apply()",
+    "DROP FUNCTION IF EXISTS user_notification_counters_add(integer, timestamp, integer)",
+)
+
+# create_all() / drop_all() get the triggers too; production gets them
+# from migration c5e1a9d7b3f2.
+UserNotificationCounter.__table__.add_is_dependent_on(UserNotification.__table__)
+for _statement in USER_NOTIFICATION_COUNTER_DDL:
+    event.listen(UserNotificationCounter.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+for _statement in USER_NOTIFICATION_COUNTER_DROP_DDL:
+    event.listen(UserNotificationCounter.__table__, "before_drop", DDL(_statement).execute_if(dialect="postgresql"))
 # ===============================
 # NOTIFICATION LOG (DUPLICATE CONTROL)
 # ===============================
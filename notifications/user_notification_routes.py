@@ -1,9 +1,8 @@
 # notifications/user_notification_routes.py
 
 from flask import Blueprint, request, jsonify
-from modules.auth.models import User
-from modules.models_user import AppUser
 from extensions import db
+from notifications.bell_inbox import resolve_app_user_id, unread_count
 from notifications.notification_models import UserNotification
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime, timedelta
@@ -16,22 +15,9 @@ user_notification_bp = Blueprint(
 )
 
 def get_app_user_id():
-    identity = get_jwt_identity()
-
-    # 🔹 Step 1: Auth user
-    user = db.session.get(User, int(identity))
-    if not user:
-        return None
-
-    # 🔹 Step 2: Map to AppUser
-    app_user = db.session.query(AppUser)\
-        .filter_by(firebase_uid=user.firebase_uid)\
-        .first()
-
-    if not app_user:
-        return None
-
-    return app_user.id
+    # users.id -> app_users.id: one indexed join, then cached per worker
+    # (notifications/bell_inbox.py)
+    return resolve_app_user_id(get_jwt_identity())
 
 # ===============================
 # 1. UNREAD COUNT
@@ -44,8 +30,6 @@ def get_unread_count():
     if not user_id:
         return jsonify({"error": "User not found"}), 404
 
-    now = datetime.utcnow()
-
     # N5 -- previously also required `created_at > cutoff` (a 5-hour
     # window), which the LIST query below does NOT apply to its own
     # `is_read == False` branch -- an unread item older than 5 hours
@@ -57,14 +41,11 @@ def get_unread_count():
     # so the count and the list now use the exact same two conditions:
     # unread AND not expired. Read items are correctly never counted,
     # regardless of age.
-    count = db.session.query(UserNotification)\
-        .filter(UserNotification.user_id == user_id)\
-        .filter(UserNotification.is_read == False)\
-        .filter(
-            (UserNotification.expires_at.is_(None)) |
-            (UserNotification.expires_at > now)
-        )\
-        .count()
+    #
+    # Served from the trigger-maintained per-user counter, recomputed
+    # only once a counted notification has expired -- see
+    # notifications/bell_inbox.py.
+    count = unread_count(user_id, datetime.utcnow())
 
     return jsonify({"unread_count": count})
 
@@ -0,0 +1,466 @@
+"""
+report_pipeline.py
+------------------
+Staged, resumable paid-report generation. What used to run start-to-
+finish inside one thread in tasks._generate_and_send_report_core() is
+split into four stages, each of which persists its output
+(models.ReportStageArtifact) the moment it succeeds:
+
+    compute  -> calculate_full_kundali + get_current_positions +
+                summary blocks + final prompt text
+    llm      -> the GPT response text (the one stage that costs money)
+    render   -> kundali drawing + WeasyPrint PDF; sets Order.pdf_url and
+                report_stage="Ready", exactly as before
+    deliver  -> SMTP email with the PDF attached
+
+A stage reads everything it needs from the earlier stages' artifacts,
+never from in-memory state, so the pipeline can always resume at the
+first stage WITHOUT an artifact: a WeasyPrint crash after a successful
+GPT call re-renders from the stored GPT text rather than paying for a
+second call. ReconciliationService.resume() and PaymentService's
+automatic retry both redispatch the SAME Order, and therefore resume
+this way for free.
+
+Two ways to drive it:
+
+    run_report_pipeline(order_id)
+        Every remaining stage, in order, in the calling thread -- what
+        the Celery task (USE_CELERY=True) and the direct call path run.
+    get_report_queue().submit(order_id)
+        Thread mode (USE_CELERY=False): replaces the bare daemon
+        threading.Thread per order with one bounded ThreadPoolExecutor
+        PER STAGE (sizes from REPORT_<STAGE>_WORKERS). A finished stage
+        hands the order to the next stage's pool, so a burst of orders
+        queues at the slow stage instead of starting N concurrent
+        WeasyPrint renders or N concurrent kundali computations.
+
+report_stage semantics are unchanged: "Processing" (with a fresh
+processing_started_at) on entry, "Ready" once the PDF exists, "Failed"
+if any stage raises before "Ready". processing_started_at is now
+refreshed after EVERY completed stage -- the Payment Hardening Blocker
+02.1 post-GPT heartbeat, generalized -- so each stage gets its own
+full abandonment window (see reconciliation_service.py). As before, a
+delivery failure after "Ready" is logged, not marked Failed. The Order
+stays "Ready" without a deliver artifact, and
+ReconciliationService.resume() re-runs only the deliver stage once the
+abandonment window has passed; a run entering at deliver leaves
+report_stage "Ready" throughout.
+
+Heavy imports (ephemeris, OpenAI, WeasyPrint) stay inside the stage
+functions so reconciliation_service.py can import the artifact
+helpers below without pulling in the whole report toolchain.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+from extensions import db
+from models import Order, ReportStageArtifact
+
+REPORT_STAGES = ("compute", "llm", "render", "deliver")
+
+# Per-stage pool sizes for thread mode: env var name and default. LLM
+# calls are network-bound and can overlap freely; WeasyPrint is
+# memory-heavy, so one render at a time is the safe default.
+STAGE_WORKER_ENV = {
+    "compute": ("REPORT_COMPUTE_WORKERS", 2),
+    "llm": ("REPORT_LLM_WORKERS", 4),
+    "render": ("REPORT_RENDER_WORKERS", 1),
+    "deliver": ("REPORT_DELIVER_WORKERS", 2),
+}
+
+LOVE_PREMIUM_PRODUCT = "relationship_future_report"
+
+# Also part of the llm stage's response-cache key.
+REPORT_LLM_MODEL = "gpt-4o-mini"
+
+RASHI_MAP = {
+    "Aries": 1, "Taurus": 2, "Gemini": 3, "Cancer": 4,
+    "Leo": 5, "Virgo": 6, "Libra": 7, "Scorpio": 8,
+    "Sagittarius": 9, "Capricorn": 10, "Aquarius": 11, "Pisces": 12
+}
+
+
+def _app():
+    # Imported lazily: app.py imports the routes that import this
+    # module (via reconciliation_service.py).
+    from app import app
+    return app
+
+
+# ------------------------------------------------------------
+# 🧾 Order + artifact helpers (DB only, caller holds app context)
+# ------------------------------------------------------------
+def get_order_details(order_id):
+    order = Order.query.get(order_id)
+    if not order:
+        return None
+    return {
+        "name": order.name,
+        "email": order.email,
+        "product": order.product,
+        "dob": order.dob,
+        "tob": order.tob,
+        "pob": order.pob,
+        "phone": order.phone,
+        "status": order.status,
+        "created_at": order.created_at.isoformat() if order.created_at else None,
+        "latitude": getattr(order, "latitude", 28.6139),
+        "longitude": getattr(order, "longitude", 77.2090),
+        "language": getattr(order, "language", "en"),
+    }
+
+
+def load_artifacts(order_id: int) -> Dict[str, Dict[str, Any]]:
+    """{stage: payload} for every stage this Order already completed."""
+    rows = ReportStageArtifact.query.filter_by(order_id=order_id).all()
+    return {row.stage: row.payload for row in rows}
+
+
+def next_pending_stage(order_id: int) -> Optional[str]:
+    """The first stage without an artifact -- where a (re)run starts --
+    or None when all four already completed."""
+    done = {
+        stage for (stage,) in
+        db.session.query(ReportStageArtifact.stage).filter_by(order_id=order_id).all()
+    }
+    for stage in REPORT_STAGES:
+        if stage not in done:
+            return stage
+    return None
+
+
+def discard_artifacts(order_id: int) -> int:
+    """Forget every completed stage so the next run regenerates the
+    report from scratch (admin "resend/regenerate"). Returns the number
+    of artifacts removed."""
+    removed = ReportStageArtifact.query.filter_by(order_id=order_id).delete(
+        synchronize_session=False,
+    )
+    db.session.commit()
+    return removed
+
+
+def _save_artifact(order_id: int, stage: str, payload: Dict[str, Any]) -> None:
+    row = ReportStageArtifact.query.filter_by(order_id=order_id, stage=stage).first()
+    if row is None:
+        row = ReportStageArtifact(order_id=order_id, stage=stage)
+        db.session.add(row)
+    row.payload = payload
+    row.completed_at = datetime.utcnow()
+
+    # Heartbeat: every completed stage restarts the abandonment window
+    # (see module docstring / ReconciliationService).
+    order_model = Order.query.get(order_id)
+    if order_model and order_model.report_stage == "Processing":
+        order_model.processing_started_at = datetime.utcnow()
+    db.session.commit()
+
+
+def _mark_failed(order_id: int) -> None:
+    # A fresh app context, same as the old single-thread pipeline's
+    # except-path: the failing stage's own context may already be gone.
+    try:
+        with _app().app_context():
+            order_model = Order.query.get(order_id)
+            if order_model and order_model.report_stage != "Ready":
+                order_model.report_stage = "Failed"
+                db.session.commit()
+    except Exception as state_write_error:
+        print(f"[Pipeline] ⚠️ Could not record Failed report_stage: {state_write_error}")
+
+
+# ------------------------------------------------------------
+# 🧩 Stages -- each returns its JSON artifact
+# ------------------------------------------------------------
+def _stage_compute(order_id: int, order: dict, artifacts: dict) -> dict:
+    from full_kundali_api import calculate_full_kundali
+    from summary_blocks import build_summary_blocks_with_transit
+    from transit_engine import get_current_positions
+
+    language = order.get("language", "en")
+    print(f"[DEBUG] Language for this order: {language}")
+
+    kundali = calculate_full_kundali(
+        name=order["name"],
+        dob=order["dob"],
+        tob=order["tob"],
+        lat=float(order.get("latitude", 28.6139)),
+        lon=float(order.get("longitude", 77.2090)),
+        language=language
+    )
+
+    transit = get_current_positions()
+    kundali["transit_summary"] = transit
+
+    summary_blocks = build_summary_blocks_with_transit(kundali, transit)
+
+    product_slug = order["product"]
+    template_path = f"prompts/{product_slug}_{language}.txt"
+    try:
+        with open(template_path, encoding="utf-8") as f:
+            template = f.read()
+    except FileNotFoundError:
+        print(f"[WARN] Template not found: {template_path}. Falling back to EN.")
+        with open(f"prompts/{product_slug}_en.txt", encoding="utf-8") as f:
+            template = f.read()
+
+    used_placeholders = re.findall(r"{(.*?)}", template)
+    prompt_final = template.format(**summary_blocks)
+
+    # Save prompt for debugging
+    os.makedirs("debug_prompts", exist_ok=True)
+    with open(f"debug_prompts/{product_slug}_{order_id}_prompt.txt", "w", encoding="utf-8") as f:
+        f.write(prompt_final)
+
+    # Only what render needs from the chart -- not the whole kundali.
+    return {
+        "summary_blocks": summary_blocks,
+        "used_placeholders": used_placeholders,
+        "prompt": prompt_final,
+        "planets": kundali["planets"],
+        "lagna_rashi": kundali.get("lagna_rashi") or kundali.get("lagna_sign"),
+    }
+
+
+def _stage_llm(order_id: int, order: dict, artifacts: dict) -> dict:
+    from services.llm_executor import get_llm_client
+    from services.llm_response_cache import get_llm_response_cache
+
+    prompt = artifacts["compute"]["prompt"]
+
+    def call():
+        response = get_llm_client().chat.completions.create(
+            model=REPORT_LLM_MODEL,
+            messages=[{"role": "user", "content": prompt}]
+        )
+        return response.choices[0].message.content.strip(), response.model_dump()
+
+    # The prompt is template.format(**summary_blocks): two orders of the
+    # same product whose charts render the same blocks share one
+    # completion. The product's template file is the prompt family.
+    gpt_content, _raw, hit = get_llm_response_cache().fetch(
+        model=REPORT_LLM_MODEL,
+        prompt=prompt,
+        prompt_version=f"report_pipeline:{order['product']}",
+        call=call,
+    )
+    if hit:
+        print(f"[Task] Order {order_id}: LLM response served from cache")
+
+    os.makedirs("debug_prompts", exist_ok=True)
+    with open(f"debug_prompts/{order['product']}_{order_id}_gpt_response.txt", "w", encoding="utf-8") as f:
+        f.write(gpt_content)
+
+    return {"gpt_content": gpt_content}
+
+
+def _stage_render(order_id: int, order: dict, artifacts: dict) -> dict:
+    from kundali_chart_generator import generate_kundali_drawing
+    from pdf_generator_weasy import generate_pdf_report_weasy as generate_pdf_report
+
+    computed = artifacts["compute"]
+    product_slug = order["product"]
+    safe_name = order["name"].replace(" ", "_")
+    lagna_rashi = computed.get("lagna_rashi")
+    if not lagna_rashi:
+        raise ValueError("Missing lagna_rashi in kundali result")
+    rashi_number = RASHI_MAP.get(lagna_rashi) if isinstance(lagna_rashi, str) else lagna_rashi
+
+    kundali_drawing = generate_kundali_drawing(
+        planets=computed["planets"],
+        lagna_rashi=rashi_number
+    )
+
+    output_path = f"/home/Jyotishasha/reports/{product_slug}_{safe_name}.pdf"
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+    generate_pdf_report(
+        output_path=output_path,
+        user_info={
+            "name": order["name"],
+            "dob": order["dob"],
+            "tob": order["tob"],
+            "pob": order["pob"]
+        },
+        summary_blocks=computed["summary_blocks"],
+        gpt_response=artifacts["llm"]["gpt_content"],
+        kundali_drawing=kundali_drawing,
+        used_placeholders=computed["used_placeholders"],
+        product=order["product"]
+    )
+
+    order_model = Order.query.get(order_id)
+    if order_model:
+        order_model.pdf_url = output_path
+        order_model.report_stage = "Ready"
+        db.session.commit()
+
+    return {"pdf_path": output_path}
+
+
+def _stage_deliver(order_id: int, order: dict, artifacts: dict) -> dict:
+    from email_utils import send_email
+
+    product_slug = order["product"]
+    subject = f"Your {product_slug.replace('-', ' ').title()} Report"
+    body = (
+        f"Hello {order['name']},\n\n"
+        f"Please find attached your personalized astrology report.\n\n"
+        f"Regards,\nTeam Jyotishasha"
+    )
+    send_email(order["email"], subject, body, artifacts["render"]["pdf_path"])
+    print(f"[Task] ✅ Email sent to {order['email']}")
+    return {"email": order["email"], "sent_at": datetime.utcnow().isoformat()}
+
+
+STAGE_FUNCTIONS: Dict[str, Callable[[int, dict, dict], dict]] = {
+    "compute": _stage_compute,
+    "llm": _stage_llm,
+    "render": _stage_render,
+    "deliver": _stage_deliver,
+}
+
+
+# ------------------------------------------------------------
+# 🚀 Pipeline driving
+# ------------------------------------------------------------
+def begin_report_pipeline(order_id: int) -> Optional[str]:
+    """
+    Entry checks shared by both drivers. Returns the first stage to run,
+    or None when there is nothing (more) for this pipeline to do: order
+    missing, a love premium order (handed to its own task, unchanged),
+    or every stage already completed.
+    """
+    print(f"[Task] Starting report generation for Order ID: {order_id}")
+    try:
+        with _app().app_context():
+            order = get_order_details(order_id)
+            if not order:
+                print(f"[ERROR] Order {order_id} not found!")
+                return None
+
+            if order.get("product") == LOVE_PREMIUM_PRODUCT:
+                from modules.love.love_report_router import route_report_generation
+                route_report_generation(order_id, order["product"])
+                return None
+
+            stage = next_pending_stage(order_id)
+            order_model = Order.query.get(order_id)
+            if order_model:
+                if stage is None or stage == "deliver":
+                    # Every stage already has an artifact -- nothing to
+                    # redo -- or only the email is left and the PDF
+                    # already exists: never leave the Order stuck in
+                    # Processing.
+                    order_model.report_stage = "Ready"
+                else:
+                    # Payment Hardening Phase 6 / Blocker 02: marked
+                    # before any real work, see reconciliation_service.py.
+                    order_model.report_stage = "Processing"
+                    order_model.processing_started_at = datetime.utcnow()
+                db.session.commit()
+            if stage is not None and stage != REPORT_STAGES[0]:
+                print(f"[Task] Resuming Order {order_id} at stage '{stage}'")
+            return stage
+    except Exception as e:
+        print(f"[Task] ❌ Error starting report pipeline: {e}")
+        traceback.print_exc()
+        _mark_failed(order_id)
+        return None
+
+
+def run_report_stage(order_id: int, stage: str) -> Optional[str]:
+    """Run ONE stage and persist its artifact. Returns the next stage
+    to run, or None when the pipeline finished or this stage failed
+    (report_stage is then "Failed" unless the report is already
+    Ready)."""
+    try:
+        with _app().app_context():
+            order = get_order_details(order_id)
+            if not order:
+                print(f"[ERROR] Order {order_id} not found!")
+                return None
+            artifacts = load_artifacts(order_id)
+            payload = STAGE_FUNCTIONS[stage](order_id, order, artifacts)
+            _save_artifact(order_id, stage, payload)
+            print(f"[Task] Order {order_id}: stage '{stage}' complete")
+    except Exception as e:
+        print(f"[Task] ❌ Error in report stage '{stage}': {e}")
+        traceback.print_exc()
+        _mark_failed(order_id)
+        return None
+
+    position = REPORT_STAGES.index(stage)
+    return REPORT_STAGES[position + 1] if position + 1 < len(REPORT_STAGES) else None
+
+
+def run_report_pipeline(order_id: int) -> None:
+    """Every remaining stage, in order, in the calling thread."""
+    stage = begin_report_pipeline(order_id)
+    while stage is not None:
+        stage = run_report_stage(order_id, stage)
+
+
+def resolve_stage_pool_sizes() -> Dict[str, int]:
+    sizes = {}
+    for stage, (env_name, default) in STAGE_WORKER_ENV.items():
+        try:
+            sizes[stage] = max(1, int(os.getenv(env_name, default)))
+        except ValueError:
+            sizes[stage] = default
+    return sizes
+
+
+class ReportPipelineQueue:
+    """Thread-mode driver: one bounded pool per stage, each finished
+    stage handing the order on to the next stage's pool."""
+
+    def __init__(self, pool_sizes: Optional[Dict[str, int]] = None):
+        sizes = pool_sizes or resolve_stage_pool_sizes()
+        self._pools = {
+            stage: ThreadPoolExecutor(max_workers=sizes[stage], thread_name_prefix=f"report-{stage}")
+            for stage in REPORT_STAGES
+        }
+
+    def submit(self, order_id: int) -> None:
+        # Entry checks are cheap; they run on the compute pool so the
+        # dispatching request returns immediately, as before.
+        self._pools[REPORT_STAGES[0]].submit(self._enter, order_id)
+
+    def shutdown(self, wait: bool = True) -> None:
+        for pool in self._pools.values():
+            pool.shutdown(wait=wait)
+
+    def _enter(self, order_id: int) -> None:
+        stage = begin_report_pipeline(order_id)
+        if stage is not None:
+            self._submit_stage(order_id, stage)
+
+    def _submit_stage(self, order_id: int, stage: str) -> None:
+        self._pools[stage].submit(self._run_stage, order_id, stage)
+
+    def _run_stage(self, order_id: int, stage: str) -> None:
+        next_stage = run_report_stage(order_id, stage)
+        if next_stage is not None:
+            self._submit_stage(order_id, next_stage)
+
+
+_queue: Optional[ReportPipelineQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_report_queue() -> ReportPipelineQueue:
+    """Lazy process-wide singleton, created on first dispatch."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = ReportPipelineQueue()
+        return _queue
@@ -1,13 +1,13 @@
 import os
 from dotenv import load_dotenv
-from openai import OpenAI
+from services.llm_executor import get_llm_client
 from email_utils import send_email as send_email_with_attachment
 from pdf_generator_weasy import generate_pdf_report_weasy as generate_pdf_report
 
 #from pdf_generator import generate_pdf_report
 
 load_dotenv()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+client = get_llm_client()
 
 def get_openai_response(prompt):
     response = client.chat.completions.create(
@@ -40,11 +40,16 @@ def get_all_orders():
 @admin_required
 def resend_order(order_id):
     from tasks import generate_and_send_report   # ✅ NEW import
+    from report_pipeline import discard_artifacts
 
     order = Order.query.get(order_id)
     if not order:
         return jsonify({"error": "Order not found"}), 404
 
+    # Resend = full regeneration: forget stored stage artifacts so the
+    # staged pipeline (report_pipeline.py) redoes every stage.
+    discard_artifacts(order_id)
+
     # Celery task फिर से चलाओ
     generate_and_send_report.delay(order_id)
 
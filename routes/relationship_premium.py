@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 
-from modules.love.service_love import run_love_compatibility, LoveServiceError
+from modules.love.pair_session import get_pair_session_store
+from modules.love.service_love import LoveServiceError
 
 relationship_premium_bp = Blueprint(
     "relationship_premium",
@@ -23,9 +24,7 @@ def analyze_relationship_premium():
         partner = payload.get("partner") or {}
         boy_is_user = payload.get("boy_is_user", True)
 
-        result = run_love_compatibility(
-            user=user,
-            partner=partner,
+        result = get_pair_session_store().session(user, partner).compatibility(
             boy_is_user=bool(boy_is_user),
         )
 
@@ -2,7 +2,8 @@
 
 from flask import Blueprint, request, jsonify
 
-from modules.love.service_love import run_love_compatibility, LoveServiceError
+from modules.love.pair_session import get_pair_session_store
+from modules.love.service_love import LoveServiceError
 from modules.love.love_report_compiler import compile_love_report
 
 relationship_premium_report_bp = Blueprint(
@@ -29,9 +30,7 @@ def love_marriage_life_report():
         language = payload.get("language", "en")
 
         # Step 1: core compatibility + kundali logic
-        analysis = run_love_compatibility(
-            user=user,
-            partner=partner,
+        analysis = get_pair_session_store().session(user, partner).compatibility(
             boy_is_user=bool(boy_is_user),
         )
 
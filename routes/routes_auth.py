@@ -6,6 +6,7 @@ from modules.auth.models import User
 from modules.models_user import AppUser
 from flask_jwt_extended import create_access_token, get_jwt_identity, jwt_required
 from firebase_admin import auth as firebase_auth
+from modules.auth.id_token_verifier import verify_firebase_id_token
 
 from modules.auth.account_deletion_service import (
     AccountDeletionError,
@@ -47,7 +48,7 @@ def register_user():
     id_token = auth_header.replace("Bearer ", "").strip()
 
     try:
-        decoded = firebase_auth.verify_id_token(id_token)
+        decoded = verify_firebase_id_token(id_token)
     except Exception:
         return jsonify({"error": "Invalid or expired Firebase token"}), 401
 
@@ -178,7 +179,7 @@ def get_backend_token():
     id_token = auth_header.replace("Bearer ", "").strip()
 
     try:
-        decoded = firebase_auth.verify_id_token(id_token)
+        decoded = verify_firebase_id_token(id_token)
     except Exception:
         return jsonify({"error": "Invalid or expired Firebase token"}), 401
 
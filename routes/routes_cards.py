@@ -1,7 +1,8 @@
 from flask import Blueprint, request, jsonify
 from services.panchang_engine import today_and_tomorrow
 from services.card_service import generate_cards
-from models import AstroEvent
+from services.cards_cache import LANGUAGES, SLOTS, get_cards_cache
+from services.event_calendar import events_on
 from datetime import datetime
 
 cards_bp = Blueprint("cards", __name__, url_prefix="/api/cards")
@@ -23,19 +24,34 @@ def get_cards():
         except:
             return jsonify({"error": "invalid lat/lng"}), 400
 
-        # 🔹 Panchang
-        panchang_data = today_and_tomorrow(lat, lng, "en")
+        language = (data.get("language") or "en").lower()
+        if language not in LANGUAGES:
+            language = "en"
+        slot = (data.get("slot") or "morning").lower()
+        if slot not in SLOTS:
+            slot = "morning"
 
         # 🔹 Date handling
         date_str = data.get("date")
         date_obj = (
             datetime.strptime(date_str, "%Y-%m-%d").date()
             if date_str
-            else datetime.now().date()
+            else None
         )
 
+        # ⚡ Today (IST) -> location-bucketed cache (services/cards_cache.py)
+        cache = get_cards_cache()
+        if date_obj is None or date_obj == cache.today():
+            bundle, _ = cache.get_bundle(lat, lng, language, slot)
+            return jsonify({
+                "cards": bundle["cards"]
+            })
+
+        # 🔹 Panchang
+        panchang_data = today_and_tomorrow(lat, lng, language)
+
         # 🔥 EVENTS FROM DB
-        events_db = AstroEvent.query.filter_by(date=date_obj).all()
+        events_db = events_on(date_obj)
 
         events = [
             {
@@ -47,7 +63,7 @@ def get_cards():
         ]
 
         # 🔹 Generate cards
-        cards = generate_cards(panchang_data, events)
+        cards = generate_cards(panchang_data, events, slot=slot)
 
         return jsonify({
             "cards": cards
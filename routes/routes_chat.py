@@ -14,21 +14,33 @@ Uses:
 - chat_engine.py
 - free_quota_service.py
 - chat_pack_service.py
+
+Streaming: /api/chat/free and /api/chat/pack also answer as server-sent
+events when the request asks for it ("stream": true, ?stream=1 or
+Accept: text/event-stream -- see services/chat_streaming.py). The
+question is RESERVED before the LLM call (claim_free_quota /
+deduct_question, both row-locked, so parallel requests cannot all pass
+the check) and REFUNDED (refund_free_quota / refund_question) if the
+answer fails, or the client disconnects, before the last token. The
+final `done` event carries the same JSON body as the non-streaming
+response.
 """
 from modules.services.chatpack_google_verify import verify_google_chatpack
 from flask import Blueprint, request, jsonify
 
 # Services
-from modules.services.chat_engine import chat_engine
+from modules.services.chat_engine import chat_engine, chat_result, prepare_chat, stream_chat_answer
+from services.chat_streaming import sse_response, stream_completion, wants_stream
 from modules.services.free_quota_service import (
-    has_free_quota,
-    use_free_quota,
+    claim_free_quota,
+    refund_free_quota,
     get_free_quota_status,
 )
 from modules.services.chat_pack_service import (
     create_chatpack_order,
     verify_chatpack_payment,
     deduct_question,
+    refund_question,
     get_pack_status,
 )
 
@@ -48,15 +60,31 @@ def chat_free():
     if not user_id or not question or not birth:
         return jsonify({"error": "Missing required fields"}), 400
 
-    # Check free quota
-    if not has_free_quota(user_id):
+    # Claim the free quota (atomic check-and-use)
+    if not claim_free_quota(user_id):
         return jsonify({
             "success": False,
             "message": "Free question already used today"
         }), 403
 
-    # Use the free quota
-    use_free_quota(user_id)
+    if wants_stream(data):
+        try:
+            context = prepare_chat(birth, question)
+            deltas = stream_chat_answer(context)
+        except Exception:
+            refund_free_quota(user_id)
+            raise
+
+        def on_complete(answer_text):
+            return {
+                "success": True,
+                "free_used": True,
+                "answer": chat_result(context, answer_text)
+            }
+
+        return sse_response(stream_completion(
+            deltas, on_complete=on_complete, on_abort=lambda: refund_free_quota(user_id),
+        ))
 
     # Get chat answer
     answer = chat_engine(birth, question)
@@ -87,6 +115,25 @@ def chat_pack():
     if not result.get("success"):
         return jsonify(result), 403
 
+    if wants_stream(data):
+        try:
+            context = prepare_chat(birth, question)
+            deltas = stream_chat_answer(context)
+        except Exception:
+            refund_question(result["pack_id"])
+            raise
+
+        def on_complete(answer_text):
+            return {
+                "success": True,
+                "remaining": result["remaining"],
+                "answer": chat_result(context, answer_text)
+            }
+
+        return sse_response(stream_completion(
+            deltas, on_complete=on_complete, on_abort=lambda: refund_question(result["pack_id"]),
+        ))
+
     # Get chat answer
     answer = chat_engine(birth, question)
 
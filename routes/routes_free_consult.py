@@ -21,13 +21,12 @@ errors. Do NOT register or import this route in the current production app.
 from flask import Blueprint, request, jsonify
 from services.full_kundali_service import generate_full_kundali_payload  # ✅ correct path (no api)
 from transit_engine import get_current_positions
-from openai import OpenAI
-import os
+from services.llm_executor import get_llm_client
 
 routes_free_consult = Blueprint("routes_free_consult", __name__)
 
-# 🔑 Initialize OpenAI client once
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# 🔑 Shared LLM client -- every call goes through services/llm_executor.py
+client = get_llm_client()
 
 @routes_free_consult.route("/api/free-consult", methods=["POST"])
 def free_consult():
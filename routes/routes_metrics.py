@@ -18,13 +18,22 @@ left in place.)
 
 Every route is read-only -- none of them can mutate an Order or a
 ProcessedPayment row.
+
+/admin/api/metrics/llm-cache reports the LLM response cache
+(services/llm_response_cache.py): this worker's hit/miss/store/eviction
+counters and hit rate, plus the table-wide entry count and persisted hit
+total across every worker. /admin/api/metrics/cards-cache does the
+same for the /api/cards location-bucketed cache
+(services/cards_cache.py).
 """
 
 from dataclasses import asdict
 
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
 
 from modules.payments.metrics_service import MetricsService
+from services.cards_cache import get_cards_cache
+from services.llm_response_cache import get_llm_response_cache
 from notifications.notification_routes import admin_required
 
 routes_metrics = Blueprint("routes_metrics", __name__)
@@ -54,10 +63,24 @@ def metrics_general():
     return jsonify(asdict(MetricsService().general_metrics())), 200
 
 
+@routes_metrics.route("/admin/api/metrics/llm-cache", methods=["GET"])
+@admin_required
+def metrics_llm_cache():
+    return jsonify(asdict(get_llm_response_cache().stats())), 200
+
+
+@routes_metrics.route("/admin/api/metrics/cards-cache", methods=["GET"])
+@admin_required
+def metrics_cards_cache():
+    return jsonify(asdict(get_cards_cache().stats())), 200
+
+
 @routes_metrics.route("/admin/api/metrics", methods=["GET"])
 @admin_required
 def metrics_full():
     """Combined snapshot -- all four sections plus the explicit
     `limitations` list explaining every metric that is `null` rather
-    than a number."""
-    return jsonify(asdict(MetricsService().full_snapshot())), 200
+    than a number. Reused for a few seconds (see MetricsService);
+    `?fresh=1` recomputes it."""
+    fresh = request.args.get("fresh", "").lower() in ("1", "true", "yes")
+    return jsonify(asdict(MetricsService().full_snapshot(fresh=fresh))), 200
@@ -23,7 +23,7 @@ import uuid
 
 from extensions import db
 from modules.user_service import get_or_create_app_user
-from firebase_admin import auth as firebase_auth
+from modules.auth.id_token_verifier import verify_firebase_id_token
 
 # 🟢 Correct kundali calculator (confirmed by you)
 from full_kundali_api import calculate_full_kundali
@@ -61,7 +61,7 @@ def bootstrap_user_profile():
     id_token = auth_header.replace("Bearer ", "").strip()
 
     try:
-        decoded = firebase_auth.verify_id_token(id_token)
+        decoded = verify_firebase_id_token(id_token)
     except Exception:
         return jsonify({"ok": False, "error": "Invalid or expired Firebase token"}), 401
 
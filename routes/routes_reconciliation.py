@@ -61,5 +61,6 @@ def resume_order(order_id):
         "order_id": result.order_id,
         "resumed": result.resumed,
         "task_id": result.task_id,
+        "resume_stage": result.resume_stage,
         "decision": _decision_json(result.decision),
     }), 200
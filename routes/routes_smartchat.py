@@ -1,7 +1,8 @@
     # routes/routes_smartchat.py
 
 from flask import Blueprint, request, jsonify
-from modules.smartchat.smartchat_engine import run_smartchat
+from modules.smartchat.smartchat_engine import prepare_smartchat_prompt, run_smartchat, stream_smartchat_answer
+from services.chat_streaming import sse_response, stream_completion, wants_stream
 
 routes_smartchat = Blueprint("routes_smartchat", __name__)
 
@@ -19,6 +20,14 @@ def smartchat_api():
         return jsonify({"success": False, "error": "Missing birth details"}), 400
 
     try:
+        # Streaming mode -- see services/chat_streaming.py
+        if wants_stream(data):
+            gpt_prompt = prepare_smartchat_prompt(birth, question)
+            return sse_response(stream_completion(
+                stream_smartchat_answer(gpt_prompt),
+                on_complete=lambda answer: {"success": True, "answer": answer},
+            ))
+
         result = run_smartchat(birth, question)
 
         return jsonify({
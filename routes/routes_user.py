@@ -16,7 +16,7 @@ from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from modules.user_service import register_or_update_user, get_user_by_id
 from modules.subscription.dual_write_adapter import resolve_profile_id_from_account_user_id
-from firebase_admin import auth as firebase_auth
+from modules.auth.id_token_verifier import verify_firebase_id_token
 
 routes_user = Blueprint("routes_user", __name__)
 
@@ -46,7 +46,7 @@ def register_or_update():
     id_token = auth_header.replace("Bearer ", "").strip()
 
     try:
-        decoded = firebase_auth.verify_id_token(id_token)
+        decoded = verify_firebase_id_token(id_token)
     except Exception:
         return jsonify({"error": "Invalid or expired Firebase token"}), 401
 
@@ -0,0 +1,110 @@
+"""
+services/ai_prediction_lab/astro_context.py
+-------------------------------------------------------------
+Request-scoped memo of the heavy astrology calls one AI report
+generation makes -- the natal kundali, the "now" transit positions, and
+each planet's upcoming rashi segments.
+
+Before this, a single BaseAIGenerator.generate() call recomputed these
+independently in several places: every current_*_phase_context.py
+helper fetched a full current-position set once PER PLANET, the phase
+context's compute_next_phase_change_date() walked
+get_next_12_rashi_segments() for every relevant planet, and
+compute_expires_at()'s compute_current_timing_expiry() walked it again
+for the fast planets (Moon/Sun/Mercury overlap). None of those results
+can change within one generation, so an AstroContext is created once per
+generate() call (see modules/ai_report_engine/base_generator.py) and
+handed to every Lab builder that needs them.
+
+Scope is deliberately ONE generation (or whatever a caller explicitly
+shares it across) -- never module-global: a kundali is a person's data,
+and the "now" positions / upcoming ingresses are only valid for the
+instant the request was made. The positions snapshot is taken once, on
+first use, so every builder in the same report reads the same instant.
+
+THE `astro` PARAMETER: every Lab builder that reads the natal kundali,
+the current positions or the rashi segments takes an optional
+`astro: Optional[AstroContext] = None`. When given -- this generation's
+AstroContext -- those reads come from it and are shared with every
+other builder in the same report (a phase context's
+next_phase_change_date lookups included). When omitted, the builder
+calls the underlying engine (full_kundali_api / transit_engine)
+directly, exactly as before. Either way this module changes no
+calculation, only how many times it runs.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Optional
+
+from full_kundali_api import calculate_full_kundali
+from transit_engine import get_current_positions, get_next_12_rashi_segments
+
+
+class AstroContext:
+    def __init__(
+        self,
+        *,
+        kundali_fn: Optional[Callable[..., Dict[str, Any]]] = None,
+        positions_fn: Optional[Callable[[], Dict[str, Any]]] = None,
+        segments_fn: Optional[Callable[[str], List[Dict[str, Any]]]] = None,
+    ):
+        # Constructor-injected engines, defaulting to the real ones, so a
+        # test can count calls without patching module globals.
+        self._kundali_fn = kundali_fn or calculate_full_kundali
+        self._positions_fn = positions_fn or get_current_positions
+        self._segments_fn = segments_fn or get_next_12_rashi_segments
+
+        self._kundalis: Dict[tuple, Dict[str, Any]] = {}
+        self._positions: Optional[Dict[str, Any]] = None
+        self._segments: Dict[str, List[Dict[str, Any]]] = {}
+        self._segment_errors: Dict[str, Exception] = {}
+
+    def kundali(self, *, name, dob, tob, lat, lon, language, user_id=None) -> Dict[str, Any]:
+        """calculate_full_kundali() for these birth details, computed at
+        most once per AstroContext. Callers must treat the returned dict
+        as read-only -- every Lab builder already does."""
+        key = (name, dob, tob, lat, lon, language, user_id)
+        if key not in self._kundalis:
+            self._kundalis[key] = self._kundali_fn(
+                name=name, dob=dob, tob=tob, lat=lat, lon=lon,
+                user_id=user_id, language=language,
+            )
+        return self._kundalis[key]
+
+    def current_positions(self) -> Dict[str, Any]:
+        """The "positions" half of get_current_positions(), snapshotted on
+        first use and reused for the rest of this context's lifetime."""
+        if self._positions is None:
+            self._positions = self._positions_fn().get("positions", {})
+        return self._positions
+
+    def rashi_segments(self, planet_name: str) -> List[Dict[str, Any]]:
+        """get_next_12_rashi_segments(planet_name), computed at most once
+        per planet. A failure is remembered and re-raised on every later
+        lookup, so a broken planet is not retried within one report."""
+        if planet_name in self._segment_errors:
+            raise self._segment_errors[planet_name]
+        if planet_name not in self._segments:
+            try:
+                self._segments[planet_name] = self._segments_fn(planet_name)
+            except Exception as exc:
+                self._segment_errors[planet_name] = exc
+                raise
+        return self._segments[planet_name]
+
+
+def current_positions(astro: Optional[AstroContext] = None) -> Dict[str, Any]:
+    """Current positions from `astro` if given, else straight from
+    transit_engine (the pre-AstroContext behaviour)."""
+    if astro is not None:
+        return astro.current_positions()
+    return get_current_positions().get("positions", {})
+
+
+def rashi_segments(planet_name: str, astro: Optional[AstroContext] = None) -> List[Dict[str, Any]]:
+    """Upcoming rashi segments from `astro` if given, else straight from
+    transit_engine (the pre-AstroContext behaviour)."""
+    if astro is not None:
+        return astro.rashi_segments(planet_name)
+    return get_next_12_rashi_segments(planet_name)
@@ -26,11 +26,12 @@ static role labels.
 
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from full_kundali_api import get_nakshatra_pada
-from transit_engine import RASHIS, get_current_positions
+from transit_engine import RASHIS
 from modules.smartchat.chart_summarizer import _rashi_to_house
+from services.ai_prediction_lab.astro_context import AstroContext, current_positions
 
 # Moon and Mercury are the same fast movers LOVE's daily layer already
 # uses; Sun replaces Venus here (not a career significator) since Sun is
@@ -39,8 +40,7 @@ from modules.smartchat.chart_summarizer import _rashi_to_house
 CAREER_ACTION_PLANETS = ["Moon", "Mercury", "Sun", "Mars"]
 
 
-def _action_transit_summary(planet_name: str, lagna_sign: str) -> Dict[str, Any]:
-    positions = get_current_positions().get("positions", {})
+def _action_transit_summary(planet_name: str, lagna_sign: str, positions: Dict[str, Any]) -> Dict[str, Any]:
     p = positions.get(planet_name) or {}
 
     rashi = p.get("rashi")
@@ -62,7 +62,7 @@ def _action_transit_summary(planet_name: str, lagna_sign: str) -> Dict[str, Any]
     }
 
 
-def build_career_action_context(kundali: Dict[str, Any]) -> Dict[str, Any]:
+def build_career_action_context(kundali: Dict[str, Any], astro: Optional[AstroContext] = None) -> Dict[str, Any]:
     """
     `kundali` must be the dict returned by
     full_kundali_api.calculate_full_kundali() -- only `lagna_sign` is
@@ -71,10 +71,13 @@ def build_career_action_context(kundali: Dict[str, Any]) -> Dict[str, Any]:
 
     Returns ONLY the four fast-moving current transits -- no Mahadasha,
     no Antardasha, no Saturn/Jupiter, no career_phase.
+
+    `astro` -- see astro_context.py.
     """
     lagna_sign = kundali.get("lagna_sign")
+    positions = current_positions(astro)
 
     return {
-        planet.lower(): _action_transit_summary(planet, lagna_sign)
+        planet.lower(): _action_transit_summary(planet, lagna_sign, positions)
         for planet in CAREER_ACTION_PLANETS
     }
@@ -26,12 +26,13 @@ the natal 10th Lord's CURRENT transit position ("foundation").
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from full_kundali_api import get_nakshatra_pada
-from transit_engine import RASHIS, get_current_positions
+from transit_engine import RASHIS
 from modules.smartchat.chart_summarizer import _rashi_to_house
 from services.ai_prediction_lab.career_context_builder import build_career_profile_context
+from services.ai_prediction_lab.astro_context import AstroContext, current_positions
 
 CAREER_TIMING_PLANETS = ["Sun", "Mercury", "Moon"]
 
@@ -68,7 +69,11 @@ def _conjunct_planets(planet_name: str, positions: Dict[str, Any]) -> List[str]:
     ]
 
 
-def build_current_career_timing_context(kundali: Dict[str, Any]) -> Dict[str, Any]:
+def build_current_career_timing_context(
+    kundali: Dict[str, Any],
+    career_context: Optional[Dict[str, Any]] = None,
+    astro: Optional[AstroContext] = None,
+) -> Dict[str, Any]:
     """
     `kundali` must be the dict returned by
     full_kundali_api.calculate_full_kundali() -- only `lagna_sign` is
@@ -78,9 +83,15 @@ def build_current_career_timing_context(kundali: Dict[str, Any]) -> Dict[str, An
     Moon's current conjunction planets (if any), and the natal 10th
     Lord's CURRENT transit position (sign/house only) -- no Mahadasha,
     no Antardasha, no career_phase, no other permanent chart facts.
+
+    `career_context` -- the Career Profile the caller already built
+    with build_career_profile_context(kundali) for this same execution, if
+    any; rebuilt here only when omitted.
+
+    `astro` -- see astro_context.py.
     """
     lagna_sign = kundali.get("lagna_sign")
-    positions = get_current_positions().get("positions", {})
+    positions = current_positions(astro)
 
     result: Dict[str, Any] = {
         planet.lower(): _timing_transit_summary(planet, lagna_sign, positions)
@@ -88,7 +99,7 @@ def build_current_career_timing_context(kundali: Dict[str, Any]) -> Dict[str, An
     }
     result["moon_conjunctions"] = _conjunct_planets("Moon", positions)
 
-    career_summary = build_career_profile_context(kundali)
+    career_summary = career_context or build_career_profile_context(kundali)
     tenth_lord_name = (career_summary.get("tenth_lord") or {}).get("name")
     result["foundation_lord"] = (
         _timing_transit_summary(tenth_lord_name, lagna_sign, positions)
@@ -29,12 +29,13 @@ this person's specific chart.
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from full_kundali_api import get_nakshatra_pada
-from transit_engine import RASHIS, get_current_positions
+from transit_engine import RASHIS
 from modules.smartchat.chart_summarizer import _rashi_to_house
 from services.ai_prediction_lab.next_phase_change import compute_next_phase_change_date
+from services.ai_prediction_lab.astro_context import AstroContext, current_positions
 
 # Moon/Jupiter/Venus/Saturn -- the four family-significator planets this
 # segment's context is scoped to (see FAMILY CONTEXT spec). All four are
@@ -54,8 +55,7 @@ PLANET_FAMILY_ROLE = {
 }
 
 
-def _transit_summary(planet_name: str, lagna_sign: str) -> Dict[str, Any]:
-    positions = get_current_positions().get("positions", {})
+def _transit_summary(planet_name: str, lagna_sign: str, positions: Dict[str, Any]) -> Dict[str, Any]:
     p = positions.get(planet_name) or {}
 
     rashi = p.get("rashi")
@@ -126,7 +126,11 @@ def _score_family_phase(
     }
 
 
-def build_current_family_phase_context(kundali: Dict[str, Any], family_context: Dict[str, Any]) -> Dict[str, Any]:
+def build_current_family_phase_context(
+    kundali: Dict[str, Any],
+    family_context: Dict[str, Any],
+    astro: Optional[AstroContext] = None,
+) -> Dict[str, Any]:
     """
     `kundali` must be the dict returned by
     full_kundali_api.calculate_full_kundali(). `family_context` must be
@@ -134,13 +138,16 @@ def build_current_family_phase_context(kundali: Dict[str, Any], family_context:
     family_context_builder.build_family_profile_context(kundali) for
     this same execution -- generated exactly once by the caller and
     passed in here, never recomputed by this function.
+
+    `astro` -- see astro_context.py.
     """
     lagna_sign = kundali.get("lagna_sign")
+    positions = current_positions(astro)
 
     mahadasha = kundali.get("current_mahadasha") or {}
     antardasha = kundali.get("current_antardasha") or {}
 
-    transits = {planet: _transit_summary(planet, lagna_sign) for planet in FAMILY_TRANSIT_PLANETS}
+    transits = {planet: _transit_summary(planet, lagna_sign, positions) for planet in FAMILY_TRANSIT_PLANETS}
 
     family_phase = _score_family_phase(
         mahadasha.get("mahadasha"),
@@ -158,7 +165,7 @@ def build_current_family_phase_context(kundali: Dict[str, Any], family_context:
     # logic (FamilyGenerator.compute_expires_at) is completely
     # unaffected.
     next_phase_change_date = compute_next_phase_change_date(
-        antardasha.get("end"), FAMILY_TRANSIT_PLANETS,
+        antardasha.get("end"), FAMILY_TRANSIT_PLANETS, astro=astro,
     )
 
     return {
@@ -30,12 +30,13 @@ person's specific chart.
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from full_kundali_api import get_nakshatra_pada
-from transit_engine import RASHIS, get_current_positions
+from transit_engine import RASHIS
 from modules.smartchat.chart_summarizer import _rashi_to_house
 from services.ai_prediction_lab.next_phase_change import compute_next_phase_change_date
+from services.ai_prediction_lab.astro_context import AstroContext, current_positions
 
 # Jupiter/Venus/Mercury/Saturn/Rahu -- the five finance-significator
 # planets this segment's context is scoped to (see FINANCE CONTEXT
@@ -67,8 +68,7 @@ PLANET_FINANCE_ROLE = {
 }
 
 
-def _transit_summary(planet_name: str, lagna_sign: str) -> Dict[str, Any]:
-    positions = get_current_positions().get("positions", {})
+def _transit_summary(planet_name: str, lagna_sign: str, positions: Dict[str, Any]) -> Dict[str, Any]:
     p = positions.get(planet_name) or {}
 
     rashi = p.get("rashi")
@@ -140,7 +140,11 @@ def _score_finance_phase(
     }
 
 
-def build_current_finance_phase_context(kundali: Dict[str, Any], finance_context: Dict[str, Any]) -> Dict[str, Any]:
+def build_current_finance_phase_context(
+    kundali: Dict[str, Any],
+    finance_context: Dict[str, Any],
+    astro: Optional[AstroContext] = None,
+) -> Dict[str, Any]:
     """
     `kundali` must be the dict returned by
     full_kundali_api.calculate_full_kundali(). `finance_context` must be
@@ -148,13 +152,16 @@ def build_current_finance_phase_context(kundali: Dict[str, Any], finance_context
     finance_context_builder.build_finance_profile_context(kundali) for
     this same execution -- generated exactly once by the caller and
     passed in here, never recomputed by this function.
+
+    `astro` -- see astro_context.py.
     """
     lagna_sign = kundali.get("lagna_sign")
+    positions = current_positions(astro)
 
     mahadasha = kundali.get("current_mahadasha") or {}
     antardasha = kundali.get("current_antardasha") or {}
 
-    transits = {planet: _transit_summary(planet, lagna_sign) for planet in FINANCE_TRANSIT_PLANETS}
+    transits = {planet: _transit_summary(planet, lagna_sign, positions) for planet in FINANCE_TRANSIT_PLANETS}
 
     finance_phase = _score_finance_phase(
         mahadasha.get("mahadasha"),
@@ -167,7 +174,7 @@ def build_current_finance_phase_context(kundali: Dict[str, Any], finance_context
     # the same _transit_summary() helper, so it can never influence
     # finance_phase's level/confidence/reasons above (unchanged
     # calculation) while still being available to the prompt.
-    transits["Moon"] = _transit_summary("Moon", lagna_sign)
+    transits["Moon"] = _transit_summary("Moon", lagna_sign, positions)
 
     # Next Phase Change -- nearest of the Antardasha end date or the next
     # rashi transit of a FINANCE_TRANSIT_PLANETS planet (Moon excluded;
@@ -176,7 +183,7 @@ def build_current_finance_phase_context(kundali: Dict[str, Any], finance_context
     # cache-expiry logic (FinanceGenerator.compute_expires_at) is
     # completely unaffected.
     next_phase_change_date = compute_next_phase_change_date(
-        antardasha.get("end"), FINANCE_TRANSIT_PLANETS,
+        antardasha.get("end"), FINANCE_TRANSIT_PLANETS, astro=astro,
     )
 
     return {
@@ -28,12 +28,13 @@ analogue to Love's 5th-house identity house).
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from full_kundali_api import get_nakshatra_pada
-from transit_engine import RASHIS, get_current_positions
+from transit_engine import RASHIS
 from modules.smartchat.chart_summarizer import _rashi_to_house
 from services.ai_prediction_lab.finance_context_builder import build_finance_profile_context
+from services.ai_prediction_lab.astro_context import AstroContext, current_positions
 
 FINANCE_TIMING_PLANETS = ["Venus", "Mercury", "Moon"]
 
@@ -70,7 +71,11 @@ def _conjunct_planets(planet_name: str, positions: Dict[str, Any]) -> List[str]:
     ]
 
 
-def build_current_finance_timing_context(kundali: Dict[str, Any]) -> Dict[str, Any]:
+def build_current_finance_timing_context(
+    kundali: Dict[str, Any],
+    finance_context: Optional[Dict[str, Any]] = None,
+    astro: Optional[AstroContext] = None,
+) -> Dict[str, Any]:
     """
     `kundali` must be the dict returned by
     full_kundali_api.calculate_full_kundali() -- only `lagna_sign` is
@@ -81,9 +86,15 @@ def build_current_finance_timing_context(kundali: Dict[str, Any]) -> Dict[str, A
     2nd Lord's CURRENT transit position (sign/house only) -- no
     Mahadasha, no Antardasha, no finance_phase, no other permanent
     chart facts.
+
+    `finance_context` -- the Finance Profile the caller already built
+    with build_finance_profile_context(kundali) for this same execution, if
+    any; rebuilt here only when omitted.
+
+    `astro` -- see astro_context.py.
     """
     lagna_sign = kundali.get("lagna_sign")
-    positions = get_current_positions().get("positions", {})
+    positions = current_positions(astro)
 
     result: Dict[str, Any] = {
         planet.lower(): _timing_transit_summary(planet, lagna_sign, positions)
@@ -91,7 +102,7 @@ def build_current_finance_timing_context(kundali: Dict[str, Any]) -> Dict[str, A
     }
     result["moon_conjunctions"] = _conjunct_planets("Moon", positions)
 
-    finance_summary = build_finance_profile_context(kundali)
+    finance_summary = finance_context or build_finance_profile_context(kundali)
     second_lord_name = (finance_summary.get("second_lord") or {}).get("name")
     result["foundation_lord"] = (
         _timing_transit_summary(second_lord_name, lagna_sign, positions)
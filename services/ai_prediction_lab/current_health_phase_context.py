@@ -29,12 +29,13 @@ computed from this person's specific chart, and never a diagnosis.
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from full_kundali_api import get_nakshatra_pada
-from transit_engine import RASHIS, get_current_positions
+from transit_engine import RASHIS
 from modules.smartchat.chart_summarizer import _rashi_to_house
 from services.ai_prediction_lab.next_phase_change import compute_next_phase_change_date
+from services.ai_prediction_lab.astro_context import AstroContext, current_positions
 
 # Moon/Sun/Mars/Saturn/Jupiter -- the five health-significator planets
 # this segment's context is scoped to (see HEALTH CONTEXT spec). All
@@ -56,8 +57,7 @@ PLANET_HEALTH_ROLE = {
 }
 
 
-def _transit_summary(planet_name: str, lagna_sign: str) -> Dict[str, Any]:
-    positions = get_current_positions().get("positions", {})
+def _transit_summary(planet_name: str, lagna_sign: str, positions: Dict[str, Any]) -> Dict[str, Any]:
     p = positions.get(planet_name) or {}
 
     rashi = p.get("rashi")
@@ -131,7 +131,11 @@ def _score_health_phase(
     }
 
 
-def build_current_health_phase_context(kundali: Dict[str, Any], health_context: Dict[str, Any]) -> Dict[str, Any]:
+def build_current_health_phase_context(
+    kundali: Dict[str, Any],
+    health_context: Dict[str, Any],
+    astro: Optional[AstroContext] = None,
+) -> Dict[str, Any]:
     """
     `kundali` must be the dict returned by
     full_kundali_api.calculate_full_kundali(). `health_context` must be
@@ -139,13 +143,16 @@ def build_current_health_phase_context(kundali: Dict[str, Any], health_context:
     health_context_builder.build_health_profile_context(kundali) for
     this same execution -- generated exactly once by the caller and
     passed in here, never recomputed by this function.
+
+    `astro` -- see astro_context.py.
     """
     lagna_sign = kundali.get("lagna_sign")
+    positions = current_positions(astro)
 
     mahadasha = kundali.get("current_mahadasha") or {}
     antardasha = kundali.get("current_antardasha") or {}
 
-    transits = {planet: _transit_summary(planet, lagna_sign) for planet in HEALTH_TRANSIT_PLANETS}
+    transits = {planet: _transit_summary(planet, lagna_sign, positions) for planet in HEALTH_TRANSIT_PLANETS}
 
     health_phase = _score_health_phase(
         mahadasha.get("mahadasha"),
@@ -163,7 +170,7 @@ def build_current_health_phase_context(kundali: Dict[str, Any], health_context:
     # logic (HealthGenerator.compute_expires_at) is completely
     # unaffected.
     next_phase_change_date = compute_next_phase_change_date(
-        antardasha.get("end"), HEALTH_TRANSIT_PLANETS,
+        antardasha.get("end"), HEALTH_TRANSIT_PLANETS, astro=astro,
     )
 
     return {
@@ -29,12 +29,13 @@ analogue to Love's 5th-house identity house).
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from full_kundali_api import get_nakshatra_pada
-from transit_engine import RASHIS, get_current_positions
+from transit_engine import RASHIS
 from modules.smartchat.chart_summarizer import _rashi_to_house
 from services.ai_prediction_lab.health_context_builder import build_health_profile_context
+from services.ai_prediction_lab.astro_context import AstroContext, current_positions
 
 HEALTH_TIMING_PLANETS = ["Moon", "Sun", "Mars"]
 
@@ -71,7 +72,11 @@ def _conjunct_planets(planet_name: str, positions: Dict[str, Any]) -> List[str]:
     ]
 
 
-def build_current_health_timing_context(kundali: Dict[str, Any]) -> Dict[str, Any]:
+def build_current_health_timing_context(
+    kundali: Dict[str, Any],
+    health_context: Optional[Dict[str, Any]] = None,
+    astro: Optional[AstroContext] = None,
+) -> Dict[str, Any]:
     """
     `kundali` must be the dict returned by
     full_kundali_api.calculate_full_kundali() -- only `lagna_sign` is
@@ -81,9 +86,15 @@ def build_current_health_timing_context(kundali: Dict[str, Any]) -> Dict[str, An
     Moon's current conjunction planets (if any), and the natal Lagna
     Lord's CURRENT transit position (sign/house only) -- no Mahadasha,
     no Antardasha, no health_phase, no other permanent chart facts.
+
+    `health_context` -- the Health Profile the caller already built
+    with build_health_profile_context(kundali) for this same execution, if
+    any; rebuilt here only when omitted.
+
+    `astro` -- see astro_context.py.
     """
     lagna_sign = kundali.get("lagna_sign")
-    positions = get_current_positions().get("positions", {})
+    positions = current_positions(astro)
 
     result: Dict[str, Any] = {
         planet.lower(): _timing_transit_summary(planet, lagna_sign, positions)
@@ -91,7 +102,7 @@ def build_current_health_timing_context(kundali: Dict[str, Any]) -> Dict[str, An
     }
     result["moon_conjunctions"] = _conjunct_planets("Moon", positions)
 
-    health_summary = build_health_profile_context(kundali)
+    health_summary = health_context or build_health_profile_context(kundali)
     lagna_lord_name = (health_summary.get("lagna_lord") or {}).get("name")
     result["foundation_lord"] = (
         _timing_transit_summary(lagna_lord_name, lagna_sign, positions)
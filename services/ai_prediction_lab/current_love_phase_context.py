@@ -31,12 +31,13 @@ not something computed from this person's specific chart.
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from full_kundali_api import get_nakshatra_pada
-from transit_engine import RASHIS, get_current_positions
+from transit_engine import RASHIS
 from modules.smartchat.chart_summarizer import _rashi_to_house
 from services.ai_prediction_lab.next_phase_change import compute_next_phase_change_date
+from services.ai_prediction_lab.astro_context import AstroContext, current_positions
 
 LOVE_TRANSIT_PLANETS = ["Jupiter", "Saturn", "Rahu", "Ketu"]
 LOVE_HOUSE = 5
@@ -61,8 +62,7 @@ PLANET_RELATIONSHIP_ROLE = {
 }
 
 
-def _transit_summary(planet_name: str, lagna_sign: str) -> Dict[str, Any]:
-    positions = get_current_positions().get("positions", {})
+def _transit_summary(planet_name: str, lagna_sign: str, positions: Dict[str, Any]) -> Dict[str, Any]:
     p = positions.get(planet_name) or {}
 
     rashi = p.get("rashi")
@@ -127,7 +127,11 @@ def _score_relationship_phase(
     }
 
 
-def build_current_love_phase_context(kundali: Dict[str, Any], love_context: Dict[str, Any]) -> Dict[str, Any]:
+def build_current_love_phase_context(
+    kundali: Dict[str, Any],
+    love_context: Dict[str, Any],
+    astro: Optional[AstroContext] = None,
+) -> Dict[str, Any]:
     """
     `kundali` must be the dict returned by
     full_kundali_api.calculate_full_kundali(). `love_context` must be the
@@ -135,13 +139,16 @@ def build_current_love_phase_context(kundali: Dict[str, Any], love_context: Dict
     context_builder.build_love_profile_context(kundali) for this same
     execution -- generated exactly once by the caller and passed in here,
     never recomputed by this function.
+
+    `astro` -- see astro_context.py.
     """
     lagna_sign = kundali.get("lagna_sign")
+    positions = current_positions(astro)
 
     mahadasha = kundali.get("current_mahadasha") or {}
     antardasha = kundali.get("current_antardasha") or {}
 
-    transits = {planet: _transit_summary(planet, lagna_sign) for planet in LOVE_TRANSIT_PLANETS}
+    transits = {planet: _transit_summary(planet, lagna_sign, positions) for planet in LOVE_TRANSIT_PLANETS}
 
     relationship_phase = _score_relationship_phase(
         mahadasha.get("mahadasha"),
@@ -154,7 +161,7 @@ def build_current_love_phase_context(kundali: Dict[str, Any], love_context: Dict
     # the same _transit_summary() helper, so it can never influence
     # relationship_phase's level/confidence/reasons above (unchanged
     # calculation) while still being available to the prompt.
-    transits["Moon"] = _transit_summary("Moon", lagna_sign)
+    transits["Moon"] = _transit_summary("Moon", lagna_sign, positions)
 
     # Next Phase Change -- nearest of the Antardasha end date or the next
     # rashi transit of a LOVE_TRANSIT_PLANETS planet (Moon excluded; see
@@ -162,7 +169,7 @@ def build_current_love_phase_context(kundali: Dict[str, Any], love_context: Dict
     # antardasha["end"] above, so compute_expires_at()'s cache-expiry
     # logic (LoveGenerator.compute_expires_at) is completely unaffected.
     next_phase_change_date = compute_next_phase_change_date(
-        antardasha.get("end"), LOVE_TRANSIT_PLANETS,
+        antardasha.get("end"), LOVE_TRANSIT_PLANETS, astro=astro,
     )
 
     return {
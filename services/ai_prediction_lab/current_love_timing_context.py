@@ -29,9 +29,9 @@ This module performs NO new astrology calculation. It only reuses:
   otherwise read or exposed; only that one planet's CURRENT transit
   position is computed and returned, via the exact same
   _timing_transit_summary() helper used for Moon/Venus/Mercury/Mars
-  below. This keeps build_current_love_timing_context()'s own signature
-  at just `(kundali)`, so LoveGenerator's existing call site is
-  unchanged.
+  below. LoveGenerator now passes the Love Profile it already built in
+  as `love_context`, so the second call only happens for callers that
+  still pass just `(kundali)`.
 
 Tracks Moon, Venus, Mercury, and Mars -- LOVE's classical
 relationship-relevant fast-moving planets (Venus = karaka of love,
@@ -48,12 +48,13 @@ up.
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from full_kundali_api import get_nakshatra_pada
-from transit_engine import RASHIS, get_current_positions
+from transit_engine import RASHIS
 from modules.smartchat.chart_summarizer import _rashi_to_house
 from services.ai_prediction_lab.context_builder import build_love_profile_context
+from services.ai_prediction_lab.astro_context import AstroContext, current_positions
 
 LOVE_TIMING_PLANETS = ["Moon", "Venus", "Mercury", "Mars"]
 
@@ -93,7 +94,11 @@ def _conjunct_planets(planet_name: str, positions: Dict[str, Any]) -> List[str]:
     ]
 
 
-def build_current_love_timing_context(kundali: Dict[str, Any]) -> Dict[str, Any]:
+def build_current_love_timing_context(
+    kundali: Dict[str, Any],
+    love_context: Optional[Dict[str, Any]] = None,
+    astro: Optional[AstroContext] = None,
+) -> Dict[str, Any]:
     """
     `kundali` must be the dict returned by
     full_kundali_api.calculate_full_kundali() -- only `lagna_sign` is
@@ -107,9 +112,15 @@ def build_current_love_timing_context(kundali: Dict[str, Any]) -> Dict[str, Any]
     5th Lord's CURRENT transit position (sign/house only) -- no
     Mahadasha, no Antardasha, no relationship_phase, no other permanent
     chart facts.
+
+    `love_context` -- the Love Profile the caller already built
+    with build_love_profile_context(kundali) for this same execution, if
+    any; rebuilt here only when omitted.
+
+    `astro` -- see astro_context.py.
     """
     lagna_sign = kundali.get("lagna_sign")
-    positions = get_current_positions().get("positions", {})
+    positions = current_positions(astro)
 
     result: Dict[str, Any] = {
         planet.lower(): _timing_transit_summary(planet, lagna_sign, positions)
@@ -122,7 +133,7 @@ def build_current_love_timing_context(kundali: Dict[str, Any]) -> Dict[str, Any]
     # Lab function (the same one LoveGenerator already calls for DNA);
     # only the planet's NAME is read from its output, never any natal
     # sign/house/nakshatra fact.
-    birth_summary = build_love_profile_context(kundali)
+    birth_summary = love_context or build_love_profile_context(kundali)
     fifth_lord_name = (birth_summary.get("fifth_lord") or {}).get("name")
     result["foundation_lord"] = (
         _timing_transit_summary(fifth_lord_name, lagna_sign, positions)
@@ -40,7 +40,7 @@ from __future__ import annotations
 from datetime import datetime, timedelta
 from typing import Optional
 
-from transit_engine import get_next_12_rashi_segments
+from services.ai_prediction_lab.astro_context import AstroContext, rashi_segments
 
 MAX_EXPIRY_HOURS = 24
 
@@ -69,6 +69,7 @@ def _safe_parse(date_str: Optional[str]) -> Optional[datetime]:
 def compute_current_timing_expiry(
     segment: str,
     generated_at: Optional[datetime] = None,
+    astro: Optional[AstroContext] = None,
 ) -> datetime:
     """
     Returns the expiry datetime for a CURRENT_TIMING report for
@@ -84,7 +85,7 @@ def compute_current_timing_expiry(
 
     for planet in FAST_TIMING_PLANETS.get(segment, ["Moon"]):
         try:
-            events = get_next_12_rashi_segments(planet)
+            events = rashi_segments(planet, astro)
         except Exception:
             events = []
         if events:
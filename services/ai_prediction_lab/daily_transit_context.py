@@ -15,7 +15,7 @@ backend functions independently.
 
 No new astrology calculation is performed here. It only reuses:
 - transit_engine.get_current_positions() for current transit
-  sign/degree/motion (unchanged, read directly)
+  sign/degree/motion (read once per build from its shared snapshot)
 - modules/smartchat/chart_summarizer._rashi_to_house() to derive a
   transit's house from the natal lagna -- the same reuse path already
   used for Layer 2
@@ -29,17 +29,17 @@ foundation for it.
 
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from full_kundali_api import get_nakshatra_pada
-from transit_engine import RASHIS, get_current_positions
+from transit_engine import RASHIS
 from modules.smartchat.chart_summarizer import _rashi_to_house
+from services.ai_prediction_lab.astro_context import AstroContext, current_positions
 
 DAILY_TRANSIT_PLANETS = ["Moon", "Mercury", "Venus", "Mars"]
 
 
-def _daily_transit_summary(planet_name: str, lagna_sign: str) -> Dict[str, Any]:
-    positions = get_current_positions().get("positions", {})
+def _daily_transit_summary(planet_name: str, lagna_sign: str, positions: Dict[str, Any]) -> Dict[str, Any]:
     p = positions.get(planet_name) or {}
 
     rashi = p.get("rashi")
@@ -61,7 +61,7 @@ def _daily_transit_summary(planet_name: str, lagna_sign: str) -> Dict[str, Any]:
     }
 
 
-def build_daily_transit_context(kundali: Dict[str, Any]) -> Dict[str, Any]:
+def build_daily_transit_context(kundali: Dict[str, Any], astro: Optional[AstroContext] = None) -> Dict[str, Any]:
     """
     `kundali` must be the dict returned by
     full_kundali_api.calculate_full_kundali() -- only `lagna_sign` is
@@ -70,10 +70,16 @@ def build_daily_transit_context(kundali: Dict[str, Any]) -> Dict[str, Any]:
 
     Returns ONLY the four fast-moving current transits -- no Mahadasha,
     no Antardasha, no Jupiter/Saturn/Rahu/Ketu, no relationship_phase.
+
+    `astro` -- see astro_context.py.
     """
     lagna_sign = kundali.get("lagna_sign")
+    # One snapshot for all four planets -- they are read from the same
+    # instant, and only one positions dict is copied out of
+    # transit_engine's shared snapshot instead of four.
+    positions = current_positions(astro)
 
     return {
-        planet.lower(): _daily_transit_summary(planet, lagna_sign)
+        planet.lower(): _daily_transit_summary(planet, lagna_sign, positions)
         for planet in DAILY_TRANSIT_PLANETS
     }
@@ -37,17 +37,17 @@ static role labels.
 
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from full_kundali_api import get_nakshatra_pada
-from transit_engine import RASHIS, get_current_positions
+from transit_engine import RASHIS
 from modules.smartchat.chart_summarizer import _rashi_to_house
+from services.ai_prediction_lab.astro_context import AstroContext, current_positions
 
 FINANCE_ACTION_PLANETS = ["Moon", "Mercury", "Venus"]
 
 
-def _action_transit_summary(planet_name: str, lagna_sign: str) -> Dict[str, Any]:
-    positions = get_current_positions().get("positions", {})
+def _action_transit_summary(planet_name: str, lagna_sign: str, positions: Dict[str, Any]) -> Dict[str, Any]:
     p = positions.get(planet_name) or {}
 
     rashi = p.get("rashi")
@@ -69,7 +69,7 @@ def _action_transit_summary(planet_name: str, lagna_sign: str) -> Dict[str, Any]
     }
 
 
-def build_finance_action_context(kundali: Dict[str, Any]) -> Dict[str, Any]:
+def build_finance_action_context(kundali: Dict[str, Any], astro: Optional[AstroContext] = None) -> Dict[str, Any]:
     """
     `kundali` must be the dict returned by
     full_kundali_api.calculate_full_kundali() -- only `lagna_sign` is
@@ -78,10 +78,13 @@ def build_finance_action_context(kundali: Dict[str, Any]) -> Dict[str, Any]:
 
     Returns ONLY the three fast-moving current transits -- no
     Mahadasha, no Antardasha, no Jupiter/Saturn/Rahu, no finance_phase.
+
+    `astro` -- see astro_context.py.
     """
     lagna_sign = kundali.get("lagna_sign")
+    positions = current_positions(astro)
 
     return {
-        planet.lower(): _action_transit_summary(planet, lagna_sign)
+        planet.lower(): _action_transit_summary(planet, lagna_sign, positions)
         for planet in FINANCE_ACTION_PLANETS
     }
@@ -33,7 +33,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Iterable, Optional
 
-from transit_engine import get_next_12_rashi_segments
+from services.ai_prediction_lab.astro_context import AstroContext, rashi_segments
 
 # Never a candidate for Next Phase Change -- see module docstring.
 _EXCLUDED_FROM_MAJOR_TRANSIT = {"Moon"}
@@ -51,6 +51,7 @@ def _safe_parse(date_str: Optional[str]) -> Optional[datetime]:
 def compute_next_phase_change_date(
     antardasha_end: Optional[str],
     relevant_planets: Iterable[str],
+    astro: Optional[AstroContext] = None,
 ) -> Optional[str]:
     """
     Returns whichever comes first, as a "YYYY-MM-DD" string:
@@ -62,6 +63,10 @@ def compute_next_phase_change_date(
     Returns None if no valid date could be determined at all -- callers
     fall back to their existing antardasha_end-only behaviour in that
     case, so an engine failure never breaks report generation.
+
+    `astro` -- the generation's AstroContext, if any; each planet's
+    segments are then computed at most once per report (shared with
+    compute_current_timing_expiry()).
     """
     candidates = []
 
@@ -73,7 +78,7 @@ def compute_next_phase_change_date(
         if planet in _EXCLUDED_FROM_MAJOR_TRANSIT:
             continue
         try:
-            events = get_next_12_rashi_segments(planet)
+            events = rashi_segments(planet, astro)
         except Exception:
             events = []
         if events:
@@ -3,22 +3,22 @@ services/ai_prediction_lab/openai_client.py
 ----------------------------------------------
 Isolated OpenAI client for the AI Prediction Lab ONLY.
 
-This does not import from, share state with, or modify any production
+This does not import from or modify any production
 OpenAI integration (report_writer.py, modules/love/love_premium_task.py,
 modules/services/chat_engine.py, modules/services/chat_requirement_engine.py,
 modules/smartchat/smartchat_engine.py, routes/routes_free_consult.py).
-It mirrors their existing client-init pattern for consistency, but is a
-separate client instance scoped to this package alone.
+Model choice and request shape stay owned here; the transport is the
+shared LLM execution layer (services/llm_executor.py) every one of
+those integrations now uses, so Lab calls share its concurrency bound,
+in-flight coalescing, timeouts and retries.
 """
 
-import os
-
 from dotenv import load_dotenv
-from openai import OpenAI
+from services.llm_executor import get_llm_client
 
 load_dotenv()
 
-_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+_client = get_llm_client()
 
 _MODEL = "gpt-5.6-luna"
 
@@ -77,7 +77,7 @@ existing STEP 5A topic-broadcast PRIORITY dict in event_scheduler.py
 serves an unrelated purpose (global topic ordering, not personalized
 push selection) and is not reused here. Transit is uniformly Tier 1
 because the existing house-eligibility filter ([1,4,7,8,10,12] in
-services/personalization_engine.py::get_users_for_transit(), unmodified)
+services/personalization_engine.py::house_by_lagna(), unmodified)
 already gates "important" before a candidate ever reaches this module.
 Panchak is uniformly Tier 2 because notification_builder.py's own
 first-day-only gating (unmodified) already means every Panchak candidate
@@ -0,0 +1,499 @@
+"""
+services/cards_cache.py
+----------------------------------------------
+Location-bucketed cache in front of /api/cards.
+
+WHY: routes/routes_cards.get_cards ran panchang_engine.today_and_tomorrow
+(two full calculate_panchang() runs -- sunrise, tithi transitions, lunar
+month...) plus an AstroEvent query and generate_cards() on EVERY request,
+and the whole morning most of those requests come from the same few
+cities. The panchang pair -- by far the expensive part -- is a function
+of (day, place, language) alone, so one computation per place per day
+is enough.
+
+KEY: (IST date, lat/lng snapped to a grid, language).
+  - CARDS_CACHE_GRID_DEGREES (default 0.1, ~11 km) is the grid; every
+    request in a cell is served the bundle computed AT THE CELL CENTRE,
+    so what a user sees never depends on who filled the entry. 0.1
+    degrees moves sunrise/sunset by well under a minute.
+  - The date is today in IST (the app's timezone for every "today"
+    decision -- see services/relative_day.py), not the server clock.
+
+ENTRY: the panchang pair {"selected_date", "next_date"}, computed at
+the cell centre, so a hit never touches the ephemeris. The day's events
+are NOT part of it: astro_events is rewritten after the warm job (the
+06:00 IST run_daily_event_job), so get_bundle() reads them through
+services/event_calendar.py::events_on() -- cached per process and
+checked against astro_event_calendar_version on every lookup -- and
+runs generate_cards() (in-memory work) per request on top of the two.
+
+EVICTION: an entry expires at the next IST midnight, whatever time it
+was written. Expired entries are never served and are deleted on the
+next write; the warm job also purges them. The store is capped at
+CARDS_CACHE_MAX_ENTRIES (default 20,000), oldest first.
+
+WARMING: run_cards_cache_warm_job() fills the entries for
+WARM_CITIES (or CARDS_CACHE_WARM_CITIES) just after the IST rollover,
+before the 6:00 IST morning notification sends everyone to the app --
+.github/workflows/cards_cache_warm.yml. It only helps the web workers
+with the shared "postgres" store.
+
+STORES (CARDS_CACHE_BACKEND): "postgres" (default) -- the `cards_cache`
+table (models.CardsCacheEntry) on its own connection
+(db.engine.begin()), never db.session; "memory" -- per-process, for
+local development and tests; "off" -- every request computes.
+
+FAIL-OPEN, like services/llm_response_cache.py: a store error is
+counted in `errors`, logged, and the request is answered from a fresh
+computation. Concurrent misses for one key in a process are single-
+flight: one computes, the rest wait for its bundle.
+
+Counters: stats() -- served at /admin/api/metrics/cards-cache.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+DEFAULT_GRID_DEGREES = 0.1
+DEFAULT_MAX_ENTRIES = 20_000
+
+IST_OFFSET = timedelta(hours=5, minutes=30)
+
+LANGUAGES = ("en", "hi")
+SLOTS = ("morning", "evening")
+
+# (name, lat, lng) -- the cities most card requests come from.
+WARM_CITIES: Tuple[Tuple[str, float, float], ...] = (
+    ("Delhi", 28.6139, 77.2090),
+    ("Mumbai", 19.0760, 72.8777),
+    ("Bengaluru", 12.9716, 77.5946),
+    ("Kolkata", 22.5726, 88.3639),
+    ("Chennai", 13.0827, 80.2707),
+    ("Hyderabad", 17.3850, 78.4867),
+    ("Pune", 18.5204, 73.8567),
+    ("Ahmedabad", 23.0225, 72.5714),
+    ("Jaipur", 26.9124, 75.7873),
+    ("Lucknow", 26.8467, 80.9462),
+    ("Patna", 25.5941, 85.1376),
+    ("Varanasi", 25.3176, 82.9739),
+    ("Indore", 22.7196, 75.8577),
+    ("Bhopal", 23.2599, 77.4126),
+    ("Chandigarh", 30.7333, 76.7794),
+)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def ist_today(now_utc: datetime) -> date:
+    return (now_utc + IST_OFFSET).date()
+
+
+def next_ist_midnight_utc(now_utc: datetime) -> datetime:
+    """The next IST date rollover, as naive UTC (the stores' clock)."""
+    return datetime.combine(ist_today(now_utc) + timedelta(days=1), datetime.min.time()) - IST_OFFSET
+
+
+def grid_point(lat: float, lng: float, grid_degrees: float) -> Tuple[float, float]:
+    """Centre of the grid cell holding (lat, lng); grid <= 0 keeps the
+    point itself (to 4 decimals)."""
+    if grid_degrees <= 0:
+        return round(lat, 4), round(lng, 4)
+    return (
+        round(round(lat / grid_degrees) * grid_degrees, 6),
+        round(round(lng / grid_degrees) * grid_degrees, 6),
+    )
+
+
+def cards_cache_key(day: date, lat: float, lng: float, language: str) -> str:
+    return f"{day.isoformat()}|{lat:.6f}|{lng:.6f}|{language}"
+
+
+def parse_warm_cities(raw: Optional[str]) -> Tuple[Tuple[str, float, float], ...]:
+    """CARDS_CACHE_WARM_CITIES="Delhi:28.61:77.21;Surat:21.17:72.83";
+    malformed items are skipped, an empty result means WARM_CITIES."""
+    cities = []
+    for item in (raw or "").split(";"):
+        parts = [p.strip() for p in item.split(":")]
+        if len(parts) != 3:
+            continue
+        try:
+            cities.append((parts[0], float(parts[1]), float(parts[2])))
+        except ValueError:
+            continue
+    return tuple(cities) or WARM_CITIES
+
+
+# ------------------------------------------------------------
+# Computation (the uncached /api/cards work)
+# ------------------------------------------------------------
+def build_panchang_pair(day: date, lat: float, lng: float, language: str = "en") -> Dict[str, Any]:
+    """The cached part: `day` and the next day's panchang."""
+    from services.panchang_engine import calculate_panchang
+
+    return {
+        "selected_date": calculate_panchang(day, lat, lng, language),
+        "next_date": calculate_panchang(day + timedelta(days=1), lat, lng, language),
+    }
+
+
+def build_cards_bundle(day: date, panchang: Dict[str, Any], slot: str = "morning") -> Dict[str, Any]:
+    """The per-request part: the day's events (event_calendar's
+    version-checked cache) and the cards generated from both."""
+    from services.card_service import generate_cards
+    from services.event_calendar import events_on
+
+    events = [
+        {"type": e.type, "name": e.name, "meta": e.meta or {}}
+        for e in events_on(day)
+    ]
+    return {
+        "panchang": panchang,
+        "events": events,
+        "cards": generate_cards(panchang, events, slot=slot),
+    }
+
+
+@dataclass
+class CardsCacheStats:
+    backend: str
+    hits: int
+    misses: int
+    stores: int
+    evictions: int
+    errors: int
+    # hits / (hits + misses) for THIS process; None before any lookup.
+    hit_rate: Optional[float]
+    # Store-wide entry count (every worker), None if unreachable.
+    entries: Optional[int]
+    grid_degrees: float
+    max_entries: int
+
+
+# ------------------------------------------------------------
+# Stores -- get() / put() / purge() / size()
+# ------------------------------------------------------------
+class InMemoryCardsCacheStore:
+    name = "memory"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def get(self, key: str, now: datetime) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry["expires_at"] <= now:
+                del self._entries[key]
+                return None
+            entry["hit_count"] += 1
+            return entry["payload"]
+
+    def put(self, key: str, row: Dict[str, Any], now: datetime, max_entries: int) -> int:
+        with self._lock:
+            self._entries[key] = dict(row)
+            self._entries.move_to_end(key)
+            evicted = self._purge_locked(now)
+            while len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+            return evicted
+
+    def purge(self, now: datetime) -> int:
+        with self._lock:
+            return self._purge_locked(now)
+
+    def _purge_locked(self, now: datetime) -> int:
+        stale = [k for k, e in self._entries.items() if e["expires_at"] <= now]
+        for k in stale:
+            del self._entries[k]
+        return len(stale)
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class PostgresCardsCacheStore:
+    name = "postgres"
+
+    def _table(self):
+        from models import CardsCacheEntry
+
+        return CardsCacheEntry.__table__
+
+    def _engine(self):
+        from extensions import db
+
+        return db.engine
+
+    def get(self, key: str, now: datetime) -> Optional[Dict[str, Any]]:
+        from sqlalchemy import update
+
+        table = self._table()
+        statement = (
+            update(table)
+            .where(table.c.cache_key == key, table.c.expires_at > now)
+            .values(hit_count=table.c.hit_count + 1)
+            .returning(table.c.payload)
+        )
+        with self._engine().begin() as conn:
+            row = conn.execute(statement).first()
+        return None if row is None else row.payload
+
+    def put(self, key: str, row: Dict[str, Any], now: datetime, max_entries: int) -> int:
+        from sqlalchemy import delete, select
+        from sqlalchemy.dialects.postgresql import insert
+
+        table = self._table()
+        upsert = insert(table).values(**dict(row, cache_key=key))
+        upsert = upsert.on_conflict_do_update(
+            index_elements=[table.c.cache_key],
+            set_={
+                "payload": upsert.excluded.payload,
+                "created_at": upsert.excluded.created_at,
+                "expires_at": upsert.excluded.expires_at,
+            },
+        )
+        overflow = (
+            select(table.c.cache_key)
+            .order_by(table.c.created_at.desc())
+            .offset(max_entries)
+            .scalar_subquery()
+        )
+        with self._engine().begin() as conn:
+            conn.execute(upsert)
+            evicted = conn.execute(delete(table).where(table.c.expires_at <= now)).rowcount
+            evicted += conn.execute(delete(table).where(table.c.cache_key.in_(overflow))).rowcount
+        return evicted
+
+    def purge(self, now: datetime) -> int:
+        from sqlalchemy import delete
+
+        table = self._table()
+        with self._engine().begin() as conn:
+            return conn.execute(delete(table).where(table.c.expires_at <= now)).rowcount
+
+    def size(self) -> int:
+        from sqlalchemy import func, select
+
+        table = self._table()
+        with self._engine().connect() as conn:
+            return conn.execute(select(func.count()).select_from(table)).scalar_one()
+
+
+def default_store():
+    backend = os.getenv("CARDS_CACHE_BACKEND", "postgres").lower()
+    if backend == "off":
+        return None
+    if backend == "memory":
+        return InMemoryCardsCacheStore()
+    return PostgresCardsCacheStore()
+
+
+# ------------------------------------------------------------
+# Cache
+# ------------------------------------------------------------
+class CardsCache:
+    def __init__(
+        self,
+        store=None,
+        *,
+        grid_degrees: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        now_fn: Optional[Callable[[], datetime]] = None,
+        build_fn: Optional[Callable[..., Dict[str, Any]]] = None,
+    ):
+        # `store=None` means disabled -- use default_store() (or
+        # get_cards_cache()) for the env-configured one. `build_fn`
+        # computes the cached panchang pair (build_panchang_pair).
+        self.store = store
+        self.grid_degrees = (
+            grid_degrees if grid_degrees is not None
+            else _env_float("CARDS_CACHE_GRID_DEGREES", DEFAULT_GRID_DEGREES)
+        )
+        self.max_entries = max(1, max_entries or _env_int("CARDS_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+        self._now = now_fn or datetime.utcnow
+        self._build = build_fn or build_panchang_pair
+
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.errors = 0
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def today(self) -> date:
+        return ist_today(self._now())
+
+    def _lookup(self, key: str, now: datetime) -> Optional[Dict[str, Any]]:
+        try:
+            return self.store.get(key, now)
+        except Exception as exc:
+            self._count("errors")
+            print(f"[CardsCache] ⚠️ lookup failed, computing instead: {exc}")
+            return None
+
+    def _save(self, key: str, day: date, lat: float, lng: float, language: str,
+              panchang: Dict[str, Any], now: datetime) -> None:
+        row = {
+            "day": day,
+            "lat": lat,
+            "lng": lng,
+            "language": language,
+            "payload": panchang,
+            "created_at": now,
+            "expires_at": next_ist_midnight_utc(now),
+            "hit_count": 0,
+        }
+        try:
+            evicted = self.store.put(key, row, now, self.max_entries)
+        except Exception as exc:
+            self._count("errors")
+            print(f"[CardsCache] ⚠️ store failed (panchang still returned): {exc}")
+            return
+        self._count("stores")
+        self._count("evictions", evicted)
+
+    def get_panchang(self, lat: float, lng: float, language: str = "en") -> Tuple[Dict[str, Any], bool]:
+        """(panchang pair, hit) for today (IST) at the grid cell holding
+        (lat, lng)."""
+        return self._panchang(ist_today(self._now()), lat, lng, language)
+
+    def _panchang(self, day: date, lat: float, lng: float, language: str) -> Tuple[Dict[str, Any], bool]:
+        # Exceptions from the computation propagate and nothing is stored.
+        cell_lat, cell_lng = grid_point(lat, lng, self.grid_degrees)
+
+        if self.store is None:
+            return self._build(day, cell_lat, cell_lng, language), False
+
+        key = cards_cache_key(day, cell_lat, cell_lng, language)
+        cached = self._lookup(key, self._now())
+        if cached is not None:
+            self._count("hits")
+            return cached, True
+
+        with self._lock:
+            gate = self._inflight.setdefault(key, threading.Lock())
+        with gate:
+            # another request may have filled it while we waited
+            cached = self._lookup(key, self._now())
+            if cached is not None:
+                self._count("hits")
+                return cached, True
+            self._count("misses")
+            try:
+                panchang = self._build(day, cell_lat, cell_lng, language)
+                self._save(key, day, cell_lat, cell_lng, language, panchang, self._now())
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+        return panchang, False
+
+    def get_bundle(self, lat: float, lng: float, language: str = "en", slot: str = "morning") -> Tuple[Dict[str, Any], bool]:
+        """(bundle, hit) for today (IST): the cached panchang pair plus
+        the day's events and cards, built per request. `hit` refers to
+        the panchang pair."""
+        day = ist_today(self._now())
+        panchang, hit = self._panchang(day, lat, lng, language)
+        return build_cards_bundle(day, panchang, slot), hit
+
+    def warm(
+        self,
+        cities: Optional[Iterable[Tuple[str, float, float]]] = None,
+        *,
+        languages: Iterable[str] = ("en",),
+    ) -> Dict[str, Any]:
+        """Fill today's entries for every city x language; one failing
+        city never stops the others."""
+        summary = {"day": self.today().isoformat(), "warmed": 0, "already_cached": 0, "failed": 0, "purged": 0}
+        if self.store is None:
+            return summary
+        try:
+            summary["purged"] = self.store.purge(self._now())
+        except Exception as exc:
+            self._count("errors")
+            print(f"[CardsCache] ⚠️ purge failed: {exc}")
+
+        for name, lat, lng in cities or WARM_CITIES:
+            for language in languages:
+                try:
+                    _, hit = self.get_panchang(lat, lng, language)
+                except Exception as exc:
+                    summary["failed"] += 1
+                    print(f"[CardsCache] ⚠️ warm failed for {name} ({language}): {exc}")
+                    continue
+                summary["already_cached" if hit else "warmed"] += 1
+        return summary
+
+    def stats(self) -> CardsCacheStats:
+        entries = None
+        if self.store is not None:
+            try:
+                entries = self.store.size()
+            except Exception as exc:
+                print(f"[CardsCache] ⚠️ could not read store-wide stats: {exc}")
+        with self._lock:
+            lookups = self.hits + self.misses
+            return CardsCacheStats(
+                backend=self.store.name if self.store is not None else "off",
+                hits=self.hits,
+                misses=self.misses,
+                stores=self.stores,
+                evictions=self.evictions,
+                errors=self.errors,
+                hit_rate=round(self.hits / lookups, 4) if lookups else None,
+                entries=entries,
+                grid_degrees=self.grid_degrees,
+                max_entries=self.max_entries,
+            )
+
+
+_cache: Optional[CardsCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_cards_cache() -> CardsCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = CardsCache(default_store())
+    return _cache
+
+
+def run_cards_cache_warm_job(cache: Optional[CardsCache] = None) -> Dict[str, Any]:
+    """Cron entry point (.github/workflows/cards_cache_warm.yml); needs
+    an app context."""
+    cache = cache or get_cards_cache()
+    languages = [l for l in os.getenv("CARDS_CACHE_WARM_LANGUAGES", "en,hi").split(",") if l.strip() in LANGUAGES]
+    summary = cache.warm(
+        parse_warm_cities(os.getenv("CARDS_CACHE_WARM_CITIES")),
+        languages=[l.strip() for l in languages] or ["en"],
+    )
+    print(f"[CardsCache] warm summary: {summary}")
+    return summary
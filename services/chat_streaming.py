@@ -0,0 +1,142 @@
+"""
+services/chat_streaming.py
+----------------------------------------------
+Streaming delivery for the chat endpoints (routes/routes_chat.py
+/api/chat/free + /api/chat/pack, routes/routes_smartchat.py
+/api/smartchat).
+
+WHY: those endpoints used to block until chat_engine()/run_smartchat()
+had the FULL completion, so the app showed nothing for the whole LLM
+latency (many seconds). In streaming mode the answer is forwarded token
+by token as server-sent events while OpenAI is still writing it.
+
+OPT-IN, per request: `"stream": true` in the JSON body, `?stream=1`, or
+`Accept: text/event-stream` (see wants_stream()). Without it every
+endpoint returns exactly the same JSON as before.
+
+WIRE FORMAT (text/event-stream):
+
+    event: token
+    data: {"text": "<next piece of the answer>"}
+
+    ...
+
+    event: done
+    data: <the endpoint's usual JSON response body>
+
+or, if the LLM fails part-way, a single terminal
+
+    event: error
+    data: {"success": false, "message": "..."}
+
+Post-processing (strip / SmartChat's clean_answer) runs incrementally
+on the token stream, so the concatenated `token` texts equal the final
+`answer` the non-streaming endpoint would have returned for the same
+completion.
+
+QUOTA: the endpoint reserves the question BEFORE the LLM call (so
+parallel requests cannot all pass a read-only check) and hands
+stream_completion() an `on_abort` that refunds it. on_abort runs when
+the answer is not delivered in full: the LLM call fails, building the
+final body fails, or the client disconnects mid-answer. `on_complete`
+builds the final `done` body once the last token arrived.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from flask import Response, request, stream_with_context
+
+
+def wants_stream(data: Dict[str, Any]) -> bool:
+    if data.get("stream") is True:
+        return True
+    if request.args.get("stream") in ("1", "true"):
+        return True
+    return "text/event-stream" in (request.headers.get("Accept") or "")
+
+
+def sse_event(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def completion_deltas(chunks: Iterable[Any]) -> Iterator[str]:
+    """Text deltas from an OpenAI-shaped chunk stream
+    (client.chat.completions.create(stream=True, ...))."""
+    for chunk in chunks:
+        choices = getattr(chunk, "choices", None) or []
+        if choices:
+            piece = getattr(choices[0].delta, "content", None)
+            if piece:
+                yield piece
+
+
+def strip_stream(deltas: Iterable[str]) -> Iterator[str]:
+    """Streaming equivalent of "".join(deltas).strip(): leading
+    whitespace is dropped, trailing whitespace is held back until
+    something non-blank follows it."""
+    started = False
+    pending = ""
+    for piece in deltas:
+        if not started:
+            piece = piece.lstrip()
+            if not piece:
+                continue
+            started = True
+        body = piece.rstrip()
+        if body:
+            yield pending + body
+            pending = piece[len(body):]
+        else:
+            pending += piece
+
+
+def stream_completion(
+    deltas: Iterable[str],
+    *,
+    on_complete: Callable[[str], Dict[str, Any]],
+    on_abort: Optional[Callable[[], None]] = None,
+) -> Iterator[str]:
+    """SSE body: a `token` event per delta, then `done` carrying
+    on_complete(full_answer) -- or `error` if the stream fails. on_abort
+    (the quota refund) runs whenever on_complete did not return: the
+    stream or on_complete raised, or the client disconnected."""
+    parts = []
+    completed = False
+    try:
+        for piece in deltas:
+            parts.append(piece)
+            yield sse_event("token", {"text": piece})
+        final = on_complete("".join(parts))
+        completed = True
+    except Exception as exc:
+        print(f"[ChatStream] ❌ stream failed: {exc}")
+        yield sse_event("error", {"success": False, "message": f"AI temporarily unavailable. Error: {exc}"})
+        return
+    finally:
+        # Client disconnect closes this generator; propagate that to the
+        # upstream LLM stream so it is cancelled, not read to the end.
+        close = getattr(deltas, "close", None)
+        if close is not None:
+            close()
+        if not completed and on_abort is not None:
+            try:
+                on_abort()
+            except Exception as refund_error:
+                print(f"[ChatStream] ⚠️ quota refund failed: {refund_error}")
+    yield sse_event("done", final)
+
+
+def sse_response(events: Iterable[str]) -> Response:
+    return Response(
+        stream_with_context(events),
+        mimetype="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # nginx / Render proxies buffer responses by default, which
+            # would hold every token back until the end.
+            "X-Accel-Buffering": "no",
+        },
+    )
@@ -1,46 +1,323 @@
-from modules.models_user import AppUser, UserDashaTimeline
-from full_kundali_api import calculate_vimshottari_dasha, get_moon_longitude_lahiri
-from datetime import datetime
+"""
+services/dasha_db_filler.py
+----------------------------------------------
+Vimshottari timeline backfill for `user_dasha_timeline` (the rows the
+dasha notifications in services/personalization_engine.py select on).
+
+WHY: fill_dasha_for_all_users() loaded AppUser.query.all(), ran one
+exists-query per user, computed every timeline serially and added 81
+ORM rows per user to one session with a single commit at the very end
+-- all in memory, nothing saved if anything went wrong late.
+
+NOW (run_dasha_backfill):
+  - users WITHOUT a timeline are streamed in keyset pages (id > last
+    id) by one anti-join query per page (NOT EXISTS on
+    ix_user_dasha_timeline_user_id) -- only id/dob/tob/lat/lng, never
+    ORM users;
+  - each page's timelines are computed in a process pool
+    (DASHA_BACKFILL_WORKERS, default 4; <= 1 computes inline) -- the
+    Moon longitude is a Swiss Ephemeris call, CPU-bound. The pool uses
+    the "spawn" start method, like modules/alerts/alerts_scheduler.py,
+    so no worker inherits the parent's Postgres connections (including
+    the advisory-lock one) whatever the platform default is; workers
+    only compute, they never open a connection;
+  - each page is written with COPY into a temp staging table and moved
+    with one INSERT ... SELECT ... WHERE NOT EXISTS, in its own
+    transaction. A user that got a timeline meanwhile (a kundali
+    request, save_dasha_to_db) is skipped, never duplicated.
+
+RESUMABLE: every page commits on its own and the selection is "users
+with no timeline", so an interrupted run simply continues where it
+stopped when re-run. `start_after_id` / `max_users` let a run cover one
+slice; the summary's `last_user_id` is where the next slice starts. A
+user whose birth data can't be computed is counted in `failed` and
+retried by the next run.
+
+One run at a time (Postgres advisory lock, same mechanism as
+modules/ai_report_engine/pregeneration_scheduler.py). Every page prints
+its throughput; the summary has users/s and rows/s for the run.
+"""
+
+import csv
+import io
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+
+from sqlalchemy import and_, exists, insert, select, text
+
 from extensions import db
+from modules.models_user import AppUser, UserDashaTimeline
+from services.dasha_timeline import DashaTimeline
 
+DEFAULT_WORKERS = 4
+DEFAULT_PAGE_SIZE = 2000
+
+# Dedicated advisory lock key for this job (alerts_scheduler.py uses
+# class 84331; 84332 was the report pre-generation job's, before it
+# switched to per-row claims).
+_ADVISORY_LOCK_CLASS_ID = 84333
+_ADVISORY_LOCK_OBJECT_ID = 1
+
+_TIMELINE_COLUMNS = ("user_id", "mahadasha", "antardasha", "start_date", "end_date")
+
+
+def _env_int(name, default):
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+@dataclass
+class DashaBackfillSummary:
+    users_scanned: int = 0
+    users_written: int = 0
+    # got a timeline from elsewhere between the page query and the write
+    users_already_filled: int = 0
+    failed: int = 0
+    rows_written: int = 0
+    pages: int = 0
+    last_user_id: int = 0
+    duration_seconds: float = 0.0
+    lock_acquired: bool = False
+
+    def to_dict(self) -> dict:
+        elapsed = self.duration_seconds or 0.0
+        return {
+            "users_scanned": self.users_scanned,
+            "users_written": self.users_written,
+            "users_already_filled": self.users_already_filled,
+            "failed": self.failed,
+            "rows_written": self.rows_written,
+            "pages": self.pages,
+            "last_user_id": self.last_user_id,
+            "duration_seconds": round(elapsed, 3),
+            "users_per_second": round(self.users_written / elapsed, 1) if elapsed else None,
+            "rows_per_second": round(self.rows_written / elapsed, 1) if elapsed else None,
+            "lock_acquired": self.lock_acquired,
+        }
+
+
+# ------------------------------------------------------------
+# Timeline computation (runs in worker processes)
+# ------------------------------------------------------------
+def timeline_rows(mahadashas):
+    """(mahadasha, antardasha, start, end) for every antardasha of a
+    calculate_vimshottari_dasha() result; dates as "YYYY-MM-DD"."""
+    return [
+        (md["mahadasha"], ad["planet"], ad["start"], ad["end"])
+        for md in mahadashas
+        for ad in md["antardashas"]
+    ]
+
+
+def compute_timeline(user):
+    """(user_id, rows, error) for one (id, dob, tob, lat, lng) tuple."""
+    from full_kundali_api import get_moon_longitude_lahiri
+
+    user_id, dob, tob, lat, lng = user
+    try:
+        moon_deg = get_moon_longitude_lahiri(dob, tob, lat, lng)
+        birth_date = datetime.strptime(f"{dob} {tob}", "%Y-%m-%d %H:%M")
+        # rows straight from the timeline arrays, no 9 x 9 dict table
+        return user_id, DashaTimeline.from_moon(moon_deg, birth_date).rows(), None
+    except Exception as exc:
+        return user_id, None, f"{type(exc).__name__}: {exc}"
 
-def fill_dasha_for_all_users():
-    users = AppUser.query.all()
 
-    for user in users:
-        if not user.dob or not user.tob or not user.lat or not user.lng:
-            continue
+# ------------------------------------------------------------
+# Selection
+# ------------------------------------------------------------
+def users_missing_timeline(after_id, limit):
+    """Next page (ordered by id) of users with birth data and no
+    timeline rows -- one anti-join query."""
+    has_timeline = exists().where(UserDashaTimeline.user_id == AppUser.id)
+    statement = (
+        select(AppUser.id, AppUser.dob, AppUser.tob, AppUser.lat, AppUser.lng)
+        .where(
+            AppUser.id > after_id,
+            and_(AppUser.dob.isnot(None), AppUser.dob != ""),
+            and_(AppUser.tob.isnot(None), AppUser.tob != ""),
+            and_(AppUser.lat.isnot(None), AppUser.lat != 0),
+            and_(AppUser.lng.isnot(None), AppUser.lng != 0),
+            ~has_timeline,
+        )
+        .order_by(AppUser.id)
+        .limit(limit)
+    )
+    return [tuple(row) for row in db.session.execute(statement)]
 
-        # skip if already exists
-        exists = UserDashaTimeline.query.filter_by(user_id=user.id).first()
-        if exists:
-            continue
 
+# ------------------------------------------------------------
+# Writing
+# ------------------------------------------------------------
+def copy_timelines(timelines, created_at=None):
+    """
+    Writes {user_id: rows} with COPY, in one transaction of its own.
+    Users that already have timeline rows by then are left alone.
+    Returns (users_written, rows_written).
+    """
+    if not timelines:
+        return 0, 0
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for user_id, rows in timelines.items():
+        for mahadasha, antardasha, start, end in rows:
+            writer.writerow((user_id, mahadasha, antardasha, start, end))
+    buffer.seek(0)
+
+    columns = ", ".join(_TIMELINE_COLUMNS)
+    with db.engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TEMP TABLE dasha_backfill_staging "
+            "(user_id integer, mahadasha varchar(20), antardasha varchar(20), start_date date, end_date date) "
+            "ON COMMIT DROP"
+        ))
+        cursor = conn.connection.dbapi_connection.cursor()
         try:
-            moon_deg = get_moon_longitude_lahiri(
-                user.dob, user.tob, user.lat, user.lng
+            cursor.copy_expert(f"COPY dasha_backfill_staging ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+        finally:
+            cursor.close()
+        written = conn.execute(
+            text(
+                f"INSERT INTO user_dasha_timeline ({columns}, created_at) "
+                f"SELECT {columns}, :created_at FROM dasha_backfill_staging s "
+                "WHERE NOT EXISTS (SELECT 1 FROM user_dasha_timeline t WHERE t.user_id = s.user_id) "
+                "RETURNING user_id"
+            ),
+            {"created_at": created_at or datetime.now(timezone.utc)},
+        ).scalars().all()
+    return len(set(written)), len(written)
+
+
+def insert_dasha_timeline(user_id, mahadashas):
+    """
+    Per-request write (full_kundali_api.save_dasha_to_db): one existence
+    check and one multi-row INSERT in the caller's session instead of 81
+    ORM objects. No-op if the user already has a timeline.
+    """
+    if db.session.query(exists().where(UserDashaTimeline.user_id == user_id)).scalar():
+        return 0
+
+    created_at = datetime.now(timezone.utc)
+    rows = [
+        {
+            "user_id": user_id,
+            "mahadasha": mahadasha,
+            "antardasha": antardasha,
+            "start_date": date.fromisoformat(start),
+            "end_date": date.fromisoformat(end),
+            "created_at": created_at,
+        }
+        for mahadasha, antardasha, start, end in timeline_rows(mahadashas)
+    ]
+    db.session.execute(insert(UserDashaTimeline), rows)
+    db.session.commit()
+    return len(rows)
+
+
+# ------------------------------------------------------------
+# Backfill
+# ------------------------------------------------------------
+def run_dasha_backfill(*, workers=None, page_size=None, start_after_id=0, max_users=None):
+    """
+    The backfill's entry point; must be called inside an app context.
+    Safe to re-run at any time -- see the module docstring.
+    """
+    started = time.monotonic()
+    workers = workers if workers is not None else _env_int("DASHA_BACKFILL_WORKERS", DEFAULT_WORKERS)
+    page_size = max(1, page_size or _env_int("DASHA_BACKFILL_PAGE_SIZE", DEFAULT_PAGE_SIZE))
+    summary = DashaBackfillSummary(last_user_id=start_after_id)
+
+    lock_conn = db.engine.connect()
+    pool = None
+    try:
+        summary.lock_acquired = bool(lock_conn.execute(
+            text("SELECT pg_try_advisory_lock(:classid, :objid)"),
+            {"classid": _ADVISORY_LOCK_CLASS_ID, "objid": _ADVISORY_LOCK_OBJECT_ID},
+        ).scalar())
+        if not summary.lock_acquired:
+            print("[DashaBackfill] another execution is already in progress -- skipping this run.")
+            return summary
+
+        if workers > 1:
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
             )
 
-            birth_date = datetime.strptime(
-                f"{user.dob} {user.tob}", "%Y-%m-%d %H:%M"
+        while max_users is None or summary.users_scanned < max_users:
+            limit = page_size if max_users is None else min(page_size, max_users - summary.users_scanned)
+            page = users_missing_timeline(summary.last_user_id, limit)
+            # don't hold the read transaction open while computing
+            db.session.commit()
+            if not page:
+                break
+
+            page_started = time.monotonic()
+            if pool is not None:
+                results = list(pool.map(compute_timeline, page, chunksize=max(1, len(page) // (workers * 4))))
+            else:
+                results = [compute_timeline(user) for user in page]
+
+            timelines = {}
+            for user_id, rows, error in results:
+                if error:
+                    summary.failed += 1
+                    print(f"❌ Error for user {user_id}: {error}")
+                else:
+                    timelines[user_id] = rows
+
+            users_written, rows_written = copy_timelines(timelines)
+
+            summary.pages += 1
+            summary.users_scanned += len(page)
+            summary.users_written += users_written
+            summary.users_already_filled += len(timelines) - users_written
+            summary.rows_written += rows_written
+            summary.last_user_id = page[-1][0]
+
+            page_seconds = time.monotonic() - page_started
+            print(
+                f"[DashaBackfill] page {summary.pages}: {users_written} users / {rows_written} rows "
+                f"in {page_seconds:.2f}s ({users_written / page_seconds if page_seconds else 0:.0f} users/s), "
+                f"last_user_id={summary.last_user_id}"
+            )
+
+        summary.duration_seconds = time.monotonic() - started
+        print(f"[DashaBackfill] {summary.to_dict()}")
+        return summary
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        if summary.lock_acquired:
+            lock_conn.execute(
+                text("SELECT pg_advisory_unlock(:classid, :objid)"),
+                {"classid": _ADVISORY_LOCK_CLASS_ID, "objid": _ADVISORY_LOCK_OBJECT_ID},
             )
+        lock_conn.close()
+        summary.duration_seconds = time.monotonic() - started
 
-            mahadashas = calculate_vimshottari_dasha(moon_deg, birth_date)
 
-            # 🔥 store ALL mahadasha + antardasha
-            for md in mahadashas:
-                for ad in md["antardashas"]:
-                    row = UserDashaTimeline(
-                        user_id=user.id,
-                        mahadasha=md["mahadasha"],
-                        antardasha=ad["planet"],
-                        start_date=datetime.strptime(ad["start"], "%Y-%m-%d").date(),
-                        end_date=datetime.strptime(ad["end"], "%Y-%m-%d").date(),
-                    )
-                    db.session.add(row)
+def fill_dasha_for_all_users():
+    summary = run_dasha_backfill()
+    print("✅ All users dasha stored")
+    return summary
 
-        except Exception as e:
-            print(f"❌ Error for user {user.id}: {e}")
 
-    db.session.commit()
-    print("✅ All users dasha stored")
\ No newline at end of file
+# 🔥 ENTRY POINT -- python -m services.dasha_db_filler
+if __name__ == "__main__":
+    from factory import create_app
+
+    app = create_app()
+
+    with app.app_context():
+        run_dasha_backfill(
+            start_after_id=_env_int("DASHA_BACKFILL_START_AFTER_ID", 0),
+            max_users=_env_int("DASHA_BACKFILL_MAX_USERS", 0) or None,
+        )
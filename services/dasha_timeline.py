@@ -0,0 +1,266 @@
+# dasha_timeline.py
+"""
+Compact Vimshottari timeline with O(log n) lookups.
+
+full_kundali_api.calculate_vimshottari_dasha() used to be the only
+representation of a dasha timeline: 9 mahadasha dicts x 9 antardasha
+dicts, every date already strftime'd -- and get_current_dasha() then
+strptime'd all of them back, one by one, to find "today". Every
+calculate_full_kundali() call paid for both, and Ask Now scanned the
+dicts again to find the next antardasha.
+
+A Vimshottari timeline is fully determined by (Moon longitude, birth
+instant): the first lord and its elapsed fraction come from the Moon's
+nakshatra, every period after that is a fixed share of 120 years. So
+DashaTimeline keeps, per level, only
+
+    lords   index into DASHA_SEQUENCE per period
+    starts  period start, integer microseconds since 1970-01-01
+    ends    period end (exclusive), same unit
+
+    mahadasha     9 periods
+    antardasha    81 periods   (9 per mahadasha)
+    pratyantar    729 periods  (9 per antardasha, built on first use)
+
+and answers with bisect:
+
+    at(when, level)           the period containing instant `when`
+    next_change(when, level)  the first period starting after `when`
+    current_indices(day)      (maha, antar) the payload marks as current
+
+Dicts / strings are produced only when a payload needs them:
+to_mahadashas() (identical to the old calculate_vimshottari_dasha()
+output), period_dict(), rows() (the user_dasha_timeline rows).
+
+Boundaries are built with the same datetime + timedelta(days=...)
+steps the old code used, so every serialized date is identical. Times
+are naive, exactly like the birth datetime they start from.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional, Tuple
+
+DASHA_SEQUENCE = ['Ketu', 'Venus', 'Sun', 'Moon', 'Mars', 'Rahu', 'Jupiter', 'Saturn', 'Mercury']
+DASHA_YEARS = {
+    'Ketu': 7, 'Venus': 20, 'Sun': 6, 'Moon': 10,
+    'Mars': 7, 'Rahu': 18, 'Jupiter': 16, 'Saturn': 19, 'Mercury': 17
+}
+
+MAHADASHA = 0
+ANTARDASHA = 1
+PRATYANTAR = 2
+
+NAKSHATRA_SIZE = 13 + 1/3
+DAYS_PER_YEAR = 365.25
+CYCLE_YEARS = 120
+
+_YEARS = [DASHA_YEARS[lord] for lord in DASHA_SEQUENCE]
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_DAY_US = 86400 * 10**6
+_DATE_FORMAT = '%Y-%m-%d'
+
+
+def _to_us(dt: datetime) -> int:
+    return (dt - _EPOCH) // _MICROSECOND
+
+
+def _from_us(us: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=us)
+
+
+def _days_us(days: float) -> int:
+    # exactly the step `dt + timedelta(days=days)` takes
+    return timedelta(days=days) // _MICROSECOND
+
+
+def _format(us: int) -> str:
+    return _from_us(us).strftime(_DATE_FORMAT)
+
+
+@dataclass(frozen=True)
+class DashaPeriod:
+    """One period; `lords` runs from the mahadasha lord down to this
+    period's own lord. `end` is exclusive."""
+
+    level: int
+    index: int
+    lords: Tuple[str, ...]
+    start: datetime
+    end: datetime
+
+    @property
+    def lord(self) -> str:
+        return self.lords[-1]
+
+    def contains(self, dt: datetime) -> bool:
+        return self.start <= dt < self.end
+
+
+class _Level:
+    __slots__ = ("lords", "starts", "ends", "days")
+
+    def __init__(self):
+        self.lords: List[int] = []
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        # unrounded length in days, what the next level is split from
+        self.days: List[float] = []
+
+
+class DashaTimeline:
+    """Vimshottari timeline for one Moon longitude and birth instant."""
+
+    __slots__ = ("_levels",)
+
+    def __init__(self, first_lord: int, start: datetime):
+        maha = _Level()
+        antar = _Level()
+        md_start = start
+        for i in range(9):
+            lord = (first_lord + i) % 9
+            years = _YEARS[lord]
+            md_end = md_start + timedelta(days=years * DAYS_PER_YEAR)
+            maha.lords.append(lord)
+            maha.starts.append(_to_us(md_start))
+            maha.ends.append(_to_us(md_end))
+            maha.days.append(years * DAYS_PER_YEAR)
+
+            # calculate_antardashas(): chained from the mahadasha start,
+            # so the last end can differ from md_end by a microsecond
+            ant_start = maha.starts[-1]
+            for j in range(9):
+                antar_lord = (lord + j) % 9
+                antar_days = (years * _YEARS[antar_lord] * DAYS_PER_YEAR) / CYCLE_YEARS
+                ant_end = ant_start + _days_us(antar_days)
+                antar.lords.append(antar_lord)
+                antar.starts.append(ant_start)
+                antar.ends.append(ant_end)
+                antar.days.append(antar_days)
+                ant_start = ant_end
+            md_start = md_end
+        self._levels = [maha, antar, None]
+
+    @classmethod
+    def from_moon(cls, moon_deg: float, birth_date: datetime) -> "DashaTimeline":
+        """Same inputs as full_kundali_api.calculate_vimshottari_dasha()."""
+        nakshatra_index = int(moon_deg // NAKSHATRA_SIZE)
+        first_lord = nakshatra_index % 9
+        fraction_passed = (moon_deg % NAKSHATRA_SIZE) / NAKSHATRA_SIZE
+        elapsed_days = fraction_passed * _YEARS[first_lord] * DAYS_PER_YEAR
+        return cls(first_lord, birth_date - timedelta(days=elapsed_days))
+
+    # -------------------------------------------------
+    # Levels
+    # -------------------------------------------------
+    def _level(self, level: int) -> _Level:
+        if level == PRATYANTAR and self._levels[PRATYANTAR] is None:
+            self._levels[PRATYANTAR] = self._build_pratyantar()
+        return self._levels[level]
+
+    def _build_pratyantar(self) -> _Level:
+        antar = self._levels[ANTARDASHA]
+        pratyantar = _Level()
+        for lord, start, days in zip(antar.lords, antar.starts, antar.days):
+            for k in range(9):
+                p_lord = (lord + k) % 9
+                p_days = days * _YEARS[p_lord] / CYCLE_YEARS
+                end = start + _days_us(p_days)
+                pratyantar.lords.append(p_lord)
+                pratyantar.starts.append(start)
+                pratyantar.ends.append(end)
+                pratyantar.days.append(p_days)
+                start = end
+        return pratyantar
+
+    def period(self, level: int, index: int) -> DashaPeriod:
+        data = self._level(level)
+        lords = []
+        i = index
+        # 9 children per period, so the parent index is index // 9
+        for parent in range(level, MAHADASHA - 1, -1):
+            lords.append(DASHA_SEQUENCE[self._level(parent).lords[i]])
+            i //= 9
+        return DashaPeriod(
+            level=level,
+            index=index,
+            lords=tuple(reversed(lords)),
+            start=_from_us(data.starts[index]),
+            end=_from_us(data.ends[index]),
+        )
+
+    # -------------------------------------------------
+    # Queries
+    # -------------------------------------------------
+    def at(self, when: datetime, level: int = ANTARDASHA) -> Optional[DashaPeriod]:
+        """The period containing `when`; None outside the 120 years."""
+        data = self._level(level)
+        t = _to_us(when)
+        i = bisect_right(data.starts, t) - 1
+        if i < 0 or t >= data.ends[-1]:
+            return None
+        return self.period(level, i)
+
+    def next_change(self, when: datetime, level: int = ANTARDASHA) -> Optional[DashaPeriod]:
+        """The first period (at `level`) starting strictly after `when`."""
+        data = self._level(level)
+        i = bisect_right(data.starts, _to_us(when))
+        if i >= len(data.starts):
+            return None
+        return self.period(level, i)
+
+    def current_indices(self, day: date) -> Tuple[int, int]:
+        """
+        (mahadasha index, antardasha index) of the periods the payload
+        marks as current on `day` -- what get_current_dasha() finds by
+        parsing: the first period with start date <= day <= end date
+        (both ends inclusive, as printed), else the first one.
+        """
+        midnight = _to_us(datetime.combine(day, time()))
+        next_midnight = midnight + _DAY_US
+
+        maha = self._levels[MAHADASHA]
+        m = bisect_left(maha.ends, midnight)
+        if m >= 9 or maha.starts[m] >= next_midnight:
+            m = 0
+
+        antar = self._levels[ANTARDASHA]
+        a = bisect_left(antar.ends, midnight, 9 * m, 9 * m + 9)
+        if a >= 9 * m + 9 or antar.starts[a] >= next_midnight:
+            a = 9 * m
+        return m, a
+
+    # -------------------------------------------------
+    # Serialization (only when a payload needs it)
+    # -------------------------------------------------
+    def period_dict(self, level: int, index: int) -> dict:
+        """One entry in the calculate_vimshottari_dasha() format."""
+        data = self._level(level)
+        lord = DASHA_SEQUENCE[data.lords[index]]
+        start, end = _format(data.starts[index]), _format(data.ends[index])
+        if level == MAHADASHA:
+            return {
+                'mahadasha': lord,
+                'start': start,
+                'end': end,
+                'antardashas': [self.period_dict(ANTARDASHA, a) for a in range(9 * index, 9 * index + 9)],
+            }
+        return {'planet': lord, 'start': start, 'end': end}
+
+    def to_mahadashas(self) -> List[dict]:
+        """Identical to the old calculate_vimshottari_dasha() result."""
+        return [self.period_dict(MAHADASHA, m) for m in range(9)]
+
+    def rows(self) -> List[Tuple[str, str, str, str]]:
+        """(mahadasha, antardasha, start, end) per antardasha -- the
+        user_dasha_timeline rows; dates as "YYYY-MM-DD"."""
+        maha, antar = self._levels[MAHADASHA], self._levels[ANTARDASHA]
+        return [
+            (DASHA_SEQUENCE[maha.lords[i // 9]], DASHA_SEQUENCE[antar.lords[i]],
+             _format(antar.starts[i]), _format(antar.ends[i]))
+            for i in range(len(antar.lords))
+        ]
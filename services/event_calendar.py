@@ -0,0 +1,218 @@
+"""
+services/event_calendar.py
+----------------------------------------------
+Read side of astro_events for the scheduler and the cards.
+
+WHY: every consumer looked AstroEvent rows up on its own --
+routes_cards / cards_cache by exact date, event_scheduler for
+target_date and the next day, run_panchang_dismiss_job for today's
+"panchang" row, and notification_engine.build_notifications() loaded
+the WHOLE table on every run just to find the notify_before_days
+pre-events in Python. Each got full ORM objects and dug planet / rashi
+/ slug out of the untyped meta JSON itself.
+
+NOW:
+  - AstroEvent has typed, Postgres-generated planet / rashi / slug /
+    sub_type columns (copies of those meta keys), an index on
+    (date, type) and one on (date - notify_before_days), the day a
+    pre-event notifies on. See models.AstroEvent.
+  - events_on(day) / events_between(start, end) / events_notifying_on(day)
+    return CalendarEvent tuples -- plain NamedTuples with the same
+    attribute names as the model, so every getattr(event, ...) reader
+    (notification_builder, notification_engine, personalization_engine,
+    event_resolver, notification_lifecycle) takes them unchanged. `meta`
+    is still carried for the content builders that render it. Treat it
+    as read-only: cached tuples are shared.
+  - Rows come back ordered by (date, id).
+
+CACHE: today's and tomorrow's events (IST -- the same "today" as
+services/relative_day.py) are held per process, loaded in one query.
+Before serving them, one primary-key read of astro_event_calendar_version
+-- set by a trigger on astro_events to the writing transaction's id --
+confirms nothing has changed since. When event_generator (or the
+scheduler's own save_events_to_db(), or anything else) writes rows,
+the next lookup in every process reloads. Other days always go to the
+database. EVENT_CALENDAR_CACHE_DAYS (default 2) sets how many days
+from today are cached; 0 turns the cache off.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from datetime import date, datetime, time, timedelta
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import select
+
+from extensions import db
+from models import AstroEvent, AstroEventCalendarVersion
+from services.relative_day import IST
+
+DEFAULT_CACHE_DAYS = 2
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+class CalendarEvent(NamedTuple):
+    id: int
+    date: date
+    type: Optional[str]
+    name: str
+    priority: Optional[int]
+    notify_before_days: Optional[int]
+    notify_same_day: Optional[bool]
+    notify_time: Optional[time]
+    planet: Optional[str]
+    rashi: Optional[str]
+    slug: Optional[str]
+    sub_type: Optional[str]
+    meta: Any
+
+
+_COLUMNS = tuple(getattr(AstroEvent, field) for field in CalendarEvent._fields)
+
+
+def _select_events(*conditions) -> List[CalendarEvent]:
+    rows = db.session.execute(
+        select(*_COLUMNS).where(*conditions).order_by(AstroEvent.date, AstroEvent.id)
+    ).all()
+    return [CalendarEvent(*row) for row in rows]
+
+
+def _of_types(events: Iterable[CalendarEvent], types: Optional[Tuple[str, ...]]) -> List[CalendarEvent]:
+    if types is None:
+        return list(events)
+    return [e for e in events if e.type in types]
+
+
+def _types(types) -> Optional[Tuple[str, ...]]:
+    if types is None:
+        return None
+    return (types,) if isinstance(types, str) else tuple(types)
+
+
+class EventCalendar:
+    def __init__(self, cache_days: Optional[int] = None, now_fn: Optional[Callable[[], datetime]] = None):
+        self.cache_days = cache_days if cache_days is not None else _env_int(
+            "EVENT_CALENDAR_CACHE_DAYS", DEFAULT_CACHE_DAYS
+        )
+        # naive UTC, like services/cards_cache.py
+        self._now = now_fn or datetime.utcnow
+        self._lock = threading.Lock()
+        self._window: Optional[Tuple[date, date]] = None
+        self._version: Optional[int] = None
+        self._days: Dict[date, Tuple[CalendarEvent, ...]] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+
+    def today(self) -> date:
+        return (self._now() + IST.utcoffset(None)).date()
+
+    # -------------------- queries --------------------
+    def events_on(self, day: date, types=None) -> List[CalendarEvent]:
+        return self.events_between(day, day, types)
+
+    def events_between(self, start: date, end: date, types=None) -> List[CalendarEvent]:
+        """Events dated start..end (inclusive), optionally of the given
+        type(s), ordered by (date, id)."""
+        types = _types(types)
+        cached = self._from_cache(start, end)
+        if cached is not None:
+            return _of_types(cached, types)
+
+        conditions = [AstroEvent.date >= start, AstroEvent.date <= end]
+        if types is not None:
+            conditions.append(AstroEvent.type.in_(types))
+        return _select_events(*conditions)
+
+    def events_notifying_on(self, day: date) -> List[CalendarEvent]:
+        """Events whose notify_before_days reminder falls on `day` (date
+        - notify_before_days == day; NULL notify_before_days never
+        matches) -- ix_astro_events_notify_on."""
+        return _select_events(AstroEvent.date - AstroEvent.notify_before_days == day)
+
+    # -------------------- cache --------------------
+    def invalidate(self) -> None:
+        with self._lock:
+            self._window, self._version, self._days = None, None, {}
+
+    def _from_cache(self, start: date, end: date) -> Optional[List[CalendarEvent]]:
+        if self.cache_days <= 0:
+            return None
+        first = self.today()
+        window = (first, first + timedelta(days=self.cache_days - 1))
+        if start < window[0] or end > window[1] or start > end:
+            return None
+
+        version = db.session.execute(
+            select(AstroEventCalendarVersion.version).where(AstroEventCalendarVersion.id == 1)
+        ).scalar()
+        with self._lock:
+            fresh = version is not None and self._window == window and self._version == version
+            if fresh:
+                self.hits += 1
+                days = self._days
+        if not fresh:
+            # Version read BEFORE the rows: a write landing in between
+            # only makes the next lookup reload again.
+            loaded = _select_events(AstroEvent.date >= window[0], AstroEvent.date <= window[1])
+            days = {window[0] + timedelta(days=i): () for i in range(self.cache_days)}
+            for e in loaded:
+                days[e.date] = days[e.date] + (e,)
+            with self._lock:
+                self.misses += 1
+                if self._window is not None:
+                    self.reloads += 1
+                if version is not None:
+                    self._window, self._version, self._days = window, version, days
+
+        out: List[CalendarEvent] = []
+        day = start
+        while day <= end:
+            out.extend(days.get(day, ()))
+            day += timedelta(days=1)
+        return out
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "cache_days": self.cache_days,
+                "window": [d.isoformat() for d in self._window] if self._window else None,
+                "cached_events": sum(len(v) for v in self._days.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "reloads": self.reloads,
+            }
+
+
+_calendar: Optional[EventCalendar] = None
+_calendar_lock = threading.Lock()
+
+
+def get_event_calendar() -> EventCalendar:
+    global _calendar
+    if _calendar is None:
+        with _calendar_lock:
+            if _calendar is None:
+                _calendar = EventCalendar()
+    return _calendar
+
+
+def events_on(day: date, types=None) -> List[CalendarEvent]:
+    return get_event_calendar().events_on(day, types)
+
+
+def events_between(start: date, end: date, types=None) -> List[CalendarEvent]:
+    return get_event_calendar().events_between(start, end, types)
+
+
+def events_notifying_on(day: date) -> List[CalendarEvent]:
+    return get_event_calendar().events_notifying_on(day)
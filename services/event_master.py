@@ -58,8 +58,9 @@ def generate_events_for_date(date, lat, lon, language="en"):
             # WHOLE raw transit dict `t` (including its own nested "meta"
             # key) as this event's meta, one level too deep. The one and
             # only reader anywhere in the codebase --
-            # services/personalization_engine.py::get_users_for_transit()
-            # -- reads event.meta.get("planet")/.get("rashi") directly, so
+            # services/personalization_engine.py::AudienceResolver.transit_house()
+            # -- reads planet/rashi from the top level of event.meta
+            # (directly, or via AstroEvent's generated columns), so
             # every transit AstroEvent ever saved silently produced zero
             # personalized recipients (verified against a real,
             # pipeline-generated production row). Storing just the inner
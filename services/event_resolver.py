@@ -99,10 +99,14 @@ def resolve_resource(event, lang="en"):
     don't populate these fields correctly resolve to None. Likewise,
     "url" is only ever a value this module can actually derive from
     type + id -- never a fabricated guess.
+
+    Rows read through services/event_calendar.py carry slug / sub_type
+    as typed columns (generated from those same meta keys); anything
+    else falls back to meta.
     """
     meta = event.meta or {}
-    slug = meta.get("slug")
-    sub_type = meta.get("type")
+    slug = getattr(event, "slug", None) or meta.get("slug")
+    sub_type = getattr(event, "sub_type", None) or meta.get("type")
 
     if not slug or not sub_type:
         return None
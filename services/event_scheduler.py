@@ -5,12 +5,13 @@ from extensions import db
 
 # Models
 from modules.models_user import AppUser
-from models import AstroEvent
 
 # Services
+from services.event_calendar import events_between, events_on
 from services.event_master import generate_events_for_date, save_events_to_db
 from services.notification_engine import build_notifications, send_push_notification, send_data_only_notification
 from services.notification_builder import get_user_notifications, build_event_content
+from services.personalization_engine import AudienceResolver
 from services.notification_engine import send_topic_notification
 from notifications.notification_models import UserNotification, NotificationLog
 from services.event_adapters.festival_adapter import normalize_events
@@ -101,9 +102,7 @@ def run_daily_event_job():
                 print("⚠️ No raw events generated")
 
             # 🔥 ALWAYS fetch from DB (no condition)
-            normalized_events = AstroEvent.query.filter(
-                AstroEvent.date.in_([target_date, target_date + timedelta(days=1)])
-            ).all()
+            normalized_events = events_between(target_date, target_date + timedelta(days=1))
 
             print(f"🔥 DEBUG: DB events count = {len(normalized_events)}")
 
@@ -224,6 +223,9 @@ def run_daily_event_job():
 
         print("📡 Sending personalized notifications...")
 
+        # One audience resolution per run, shared by every user below
+        audiences = AudienceResolver()
+
         while True:
             users = db.session.query(AppUser).limit(BATCH_SIZE).offset(offset).all()
             if not users:
@@ -233,7 +235,8 @@ def run_daily_event_job():
                 try:
                     user_notifications = get_user_notifications(
                         user,
-                        normalized_events   # ✔ DB events
+                        normalized_events,   # ✔ DB events
+                        audiences=audiences,
                     )
 
                     seen_events = set()
@@ -329,7 +332,8 @@ def run_daily_event_job():
                             # -- no AstroEvent backing; anchored to the
                             # REAL calendar day this specific notification
                             # was built on (services/personalization_engine.py
-                            # ::get_users_for_dasha_change() reads
+                            # ::AudienceResolver, like
+                            # get_users_for_dasha_change(), reads
                             # datetime.now(IST).date() internally, NOT
                             # target_date -- recomputed the same way here
                             # so an evening-slot run still expires this
@@ -585,10 +589,7 @@ def run_panchang_dismiss_job():
     with app.app_context():
         today = datetime.now(IST).date()
 
-        panchang_event = AstroEvent.query.filter_by(
-            type="panchang",
-            date=today
-        ).first()
+        panchang_event = next(iter(events_on(today, types="panchang")), None)
 
         if not panchang_event:
             print("⚠️ No Panchang event for today -- nothing to dismiss")
@@ -1,28 +1,39 @@
 from datetime import datetime, timedelta
 # Panchang engine se sirf wahi functions liye hain jo aapke paas available hain
-from services.panchang_engine import calculate_panchang, _tithi_number_at, _karan_at
+from services.panchang_engine import calculate_panchang
 from services.lunar_month_engine import get_lunar_month
+# Exact karana/tithi start-end (elongation root finding) -- no polling
+from services.karana_intervals import bhadra_intervals, tithi_intervals
 
-def _get_bhadra_end_time(start_time, limit_hours=18):
-    """Bhadra kab khatam ho rahi hai, 5-minute check se nikalta hai."""
-    check_time = start_time
-    limit_time = start_time + timedelta(hours=limit_hours)
-    while check_time <= limit_time:
-        k_name, _ = _karan_at(check_time)
-        if k_name != "Vishti (Bhadra)":
-            return check_time
-        check_time += timedelta(minutes=5)
-    return start_time + timedelta(hours=12)
-
-def calculate_muhurta_window(sunset_dt, purnima_end_dt, bhadra_end_dt=None):
+PURNIMA = 15
+PRADOSH_MINUTES = 144
+
+def _ceil_minute(dt):
+    """Muhurta HH:MM kabhi exact boundary se pehle na dikhe."""
+    if dt.second or dt.microsecond:
+        return dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    return dt
+
+def _bhadra_end_in_pradosh(sunset_dt):
+    """Pradosh (sunset + 2h24m) ko chhune wali pehli Bhadra ka end, warna sunset."""
+    pradosh_limit = sunset_dt + timedelta(minutes=PRADOSH_MINUTES)
+    for bhadra in bhadra_intervals(sunset_dt, pradosh_limit):
+        return bhadra.end
+    return sunset_dt
+
+def calculate_muhurta_window(sunset_dt, purnima_end_dt, bhadra_end_dt=None, purnima_start_dt=None):
     """Exact dahan ka samay nikalne ka logic."""
     start_time = sunset_dt
-    if bhadra_end_dt and bhadra_end_dt > sunset_dt:
+    if bhadra_end_dt and bhadra_end_dt > start_time:
         start_time = bhadra_end_dt
+    # Purnima sunset ke baad shuru ho toh dahan bhi tabhi se
+    if purnima_start_dt and purnima_start_dt > start_time:
+        start_time = purnima_start_dt
+    start_time = _ceil_minute(start_time)
     
     # Pradosh limit: Sunset ke 2 ghante 24 min tak
-    pradosh_limit = sunset_dt + timedelta(minutes=144)
-    end_time = min(purnima_end_dt, pradosh_limit)
+    pradosh_limit = sunset_dt + timedelta(minutes=PRADOSH_MINUTES)
+    end_time = min(purnima_end_dt, pradosh_limit).replace(second=0, microsecond=0)
     
     # Rare Case: Agar window negative ho jaye (2026), toh minimum 15 min ka window
     if start_time >= end_time:
@@ -51,33 +62,33 @@ def format_response(year, d_date, p_data, method, muhurta, extra):
         }
     }
 
-def detect_holi(year, lat, lon, language="en"):
-    # Holi search range: March 1 se April 15 tak (Holi Feb me nahi aati standardly)
-    d = datetime(year, 3, 1).date() 
+def _purnima_candidate_days(year):
+    """March 1 - April 15 ki Purnima(s) exact intervals se; sirf woh din
+    jinke Pradosh mein Purnima aa sakti hai (Purnima start se ek din
+    pehle se Purnima end tak). Pehle har din calculate_panchang chalta tha."""
+    start = datetime(year, 3, 1)
     end_search = datetime(year, 4, 15).date()
+    for purnima in tithi_intervals(start, datetime(year, 4, 16)):
+        if purnima.number != PURNIMA:
+            continue
+        d = max(purnima.start.date() - timedelta(days=1), start.date())
+        while d <= min(purnima.end.date(), end_search):
+            yield d, purnima
+            d += timedelta(days=1)
 
-    results = []
-
-    while d <= end_search:
+def detect_holi(year, lat, lon, language="en"):
+    # Holi search range: March 1 se April 15 tak (Holi Feb me nahi aati standardly)
+    for d, purnima in _purnima_candidate_days(year):
         try:
-            # 1. Tithi Check sabse pehle (Kyunki Holi = Purnima)
             p = calculate_panchang(d, lat, lon, language)
             sunset_str = p.get("sunset")
             if not sunset_str:
-                d += timedelta(days=1)
                 continue
 
             sunset_dt = datetime.strptime(f"{d} {sunset_str}", "%Y-%m-%d %H:%M")
-            
-            # Kya Pradosh window mein Purnima (15) hai?
-            is_purnima = False
-            for mins in range(0, 180, 10): # 3 ghante ka window check
-                if _tithi_number_at(sunset_dt + timedelta(minutes=mins)) == 15:
-                    is_purnima = True
-                    break
-            
-            if not is_purnima:
-                d += timedelta(days=1)
+
+            # 1. Kya Pradosh window (sunset + 3 ghante) mein Purnima (15) hai?
+            if not purnima.overlaps(sunset_dt, sunset_dt + timedelta(minutes=180)):
                 continue
 
             # 2. Lunar Month Check (Sirf verification ke liye, crash rokne ke liye)
@@ -87,17 +98,12 @@ def detect_holi(year, lat, lon, language="en"):
             except:
                 l_month = "Phalguna" # Fallback agar engine phate
 
-            # 3. Agar Purnima mil gayi hai March/April mein, toh wahi Holi hai
-            # Find Purnima end
-            p_end = sunset_dt
-            for mins in range(0, 1440, 15):
-                if _tithi_number_at(sunset_dt + timedelta(minutes=mins)) != 15:
-                    p_end = sunset_dt + timedelta(minutes=mins)
-                    break
+            # 3. Purnima end = exact tithi interval end
+            p_end = purnima.end
 
-            # Bhadra logic
-            b_end = _get_bhadra_end_time(sunset_dt, limit_hours=30)
-            pradosh_limit = sunset_dt + timedelta(minutes=144)
+            # Bhadra logic (exact Vishti interval)
+            b_end = _bhadra_end_in_pradosh(sunset_dt)
+            pradosh_limit = sunset_dt + timedelta(minutes=PRADOSH_MINUTES)
 
             # 2026 Special Case: Bhadra covers full night
             if b_end > pradosh_limit and b_end.date() > d:
@@ -106,15 +112,15 @@ def detect_holi(year, lat, lon, language="en"):
                 s_next = p_next.get("sunset")
                 s_next_dt = datetime.strptime(f"{next_day} {s_next}", "%Y-%m-%d %H:%M")
                 
-                muhurta = {"start": s_next_dt.strftime("%H:%M"), "end": (s_next_dt + timedelta(minutes=144)).strftime("%H:%M"), "duration": "2 Hours 24 Mins"}
+                muhurta = {"start": s_next_dt.strftime("%H:%M"), "end": (s_next_dt + timedelta(minutes=PRADOSH_MINUTES)).strftime("%H:%M"), "duration": "2 Hours 24 Mins"}
                 return format_response(year, next_day, p_next, "Pradosh (Vedic Exception)", muhurta, "Dahan shifted due to Bhadra.")
 
-            muhurta = calculate_muhurta_window(sunset_dt, p_end, b_end if b_end > sunset_dt else None)
+            muhurta = calculate_muhurta_window(
+                sunset_dt, p_end, b_end if b_end > sunset_dt else None, purnima_start_dt=purnima.start
+            )
             return format_response(year, d, p, "Standard Pradosh", muhurta, f"Holika Dahan in {l_month} Purnima.")
 
         except Exception as e:
             print(f"Error on {d}: {e}")
-        
-        d += timedelta(days=1)
 
-    return None
\ No newline at end of file
+    return None
@@ -1,9 +1,16 @@
 from datetime import datetime, timedelta
-from services.panchang_engine import calculate_sunrise_sunset
-from services.astro_core import _tithi_number_at
-from services.lunar_month_engine import get_amanta_month
-from services.panchang_engine import calculate_panchang
+from services.panchang_engine import _abhijit, _brahma_muhurta, _rahu_kaal
+from services.lunar_calendar import PRATIPADA, build_tithi_calendar
 
+# Navratri ek precomputed amanta month + tithi calendar se nikalti hai
+# (services/lunar_calendar.py): poori window ke exact tithi intervals ek
+# baar, har din sirf sunrise/sunset -- per-day ephemeris scan nahi.
+
+NAVAMI = 9
+DASHAMI = 10
+SEARCH_DAYS = 80
+# Day 1 search ke aakhri din mile tab bhi Dashami calendar ke andar rahe
+CALENDAR_PADDING_DAYS = 15
 
 NAVRATRI_DAY_MAP = {
     1: "Shailputri",
@@ -17,127 +24,100 @@ NAVRATRI_DAY_MAP = {
     9: "Siddhidatri"
 }
 
-def detect_navratri(year, lat, lon, navratri_type="chaitra"):
-
-    
+def _aparahna(sunrise, sunset):
+    """Din ke 5 bhaag, teesra bhaag = Aparahna."""
+    one_part = (sunset - sunrise) / 5
+    return sunrise + one_part * 2, sunrise + one_part * 3
+
+def _month_tithi(calendar, month, number):
+    """Is amanta month ki given tithi ka exact interval."""
+    for day in calendar:
+        for t in day.tithis:
+            if t.number == number and month.contains(t.start + timedelta(seconds=1)):
+                return t
+    return None
+
+def _locate_navratri(year, lat, lon, navratri_type="chaitra"):
+    """
+    Returns (calendar, day1_index, last_day_index, vijayadashami_index, month)
+    ya None.
+
+    - Month: pehla Chaitra / Ashwin (amanta) jo Mar 1 / Sep 1 se 80 din
+      ke andar shuru ho.
+    - Day 1 (Kalash Sthapana): jis din ke sunrise par Pratipada ho. Vriddhi
+      (do sunrise) -> pehla din. Kshaya (kisi sunrise ko na chhue, jaise
+      2026 Chaitra) -> woh din jiske sunrise->next sunrise mein Pratipada
+      poori hoti hai.
+    - Navratri days: Day 1 se us din tak jiske sunrise par Navami (ya
+      kshaya Navami wala din) ho -- tithi kshaya ho toh 8, vriddhi ho toh
+      10 din.
+    - Vijayadashami: pehla din jiske Aparahna mein Dashami ho (aakhri
+      Navratri din bhi ho sakta hai); Dashami kisi Aparahna ko na chhue
+      toh jis din woh shuru hoti hai.
+    """
     target_month_name = "Chaitra" if navratri_type == "chaitra" else "Ashwin"
 
     start_date = datetime(year, 3, 1).date() if navratri_type == "chaitra" else datetime(year, 9, 1).date()
-    d = start_date
-    search_end = d + timedelta(days=80)
-
-    navratri_days = []
-    started = False
-
-    while d <= search_end:
-
-        
-        dt_input = datetime.combine(d, datetime.min.time())
-        sunrise_dt, _ = calculate_sunrise_sunset(dt_input, lat, lon)
-
-        tithi_sunrise = _tithi_number_at(sunrise_dt)
-        tithi_6h = _tithi_number_at(sunrise_dt + timedelta(hours=6))
-        tithi_12h = _tithi_number_at(sunrise_dt + timedelta(hours=12))
-
-        lunar_info = get_amanta_month(sunrise_dt)
-
-        # -------- PREVIOUS DAY DEBUG --------
-        prev_date = d - timedelta(days=1)
-        prev_sunrise, _ = calculate_sunrise_sunset(
-            datetime.combine(prev_date, datetime.min.time()),
-            lat, lon
-        )
-
-        prev_tithi = _tithi_number_at(prev_sunrise)
-        prev_month = get_amanta_month(prev_sunrise)["name"]
-
-        # -------- START CONDITION CHECK --------
-        pratipada_present = (
-            tithi_sunrise == 1
-            or tithi_6h == 1
-            or tithi_12h == 1
-        )
-
-        if not started:
-
-            # -------- NORMAL RULE --------
-            # Sunrise पर Pratipada मिले
-            if (
-                lunar_info["name"] == target_month_name
-                and tithi_sunrise == 1
-            ):
-                
-                started = True
-
-                navratri_days.append({
-                    "day_number": 1,
-                    "date": d.strftime("%Y-%m-%d"),
-                    "tithi": 1,
-                    "label": "Kalash Sthapana"
-                })
-
-            # -------- RARE EDGE CASE (Like 2026) --------
-            else:
-
-                # Check if TODAY sunrise = 30 (Amavasya end)
-                if tithi_sunrise == 30:
-
-                    # Check if during today Pratipada occurred
-                    tithi_6h = _tithi_number_at(sunrise_dt + timedelta(hours=6))
-                    tithi_12h = _tithi_number_at(sunrise_dt + timedelta(hours=12))
-
-                    pratipada_inside_day = (
-                        tithi_6h == 1 or tithi_12h == 1
-                    )
-
-                    # Check next day sunrise
-                    next_date = d + timedelta(days=1)
-                    next_sunrise, _ = calculate_sunrise_sunset(
-                        datetime.combine(next_date, datetime.min.time()),
-                        lat, lon
-                    )
-
-                    next_tithi = _tithi_number_at(next_sunrise)
-                    next_month = get_amanta_month(next_sunrise)["name"]
-
-                    if (
-                        pratipada_inside_day
-                        and next_tithi == 2
-                        and next_month == target_month_name
-                    ):
-                        
-                        started = True
-
-                        navratri_days.append({
-                            "day_number": 1,
-                            "date": d.strftime("%Y-%m-%d"),
-                            "tithi": 1,
-                            "label": "Kalash Sthapana"
-                        })
-
-        else:
-            if 1 <= tithi_sunrise <= 10:
-
-                if str(d) not in [x['date'] for x in navratri_days]:
-                    day_num = len(navratri_days) + 1
-
-                    
-                    navratri_days.append({
-                        "day_number": day_num,
-                        "date": d.strftime("%Y-%m-%d"),
-                        "tithi": tithi_sunrise,
-                        "label": f"Navratri Day {day_num}"
-                    })
-
-            if len(navratri_days) >= 9 or tithi_sunrise >= 10:
-                break
-
-        d += timedelta(days=1)
-
-    
-    if not navratri_days:
+    calendar = build_tithi_calendar(
+        start_date, start_date + timedelta(days=SEARCH_DAYS + CALENDAR_PADDING_DAYS), lat, lon
+    )
+
+    month = next(
+        (
+            day.month for day in calendar[:SEARCH_DAYS + 1]
+            if day.month and day.month.name == target_month_name
+        ),
+        None,
+    )
+    if month is None:
+        return None
+
+    pratipada = _month_tithi(calendar, month, PRATIPADA)
+    navami = _month_tithi(calendar, month, NAVAMI)
+    dashami = _month_tithi(calendar, month, DASHAMI)
+    if pratipada is None or navami is None or dashami is None:
+        return None
+
+    def covers(day, tithi):
+        # sunrise par hai, ya sunrise -> next sunrise ke andar poori (kshaya)
+        return tithi.contains(day.sunrise) or (tithi in day.tithis and tithi.end <= day.next_sunrise)
+
+    day1 = next((i for i, day in enumerate(calendar) if covers(day, pratipada)), None)
+    if day1 is None or day1 > SEARCH_DAYS:
+        return None
+
+    last_day = max(i for i, day in enumerate(calendar) if covers(day, navami))
+
+    dashami_days = [i for i in range(day1 + 1, len(calendar)) if dashami in calendar[i].tithis]
+    vijayadashami = next(
+        (i for i in dashami_days if dashami.overlaps(*_aparahna(calendar[i].sunrise, calendar[i].sunset))),
+        dashami_days[0] if dashami_days else None,
+    )
+    if vijayadashami is None:
+        return None
+
+    return calendar, day1, last_day, vijayadashami, month
+
+def _navratri_days(calendar, day1, last_day):
+    days = []
+    for n, day in enumerate(calendar[day1:last_day + 1], start=1):
+        days.append({
+            "day_number": n,
+            "date": day.date.strftime("%Y-%m-%d"),
+            # kshaya Pratipada ke din sunrise par Amavasya hoti hai
+            "tithi": PRATIPADA if n == 1 else day.sunrise_tithi.number,
+            "label": "Kalash Sthapana" if n == 1 else f"Navratri Day {n}"
+        })
+    return days
+
+def detect_navratri(year, lat, lon, navratri_type="chaitra"):
+    found = _locate_navratri(year, lat, lon, navratri_type)
+    if found is None:
         return {"error": f"{navratri_type} Navratri not found for {year}", "year": year}
 
+    calendar, day1, last_day, _, _ = found
+    navratri_days = _navratri_days(calendar, day1, last_day)
+
     return {
         "type": navratri_type,
         "year": year,
@@ -148,32 +128,40 @@ def detect_navratri(year, lat, lon, navratri_type="chaitra"):
 
 def build_full_navratri(year, lat, lon, navratri_type="chaitra"):
 
-    base = detect_navratri(year, lat, lon, navratri_type)
-
-    if "error" in base:
-        return base
+    found = _locate_navratri(year, lat, lon, navratri_type)
+    if found is None:
+        return {"error": f"{navratri_type} Navratri not found for {year}", "year": year}
 
-    days = base["days"]
+    calendar, day1, last_day, vijayadashami, month = found
 
     # ---------------------------------
-    # Attach Mata Names + Panchang Data
+    # Attach Mata Names + Panchang Data (calendar se, bina ephemeris)
     # ---------------------------------
     enriched_days = []
 
-    for d in days:
-        date_obj = datetime.strptime(d["date"], "%Y-%m-%d").date()
-
-        panchang = calculate_panchang(date_obj, lat, lon, "en")
+    for d, day in zip(_navratri_days(calendar, day1, last_day), calendar[day1:last_day + 1]):
+        rahu_s, rahu_e = _rahu_kaal(day.date, day.sunrise, day.sunset)
+        abhi_s, abhi_e = _abhijit(day.sunrise, day.sunset)
+        brahma_s, brahma_e = _brahma_muhurta(day.sunrise)
+        t = day.sunrise_tithi
 
         d["mata_name"] = NAVRATRI_DAY_MAP.get(d["day_number"])
-        d["sunrise"] = panchang["sunrise"]
-        d["sunset"] = panchang["sunset"]
-        d["abhijit_muhurta"] = panchang["abhijit_muhurta"]
-        d["brahma_muhurta"] = panchang["brahma_muhurta"]
-        d["rahu_kaal"] = panchang["rahu_kaal"]
-        d["tithi_window"] = panchang["tithi"]
-        d["kshaya"] = panchang["tithi_special"]["kshaya"]
-        d["vriddhi"] = panchang["tithi_special"]["vriddhi"]
+        d["sunrise"] = day.sunrise.strftime("%H:%M")
+        d["sunset"] = day.sunset.strftime("%H:%M")
+        d["abhijit_muhurta"] = {"start": abhi_s.strftime("%H:%M"), "end": abhi_e.strftime("%H:%M")}
+        d["brahma_muhurta"] = {"start": brahma_s.strftime("%H:%M"), "end": brahma_e.strftime("%H:%M")}
+        d["rahu_kaal"] = {"start": rahu_s.strftime("%H:%M"), "end": rahu_e.strftime("%H:%M")}
+        d["tithi_window"] = {
+            "number": t.number,
+            "name": t.name,
+            "paksha": "Shukla" if t.number <= 15 else "Krishna",
+            "start_ist": t.start.strftime("%Y-%m-%d %H:%M"),
+            "end_ist": t.end.strftime("%Y-%m-%d %H:%M"),
+        }
+        d["kshaya"] = day.kshaya
+        d["vriddhi"] = day.vriddhi
+        # sunrise -> next sunrise ki saari tithis (kshaya wali bhi)
+        d["tithis"] = [x.number for x in day.tithis[:-1]] or [t.number]
 
         enriched_days.append(d)
 
@@ -191,50 +179,30 @@ def build_full_navratri(year, lat, lon, navratri_type="chaitra"):
     }
 
     # ---------------------------------
-    # Sandhi Puja (Ashtami → Navami)
+    # Sandhi Puja (Ashtami → Navami), exact Navami start
     # ---------------------------------
     sandhi_puja = None
 
-    navami = next((x for x in enriched_days if x["day_number"] == 9), None)
+    navami = _month_tithi(calendar, month, NAVAMI)
 
     if navami:
-        navami_start_str = navami["tithi_window"]["start_ist"]
-        navami_start = datetime.strptime(navami_start_str, "%Y-%m-%d %H:%M")
-
-        sandhi_start = navami_start - timedelta(minutes=24)
-        sandhi_end = navami_start + timedelta(minutes=24)
+        sandhi_start = navami.start - timedelta(minutes=24)
+        sandhi_end = navami.start + timedelta(minutes=24)
 
         sandhi_puja = {
-            "date": navami_start.strftime("%Y-%m-%d"),  # ✅ FIXED
+            "date": navami.start.strftime("%Y-%m-%d"),
             "start": sandhi_start.strftime("%H:%M"),
             "end": sandhi_end.strftime("%H:%M")
         }
 
     # ---------------------------------
-    # Vijayadashami (Day 9 Panchang Based Aparahna)
+    # Vijayadashami (Aparahna-vyapini Dashami)
     # ---------------------------------
-    dashami = enriched_days[-1]
-
-    dashami_date_obj = datetime.strptime(dashami["date"], "%Y-%m-%d").date()
-    dashami_panchang = calculate_panchang(dashami_date_obj, lat, lon, "en")
-
-    sunrise = datetime.strptime(
-        dashami["date"] + " " + dashami_panchang["sunrise"],
-        "%Y-%m-%d %H:%M"
-    )
-    sunset = datetime.strptime(
-        dashami["date"] + " " + dashami_panchang["sunset"],
-        "%Y-%m-%d %H:%M"
-    )
-
-    day_duration = sunset - sunrise
-    one_part = day_duration / 5
-
-    aparahna_start = sunrise + one_part * 2
-    aparahna_end = sunrise + one_part * 3
+    dashami_day = calendar[vijayadashami]
+    aparahna_start, aparahna_end = _aparahna(dashami_day.sunrise, dashami_day.sunset)
 
     vijayadashami = {
-        "date": dashami["date"],
+        "date": dashami_day.date.strftime("%Y-%m-%d"),
         "aparahna_start": aparahna_start.strftime("%H:%M"),
         "aparahna_end": aparahna_end.strftime("%H:%M")
     }
@@ -252,4 +220,4 @@ def build_full_navratri(year, lat, lon, navratri_type="chaitra"):
         "sandhi_puja": sandhi_puja,
         "vijayadashami": vijayadashami,
         "days": enriched_days
-    }
\ No newline at end of file
+    }
@@ -771,6 +771,7 @@ def generate_full_kundali_payload(form_data: Dict[str, Any]) -> Dict[str, Any]:
         "mahadashas": base.get("Mahadasha") or base.get("mahadasha") or [],
         "current_mahadasha": base.get("current_mahadasha"),
         "current_antardasha": base.get("current_antardasha"),
+        "next_antardasha": base.get("next_antardasha"),
         "current_block": _build_current_dasha_snippet(base, form_data.get("language", "en")),
     }
 
@@ -0,0 +1,218 @@
+# karana_intervals.py
+"""
+Exact karana / tithi intervals by elongation root finding.
+
+Festival engines used to find "when does this karana end" by polling
+panchang_engine._karan_at() on a fixed grid (holi_engine: every 5 min
+for Bhadra, every 10/15 min for Purnima) -- hundreds of ephemeris calls
+per candidate day, and answers only as good as the grid.
+
+Both limbs are pure functions of the Moon-Sun elongation E (sidereal,
+Lahiri -- the same FLAGS as astro_core / panchang_engine):
+
+    karana slot = int(E // 6) + 1     (1..60)
+    tithi       = int(E // 12) + 1    (1..30)
+
+so every boundary is the instant E crosses a multiple of 6 (or 12)
+degrees. We solve E(t) = target with Newton's method, using the Moon and
+Sun longitude speeds Swiss Ephemeris returns with FLG_SPEED (E moves
+~10-15 deg/day and never reverses), which converges in 2-4 iterations to
+well under a second. Boundaries are rounded to the whole second.
+
+    karana_intervals(start, end)   every karana overlapping [start, end)
+    tithi_intervals(start, end)    every tithi overlapping [start, end)
+    bhadra_intervals(start, end)   only the Vishti (Bhadra) karanas
+    karana_interval_at(dt)         the karana containing dt
+    tithi_interval_at(dt)          the tithi containing dt
+    lunation_intervals(start, end) new moon to new moon (amanta months)
+    bhadra_free_windows(start, end)
+                                   [start, end) minus Bhadra -- what
+                                   Holika Dahan / Raksha Bandhan style
+                                   muhurtas need
+
+All datetimes are naive IST, like the rest of the panchang code.
+Karana names come from panchang_engine._karan_name_for_slot(), so an
+interval always agrees with _karan_at() at any instant inside it.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, List, Tuple
+
+import swisseph as swe
+
+from services.astro_core import FLAGS
+from services.panchang_engine import TITHI_NAMES, _karan_name_for_slot
+
+BHADRA = "Vishti (Bhadra)"
+
+KARANA_SPAN_DEG = 6.0
+TITHI_SPAN_DEG = 12.0
+
+_IST_OFFSET = timedelta(hours=5, minutes=30)
+_MEAN_ELONGATION_RATE = 360.0 / 29.530588  # deg/day, only a first guess
+_MAX_ITERATIONS = 12
+_TOLERANCE_DAYS = 0.01 / 86400.0  # 10 ms
+
+
+@dataclass(frozen=True)
+class LunarInterval:
+    """One karana (number = slot 1..60) or tithi (number = 1..30);
+    `end` is exclusive and equals the next interval's `start`."""
+
+    number: int
+    name: str
+    start: datetime
+    end: datetime
+
+    def contains(self, dt: datetime) -> bool:
+        return self.start <= dt < self.end
+
+    def overlaps(self, start: datetime, end: datetime) -> bool:
+        return self.start < end and start < self.end
+
+    def to_dict(self) -> dict:
+        return {
+            "number": self.number,
+            "name": self.name,
+            "start": self.start.strftime("%Y-%m-%d %H:%M:%S"),
+            "end": self.end.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+
+
+# -------------------------------------------------
+# Elongation + Newton solver (Julian days, UT)
+# -------------------------------------------------
+def _julday(dt_ist: datetime) -> float:
+    utc = dt_ist - _IST_OFFSET
+    return swe.julday(
+        utc.year,
+        utc.month,
+        utc.day,
+        utc.hour + utc.minute / 60 + (utc.second + utc.microsecond / 1e6) / 3600,
+    )
+
+
+def _elongation(jd_ut: float) -> Tuple[float, float]:
+    """(Moon - Sun) % 360 and its rate in deg/day."""
+    sun = swe.calc_ut(jd_ut, swe.SUN, FLAGS | swe.FLG_SPEED)[0]
+    moon = swe.calc_ut(jd_ut, swe.MOON, FLAGS | swe.FLG_SPEED)[0]
+    return (moon[0] - sun[0]) % 360.0, moon[3] - sun[3]
+
+
+def _solve_crossing(target_deg: float, jd_guess: float) -> Tuple[float, float]:
+    """(jd, elongation rate there) of the crossing nearest jd_guess."""
+    jd = jd_guess
+    rate = _MEAN_ELONGATION_RATE
+    for _ in range(_MAX_ITERATIONS):
+        elong, rate = _elongation(jd)
+        # signed distance to the target, in (-180, 180]
+        delta = (elong - target_deg + 180.0) % 360.0 - 180.0
+        step = delta / rate
+        jd -= step
+        if abs(step) < _TOLERANCE_DAYS:
+            break
+    return jd, rate
+
+
+class _Clock:
+    """Julian day <-> naive IST datetime around one anchor (keeps the
+    conversion exact to well under a millisecond)."""
+
+    def __init__(self, anchor: datetime):
+        self.anchor = anchor
+        self.anchor_jd = _julday(anchor)
+
+    def to_dt(self, jd: float) -> datetime:
+        dt = self.anchor + timedelta(days=jd - self.anchor_jd)
+        return (dt + timedelta(microseconds=500_000)).replace(microsecond=0)
+
+
+def elongation_crossing(target_deg: float, near_dt: datetime) -> datetime:
+    """Instant (IST, whole second) closest to `near_dt` at which the
+    Moon-Sun elongation equals `target_deg`."""
+    clock = _Clock(near_dt)
+    return clock.to_dt(_solve_crossing(target_deg % 360.0, clock.anchor_jd)[0])
+
+
+# -------------------------------------------------
+# Interval walk
+# -------------------------------------------------
+def _intervals(
+    start_dt: datetime,
+    end_dt: datetime,
+    span_deg: float,
+    name_for: Callable[[int], str],
+) -> List[LunarInterval]:
+    if end_dt <= start_dt:
+        return []
+
+    count = int(round(360.0 / span_deg))
+    clock = _Clock(start_dt)
+
+    elong, rate = _elongation(clock.anchor_jd)
+    index = int(elong // span_deg)  # 0-based
+    boundary_jd, rate = _solve_crossing(
+        index * span_deg,
+        clock.anchor_jd - (elong - index * span_deg) / rate,
+    )
+    boundary = clock.to_dt(boundary_jd)
+
+    out: List[LunarInterval] = []
+    while boundary < end_dt:
+        nxt = (index + 1) % count
+        # the rate at the last boundary is a far better first guess than
+        # the mean rate -- saves a Newton step per boundary
+        guess_rate = rate if span_deg < 360.0 else _MEAN_ELONGATION_RATE
+        next_jd, rate = _solve_crossing(nxt * span_deg, boundary_jd + span_deg / guess_rate)
+        next_boundary = clock.to_dt(next_jd)
+        if next_boundary > start_dt:
+            out.append(LunarInterval(index + 1, name_for(index + 1), boundary, next_boundary))
+        index, boundary_jd, boundary = nxt, next_jd, next_boundary
+    return out
+
+
+def karana_intervals(start_dt: datetime, end_dt: datetime) -> List[LunarInterval]:
+    """Every karana overlapping [start_dt, end_dt), in order, with exact
+    start/end (the first may start before start_dt, the last may end
+    after end_dt)."""
+    return _intervals(start_dt, end_dt, KARANA_SPAN_DEG, _karan_name_for_slot)
+
+
+def tithi_intervals(start_dt: datetime, end_dt: datetime) -> List[LunarInterval]:
+    """Every tithi overlapping [start_dt, end_dt); number 15 = Purnima,
+    30 = Amavasya."""
+    return _intervals(start_dt, end_dt, TITHI_SPAN_DEG, lambda n: TITHI_NAMES[n - 1])
+
+
+def lunation_intervals(start_dt: datetime, end_dt: datetime) -> List[LunarInterval]:
+    """Every lunation (Amavasya end -> next Amavasya end, i.e. an amanta
+    month) overlapping [start_dt, end_dt) -- one solve per new moon."""
+    return _intervals(start_dt, end_dt, 360.0, lambda n: "Lunation")
+
+
+def bhadra_intervals(start_dt: datetime, end_dt: datetime) -> List[LunarInterval]:
+    return [k for k in karana_intervals(start_dt, end_dt) if k.name == BHADRA]
+
+
+def karana_interval_at(dt_ist: datetime) -> LunarInterval:
+    return karana_intervals(dt_ist, dt_ist + timedelta(seconds=1))[0]
+
+
+def tithi_interval_at(dt_ist: datetime) -> LunarInterval:
+    return tithi_intervals(dt_ist, dt_ist + timedelta(seconds=1))[0]
+
+
+def bhadra_free_windows(start_dt: datetime, end_dt: datetime) -> List[Tuple[datetime, datetime]]:
+    """[start_dt, end_dt) with every Bhadra cut out, as (start, end) pairs."""
+    windows: List[Tuple[datetime, datetime]] = []
+    cursor = start_dt
+    for bhadra in bhadra_intervals(start_dt, end_dt):
+        if bhadra.start > cursor:
+            windows.append((cursor, bhadra.start))
+        cursor = max(cursor, bhadra.end)
+    if cursor < end_dt:
+        windows.append((cursor, end_dt))
+    return windows
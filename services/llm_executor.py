@@ -0,0 +1,463 @@
+"""
+services/llm_executor.py
+----------------------------------------------
+Shared LLM execution layer for every chat.completions call in the
+backend -- Premium AI Reports (services/ai_prediction_lab/openai_client.py,
+behind modules/ai_report_engine/openai_executor.py), legacy report
+generation (report_writer.py, report_pipeline.py), Ask Now
+(modules/services/chat_engine.py, chat_requirement_engine.py),
+SmartChat, Free Consult, Love Premium and the app-level helpers.
+
+WHY: each of those modules used to own a blocking `OpenAI()` client and
+make one call at a time, so a gunicorn worker thread was held for the
+whole LLM latency with no bound on how many calls the process had open
+and no sharing between identical requests. This module replaces them
+with one process-wide executor:
+
+  - ONE asyncio event loop on a daemon thread, holding an
+    `AsyncOpenAI` client -- every HTTP connection to OpenAI lives there,
+    not in the request threads.
+  - A bounded semaphore (LLM_MAX_CONCURRENCY) caps concurrent calls per
+    process, so a burst of chat traffic queues instead of opening
+    hundreds of sockets / tripping OpenAI rate limits.
+  - REQUEST COALESCING: identical in-flight requests (same model,
+    messages and parameters -- see _request_key()) share a single
+    upstream call; every waiter receives the same response. The entry
+    is dropped the moment the call finishes -- this is deduplication of
+    concurrent work, not a response cache.
+  - Per-attempt timeout (LLM_TIMEOUT_SECONDS) and bounded retries with
+    exponential backoff (LLM_MAX_RETRIES, LLM_RETRY_BACKOFF_SECONDS) on
+    transient failures only (timeouts, connection errors, 429, 5xx);
+    a 4xx like a bad request is raised immediately.
+  - LLM_BACKEND=stub swaps in StubChatBackend -- a local, deterministic,
+    zero-network backend for tests and offline development.
+
+SYNC CALLERS: Flask routes stay synchronous. `submit()` hands the
+request to the loop and returns a concurrent.futures.Future at once, so
+a caller that needs several completions (or has other work to do) can
+fire them all and wait once; `create()` is submit-and-wait. The waiting
+thread holds only a future, not a socket, and the upstream concurrency
+is governed by the semaphore rather than by how many worker threads
+happen to be blocked.
+
+That waiting thread is still a request thread for the full LLM
+latency, so the web server needs more than one of them: render.yaml
+runs gunicorn with the gthread worker class and 16 threads, twice the
+default LLM_MAX_CONCURRENCY, so requests that never call the LLM are
+still served while a full semaphore's worth of callers wait. Raise
+--threads together with LLM_MAX_CONCURRENCY. (gthread's timeout is a
+worker heartbeat, not a per-request limit, so a long completion or
+stream no longer trips the sync worker's 30s kill.)
+
+STREAMING: `create(stream=True, ...)` (or `stream()`) returns a plain
+iterator of ChatCompletionChunk objects, exactly what the sync OpenAI
+client returns for stream=True. The upstream stream is read on the loop
+thread and handed over through a queue as each chunk arrives, so the
+caller sees the first token as soon as OpenAI sends it. Streams are
+never coalesced (each has its own consumer), still count against the
+concurrency bound for their whole duration, apply the timeout per chunk
+(an idle upstream, not a long answer, is what times out), and are
+retried only if they fail BEFORE the first chunk -- a half-delivered
+answer is never silently restarted. Closing the iterator early (e.g.
+the HTTP client disconnected) cancels the upstream request.
+
+`get_llm_client()` returns an OpenAI-shaped facade
+(`client.chat.completions.create(**kwargs)` -> ChatCompletion), so every
+existing call site -- and every test that monkeypatches a module-level
+`client` with a fake of that same shape -- keeps working unchanged.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional
+
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_TIMEOUT_SECONDS = 120.0
+DEFAULT_MAX_RETRIES = 2
+DEFAULT_RETRY_BACKOFF_SECONDS = 1.0
+
+
+def _env_number(name: str, default, cast):
+    raw = os.getenv(name)
+    if raw in (None, ""):
+        return default
+    try:
+        return cast(raw)
+    except ValueError:
+        return default
+
+
+def _request_key(kwargs: Dict[str, Any]) -> str:
+    """Stable identity of a chat.completions request -- two calls with
+    the same key would be sent to OpenAI byte-for-byte identically."""
+    canonical = json.dumps(kwargs, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, asyncio.TimeoutError):
+        return True
+    try:
+        import openai
+    except ImportError:  # stub-only environments
+        return False
+    if isinstance(exc, (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError)):
+        return True
+    if isinstance(exc, openai.APIStatusError):
+        return exc.status_code >= 500
+    return False
+
+
+# ------------------------------------------------------------
+# Backends -- anything with `async create(**kwargs) -> ChatCompletion`.
+# ------------------------------------------------------------
+class OpenAIChatBackend:
+    def __init__(self, api_key: Optional[str] = None):
+        self._api_key = api_key
+        self._client = None
+
+    async def create(self, **kwargs):
+        if self._client is None:
+            from openai import AsyncOpenAI
+
+            # Retries are owned by LLMExecutor (so coalesced waiters and
+            # the semaphore see one logical call), never doubled here.
+            self._client = AsyncOpenAI(
+                api_key=self._api_key or os.getenv("OPENAI_API_KEY"),
+                max_retries=0,
+            )
+        return await self._client.chat.completions.create(**kwargs)
+
+
+class StubChatBackend:
+    """
+    Local backend -- no network. Returns a real
+    openai.types.chat.ChatCompletion so callers' `.choices[0].message
+    .content` / `.model_dump()` paths are exercised unchanged.
+
+    `responder(kwargs) -> str` overrides the default echo text and may
+    raise to simulate failures; `delay_seconds` simulates LLM latency
+    (time to first token when streaming). With stream=True the text is
+    sent as ChatCompletionChunk objects of `chunk_chars` characters,
+    `chunk_delay_seconds` apart.
+    """
+
+    def __init__(
+        self,
+        responder: Optional[Callable[[Dict[str, Any]], str]] = None,
+        delay_seconds: float = 0.0,
+        *,
+        chunk_chars: int = 16,
+        chunk_delay_seconds: float = 0.0,
+    ):
+        self._responder = responder
+        self.delay_seconds = delay_seconds
+        self.chunk_chars = max(1, chunk_chars)
+        self.chunk_delay_seconds = chunk_delay_seconds
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        from openai.types.chat import ChatCompletion
+
+        self.calls += 1
+        if self.delay_seconds:
+            await asyncio.sleep(self.delay_seconds)
+        if self._responder is not None:
+            text = self._responder(kwargs)
+        else:
+            user_turns = [m.get("content", "") for m in kwargs.get("messages", []) if m.get("role") == "user"]
+            text = f"[stub completion] {(user_turns[-1] if user_turns else '')[:200]}"
+        if kwargs.get("stream"):
+            return self._chunks(text, kwargs.get("model", "stub"))
+        return ChatCompletion.model_validate({
+            "id": f"stub-{self.calls}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": kwargs.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": text},
+            }],
+        })
+
+
+    async def _chunks(self, text: str, model: str):
+        from openai.types.chat import ChatCompletionChunk
+
+        for start in range(0, len(text), self.chunk_chars):
+            if start and self.chunk_delay_seconds:
+                await asyncio.sleep(self.chunk_delay_seconds)
+            yield ChatCompletionChunk.model_validate({
+                "id": f"stub-{self.calls}",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "finish_reason": None,
+                    "delta": {"content": text[start:start + self.chunk_chars]},
+                }],
+            })
+
+
+def default_backend():
+    if os.getenv("LLM_BACKEND", "openai").lower() == "stub":
+        return StubChatBackend()
+    return OpenAIChatBackend()
+
+
+# ------------------------------------------------------------
+# Executor
+# ------------------------------------------------------------
+# Markers on the queue between the loop thread and a stream() consumer.
+_CHUNK = object()
+_ERROR = object()
+_DONE = object()
+
+class LLMExecutor:
+    def __init__(
+        self,
+        backend=None,
+        *,
+        max_concurrency: Optional[int] = None,
+        timeout_seconds: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        retry_backoff_seconds: Optional[float] = None,
+    ):
+        self.backend = backend or default_backend()
+        self.max_concurrency = max(1, max_concurrency or _env_number("LLM_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY, int))
+        self.timeout_seconds = timeout_seconds or _env_number("LLM_TIMEOUT_SECONDS", DEFAULT_TIMEOUT_SECONDS, float)
+        self.max_retries = max_retries if max_retries is not None else _env_number("LLM_MAX_RETRIES", DEFAULT_MAX_RETRIES, int)
+        self.retry_backoff_seconds = (
+            retry_backoff_seconds if retry_backoff_seconds is not None
+            else _env_number("LLM_RETRY_BACKOFF_SECONDS", DEFAULT_RETRY_BACKOFF_SECONDS, float)
+        )
+
+        self._start_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+        # Observability -- read by tests and by anyone sizing
+        # LLM_MAX_CONCURRENCY.
+        self.upstream_calls = 0
+        self.coalesced = 0
+        self.retries = 0
+        self.active = 0
+        self.peak_active = 0
+
+    # -------------------- sync entry points --------------------
+    def submit(self, **kwargs) -> concurrent.futures.Future:
+        """Queue one chat.completions request; returns immediately."""
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(self.acreate(**kwargs), loop)
+
+    def create(self, **kwargs):
+        """submit() and wait -- the drop-in for client.chat.completions.create().
+        With stream=True, returns stream()'s chunk iterator instead."""
+        if kwargs.get("stream"):
+            return self.stream(**kwargs)
+        return self.submit(**kwargs).result()
+
+    def stream(self, **kwargs) -> Iterator[Any]:
+        """Start a streamed completion now; iterate the result for
+        ChatCompletionChunk objects as they arrive upstream."""
+        kwargs["stream"] = True
+        loop = self._ensure_loop()
+        chunks: "queue.Queue" = queue.Queue()
+
+        async def pump():
+            try:
+                async for chunk in self._astream(kwargs):
+                    chunks.put((_CHUNK, chunk))
+            except asyncio.CancelledError:
+                chunks.put((_DONE, None))
+                raise
+            except BaseException as exc:
+                chunks.put((_ERROR, exc))
+            else:
+                chunks.put((_DONE, None))
+
+        future = asyncio.run_coroutine_threadsafe(pump(), loop)
+        return self._drain(chunks, future)
+
+    @staticmethod
+    def _drain(chunks: "queue.Queue", future: concurrent.futures.Future) -> Iterator[Any]:
+        try:
+            while True:
+                kind, value = chunks.get()
+                if kind is _CHUNK:
+                    yield value
+                elif kind is _ERROR:
+                    raise value
+                else:
+                    return
+        finally:
+            # No-op once the stream finished; cancels the upstream
+            # request if the consumer stopped early.
+            future.cancel()
+
+    def shutdown(self):
+        with self._start_lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=5)
+
+    # -------------------- async entry point --------------------
+    async def acreate(self, **kwargs):
+        """Coalesced, bounded, retried call. Must run on this executor's
+        loop (submit() guarantees that for sync callers)."""
+        key = _request_key(kwargs)
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await self._call_with_retries(kwargs)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark retrieved so a failure nobody else awaited is not
+            # reported as "exception was never retrieved".
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._in_flight.pop(key, None)
+
+    async def _call_with_retries(self, kwargs):
+        attempt = 0
+        while True:
+            try:
+                async with self._semaphore:
+                    self.active += 1
+                    self.peak_active = max(self.peak_active, self.active)
+                    self.upstream_calls += 1
+                    try:
+                        return await asyncio.wait_for(self.backend.create(**kwargs), self.timeout_seconds)
+                    finally:
+                        self.active -= 1
+            except Exception as exc:
+                if attempt >= self.max_retries or not _is_retryable(exc):
+                    raise
+                attempt += 1
+                self.retries += 1
+                await asyncio.sleep(self.retry_backoff_seconds * (2 ** (attempt - 1)))
+
+    async def _astream(self, kwargs):
+        attempt = 0
+        while True:
+            started = False
+            try:
+                async with self._semaphore:
+                    self.active += 1
+                    self.peak_active = max(self.peak_active, self.active)
+                    self.upstream_calls += 1
+                    stream = None
+                    try:
+                        stream = await asyncio.wait_for(self.backend.create(**kwargs), self.timeout_seconds)
+                        iterator = stream.__aiter__()
+                        while True:
+                            try:
+                                chunk = await asyncio.wait_for(iterator.__anext__(), self.timeout_seconds)
+                            except StopAsyncIteration:
+                                return
+                            started = True
+                            yield chunk
+                    finally:
+                        self.active -= 1
+                        closer = getattr(stream, "aclose", None) or getattr(stream, "close", None)
+                        if closer is not None:
+                            await closer()
+            except Exception as exc:
+                if started or attempt >= self.max_retries or not _is_retryable(exc):
+                    raise
+                attempt += 1
+                self.retries += 1
+                await asyncio.sleep(self.retry_backoff_seconds * (2 ** (attempt - 1)))
+
+    # -------------------- loop management --------------------
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        # Re-created after a fork (gunicorn preload, Celery prefork): a
+        # child inherits the parent's loop object but not its thread.
+        if self._loop is not None and self._pid == os.getpid():
+            return self._loop
+        with self._start_lock:
+            if self._loop is None or self._pid != os.getpid():
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run():
+                    asyncio.set_event_loop(loop)
+                    self._semaphore = asyncio.Semaphore(self.max_concurrency)
+                    ready.set()
+                    loop.run_forever()
+
+                thread = threading.Thread(target=run, name="llm-executor", daemon=True)
+                thread.start()
+                ready.wait()
+                self._in_flight = {}
+                self._loop, self._thread, self._pid = loop, thread, os.getpid()
+        return self._loop
+
+
+# ------------------------------------------------------------
+# OpenAI-shaped sync facade
+# ------------------------------------------------------------
+class _Completions:
+    def __init__(self, executor_fn):
+        self._executor_fn = executor_fn
+
+    def create(self, **kwargs):
+        return self._executor_fn().create(**kwargs)
+
+
+class _Chat:
+    def __init__(self, executor_fn):
+        self.completions = _Completions(executor_fn)
+
+
+class LLMClient:
+    """`client.chat.completions.create(**kwargs)` routed through an
+    LLMExecutor (the process-wide one by default, resolved per call so
+    a module-level client never pins a pre-fork executor)."""
+
+    def __init__(self, executor: Optional[LLMExecutor] = None):
+        self.chat = _Chat(lambda: executor or get_llm_executor())
+
+
+_executor: Optional[LLMExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_llm_executor() -> LLMExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = LLMExecutor()
+    return _executor
+
+
+def get_llm_client() -> LLMClient:
+    return LLMClient()
@@ -0,0 +1,370 @@
+"""
+services/llm_response_cache.py
+----------------------------------------------
+Content-addressed response cache in front of the LLM.
+
+WHY: many prompts are identical for every user who shares the same
+chart features -- the ai_prediction_lab *_prompt_builder modules render
+only chart-derived facts, and the report pipeline's compute stage
+(report_pipeline._stage_compute, formerly tasks.py) fills a product
+template with summary_blocks. ReportLifecycleManager caches per
+(profile, segment, report_type, language), so two profiles with the
+same Leo-lagna / 7th-lord-in-10th configuration still paid for two
+identical completions. This module answers the second one from a
+shared store instead.
+
+KEY: sha256(model | prompt_version | sha256(normalized prompt)).
+  - normalize_prompt() only removes whitespace noise (trailing spaces,
+    runs of spaces/tabs, 3+ blank lines, leading/trailing blank lines)
+    -- case and wording are untouched, so two prompts share a key only
+    when the model would see the same text.
+  - prompt_version is the generator's PROMPT_VERSION (or the pipeline's
+    product template name): bumping it invalidates every old entry of
+    that prompt family without touching the table.
+  - Anything time-dependent (today's date, current transits) is already
+    INSIDE the prompt text, so it changes the key by itself; the TTL is
+    an upper bound on staleness, not the freshness mechanism.
+
+STORES (LLM_CACHE_BACKEND):
+  - "postgres" (default) -- the `llm_response_cache` table
+    (models.LLMResponseCacheEntry), shared by every worker/process. It
+    talks to the database on its own connection (db.engine.begin()),
+    never through db.session, so a cache read/write can never commit or
+    roll back the caller's unit of work.
+  - "memory" -- a per-process LRU, for local development and tests.
+  - "off" -- no cache; every call goes upstream.
+
+BOUNDS: entries expire after LLM_CACHE_TTL_SECONDS (default 7 days);
+the store is capped at LLM_CACHE_MAX_ENTRIES (default 50,000), evicting
+least-recently-used entries first. Eviction runs on every write --
+writes happen only on a miss, which already cost a full LLM call.
+
+FAIL-OPEN: a cache error (no app context, database down, bad row) is
+counted in `errors`, logged, and the caller falls straight through to
+the live LLM call -- the cache can make a report faster, never fail it.
+
+Two identical prompts that miss at the same instant both reach
+services/llm_executor.py, whose in-flight coalescing already collapses
+them into one upstream call; the second write is a harmless upsert.
+
+Hit-rate metrics: stats() -- per-process hits/misses/stores/evictions/
+errors plus the store's entry count and persisted cross-worker hit
+total -- served at /admin/api/metrics/llm-cache (routes/routes_metrics.py).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Tuple
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 50_000
+
+_TRAILING_SPACE = re.compile(r"[ \t]+\n")
+_INNER_SPACE = re.compile(r"[ \t]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def normalize_prompt(prompt: str) -> str:
+    text = prompt.replace("\r\n", "\n").replace("\r", "\n")
+    text = _TRAILING_SPACE.sub("\n", text)
+    text = _INNER_SPACE.sub(" ", text)
+    text = _BLANK_LINES.sub("\n\n", text)
+    return text.strip()
+
+
+def prompt_hash(prompt: str) -> str:
+    return hashlib.sha256(normalize_prompt(prompt).encode("utf-8")).hexdigest()
+
+
+def cache_key(model: str, prompt: str, prompt_version: Optional[str]) -> str:
+    identity = f"{model}|{prompt_version or ''}|{prompt_hash(prompt)}"
+    return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CachedResponse:
+    text: str
+    raw: Dict[str, Any]
+
+
+@dataclass
+class LLMCacheStats:
+    backend: str
+    hits: int
+    misses: int
+    stores: int
+    evictions: int
+    errors: int
+    # hits / (hits + misses) for THIS process; None before any lookup.
+    hit_rate: Optional[float]
+    # Store-wide figures (every worker), None if the store is unreachable.
+    entries: Optional[int]
+    persisted_hits: Optional[int]
+    ttl_seconds: int
+    max_entries: int
+
+
+# ------------------------------------------------------------
+# Stores -- get() / put() / size() / total_hits()
+# ------------------------------------------------------------
+class InMemoryLLMCacheStore:
+    name = "memory"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._hits = 0
+
+    def get(self, key: str, now: datetime) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry["expires_at"] <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            entry["hit_count"] += 1
+            self._hits += 1
+            return CachedResponse(text=entry["response_text"], raw=dict(entry["raw_response"] or {}))
+
+    def put(self, key: str, row: Dict[str, Any], now: datetime, max_entries: int) -> int:
+        with self._lock:
+            self._entries[key] = dict(row)
+            self._entries.move_to_end(key)
+            evicted = 0
+            for stale in [k for k, e in self._entries.items() if e["expires_at"] <= now]:
+                del self._entries[stale]
+                evicted += 1
+            while len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+            return evicted
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def total_hits(self) -> int:
+        with self._lock:
+            return self._hits
+
+
+class PostgresLLMCacheStore:
+    name = "postgres"
+
+    def _table(self):
+        from models import LLMResponseCacheEntry
+
+        return LLMResponseCacheEntry.__table__
+
+    def _engine(self):
+        from extensions import db
+
+        return db.engine
+
+    def get(self, key: str, now: datetime) -> Optional[CachedResponse]:
+        from sqlalchemy import update
+
+        table = self._table()
+        # One round trip: bump the hit tally / LRU clock and read the
+        # payload, only if the row exists and has not expired.
+        statement = (
+            update(table)
+            .where(table.c.cache_key == key, table.c.expires_at > now)
+            .values(hit_count=table.c.hit_count + 1, last_used_at=now)
+            .returning(table.c.response_text, table.c.raw_response)
+        )
+        with self._engine().begin() as conn:
+            row = conn.execute(statement).first()
+        if row is None:
+            return None
+        return CachedResponse(text=row.response_text, raw=dict(row.raw_response or {}))
+
+    def put(self, key: str, row: Dict[str, Any], now: datetime, max_entries: int) -> int:
+        from sqlalchemy import delete, select
+        from sqlalchemy.dialects.postgresql import insert
+
+        table = self._table()
+        values = dict(row, cache_key=key)
+        upsert = insert(table).values(**values)
+        upsert = upsert.on_conflict_do_update(
+            index_elements=[table.c.cache_key],
+            set_={
+                "response_text": upsert.excluded.response_text,
+                "raw_response": upsert.excluded.raw_response,
+                "created_at": upsert.excluded.created_at,
+                "expires_at": upsert.excluded.expires_at,
+                "last_used_at": upsert.excluded.last_used_at,
+            },
+        )
+        overflow = (
+            select(table.c.cache_key)
+            .order_by(table.c.last_used_at.desc())
+            .offset(max_entries)
+            .scalar_subquery()
+        )
+        with self._engine().begin() as conn:
+            conn.execute(upsert)
+            evicted = conn.execute(delete(table).where(table.c.expires_at <= now)).rowcount
+            evicted += conn.execute(delete(table).where(table.c.cache_key.in_(overflow))).rowcount
+        return evicted
+
+    def size(self) -> int:
+        from sqlalchemy import func, select
+
+        table = self._table()
+        with self._engine().connect() as conn:
+            return conn.execute(select(func.count()).select_from(table)).scalar_one()
+
+    def total_hits(self) -> int:
+        from sqlalchemy import func, select
+
+        table = self._table()
+        with self._engine().connect() as conn:
+            return conn.execute(select(func.coalesce(func.sum(table.c.hit_count), 0))).scalar_one()
+
+
+def default_store():
+    backend = os.getenv("LLM_CACHE_BACKEND", "postgres").lower()
+    if backend == "off":
+        return None
+    if backend == "memory":
+        return InMemoryLLMCacheStore()
+    return PostgresLLMCacheStore()
+
+
+# ------------------------------------------------------------
+# Cache
+# ------------------------------------------------------------
+class LLMResponseCache:
+    def __init__(
+        self,
+        store=None,
+        *,
+        ttl_seconds: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        now_fn: Optional[Callable[[], datetime]] = None,
+    ):
+        # `store=None` means disabled -- use default_store() (or
+        # get_llm_response_cache()) for the env-configured one.
+        self.store = store
+        self.ttl_seconds = ttl_seconds or _env_int("LLM_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)
+        self.max_entries = max(1, max_entries or _env_int("LLM_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+        self._now = now_fn or datetime.utcnow
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.errors = 0
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def lookup(self, *, model: str, prompt: str, prompt_version: Optional[str]) -> Optional[CachedResponse]:
+        if self.store is None:
+            return None
+        try:
+            cached = self.store.get(cache_key(model, prompt, prompt_version), self._now())
+        except Exception as exc:
+            self._count("errors")
+            print(f"[LLMCache] ⚠️ lookup failed, calling the LLM instead: {exc}")
+            return None
+        self._count("hits" if cached is not None else "misses")
+        return cached
+
+    def save(self, *, model: str, prompt: str, prompt_version: Optional[str], text: str, raw: Dict[str, Any]) -> None:
+        if self.store is None:
+            return
+        now = self._now()
+        row = {
+            "model": model,
+            "prompt_version": prompt_version or "",
+            "prompt_hash": prompt_hash(prompt),
+            "response_text": text,
+            "raw_response": raw,
+            "created_at": now,
+            "expires_at": now + timedelta(seconds=self.ttl_seconds),
+            "last_used_at": now,
+            "hit_count": 0,
+        }
+        try:
+            evicted = self.store.put(cache_key(model, prompt, prompt_version), row, now, self.max_entries)
+        except Exception as exc:
+            self._count("errors")
+            print(f"[LLMCache] ⚠️ store failed (response still returned): {exc}")
+            return
+        self._count("stores")
+        self._count("evictions", evicted)
+
+    def fetch(
+        self,
+        *,
+        model: str,
+        prompt: str,
+        prompt_version: Optional[str],
+        call: Callable[[], Tuple[str, Dict[str, Any]]],
+    ) -> Tuple[str, Dict[str, Any], bool]:
+        """(text, raw, hit) -- the cached response if there is one,
+        otherwise `call()`'s result, which is then stored. Exceptions
+        from `call()` propagate and nothing is stored."""
+        cached = self.lookup(model=model, prompt=prompt, prompt_version=prompt_version)
+        if cached is not None:
+            return cached.text, cached.raw, True
+        text, raw = call()
+        self.save(model=model, prompt=prompt, prompt_version=prompt_version, text=text, raw=raw)
+        return text, raw, False
+
+    def stats(self) -> LLMCacheStats:
+        entries = persisted_hits = None
+        if self.store is not None:
+            try:
+                entries = self.store.size()
+                persisted_hits = self.store.total_hits()
+            except Exception as exc:
+                print(f"[LLMCache] ⚠️ could not read store-wide stats: {exc}")
+        with self._lock:
+            lookups = self.hits + self.misses
+            return LLMCacheStats(
+                backend=self.store.name if self.store is not None else "off",
+                hits=self.hits,
+                misses=self.misses,
+                stores=self.stores,
+                evictions=self.evictions,
+                errors=self.errors,
+                hit_rate=round(self.hits / lookups, 4) if lookups else None,
+                entries=entries,
+                persisted_hits=persisted_hits,
+                ttl_seconds=self.ttl_seconds,
+                max_entries=self.max_entries,
+            )
+
+
+_cache: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_response_cache() -> LLMResponseCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LLMResponseCache(default_store())
+    return _cache
@@ -0,0 +1,158 @@
+# lunar_calendar.py
+"""
+Precomputed amanta month + sunrise-day tithi calendar.
+
+Festival engines (navratri_engine) used to decide "which tithi / which
+month is this day" by sampling the ephemeris per civil day: several
+_tithi_number_at() calls around sunrise and two get_amanta_month() calls
+(each a day-stepped + binary Amavasya search) for every day scanned.
+
+This module builds the same facts once for a date range from exact tithi
+intervals (services/karana_intervals.py):
+
+    lunar_months(start_dt, end_dt)
+        every amanta month overlapping the range -- Amavasya end to
+        Amavasya end, named and adhik-flagged exactly like
+        lunar_month_engine.get_amanta_month()
+    build_tithi_calendar(start_date, end_date, lat, lon)
+        one CalendarDay per civil day: sunrise/sunset (sun_calc, no
+        ephemeris), the tithis touching sunrise -> next sunrise (the
+        first is the sunrise tithi), kshaya / vriddhi with the same
+        definition as calculate_panchang()["tithi_special"], and the
+        amanta month at sunrise
+
+Ephemeris cost is one Newton solve per tithi boundary and per new moon,
+plus two Sun positions per month -- instead of dozens of samples per
+day.
+"""
+
+from __future__ import annotations
+
+import bisect
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+
+from services.karana_intervals import LunarInterval, lunation_intervals, tithi_intervals
+from services.lunar_month_engine import HINDU_MONTHS, _sun_rashi_index
+from services.sun_calc import calculate_sunrise_sunset
+
+PRATIPADA = 1
+
+
+@dataclass(frozen=True)
+class LunarMonth:
+    """Amanta month: starts when Amavasya ends, ends when the next one does."""
+
+    name: str
+    index: int
+    is_adhik: bool
+    start: datetime
+    end: datetime
+
+    def contains(self, dt: datetime) -> bool:
+        return self.start <= dt < self.end
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "is_adhik": self.is_adhik, "index": self.index}
+
+
+@dataclass(frozen=True)
+class CalendarDay:
+    date: date
+    sunrise: datetime
+    sunset: datetime
+    next_sunrise: datetime
+    tithis: List[LunarInterval]  # every tithi touching sunrise -> next sunrise
+    month: Optional[LunarMonth]  # amanta month at sunrise
+
+    @property
+    def sunrise_tithi(self) -> LunarInterval:
+        return self.tithis[0]
+
+    @property
+    def transition_count(self) -> int:
+        return len(self.tithis) - 1
+
+    @property
+    def kshaya(self) -> bool:
+        # a whole tithi begins and ends between two sunrises
+        return self.transition_count >= 2
+
+    @property
+    def vriddhi(self) -> bool:
+        # the same tithi at both sunrises
+        return self.transition_count == 0
+
+    def tithi_at(self, dt: datetime) -> Optional[LunarInterval]:
+        return next((t for t in self.tithis if t.contains(dt)), None)
+
+
+def _month_from_bounds(start: datetime, end: datetime) -> LunarMonth:
+    # Same sampling points as get_amanta_month()
+    rashi_start = _sun_rashi_index(start + timedelta(hours=2))
+    rashi_end = _sun_rashi_index(end - timedelta(hours=2))
+    return LunarMonth(
+        name=HINDU_MONTHS[rashi_end],
+        index=rashi_end,
+        is_adhik=(rashi_start == rashi_end),
+        start=start,
+        end=end,
+    )
+
+
+def lunar_months(start_dt: datetime, end_dt: datetime) -> List[LunarMonth]:
+    """Every amanta month overlapping [start_dt, end_dt), in order."""
+    return [_month_from_bounds(l.start, l.end) for l in lunation_intervals(start_dt, end_dt)]
+
+
+def _sun_times(dates, lat: float, lon: float):
+    sun = []
+    for d in dates:
+        sunrise, sunset = calculate_sunrise_sunset(d, lat, lon)
+        # sun_calc returns aware IST; the tithi calendar is naive IST
+        sun.append((
+            sunrise.replace(tzinfo=None) if sunrise else None,
+            sunset.replace(tzinfo=None) if sunset else None,
+        ))
+    # sun_calc occasionally fails for a single day -- borrow a neighbour's
+    # times shifted by a day, like calculate_panchang() does for tomorrow.
+    for i, (sunrise, sunset) in enumerate(sun):
+        if sunrise is None or sunset is None:
+            for j, shift in ((i - 1, 1), (i + 1, -1)):
+                if 0 <= j < len(sun) and None not in sun[j]:
+                    sun[i] = tuple(t + timedelta(days=shift) for t in sun[j])
+                    break
+            else:
+                base = datetime.combine(dates[i], datetime.min.time())
+                sun[i] = (base + timedelta(hours=6), base + timedelta(hours=18))
+    return sun
+
+
+def build_tithi_calendar(start_date: date, end_date: date, lat: float, lon: float) -> List[CalendarDay]:
+    """CalendarDay for every civil day in [start_date, end_date]."""
+    dates = [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 2)]
+    sun = _sun_times(dates, lat, lon)
+    sunrises = [s[0] for s in sun]
+
+    tithis = tithi_intervals(sunrises[0], sunrises[-1] + timedelta(seconds=1))
+    tithi_ends = [t.end for t in tithis]
+    months = lunar_months(sunrises[0], sunrises[-1])
+    month_starts = [m.start for m in months]
+
+    days: List[CalendarDay] = []
+    for i, d in enumerate(dates[:-1]):
+        sunrise, sunset = sun[i]
+        next_sunrise = sunrises[i + 1]
+        first = bisect.bisect_right(tithi_ends, sunrise)
+        last = bisect.bisect_right(tithi_ends, next_sunrise)
+        m = bisect.bisect_right(month_starts, sunrise) - 1
+        days.append(CalendarDay(
+            date=d,
+            sunrise=sunrise,
+            sunset=sunset,
+            next_sunrise=next_sunrise,
+            tithis=tithis[first:last + 1],
+            month=months[m] if m >= 0 and months[m].contains(sunrise) else None,
+        ))
+    return days
@@ -1,9 +1,5 @@
 import os
-from services.personalization_engine import (
-    get_users_for_transit,
-    get_users_for_dasha_change,
-    get_current_dasha_users
-)
+from services.personalization_engine import AudienceResolver
 from services.relative_day import get_relative_day, TODAY, TOMORROW, YESTERDAY
 from services.card_service import build_good_morning_card
 from datetime import date, timedelta
@@ -205,15 +201,22 @@ def build_panchang_content(event):
     }
 
 
-def get_user_notifications(user, events):
+def get_user_notifications(user, events, audiences=None):
     """
     Returns personalized notifications for a user. There is no generic
     "global" fallback section any more -- if nothing below has anything
     eligible to say, this simply returns an empty list (v1.1 freeze:
     the generic "Aaj ka Din Mahatvapurn Hai" fallback is removed and
     must never be sent).
+
+    `audiences` is an AudienceResolver shared across every user of one
+    scheduler run, so transit / dasha audiences are resolved once per
+    run; a fresh one is used when called for a single user.
     """
 
+    if audiences is None:
+        audiences = AudienceResolver()
+
     final_notifications = []
     seen = set()
 
@@ -268,91 +271,81 @@ def get_user_notifications(user, events):
     # refuse to send once the transit day has actually begun (delayed-cron
     # safety), and what stops the morning slot from ever double-sending the
     # same transit later the same day.
-    transit_map = {}
+    transit_slot = os.getenv("NOTIFICATION_SLOT", "").strip().lower()
 
     for event in events:
         event_type = getattr(event, "type", None)
         event_id = getattr(event, "id", None)
+        event_date = getattr(event, "date", None)
 
         if event_type != "transit" or not event_id:
             continue
 
+        if transit_slot != "evening":
+            continue
+        if get_relative_day(event_date) != TOMORROW:
+            continue
+
         try:
-            transit_map[event_id] = get_users_for_transit(event)
+            # This user's house for the transit, from the event's
+            # lagna -> house table (services/personalization_engine.py)
+            target = audiences.transit_house(event, user)
         except Exception as e:
             print(f"❌ Transit map error for event {event_id}: {str(e)}")
             continue
 
-    transit_slot = os.getenv("NOTIFICATION_SLOT", "").strip().lower()
-
-    for event in events:
-        event_type = getattr(event, "type", None)
-        event_id = getattr(event, "id", None)
-        event_date = getattr(event, "date", None)
-
-        if event_type != "transit" or not event_id:
+        if target is None:
             continue
+        planet, house = target
 
-        if transit_slot != "evening":
-            continue
-        if get_relative_day(event_date) != TOMORROW:
-            continue
+        try:
+            event_id_str = f"transit_{event_id}_{planet}_{house}"
 
-        for u in transit_map.get(event_id, []):
-            try:
-                if u["user"].id != user.id:
-                    continue
-
-                event_id_str = f"transit_{event_id}_{u['planet']}_{u['house']}"
-
-                if event_id_str in seen:
-                    continue
-                seen.add(event_id_str)
-
-                # Language: resolved once, deterministically, from the
-                # user's own persisted preference (modules/models_user.py::
-                # AppUser.lang, N3) -- never device guesswork. Unset/
-                # unrecognized values fall back to "en", matching this
-                # project's existing default (see routes_profile_bootstrap.py
-                # ::bootstrap_user_profile()'s own `data.get("lang", "en")`).
-                lang = (getattr(user, "lang", None) or "en").strip().lower()
-                if lang not in ("en", "hi"):
-                    lang = "en"
-
-                content = build_transit_content(u["planet"], u["house"], lang)
-
-                data = {
-                    "type": "transit",
-                    "event_id": str(event_id),
-                    "planet": u["planet"],
-                    "house": str(u["house"]),
-                    "language": lang,
-                }
-                if event_date is not None:
-                    data["transit_date"] = str(event_date)
-                if content["url"]:
-                    data["url"] = content["url"]
-
-                final_notifications.append({
-                    "title": content["title"],
-                    "body": content["body"],
-                    "data": data,
-                })
-
-            except Exception as e:
-                print(f"❌ Transit user error: {str(e)}")
+            if event_id_str in seen:
                 continue
+            seen.add(event_id_str)
+
+            # Language: resolved once, deterministically, from the
+            # user's own persisted preference (modules/models_user.py::
+            # AppUser.lang, N3) -- never device guesswork. Unset/
+            # unrecognized values fall back to "en", matching this
+            # project's existing default (see routes_profile_bootstrap.py
+            # ::bootstrap_user_profile()'s own `data.get("lang", "en")`).
+            lang = (getattr(user, "lang", None) or "en").strip().lower()
+            if lang not in ("en", "hi"):
+                lang = "en"
+
+            content = build_transit_content(planet, house, lang)
+
+            data = {
+                "type": "transit",
+                "event_id": str(event_id),
+                "planet": planet,
+                "house": str(house),
+                "language": lang,
+            }
+            if event_date is not None:
+                data["transit_date"] = str(event_date)
+            if content["url"]:
+                data["url"] = content["url"]
+
+            final_notifications.append({
+                "title": content["title"],
+                "body": content["body"],
+                "data": data,
+            })
+
+        except Exception as e:
+            print(f"❌ Transit user error: {str(e)}")
+            continue
 
     # ---------------------------
     # 🔹 DASHA T-5 ALERT
     # ---------------------------
-    t_minus_5_users = get_users_for_dasha_change(days_before=5)
+    t_minus_5_users = audiences.dasha_changes(user.id, days_before=5)
 
     for d in t_minus_5_users:
-        if d["user"].id != user.id:
-            continue
-
-        event_id_str = f"dasha_pre_{d['user'].id}_{d['mahadasha']}_{d['antardasha']}"
+        event_id_str = f"dasha_pre_{user.id}_{d['mahadasha']}_{d['antardasha']}"
 
         if event_id_str in seen:
             continue
@@ -380,13 +373,10 @@ def get_user_notifications(user, events):
     # ---------------------------
     # 🔹 DASHA START (SAME DAY)
     # ---------------------------
-    dasha_users = get_users_for_dasha_change()
+    dasha_users = audiences.dasha_changes(user.id)
 
     for d in dasha_users:
-        if d["user"].id != user.id:
-            continue
-
-        event_id_str = f"dasha_{d['user'].id}_{d['mahadasha']}_{d['antardasha']}"
+        event_id_str = f"dasha_{user.id}_{d['mahadasha']}_{d['antardasha']}"
 
         if event_id_str in seen:
             continue
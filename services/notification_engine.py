@@ -1,5 +1,5 @@
 from datetime import datetime, timedelta, timezone
-from models import AstroEvent
+from services.event_calendar import events_notifying_on, events_on
 from firebase_admin import messaging
 from collections import defaultdict
 
@@ -20,9 +20,7 @@ def get_today_date():
 def get_today_notifications():
     today = get_today_date()
 
-    return AstroEvent.query.filter(
-        AstroEvent.date == today
-    ).all()
+    return events_on(today)
 
 
 # -------------------------------
@@ -37,36 +35,16 @@ def build_notifications(target_date=None):
     print(f"\n🧪 TARGET DATE: {target_date}")
 
     # 🔹 GET TODAY EVENTS
-    today_events = AstroEvent.query.filter(
-        AstroEvent.date == target_date
-    ).all()
+    today_events = events_on(target_date)
 
     print(f"🧪 Today events count: {len(today_events)}")
 
     # 🔹 GET PRE-EVENTS
-    all_db_events = AstroEvent.query.all()
-    print(f"🧪 Total DB events: {len(all_db_events)}")
-
-    pre_events = []
-
-    for event in all_db_events:
-        if event.notify_before_days is None:
-            continue
-
-        try:
-            event_date = event.date
-
-            if isinstance(event_date, str):
-                event_date = datetime.strptime(event_date, "%Y-%m-%d").date()
-
-            notify_date = event_date - timedelta(days=event.notify_before_days)
-
-            if notify_date == target_date:
-                print(f"📅 Pre-event matched: {event.name}")
-                pre_events.append(event)
-
-        except Exception as e:
-            print(f"❌ Pre-event error (event {event.id}): {str(e)}")
+    # date - notify_before_days == target_date, answered by
+    # ix_astro_events_notify_on instead of loading every row.
+    pre_events = events_notifying_on(target_date)
+    for event in pre_events:
+        print(f"📅 Pre-event matched: {event.name}")
 
     print(f"🧪 Pre events count: {len(pre_events)}")
 
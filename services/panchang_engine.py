@@ -409,6 +409,7 @@ def _karan_at(dt_ist):
     """
     Exact Karan at specific IST datetime.
     Used for festival-level precision (Holika Dahan etc).
+    For exact karan start/end times use services/karana_intervals.py.
     """
     sun, moon = sidereal_longitudes(dt_ist)
     diff = (moon - sun) % 360.0
@@ -416,20 +417,25 @@ def _karan_at(dt_ist):
     # 1..60 karan slots (each = 6 degrees)
     slot = int(diff // 6.0) + 1
 
+    return _karan_name_for_slot(slot), slot
+
+def _karan_name_for_slot(slot):
+    """Karan name for a 1..60 slot -- shared by _karan_at() and the
+    interval engine so both always agree."""
     if slot == 1:
-        return "Kimstughna", slot
+        return "Kimstughna"
     if 2 <= slot <= 56:
-        return KARANS_REPEATING[(slot - 2) % 7], slot
+        return KARANS_REPEATING[(slot - 2) % 7]
     if slot == 57:
-        return "Shakuni", slot
+        return "Shakuni"
     if slot == 58:
-        return "Chatushpada", slot
+        return "Chatushpada"
     if slot == 59:
-        return "Naga", slot
+        return "Naga"
     if slot == 60:
-        return "Vishti (Bhadra)", slot
+        return "Vishti (Bhadra)"
 
-    return "Unknown", slot
+    return "Unknown"
 
 def _tithi_start_end_ist(sunrise_dt):
     """
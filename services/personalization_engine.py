@@ -2,6 +2,8 @@ from modules.models_user import AppUser
 from datetime import datetime, timezone, timedelta, date
 from modules.models_user import UserDashaTimeline
 from services.notification_engine import IST
+from extensions import db
+from sqlalchemy import select
 
 # 🔹 Rashi map
 RASHI_MAP = {
@@ -10,6 +12,11 @@ RASHI_MAP = {
     "sagittarius": 9, "capricorn": 10, "aquarius": 11, "pisces": 12
 }
 
+# Houses a transit is notified for
+TRANSIT_HOUSES = (1, 4, 7, 8, 10, 12)
+
+AUDIENCE_BATCH_SIZE = 1000
+
 
 # -------------------------------
 # 🔹 House Calculation
@@ -24,37 +31,110 @@ def calculate_house(lagna, planet_rashi):
     return (rashi_num - lagna_num + 12) % 12 + 1
 
 
-# -------------------------------
-# 🔹 Transit Users
-# -------------------------------
-def get_users_for_transit(event):
-    if not event.meta:
-        return []
+def normalize_lagna(lagna):
+    return str(lagna).strip().lower() if lagna else None
 
-    planet = event.meta.get("planet")
-    rashi = event.meta.get("rashi")
 
+# -------------------------------
+# 🔹 Audience Resolution
+# -------------------------------
+# Audiences used to be resolved by loading EVERY AppUser with a lagna
+# (or every UserDashaTimeline row) and filtering in Python -- once per
+# event, and get_user_notifications() did it again for every user it
+# was called for. Now (AudienceResolver, once per scheduler run):
+#   - a transit's house depends only on the lagna, so the 12
+#     lagna -> house results are computed once per event and each user's
+#     own lagna is looked up in that table -- no query at all;
+#   - a dasha-change audience is one query on the
+#     ix_user_dasha_timeline_start_date index, streamed as ids (plus the
+#     per-user fields the notification needs), never ORM users.
+
+def house_by_lagna(planet_rashi, houses=TRANSIT_HOUSES):
+    """{normalized lagna: house} for the lagnas whose house is in `houses`."""
+    table = {}
+    for lagna in RASHI_MAP:
+        house = calculate_house(lagna, planet_rashi)
+        if house in houses:
+            table[lagna] = house
+    return table
+
+
+def _transit_target(event):
+    # Typed columns (services/event_calendar.py rows), else meta.
+    meta = getattr(event, "meta", None) or {}
+    planet = getattr(event, "planet", None) or meta.get("planet")
+    rashi = getattr(event, "rashi", None) or meta.get("rashi")
     if not planet or not rashi:
-        return []
-
-    target_users = []
-
-    users = AppUser.query.filter(AppUser.lagna.isnot(None)).all()
-
-    for user in users:
-        if not user.lagna:
-            continue
-
-        house = calculate_house(user.lagna, rashi)
-
-        if house in [1, 4, 7, 8, 10, 12]:
-            target_users.append({
-                "user": user,
-                "house": house,
-                "planet": planet
-            })
-
-    return target_users
+        return None, {}
+    return planet, house_by_lagna(rashi)
+
+
+def _stream(statement, batch_size):
+    # Same session (and transaction) the ORM queries used; rows are
+    # fetched batch_size at a time instead of all at once.
+    yield from db.session.execute(statement.execution_options(yield_per=batch_size))
+
+
+def iter_dasha_change_audience(target_date, batch_size=AUDIENCE_BATCH_SIZE):
+    """Yields (user_id, mahadasha, antardasha, start_date) for every
+    dasha period starting on target_date."""
+    statement = (
+        select(
+            UserDashaTimeline.user_id,
+            UserDashaTimeline.mahadasha,
+            UserDashaTimeline.antardasha,
+            UserDashaTimeline.start_date,
+        )
+        .join(AppUser, AppUser.id == UserDashaTimeline.user_id)
+        .where(UserDashaTimeline.start_date == target_date)
+        .order_by(UserDashaTimeline.user_id, UserDashaTimeline.id)
+    )
+    yield from (tuple(row) for row in _stream(statement, batch_size))
+
+
+class AudienceResolver:
+    """
+    Per-run memo for get_user_notifications(): each transit's lagna table
+    and each dasha-change audience is resolved once per scheduler run, not
+    once per user. Transit membership needs no query at all -- the user's
+    own lagna is looked up in the event's 12-entry table.
+    """
+
+    def __init__(self, today=None):
+        self.today = today or datetime.now(IST).date()
+        self._transits = {}
+        self._dasha_changes = {}
+
+    def transit_house(self, event, user):
+        """(planet, house) if this transit is for `user`, else None."""
+        key = getattr(event, "id", None) or id(event)
+        if key not in self._transits:
+            self._transits[key] = _transit_target(event)
+        planet, table = self._transits[key]
+        house = table.get(normalize_lagna(getattr(user, "lagna", None)))
+        return (planet, house) if house else None
+
+    def dasha_changes(self, user_id, days_before=0):
+        """This user's dasha periods starting `days_before` days from today."""
+        if days_before not in self._dasha_changes:
+            by_user = {}
+            target_date = self.today + timedelta(days=days_before)
+            for row_user_id, mahadasha, antardasha, start_date in iter_dasha_change_audience(target_date):
+                by_user.setdefault(row_user_id, []).append({
+                    "mahadasha": mahadasha,
+                    "antardasha": antardasha,
+                    "start_date": start_date,
+                })
+            self._dasha_changes[days_before] = by_user
+        return self._dasha_changes[days_before].get(user_id, [])
+
+
+def _users_by_id(ids):
+    users = {}
+    for i in range(0, len(ids), AUDIENCE_BATCH_SIZE):
+        chunk = ids[i:i + AUDIENCE_BATCH_SIZE]
+        users.update((u.id, u) for u in AppUser.query.filter(AppUser.id.in_(chunk)).all())
+    return users
 
 
 # -------------------------------
@@ -65,20 +145,19 @@ def get_users_for_dasha_change(days_before=0):
 
     target_date = today + timedelta(days=days_before)
 
-    rows = UserDashaTimeline.query.filter(
-        UserDashaTimeline.start_date == target_date
-    ).all()
+    rows = list(iter_dasha_change_audience(target_date))
+    users = _users_by_id(sorted({r[0] for r in rows}))
 
     result = []
 
-    for r in rows:
-        if not r.user:
+    for user_id, mahadasha, antardasha, start_date in rows:
+        if user_id not in users:
             continue
 
         result.append({
-            "user": r.user,
-            "mahadasha": r.mahadasha,
-            "antardasha": r.antardasha,
+            "user": users[user_id],
+            "mahadasha": mahadasha,
+            "antardasha": antardasha,
             "type": "dasha_change",
             "days_before": days_before,
             # N2.1 -- the authoritative transition date this row is
@@ -86,31 +165,7 @@ def get_users_for_dasha_change(days_before=0):
             # simply surfaced rather than recomputed/guessed downstream.
             # Query/selection logic itself (who matches, days_before
             # semantics) is completely unchanged.
-            "start_date": r.start_date,
-        })
-
-    return result
-
-
-def get_current_dasha_users():
-    today = datetime.now(IST).date()
-
-    rows = UserDashaTimeline.query.filter(
-        UserDashaTimeline.start_date <= today,
-        UserDashaTimeline.end_date >= today
-    ).all()
-
-    result = []
-
-    for r in rows:
-        if not r.user:
-            continue
-
-        result.append({
-            "user": r.user,
-            "mahadasha": r.mahadasha,
-            "antardasha": r.antardasha,
-            "type": "running"
+            "start_date": start_date,
         })
 
     return result
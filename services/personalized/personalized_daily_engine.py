@@ -1,9 +1,23 @@
 # personalized_daily_engine.py
 # (Transit Engine for Personalized Daily Horoscope)
+#
+# Per-lagna daily precompute: the profile depends only on (date, lagna)
+# plus the paksha at the requested location -- planet positions are
+# read at IST midnight of the date and are the same for every lagna,
+# only the houses differ. So each IST day's 9 planet positions are
+# computed ONCE, all 12 lagna profiles for today + tomorrow are built
+# from them on the first request of the day, and calculate_panchang
+# runs once per (date, lat, lon) instead of twice per request.
+# Entries for days before the current IST day are evicted as soon as
+# the day rolls over.
 
 from smart_transit_engine import get_planet_position_on
 from services.panchang_engine import calculate_panchang
+from collections import OrderedDict
+import copy
 import datetime
+import threading
+import pytz
 
 # ---------------------------------------
 # Constants
@@ -24,6 +38,15 @@ NAKSHATRAS = [
 
 PLANETS_FOR_ASPECT = ["Sun","Mercury","Venus","Mars","Jupiter","Saturn","Rahu","Ketu"]
 
+IST = pytz.timezone("Asia/Kolkata")
+
+DEFAULT_LAT = 28.6
+DEFAULT_LON = 77.2
+
+# Paksha entries per day are one per distinct request location; bound
+# them so a day of scattered coordinates can't grow without limit.
+MAX_PAKSHA_ENTRIES = 5000
+
 
 # ---------------------------------------
 # Nakshatra finder using 0–360 degree logic
@@ -83,15 +106,22 @@ def planet_aspects_moon(planet_name, planet_house, moon_house):
 
 
 # ---------------------------------------
-# Build Today Positions
+# Planet positions for a date (lagna-independent)
 # ---------------------------------------
-def get_today_positions(date_str, lagna, lat, lon):
+def get_planet_positions_for_day(date_str):
+    return {p: get_planet_position_on(date_str, p) for p in ["Moon"] + PLANETS_FOR_ASPECT}
+
+
+# ---------------------------------------
+# One lagna's view of a day's positions (no paksha)
+# ---------------------------------------
+def build_lagna_positions(lagna, positions):
     out = {}
 
     # -------------------------
     # MOON
     # -------------------------
-    moon = get_planet_position_on(date_str, "Moon")
+    moon = positions["Moon"]
     moon_rashi = moon["rashi"]
     moon_deg = moon["degree"]
     moon_house = get_house(lagna, moon_rashi)
@@ -113,7 +143,7 @@ def get_today_positions(date_str, lagna, lat, lon):
     planets_out = {}
 
     for p in PLANETS_FOR_ASPECT:
-        pos = get_planet_position_on(date_str, p)
+        pos = positions[p]
 
         r = pos["rashi"]
         h = get_house(lagna, r)
@@ -128,32 +158,127 @@ def get_today_positions(date_str, lagna, lat, lon):
         }
 
     out["planets"] = planets_out
+    return out
 
-    # -------------------------
-    # PANCHANG PAKSHA
-    # -------------------------
+
+# ---------------------------------------
+# Panchang paksha for a date + location
+# ---------------------------------------
+def get_paksha(date_str, lat, lon):
     date_obj = datetime.datetime.strptime(date_str, "%Y-%m-%d").date()
     panchang = calculate_panchang(date_obj, lat, lon)
-    out["paksha"] = panchang["tithi"]["paksha"]
+    return panchang["tithi"]["paksha"]
+
 
+# ---------------------------------------
+# Build Today Positions (uncached, single lagna)
+# ---------------------------------------
+def get_today_positions(date_str, lagna, lat, lon):
+    out = build_lagna_positions(lagna, get_planet_positions_for_day(date_str))
+    out["paksha"] = get_paksha(date_str, lat, lon)
     return out
 
 
 # ---------------------------------------
-# Tomorrow
+# Tomorrow (uncached, single lagna)
 # ---------------------------------------
 def get_tomorrow_positions(lagna, lat, lon):
-    tomorrow = (datetime.datetime.now() + datetime.timedelta(days=1)).strftime("%Y-%m-%d")
+    tomorrow = (_ist_today() + datetime.timedelta(days=1)).strftime("%Y-%m-%d")
     return get_today_positions(tomorrow, lagna, lat, lon)
 
 
 # ---------------------------------------
-# MASTER ENGINE
+# Per-day precompute table
 # ---------------------------------------
-def build_personalized_daily_profile(lagna, lat=28.6, lon=77.2):
-    today = datetime.datetime.now().strftime("%Y-%m-%d")
+def _ist_today():
+    return datetime.datetime.now(IST).date()
 
-    return {
-        "today": get_today_positions(today, lagna, lat, lon),
-        "tomorrow": get_tomorrow_positions(lagna, lat, lon)
-    }
+
+class PersonalizedDailyPrecompute:
+    """
+    {IST date: {lagna: positions}} for today and tomorrow, plus an LRU
+    of {(date, lat, lon): paksha}. Served copies are deep copies --
+    callers add keys (e.g. "lang") to what they get back.
+    """
+
+    def __init__(self, today_fn=_ist_today):
+        self._today_fn = today_fn
+        self._lock = threading.Lock()
+        self._profiles = {}
+        self._paksha = OrderedDict()
+
+    def precompute(self):
+        """Build all 12 lagna profiles for today and tomorrow (and the
+        default-location paksha) if not already built; evict older
+        days. Safe to call any number of times."""
+        today, tomorrow = self._window()
+        with self._lock:
+            self._evict_before(today)
+            for day in (today, tomorrow):
+                if day not in self._profiles:
+                    positions = get_planet_positions_for_day(day)
+                    self._profiles[day] = {
+                        lagna: build_lagna_positions(lagna, positions) for lagna in RASHIS
+                    }
+        for day in (today, tomorrow):
+            self._paksha_for(day, DEFAULT_LAT, DEFAULT_LON)
+        return today, tomorrow
+
+    def profile(self, lagna, lat=DEFAULT_LAT, lon=DEFAULT_LON):
+        lagna = lagna.capitalize()
+        today, tomorrow = self.precompute()
+        result = {}
+        for key, day in (("today", today), ("tomorrow", tomorrow)):
+            with self._lock:
+                positions = copy.deepcopy(self._profiles[day][lagna])
+            positions["paksha"] = self._paksha_for(day, lat, lon)
+            result[key] = positions
+        return result
+
+    def days(self):
+        with self._lock:
+            return sorted(self._profiles)
+
+    def _window(self):
+        today = self._today_fn()
+        return (
+            today.strftime("%Y-%m-%d"),
+            (today + datetime.timedelta(days=1)).strftime("%Y-%m-%d"),
+        )
+
+    def _evict_before(self, day):
+        for stale in [d for d in self._profiles if d < day]:
+            del self._profiles[stale]
+        for stale in [k for k in self._paksha if k[0] < day]:
+            del self._paksha[stale]
+
+    def _paksha_for(self, day, lat, lon):
+        key = (day, float(lat), float(lon))
+        with self._lock:
+            if key in self._paksha:
+                self._paksha.move_to_end(key)
+                return self._paksha[key]
+        # Computed outside the lock -- calculate_panchang is the slow
+        # part; a duplicate computation under a race is harmless.
+        paksha = get_paksha(day, lat, lon)
+        with self._lock:
+            self._paksha[key] = paksha
+            if len(self._paksha) > MAX_PAKSHA_ENTRIES:
+                self._paksha.popitem(last=False)
+        return paksha
+
+
+_precompute = PersonalizedDailyPrecompute()
+
+
+def precompute_personalized_daily():
+    """Warm today's and tomorrow's 12 lagna profiles (e.g. right after
+    IST midnight); requests also trigger it lazily."""
+    return _precompute.precompute()
+
+
+# ---------------------------------------
+# MASTER ENGINE
+# ---------------------------------------
+def build_personalized_daily_profile(lagna, lat=DEFAULT_LAT, lon=DEFAULT_LON):
+    return _precompute.profile(lagna, lat=lat, lon=lon)
@@ -3,14 +3,13 @@ from full_kundali_api import calculate_full_kundali
 from transit_engine import get_current_positions
 from summary_blocks import build_summary_blocks_with_transit
 from pdf_generator import generate_pdf_report
-from openai import OpenAI
-import os
+from services.llm_executor import get_llm_client
 import re
 
 summary_api = Blueprint('summary_api', __name__)
 
-# Initialize OpenAI client
-openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+# Shared LLM client -- every call goes through services/llm_executor.py
+openai_client = get_llm_client()
 
 @summary_api.route("/api/generate-summary-report", methods=["POST"])
 def generate_full_summary_report():
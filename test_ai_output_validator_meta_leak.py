@@ -391,7 +391,7 @@ def main():
         def __init__(self, text):
             self._text = text
 
-        def run(self, prompt):
+        def run(self, prompt, *, prompt_version=None):
             return self._text, {"model": "fake-model-v1"}
 
     class _StubGenerator(BaseAIGenerator):
@@ -399,7 +399,7 @@ def main():
         trivial, only `generate()`'s own fixed workflow (unmodified) is
         under test here."""
 
-        def build_context(self, *, profile_id, report_type, language):
+        def build_context(self, *, profile_id, report_type, language, astro_context):
             return {}
 
         def build_prompt(self, *, context, report_type, language):
@@ -460,6 +460,9 @@ def main():
             row.status = "FAILED"
             return row
 
+        def record_read(self, row):
+            pass
+
     corrupted_row = _FakeCacheRow()
     corrupted_row.status = "PENDING"  # eligible for regeneration this call
     fake_repo = _FakeRepository(existing_row=corrupted_row)
@@ -150,6 +150,27 @@ def main():
         check("E: to_dict has ai_action", as_dict.get("ai_action") == "updated action")
         check("E: to_dict has ai_generated_at as ISO string", as_dict.get("ai_generated_at") == new_gen_time.isoformat())
 
+        # ==========================================================
+        print("\n=== F: set-based sync -- explicit None clears, omission keeps, in ONE batch ===")
+        # ==========================================================
+        # Both rows go through the same INSERT ... ON CONFLICT statement;
+        # the per-row has_<key> flags must keep their contracts apart.
+        counts = repository.synchronize_profile_events(
+            profile_id=TEST_PROFILE,
+            detected_events=[
+                base_event("opportunity_window", state="ACTIVE", ai_insight=None),
+                base_event("delay_possible", state="ACTIVE", triggered_facts=["Saturn is currently transiting house 7"]),
+            ],
+        )
+        row_f1 = repository.read(profile_id=TEST_PROFILE, event_id="opportunity_window")
+        row_f2 = repository.read(profile_id=TEST_PROFILE, event_id="delay_possible")
+        # delay_possible was expired by C (not in that run's set), so it
+        # comes back as a reactivation; opportunity_window is an update.
+        check("F: RETURNING-derived counts: one update, one reactivation", (counts.created, counts.updated, counts.reactivated, counts.expired) == (0, 1, 1, 0))
+        check("F: explicitly supplied None clears ai_insight", row_f1.ai_insight is None)
+        check("F: omitted ai_action left untouched on the same row", row_f1.ai_action == "updated action")
+        check("F: other row's supplied triggered_facts written", row_f2.triggered_facts == ["Saturn is currently transiting house 7"])
+
         cleanup()
 
     print(f"\n{'='*50}\nRESULT: {passed} passed, {failed} failed\n{'='*50}")
@@ -91,6 +91,61 @@ def main():
               f"{len(custom_planned)} events returned")
         assert custom_engine.window_days == override
 
+    # --------------------------------------------------------------
+    # Equivalence-class evaluation -- a second profile with the SAME
+    # rule-relevant inputs (here: the same chart under a different
+    # name) is served from the engine's RuleEvaluationCache, and the
+    # result is identical to a cold, uncached engine's.
+    # --------------------------------------------------------------
+    print("\n" + "=" * 60)
+    print("EQUIVALENCE-CLASS EVALUATION -- RuleEvaluationCache")
+    print("=" * 60)
+    from modules.alerts.rule_evaluation_cache import RuleEvaluationCache
+
+    anchors = engine._default_day_anchors()
+    shared_engine = PlanningWindowEngine(evaluation_cache=RuleEvaluationCache())
+    first = shared_engine.plan(kundali, day_anchors=anchors)
+    misses_after_first = shared_engine.evaluation_cache.misses
+    twin = dict(kundali, name="Twin")
+    second = shared_engine.plan(twin, day_anchors=anchors)
+    cold = PlanningWindowEngine(evaluation_cache=RuleEvaluationCache()).plan(kundali, day_anchors=anchors)
+    print(f"  cache stats after two equivalent profiles: {shared_engine.evaluation_cache.stats()}")
+    assert first == second == cold, "cached evaluation must never change a detection result"
+    assert shared_engine.evaluation_cache.misses == misses_after_first, "twin profile should be all cache hits"
+    assert shared_engine.evaluation_cache.hits >= misses_after_first
+
+    other_dasha = dict(kundali, current_mahadasha={"mahadasha": "__none__"})
+    sig_a = shared_engine.context_signature(shared_engine.build_evaluation_context(kundali, day_anchors=anchors))
+    sig_b = shared_engine.context_signature(shared_engine.build_evaluation_context(other_dasha, day_anchors=anchors))
+    assert sig_a != sig_b, "a different dasha lord must be a different signature"
+
+    # Facts no catalog rule reads -- here an extra natal aspect from a
+    # planet no rule lists, and every natal nakshatra -- stay out of the
+    # signature: a different chart in those respects shares the class.
+    unread = dict(kundali, planets=[
+        dict(p, aspected_by=list(p.get("aspected_by") or []) + ["Ketu"], nakshatra="__other__")
+        for p in kundali["planets"]
+    ])
+    sig_unread = shared_engine.context_signature(shared_engine.build_evaluation_context(unread, day_anchors=anchors))
+    assert sig_unread == sig_a, "facts no rule reads must not split a signature"
+    misses_before = shared_engine.evaluation_cache.misses
+    from_cache = shared_engine.plan(unread, day_anchors=anchors)
+    assert shared_engine.evaluation_cache.misses == misses_before, "same class -> all cache hits"
+    assert from_cache == PlanningWindowEngine(evaluation_cache=RuleEvaluationCache()).plan(unread, day_anchors=anchors)
+    print(f"  signature reads {len(shared_engine.signature_reads)} catalog facts")
+
+    tiny = RuleEvaluationCache(max_entries=2)
+    for key in ("a", "b", "c"):
+        tiny.get_or_evaluate("sig", key, lambda: ((), None))
+    assert len(tiny) == 2, "cache must stay bounded"
+    print("  [OK] cached == uncached, twin / unread-facts profiles served from cache, cache bounded")
+
+    # plan() given precomputed contexts (as detect_profile_events()
+    # hands it) matches plan() building them itself.
+    contexts = shared_engine.build_daily_contexts(kundali, day_anchors=anchors)
+    assert shared_engine.plan(kundali, day_anchors=anchors, contexts_by_day=contexts) == first
+    print("  [OK] precomputed contexts_by_day honoured")
+
     # --------------------------------------------------------------
     # Event State layer, exercised directly and in isolation --
     # proves it's a genuinely separate layer, not baked into the Rule
@@ -109,11 +109,17 @@ class FakePlanningEngine:
         self._events = events or []
         self._raise_error = raise_error
 
-    def plan(self, kundali, day_anchors=None):
+    def plan(self, kundali, day_anchors=None, contexts_by_day=None):
         if self._raise_error:
             raise RuntimeError("Simulated Rule Engine failure")
         return self._events
 
+    def build_daily_contexts(self, kundali, day_anchors=None):
+        # Matches PlanningWindowEngine.build_daily_contexts()'s contract
+        # -- detect_profile_events() builds the window once and hands it
+        # to plan(contexts_by_day=...).
+        return [self.build_evaluation_context(kundali, day_anchors)] * self.window_days
+
     def build_evaluation_context(self, kundali, day_anchors=None):
         # AI-Written Personalized Alert Content addition -- matches
         # PlanningWindowEngine.build_evaluation_context()'s real
@@ -35,9 +35,10 @@ from modules.alerts.persistence_repository import AlertPersistenceRepository, Al
 from modules.alerts.profile_detection_service import ProfileDataError, DetectionRunFailedError  # noqa: E402
 import modules.alerts.alert_delivery_service as delivery_module  # noqa: E402
 from modules.alerts.alerts_scheduler import (  # noqa: E402
-    run_daily_alerts_job, _fetch_candidate_profile_ids,
+    run_daily_alerts_job, _fetch_candidate_profile_ids, resolve_worker_count,
     _ADVISORY_LOCK_CLASS_ID, _ADVISORY_LOCK_OBJECT_ID,
 )
+from modules.alerts.profile_detection_service import ProfileDetectionService  # noqa: E402
 from notifications.notification_models import UserNotification  # noqa: E402
 
 ALL_SEGMENTS = list(SUBSCRIPTION_SECTIONS)  # all 6 sections, including Alerts & Opportunities
@@ -334,6 +335,55 @@ def main():
         check("scheduler never references AstroEvent", "AstroEvent" not in source)
         check("scheduler never references NotificationLog", "NotificationLog" not in source)
 
+        # ==============================================================
+        print("\n=== Test 13: parallel mode (worker pool for the pure astrology stage) ===")
+        # ==============================================================
+        os.environ.pop("ALERTS_JOB_WORKERS", None)
+        check("Test 13: default worker count is 1 (original sequential loop)", resolve_worker_count() == 1)
+        check("Test 13: explicit worker count wins", resolve_worker_count(3) == 3)
+        os.environ["ALERTS_JOB_WORKERS"] = "auto"
+        check("Test 13: ALERTS_JOB_WORKERS=auto resolves to the core count", resolve_worker_count() == max(1, os.cpu_count() or 1))
+        os.environ["ALERTS_JOB_WORKERS"] = "not-a-number"
+        check("Test 13: unparseable env value falls back to sequential", resolve_worker_count() == 1)
+        os.environ.pop("ALERTS_JOB_WORKERS", None)
+
+        spy_parallel = SpyDetectionService(repo)
+        spy_parallel.configure(P_BATCH_A, lambda: FakeEvalResult(events_detected=0))
+        summary_spy_parallel = run_daily_alerts_job(
+            entitlement_service=MultiProfileFakeEntitlementService(entitled_profile_ids=[P_BATCH_A]),
+            detection_service=spy_parallel, repository=repo, now=now, workers=2,
+        )
+        check("Test 13: injected non-ProfileDetectionService still runs sequentially via evaluate_profile()", spy_parallel.calls == [P_BATCH_A])
+        check("Test 13: sequential fallback evaluated the profile", summary_spy_parallel.profiles_evaluated == 1)
+
+        # P_BATCH_A gets real birth data (real astrology in a worker);
+        # P_BATCH_B keeps its missing birth fields (ProfileDataError,
+        # raised in the parent before anything is submitted).
+        db.session.execute(text(
+            "UPDATE app_users SET name = 'Ravi', dob = '1985-03-31', tob = '19:45', pob = 'Lucknow', "
+            "lat = 26.8467, lng = 80.9462 WHERE id = :p"
+        ), {"p": P_BATCH_A})
+        # Test 6 left a fake mood_low row for P_BATCH_A; clear it so every
+        # active row afterwards is one the parallel run itself persisted.
+        db.session.execute(text("DELETE FROM alert_micro_events WHERE profile_id = :p"), {"p": P_BATCH_A})
+        db.session.commit()
+
+        sender_parallel = FakeFcmSender(result=True)
+        delivery_module.send_push_notification = sender_parallel
+        summary_parallel = run_daily_alerts_job(
+            entitlement_service=MultiProfileFakeEntitlementService(entitled_profile_ids=[P_BATCH_A, P_BATCH_B]),
+            detection_service=ProfileDetectionService(repository=repo),
+            repository=repo, now=now, workers=2,
+        )
+        check("Test 13: parallel run acquired the advisory lock", summary_parallel.lock_acquired)
+        check("Test 13: valid profile evaluated through the worker pool", summary_parallel.profiles_evaluated == 1)
+        check("Test 13: invalid birth data isolated in the parent", summary_parallel.invalid_profile_skipped == 1)
+        check("Test 13: no unexpected failures in parallel mode", summary_parallel.failures == 0)
+        persisted = repo.fetch_active_for_profile(profile_id=P_BATCH_A)
+        print(f"  parallel run detected {summary_parallel.alerts_detected} event(s) for P_BATCH_A")
+        check("Test 13: the real chart fires at least one event on this date", summary_parallel.alerts_detected >= 1)
+        check("Test 13: every detection from the worker was persisted by the parent", len(persisted) == summary_parallel.alerts_detected)
+
         cleanup()
 
     print(f"\n{'='*50}\nRESULT: {passed} passed, {failed} failed\n{'='*50}")
@@ -0,0 +1,141 @@
+"""
+test_ashtakoot_matrix.py
+----------------------------------
+Precomputed Ashtakoot tables and bulk match search
+(modules/love/ashtakoot_matrix.py) against the per-pair
+compute_ashtakoot() (modules/love/ashtakoot_love.py).
+
+Covers:
+  A. Table parity: score_pair() == compute_ashtakoot()["total_score"]
+     for every pair of Moons sampled every 2.5 degrees round the zodiac
+     (all nakshatra/rashi combinations, both sides of the
+     Sagittarius/Capricorn 15-degree vashya split), both varna
+     directions.
+  B. search_matches(): same top-k as ranking every pair with
+     compute_ashtakoot(), ties in input order, full koota breakdowns,
+     min_score, undecodable candidates skipped, bad seeker rejected.
+  C. Micro-benchmark: 5,000 candidates, bulk search vs a per-pair loop
+     (printed; the bulk path must be faster).
+
+NO DATABASE, NO EPHEMERIS.
+"""
+
+import random
+import sys
+import time
+
+if hasattr(sys.stdout, "reconfigure"):
+    sys.stdout.reconfigure(encoding="utf-8")
+
+from modules.love.ashtakoot_love import NAKSHATRAS_27, RASHIS, compute_ashtakoot
+from modules.love.ashtakoot_matrix import moon_key, score_pair, search_matches
+
+passed = 0
+failed = 0
+
+
+def check(label, condition):
+    global passed, failed
+    if condition:
+        print(f"  PASS: {label}")
+        passed += 1
+    else:
+        print(f"  FAIL: {label}")
+        failed += 1
+
+
+def moon_at(longitude):
+    longitude %= 360
+    return {
+        "rashi": RASHIS[int(longitude // 30)],
+        "degree": longitude % 30,
+        "nakshatra": NAKSHATRAS_27[int(longitude // (360 / 27))],
+    }
+
+
+def main():
+    # ==========================================================
+    print("=== A: tables == compute_ashtakoot ===")
+    # ==========================================================
+    moons = [moon_at(i * 2.5 + 0.3) for i in range(144)]
+    keys = [moon_key(m) for m in moons]
+    check("A: every sampled Moon encodes", all(k is not None for k in keys))
+    for boy_is_groom in (True, False):
+        mismatches = 0
+        for bride, bride_key in zip(moons, keys):
+            for groom, groom_key in zip(moons, keys):
+                expected = compute_ashtakoot(bride, groom, boy_is_groom=boy_is_groom)["total_score"]
+                if score_pair(bride_key, groom_key, boy_is_groom=boy_is_groom) != expected:
+                    mismatches += 1
+        check(f"A: all {len(moons) ** 2} pairs identical (boy_is_groom={boy_is_groom})", mismatches == 0)
+    check("A: Sagittarius split by degree",
+          moon_key({"rashi": "Sagittarius", "nakshatra": "Purva Ashadha", "degree": 14.0}).vashya
+          != moon_key({"rashi": "Sagittarius", "nakshatra": "Purva Ashadha", "degree": 16.0}).vashya)
+
+    # ==========================================================
+    print("\n=== B: search_matches ===")
+    # ==========================================================
+    rng = random.Random(39)
+    candidates = [dict(moon_at(rng.uniform(0, 360)), id=i) for i in range(2000)]
+    candidates[7] = {"rashi": "Capricorn", "nakshatra": "Shravana", "id": 7}   # no degree
+    candidates[8] = {"rashi": "Leo", "id": 8}                                   # no nakshatra
+    seeker = moon_at(123.4)
+
+    found = search_matches(seeker, candidates, seeker_is_bride=False, top_k=25)
+    brute = sorted(
+        ((compute_ashtakoot(c, seeker)["total_score"], -i) for i, c in enumerate(candidates) if i not in (7, 8)),
+        reverse=True,
+    )[:25]
+    check("B: same top-25 (score, input order) as per-pair ranking",
+          [(m["total_score"], -m["index"]) for m in found["matches"]] == brute)
+    top = found["matches"][0]
+    check("B: breakdown is the full compute_ashtakoot result",
+          top["ashtakoot"] == compute_ashtakoot(top["candidate"], seeker)
+          and set(top["ashtakoot"]["kootas"]) == {"varna", "vashya", "tara", "yoni", "graha_maitri", "gana", "bhakoot", "nadi"})
+    check("B: candidate passed through with its id", top["candidate"]["id"] == top["index"])
+    check("B: undecodable candidates skipped, not ranked",
+          (found["scanned"], found["skipped"]) == (2000, 2)
+          and all(m["index"] not in (7, 8) for m in found["matches"]))
+
+    as_bride = search_matches(seeker, candidates, seeker_is_bride=True, boy_is_groom=False, top_k=5)
+    check("B: seeker as bride, reversed varna -> per-pair totals",
+          all(m["total_score"] == compute_ashtakoot(seeker, m["candidate"], boy_is_groom=False)["total_score"]
+              for m in as_bride["matches"]))
+    strict = search_matches(seeker, candidates, seeker_is_bride=False, top_k=2000, min_score=28)
+    expected_strict = sum(
+        1 for i, c in enumerate(candidates) if i not in (7, 8) and compute_ashtakoot(c, seeker)["total_score"] >= 28
+    )
+    check("B: min_score keeps exactly the candidates at or above it",
+          len(strict["matches"]) == expected_strict and all(m["total_score"] >= 28 for m in strict["matches"]))
+    try:
+        search_matches({"rashi": "Sagittarius", "nakshatra": "Mula"}, candidates, seeker_is_bride=True)
+        rejected = False
+    except ValueError:
+        rejected = True
+    check("B: seeker without a usable Moon -> ValueError", rejected)
+
+    # ==========================================================
+    print("\n=== C: micro-benchmark (5,000 candidates) ===")
+    # ==========================================================
+    pool = [moon_at(rng.uniform(0, 360)) for _ in range(5000)]
+
+    started = time.perf_counter()
+    ranked = sorted((compute_ashtakoot(c, seeker)["total_score"] for c in pool), reverse=True)[:10]
+    per_pair_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    bulk = search_matches(seeker, pool, seeker_is_bride=False, top_k=10)
+    bulk_ms = (time.perf_counter() - started) * 1000
+
+    print(f"  per-pair compute_ashtakoot : {per_pair_ms:8.1f} ms")
+    print(f"  search_matches             : {bulk_ms:8.1f} ms ({per_pair_ms / bulk_ms:.0f}x)")
+    check("C: same top-10 scores", [m["total_score"] for m in bulk["matches"]] == ranked)
+    check("C: bulk search faster than the per-pair loop", bulk_ms < per_pair_ms)
+
+    print(f"\n{'='*50}\nRESULT: {passed} passed, {failed} failed\n{'='*50}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
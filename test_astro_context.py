@@ -0,0 +1,167 @@
+"""
+test_astro_context.py
+----------------------------------
+Request-scoped AstroContext (services/ai_prediction_lab/astro_context.py)
+as created by BaseAIGenerator.generate() and threaded through every
+ai_prediction_lab builder.
+
+Covers:
+  A. One CareerGenerator CURRENT_PHASE generation computes the kundali
+     once, the current positions once, and each planet's rashi segments
+     at most once -- instead of once per planet per helper.
+  B. CURRENT_TIMING: compute_expires_at() reuses the same context, and
+     a context shared across report_types of the same profile never
+     recomputes anything already computed.
+  C. Builders called with an AstroContext return exactly what they
+     return without one (the pre-AstroContext behaviour).
+
+NO OPENAI CALL, NO DATABASE -- the executor/validator/cache repository
+are constructor-injected fakes and the AppUser lookup is replaced on the
+instance. The kundali and ephemeris calls are the real ones, only
+wrapped for counting.
+"""
+
+import sys
+from collections import Counter
+from types import SimpleNamespace
+
+if hasattr(sys.stdout, "reconfigure"):
+    sys.stdout.reconfigure(encoding="utf-8")
+
+from full_kundali_api import calculate_full_kundali
+from transit_engine import get_current_positions, get_next_12_rashi_segments
+from modules.career.career_generator import CareerGenerator
+from services.ai_prediction_lab.astro_context import AstroContext
+from services.ai_prediction_lab.career_context_builder import build_career_profile_context
+from services.ai_prediction_lab.current_career_phase_context import (
+    CAREER_TRANSIT_PLANETS,
+    build_current_career_phase_context,
+)
+from services.ai_prediction_lab.current_career_timing_context import build_current_career_timing_context
+from services.ai_prediction_lab.career_action_context import build_career_action_context
+
+DEMO_PERSON = {
+    "name": "Ravi",
+    "dob": "1985-03-31",
+    "tob": "19:45",
+    "pob": "Lucknow, Uttar Pradesh, India",
+    "lat": 26.8467,
+    "lon": 80.9462,
+}
+
+passed = 0
+failed = 0
+
+
+def check(label, condition):
+    global passed, failed
+    if condition:
+        print(f"  PASS: {label}")
+        passed += 1
+    else:
+        print(f"  FAIL: {label}")
+        failed += 1
+
+
+class CountingAstroContext(AstroContext):
+    """Real engines, wrapped so each underlying call is counted."""
+
+    def __init__(self):
+        self.calls = Counter()
+
+        def kundali_fn(**kwargs):
+            self.calls["kundali"] += 1
+            return calculate_full_kundali(**kwargs)
+
+        def positions_fn():
+            self.calls["positions"] += 1
+            return get_current_positions()
+
+        def segments_fn(planet):
+            self.calls[f"segments:{planet}"] += 1
+            return get_next_12_rashi_segments(planet)
+
+        super().__init__(kundali_fn=kundali_fn, positions_fn=positions_fn, segments_fn=segments_fn)
+
+
+class _FakeExecutor:
+    def run(self, prompt, *, prompt_version=None):
+        return "generated text", {"model": "fake-model-v1"}
+
+
+class _PassThroughValidator:
+    def validate(self, text, *, report_type, language):
+        return text
+
+
+class _FakeRepository:
+    def read_cache(self, *, profile_id, segment, report_type, language):
+        return SimpleNamespace(status="READY", content_json={"content": f"cached {report_type}"})
+
+
+def make_generator():
+    generator = CareerGenerator(
+        executor=_FakeExecutor(),
+        validator=_PassThroughValidator(),
+        repository=_FakeRepository(),
+    )
+    generator._load_birth_details = lambda profile_id: dict(DEMO_PERSON)
+    return generator
+
+
+def main():
+    generator = make_generator()
+
+    # ==========================================================
+    print("=== A: one CURRENT_PHASE generation, each heavy call once ===")
+    # ==========================================================
+    astro = CountingAstroContext()
+    generator.generate(profile_id=1, report_type="CURRENT_PHASE", language="en", astro_context=astro)
+    check("A: kundali computed once", astro.calls["kundali"] == 1)
+    check("A: current positions computed once (was once per planet)", astro.calls["positions"] == 1)
+    check("A: every phase planet's segments computed exactly once",
+          all(astro.calls[f"segments:{p}"] == 1 for p in CAREER_TRANSIT_PLANETS))
+
+    # ==========================================================
+    print("\n=== B: CURRENT_TIMING + sharing across report_types ===")
+    # ==========================================================
+    before = Counter(astro.calls)
+    generator.generate(profile_id=1, report_type="CURRENT_TIMING", language="en", astro_context=astro)
+    generator.generate(profile_id=1, report_type="DAILY_INSIGHT", language="en", astro_context=astro)
+    check("B: shared context -> kundali not recomputed", astro.calls["kundali"] == 1)
+    check("B: shared context -> positions not recomputed", astro.calls["positions"] == 1)
+    check("B: Sun/Mercury segments reused by timing expiry",
+          astro.calls["segments:Sun"] == before["segments:Sun"] == 1
+          and astro.calls["segments:Mercury"] == before["segments:Mercury"] == 1)
+    check("B: Moon segments computed once for the expiry", astro.calls["segments:Moon"] == 1)
+
+    fresh = CountingAstroContext()
+    report = generator.generate(profile_id=1, report_type="CURRENT_TIMING", language="en", astro_context=fresh)
+    check("B: standalone CURRENT_TIMING -> one kundali, one positions snapshot",
+          (fresh.calls["kundali"], fresh.calls["positions"]) == (1, 1))
+    check("B: expiry still computed", report.expires_at is not None)
+
+    # ==========================================================
+    print("\n=== C: builders with an AstroContext == without one ===")
+    # ==========================================================
+    kundali = astro.kundali(
+        name=DEMO_PERSON["name"], dob=DEMO_PERSON["dob"], tob=DEMO_PERSON["tob"],
+        lat=DEMO_PERSON["lat"], lon=DEMO_PERSON["lon"], language="en",
+    )
+    summary = build_career_profile_context(kundali)
+    check("C: phase context unchanged",
+          build_current_career_phase_context(kundali, summary, astro=astro)
+          == build_current_career_phase_context(kundali, summary))
+    check("C: action context unchanged",
+          build_career_action_context(kundali, astro=astro) == build_career_action_context(kundali))
+    check("C: timing context unchanged (summary passed in vs rebuilt)",
+          build_current_career_timing_context(kundali, summary, astro=astro)
+          == build_current_career_timing_context(kundali))
+
+    print(f"\n{'='*50}\nRESULT: {passed} passed, {failed} failed\n{'='*50}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
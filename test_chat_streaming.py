@@ -0,0 +1,187 @@
+"""
+test_chat_streaming.py
+----------------------------------
+Streaming token delivery for the chat endpoints: LLMExecutor.stream()
+(services/llm_executor.py), the incremental post-processing in
+services/chat_streaming.py and modules/smartchat/smartchat_engine.py,
+and /api/smartchat's server-sent-event mode.
+
+Covers:
+  A. Executor streaming: the first chunk reaches the caller long before
+     the completion ends; chunks join to the full text; streams respect
+     max_concurrency; a failure before the first chunk is retried.
+  B. strip_stream() == "".join(...).strip() and AnswerCleaner ==
+     clean_answer() for every way of chunking the same completion.
+  C. /api/smartchat with "stream": true -> token events, then a done
+     event whose answer equals the joined tokens and the non-streaming
+     answer; an LLM failure -> a single error event.
+
+NO OPENAI CALL, NO DATABASE -- LLM traffic goes through a
+StubChatBackend executor. The quota-on-completion behaviour of
+/api/chat/free and /api/chat/pack is in test_chat_streaming_quota.py.
+"""
+
+import asyncio
+import json
+import sys
+import threading
+import time
+
+if hasattr(sys.stdout, "reconfigure"):
+    sys.stdout.reconfigure(encoding="utf-8")
+
+from flask import Flask
+
+from modules.smartchat import smartchat_engine
+from modules.smartchat.smartchat_engine import AnswerCleaner, clean_answer
+from routes.routes_smartchat import routes_smartchat
+from services.chat_streaming import strip_stream
+from services.llm_executor import LLMClient, LLMExecutor, StubChatBackend
+
+passed = 0
+failed = 0
+
+
+def check(label, condition):
+    global passed, failed
+    if condition:
+        print(f"  PASS: {label}")
+        passed += 1
+    else:
+        print(f"  FAIL: {label}")
+        failed += 1
+
+
+BIRTH = {"name": "Ravi", "dob": "1985-03-31", "tob": "19:45", "pob": "Lucknow", "lat": 26.8467, "lng": 80.9462}
+
+RAW_ANSWER = (
+    "  Lagna: Libra\n"
+    "Your 7th lord Mars sits in the 10th.\n"
+    "\n"
+    "Dasha: Venus-Saturn\n"
+    "   The strongest window is March 2028 to November 2030.  \n"
+    "{debug}\n"
+    "Lagoon-side walks will calm you.\n"
+    "\thousehold harmony improves\n"
+    "This answer is for astrological guidance only.   \n\n"
+)
+
+
+def parse_sse(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def chunkings(text):
+    yield [text]
+    for size in (1, 2, 3, 5, 7, 11):
+        yield [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def main():
+    # ==========================================================
+    print("=== A: LLMExecutor.stream() ===")
+    # ==========================================================
+    text = "The strongest window is March 2028 to November 2030."
+    backend = StubChatBackend(responder=lambda kwargs: text, delay_seconds=0.1,
+                              chunk_chars=4, chunk_delay_seconds=0.05)
+    executor = LLMExecutor(backend, max_concurrency=2)
+    started = time.monotonic()
+    pieces = []
+    first_at = None
+    for chunk in LLMClient(executor).chat.completions.create(model="m", messages=[], stream=True):
+        if first_at is None:
+            first_at = time.monotonic() - started
+        pieces.append(chunk.choices[0].delta.content)
+    total = time.monotonic() - started
+    check("A: chunks join to the full completion", "".join(pieces) == text)
+    check(f"A: first chunk ({first_at:.2f}s) well before the end ({total:.2f}s)", first_at < total / 2)
+
+    results = []
+
+    def consume():
+        results.append("".join(c.choices[0].delta.content for c in executor.stream(model="m", messages=[])))
+
+    threads = [threading.Thread(target=consume) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    check("A: five concurrent streams all complete", results == [text] * 5)
+    check("A: never more than max_concurrency streams upstream", executor.peak_active == 2)
+    executor.shutdown()
+
+    attempts = {"n": 0}
+
+    def flaky(kwargs):
+        attempts["n"] += 1
+        if attempts["n"] == 1:
+            raise asyncio.TimeoutError()
+        return "second time lucky"
+
+    retrying = LLMExecutor(StubChatBackend(responder=flaky), max_retries=2, retry_backoff_seconds=0.01)
+    streamed = "".join(c.choices[0].delta.content for c in retrying.stream(model="m", messages=[]))
+    check("A: failure before the first chunk is retried", streamed == "second time lucky" and retrying.retries == 1)
+    retrying.shutdown()
+
+    # ==========================================================
+    print("\n=== B: incremental post-processing == batch ===")
+    # ==========================================================
+    strip_ok = all("".join(strip_stream(parts)) == RAW_ANSWER.strip() for parts in chunkings(RAW_ANSWER))
+    check("B: strip_stream == str.strip for every chunking", strip_ok)
+
+    def cleaned(parts):
+        cleaner = AnswerCleaner()
+        return "".join(cleaner.feed(p) for p in parts) + cleaner.finish()
+
+    expected = clean_answer(RAW_ANSWER.strip())
+    check("B: AnswerCleaner == clean_answer for every chunking",
+          all(cleaned(parts) == expected for parts in chunkings(RAW_ANSWER)))
+    check("B: banned lines really removed", "Lagna" not in expected and "household" not in expected)
+    check("B: a line that only starts like a banned word is kept", "Lagoon-side walks" in expected)
+
+    # ==========================================================
+    print("\n=== C: /api/smartchat SSE mode ===")
+    # ==========================================================
+    app = Flask("test_chat_streaming")
+    app.register_blueprint(routes_smartchat)
+    http = app.test_client()
+
+    stub_executor = LLMExecutor(StubChatBackend(responder=lambda kwargs: RAW_ANSWER, chunk_chars=6))
+    real_client = smartchat_engine.client
+    smartchat_engine.client = LLMClient(stub_executor)
+    try:
+        response = http.post("/api/smartchat", json={"question": "When will I marry?", "birth": BIRTH, "stream": True})
+        events = parse_sse(response.get_data(as_text=True))
+        tokens = [data["text"] for kind, data in events if kind == "token"]
+        check("C: text/event-stream response", response.mimetype == "text/event-stream")
+        check("C: several token events, then done", len(tokens) > 3 and events[-1][0] == "done")
+        check("C: done answer == joined tokens", events[-1][1] == {"success": True, "answer": "".join(tokens)})
+
+        blocking = http.post("/api/smartchat", json={"question": "When will I marry?", "birth": BIRTH})
+        check("C: non-streaming JSON unchanged, same answer",
+              blocking.get_json() == {"success": True, "answer": "".join(tokens)})
+
+        def broken(kwargs):
+            raise ValueError("upstream rejected the request")
+
+        smartchat_engine.client = LLMClient(LLMExecutor(StubChatBackend(responder=broken)))
+        failed_events = parse_sse(http.post(
+            "/api/smartchat?stream=1", json={"question": "When will I marry?", "birth": BIRTH},
+        ).get_data(as_text=True))
+        check("C: LLM failure -> one error event, no done",
+              [kind for kind, _ in failed_events] == ["error"] and failed_events[0][1]["success"] is False)
+    finally:
+        smartchat_engine.client = real_client
+        stub_executor.shutdown()
+
+    print(f"\n{'='*50}\nRESULT: {passed} passed, {failed} failed\n{'='*50}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""
+test_dasha_timeline.py
+----------------------------------
+Closed-form Vimshottari lookups (services/dasha_timeline.py).
+
+Covers:
+  A. to_mahadashas() is byte-identical to the old
+     calculate_vimshottari_dasha() dict table, for many births.
+  B. current_indices(day) picks the same current maha / antar the old
+     get_current_dasha() found by parsing, on every boundary day.
+  C. at() / next_change() == a linear scan, at all three levels;
+     pratyantars tile their antardasha.
+  D. calculate_full_kundali()'s next_antardasha and chat_engine's
+     _find_next_antardasha() agree with the old dict scan.
+  E. rows() == the old timeline_rows(dicts); timing vs the old path.
+
+Pure computation -- no DB, no network.
+"""
+
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+if hasattr(sys.stdout, "reconfigure"):
+    sys.stdout.reconfigure(encoding="utf-8")
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("OPENAI_API_KEY", "test-key-not-used")
+
+from services.dasha_db_filler import timeline_rows  # noqa: E402
+from services.dasha_timeline import (  # noqa: E402
+    ANTARDASHA,
+    DASHA_SEQUENCE,
+    DASHA_YEARS,
+    MAHADASHA,
+    PRATYANTAR,
+    DashaTimeline,
+)
+
+passed = 0
+failed = 0
+
+
+def check(label, condition):
+    global passed, failed
+    if condition:
+        print(f"  PASS: {label}")
+        passed += 1
+    else:
+        print(f"  FAIL: {label}")
+        failed += 1
+
+
+# ------------------------------------------------------------
+# The old full_kundali_api implementation, verbatim (today as a param)
+# ------------------------------------------------------------
+def old_antardashas(maha_lord, maha_start, maha_years):
+    antardashas = []
+    maha_index = DASHA_SEQUENCE.index(maha_lord)
+    ant_start = maha_start
+    for i in range(9):
+        antar_lord = DASHA_SEQUENCE[(maha_index + i) % 9]
+        antar_days = (maha_years * DASHA_YEARS[antar_lord] * 365.25) / 120
+        antar_end = ant_start + timedelta(days=antar_days)
+        antardashas.append({
+            'planet': antar_lord,
+            'start': ant_start.strftime('%Y-%m-%d'),
+            'end': antar_end.strftime('%Y-%m-%d')
+        })
+        ant_start = antar_end
+    return antardashas
+
+
+def old_vimshottari(moon_deg, birth_date):
+    nakshatra_size = 13 + 1/3
+    nakshatra_index = int(moon_deg // nakshatra_size)
+    dasha_lord = DASHA_SEQUENCE[nakshatra_index % 9]
+    fraction_passed = (moon_deg % nakshatra_size) / nakshatra_size
+    total_years = DASHA_YEARS[dasha_lord]
+    elapsed_days = fraction_passed * total_years * 365.25
+    start_date = birth_date - timedelta(days=elapsed_days)
+
+    mahadashas = []
+    current_index = DASHA_SEQUENCE.index(dasha_lord)
+    md_start = start_date
+    for i in range(9):
+        lord = DASHA_SEQUENCE[(current_index + i) % 9]
+        years = DASHA_YEARS[lord]
+        md_end = md_start + timedelta(days=years * 365.25)
+        antardashas = old_antardashas(lord, md_start, DASHA_YEARS[lord])
+        mahadashas.append({
+            'mahadasha': lord,
+            'start': md_start.strftime('%Y-%m-%d'),
+            'end': md_end.strftime('%Y-%m-%d'),
+            'antardashas': antardashas
+        })
+        md_start = md_end
+    return mahadashas
+
+
+def old_current(mahadashas, today):
+    current_maha = None
+    for md in mahadashas:
+        start = datetime.strptime(md["start"], "%Y-%m-%d").date()
+        end = datetime.strptime(md["end"], "%Y-%m-%d").date()
+        if start <= today <= end:
+            current_maha = md
+            break
+    if not current_maha:
+        current_maha = mahadashas[0]
+
+    current_antar = None
+    for ad in current_maha["antardashas"]:
+        start = datetime.strptime(ad["start"], "%Y-%m-%d").date()
+        end = datetime.strptime(ad["end"], "%Y-%m-%d").date()
+        if start <= today <= end:
+            current_antar = ad
+            break
+    if not current_antar:
+        current_antar = current_maha["antardashas"][0]
+
+    return current_maha, current_antar
+
+
+def births(n, seed=46):
+    rng = random.Random(seed)
+    out = [(0.0, datetime(2000, 1, 1)), (359.999999, datetime(1950, 6, 15, 23, 59)),
+           (13 + 1/3, datetime(1985, 3, 3, 4, 5)), (120.0, datetime(2024, 2, 29, 12, 0))]
+    for _ in range(n - len(out)):
+        out.append((rng.uniform(0, 360),
+                    datetime(1930, 1, 1) + timedelta(minutes=rng.randrange(0, 95 * 365 * 1440))))
+    return out
+
+
+def main():
+    samples = births(400)
+
+    # ==========================================================
+    print("=== A: to_mahadashas() == old dict table ===")
+    # ==========================================================
+    mismatches = [s for s in samples if DashaTimeline.from_moon(*s).to_mahadashas() != old_vimshottari(*s)]
+    check(f"A: identical for all {len(samples)} births", not mismatches)
+    from full_kundali_api import calculate_vimshottari_dasha
+    check("A: calculate_vimshottari_dasha() still returns the same table",
+          all(calculate_vimshottari_dasha(*s) == old_vimshottari(*s) for s in samples[:50]))
+
+    # ==========================================================
+    print("\n=== B: current_indices() == old get_current_dasha() ===")
+    # ==========================================================
+    days_checked = 0
+    wrong = []
+    for moon_deg, birth_date in samples[:120]:
+        timeline = DashaTimeline.from_moon(moon_deg, birth_date)
+        table = old_vimshottari(moon_deg, birth_date)
+        days = {birth_date.date(), (birth_date - timedelta(days=40000)).date(),
+                (birth_date + timedelta(days=60000)).date()}
+        for md in table:
+            for ad in md["antardashas"]:
+                for stamp in (ad["start"], ad["end"]):
+                    d = datetime.strptime(stamp, "%Y-%m-%d").date()
+                    days.update((d - timedelta(days=1), d, d + timedelta(days=1)))
+        for day in days:
+            m, a = timeline.current_indices(day)
+            maha, antar = old_current(table, day)
+            days_checked += 1
+            if table[m] is not maha or table[m]["antardashas"][a % 9] is not antar:
+                wrong.append((moon_deg, birth_date, day))
+    check(f"B: same current maha/antar on {days_checked} boundary days", not wrong)
+    timeline = DashaTimeline.from_moon(*samples[0])
+    check("B: before / after the 120 years -> first maha, its first antar (old fallback)",
+          timeline.current_indices(datetime(1800, 1, 1).date()) == (0, 0)
+          and timeline.current_indices(datetime(2300, 1, 1).date()) == (0, 0))
+
+    # ==========================================================
+    print("\n=== C: at() / next_change() ===")
+    # ==========================================================
+    rng = random.Random(7)
+    scan_ok = True
+    for moon_deg, birth_date in samples[:40]:
+        timeline = DashaTimeline.from_moon(moon_deg, birth_date)
+        for level, count in ((MAHADASHA, 9), (ANTARDASHA, 81), (PRATYANTAR, 729)):
+            periods = [timeline.period(level, i) for i in range(count)]
+            for _ in range(25):
+                when = periods[0].start + timedelta(seconds=rng.uniform(-1e8, 120 * 365.25 * 86400 + 1e8))
+                inside = [p for p in periods if p.start <= when] if when < periods[-1].end else []
+                expected = inside[-1] if inside else None
+                after = [p for p in periods if p.start > when]
+                if timeline.at(when, level) != expected or timeline.next_change(when, level) != (after[0] if after else None):
+                    scan_ok = False
+    check("C: at / next_change == linear scan (maha, antar, pratyantar)", scan_ok)
+
+    timeline = DashaTimeline.from_moon(200.0, datetime(1990, 5, 17, 8, 30))
+    antar = timeline.at(datetime(2026, 10, 19), ANTARDASHA)
+    pratyantars = [timeline.period(PRATYANTAR, i) for i in range(antar.index * 9, antar.index * 9 + 9)]
+    check("C: pratyantars chain from their antardasha and end within a second of it",
+          pratyantars[0].start == antar.start
+          and all(a.end == b.start for a, b in zip(pratyantars, pratyantars[1:]))
+          and abs((pratyantars[-1].end - antar.end).total_seconds()) < 1)
+    check("C: pratyantar sequence starts from the antardasha lord",
+          [p.lord for p in pratyantars][0] == antar.lord and pratyantars[0].lords[:2] == antar.lords)
+    nxt = timeline.next_change(antar.start, ANTARDASHA)
+    check("C: next_change at a boundary -> the following period", nxt.index == antar.index + 1)
+    check("C: outside the 120 years -> None",
+          timeline.at(datetime(1800, 1, 1)) is None and timeline.next_change(datetime(2300, 1, 1)) is None)
+
+    # ==========================================================
+    print("\n=== D: next_antardasha (payload + chat_engine) ===")
+    # ==========================================================
+    from full_kundali_api import calculate_full_kundali
+    from modules.services.chat_engine import _find_next_antardasha
+
+    kundali = calculate_full_kundali("T", "1990-05-17", "08:30", 28.61, 77.21)
+    dasha = {"mahadashas": kundali["Mahadasha"], "current_mahadasha": kundali["current_mahadasha"],
+             "current_antardasha": kundali["current_antardasha"]}
+    scanned = _find_next_antardasha(dasha, dasha["current_mahadasha"], dasha["current_antardasha"])
+    nxt = kundali["next_antardasha"]
+    check("D: payload next_antardasha == old dict scan", (nxt["planet"], nxt["start"]) == scanned)
+    check("D: current maha/antar == old get_current_dasha()",
+          old_current(kundali["Mahadasha"], datetime.now().date())
+          == (kundali["current_mahadasha"], kundali["current_antardasha"]))
+    dasha["next_antardasha"] = nxt
+    check("D: chat_engine reads next_antardasha without scanning",
+          _find_next_antardasha(dasha, {}, dasha["current_antardasha"]) == scanned)
+    check("D: stale next_antardasha (not after current) -> falls back to the scan",
+          _find_next_antardasha({**dasha, "next_antardasha": {"planet": "Sun", "start": "1900-01-01"}},
+                                dasha["current_mahadasha"], dasha["current_antardasha"]) == scanned)
+
+    # ==========================================================
+    print("\n=== E: rows() + timing ===")
+    # ==========================================================
+    check("E: rows() == timeline_rows(old dicts)",
+          all(DashaTimeline.from_moon(*s).rows() == timeline_rows(old_vimshottari(*s)) for s in samples[:100]))
+
+    today = datetime.now().date()
+    started = time.perf_counter()
+    for s in samples:
+        table = old_vimshottari(*s)
+        old_current(table, today)
+    old_ms = (time.perf_counter() - started) * 1000 / len(samples)
+
+    started = time.perf_counter()
+    for s in samples:
+        DashaTimeline.from_moon(*s).current_indices(today)
+    new_ms = (time.perf_counter() - started) * 1000 / len(samples)
+
+    timeline = DashaTimeline.from_moon(*samples[1])
+    started = time.perf_counter()
+    for _ in range(10000):
+        timeline.at(datetime(2026, 10, 19), ANTARDASHA)
+    lookup_us = (time.perf_counter() - started) * 1e6 / 10000
+    print(f"  old build+parse {old_ms:.3f} ms, timeline build+lookup {new_ms:.3f} ms, at() {lookup_us:.1f} us")
+    check("E: timeline build + current lookup faster than dicts + parse", new_ms < old_ms)
+
+    print(f"\n{'='*50}\nRESULT: {passed} passed, {failed} failed\n{'='*50}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+"""
+test_id_token_verifier.py
+----------------------------------
+Cached Firebase ID-token verification (modules/auth/id_token_verifier.py).
+
+Covers:
+  A. FakeIdTokenIssuer behaves like the SDK: valid -> claims with uid;
+     expired / tampered / foreign tokens -> ExpiredIdTokenError /
+     InvalidIdTokenError.
+  B. Claims cache: same token verified once until its exp; callers get
+     copies; failures and exp-less claims are never cached; LRU bound;
+     max_entries 0 disables it.
+  C. Latency / hit counters and stats().
+  D. Cert refresh thread: prefetches periodically, survives a failing
+     backend, one thread per process, disabled at 0.
+  E. The default backend resolves firebase_admin.auth.verify_id_token per
+     call (what the route tests monkeypatch); the hot routes go through
+     the verifier, delete-account still verifies directly.
+  F. Timing: a cache hit vs a full RS256 verification.
+
+No DB, no network.
+"""
+
+import base64
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+
+if hasattr(sys.stdout, "reconfigure"):
+    sys.stdout.reconfigure(encoding="utf-8")
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from firebase_admin import auth as firebase_auth  # noqa: E402
+
+from modules.auth.id_token_verifier import (  # noqa: E402
+    FakeIdTokenIssuer,
+    IdTokenVerifier,
+    verify_firebase_id_token,
+)
+
+passed = 0
+failed = 0
+
+
+def check(label, condition):
+    global passed, failed
+    if condition:
+        print(f"  PASS: {label}")
+        passed += 1
+    else:
+        print(f"  FAIL: {label}")
+        failed += 1
+
+
+def raises(exc_type, fn, *args):
+    try:
+        fn(*args)
+    except exc_type:
+        return True
+    except Exception as exc:
+        print(f"    (raised {type(exc).__name__}: {exc})")
+        return False
+    return False
+
+
+def tampered(id_token, **claims):
+    """Same header and signature, different payload."""
+    header, payload, signature = id_token.split(".")
+    decoded = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+    decoded.update(claims)
+    forged = base64.urlsafe_b64encode(json.dumps(decoded).encode("utf-8")).rstrip(b"=").decode("ascii")
+    return ".".join((header, forged, signature))
+
+
+class Clock:
+    def __init__(self):
+        self.now = time.time()
+
+    def __call__(self):
+        return self.now
+
+
+class FailingCerts:
+    def __init__(self, issuer):
+        self.issuer = issuer
+        self.attempts = 0
+
+    def verify(self, id_token):
+        return self.issuer.verify(id_token)
+
+    def prefetch_certs(self):
+        self.attempts += 1
+        raise ConnectionError("simulated: googleapis.com unreachable")
+
+
+def main():
+    issuer = FakeIdTokenIssuer()
+    token = issuer.issue("uid-a")
+
+    # ==========================================================
+    print("=== A: fake issuer ===")
+    # ==========================================================
+    claims = issuer.verify(token)
+    check("A: valid token -> uid / sub / aud", claims["uid"] == claims["sub"] == "uid-a" and claims["aud"] == issuer.project_id)
+    check("A: expired token -> ExpiredIdTokenError",
+          raises(firebase_auth.ExpiredIdTokenError, issuer.verify, issuer.issue("uid-a", ttl_seconds=-10)))
+    check("A: tampered payload -> InvalidIdTokenError",
+          raises(firebase_auth.InvalidIdTokenError, issuer.verify, tampered(token, sub="uid-b")))
+    check("A: another issuer's token -> InvalidIdTokenError",
+          raises(firebase_auth.InvalidIdTokenError, issuer.verify, FakeIdTokenIssuer().issue("uid-a")))
+    check("A: garbage -> InvalidIdTokenError", raises(firebase_auth.InvalidIdTokenError, issuer.verify, "not-a-jwt"))
+
+    # ==========================================================
+    print("\n=== B: claims cache ===")
+    # ==========================================================
+    clock = Clock()
+    verifier = IdTokenVerifier(issuer, max_entries=3, cert_refresh_seconds=0, now_fn=clock)
+    calls = issuer.verify_calls
+    first = verifier.verify(token)
+    first["uid"] = "mutated"
+    second = verifier.verify(token)
+    check("B: second call served from cache (one backend verify)", issuer.verify_calls == calls + 1)
+    check("B: callers get copies", second["uid"] == "uid-a")
+
+    clock.now = second["exp"]
+    calls = issuer.verify_calls
+    verifier.verify(token)
+    verifier.verify(token)
+    check("B: from exp on, the token is verified again (and not re-cached)", issuer.verify_calls == calls + 2)
+    clock.now = time.time()
+
+    calls = issuer.verify_calls
+    bad = tampered(token, sub="uid-b")
+    raises(firebase_auth.InvalidIdTokenError, verifier.verify, bad)
+    raises(firebase_auth.InvalidIdTokenError, verifier.verify, bad)
+    check("B: failures are never cached", issuer.verify_calls == calls + 2)
+
+    class NoExp:
+        calls = 0
+
+        def verify(self, id_token):
+            NoExp.calls += 1
+            return {"uid": id_token}
+
+    no_exp = IdTokenVerifier(NoExp(), cert_refresh_seconds=0)
+    no_exp.verify("t")
+    no_exp.verify("t")
+    check("B: claims without exp -> not cached", NoExp.calls == 2)
+
+    tokens = [issuer.issue(f"uid-{i}") for i in range(5)]
+    for t in tokens:
+        verifier.verify(t)
+    check("B: LRU keeps max_entries tokens", verifier.stats()["cached_tokens"] == 3)
+    calls = issuer.verify_calls
+    verifier.verify(tokens[-1])
+    verifier.verify(tokens[0])
+    check("B: most recent kept, oldest evicted", issuer.verify_calls == calls + 1)
+
+    disabled = IdTokenVerifier(issuer, max_entries=0, cert_refresh_seconds=0)
+    calls = issuer.verify_calls
+    disabled.verify(token)
+    disabled.verify(token)
+    check("B: max_entries 0 -> no cache", issuer.verify_calls == calls + 2)
+
+    # ==========================================================
+    print("\n=== C: latency / stats ===")
+    # ==========================================================
+    timed = IdTokenVerifier(issuer, cert_refresh_seconds=0)
+    timed.verify(token)
+    timed.verify(token)
+    raises(firebase_auth.InvalidIdTokenError, timed.verify, bad)
+    stats = timed.stats()
+    check("C: 2 verifications (one failed) + 1 hit", (stats["verifications"], stats["hits"]) == (2, 1))
+    check("C: latency recorded (avg > 0, max >= avg)",
+          0 < stats["verify_seconds_avg"] <= stats["verify_seconds_max"])
+
+    # ==========================================================
+    print("\n=== D: cert refresh ===")
+    # ==========================================================
+    refreshing = IdTokenVerifier(FakeIdTokenIssuer(), cert_refresh_seconds=0.05)
+    before = threading.active_count()
+    refreshing.start()
+    refreshing.start()
+    time.sleep(0.3)
+    check("D: one refresh thread per process", threading.active_count() == before + 1)
+    check("D: certs prefetched at start and periodically", refreshing.backend.cert_fetches >= 3)
+    refreshing.stop()
+    check("D: stop() ends the thread", threading.active_count() == before)
+
+    failing = FailingCerts(issuer)
+    flaky = IdTokenVerifier(failing, cert_refresh_seconds=0.05)
+    fresh = issuer.issue("uid-flaky")
+    check("D: verify still works while cert refresh fails", flaky.verify(fresh)["uid"] == "uid-flaky")
+    time.sleep(0.2)
+    flaky.stop()
+    check("D: failures counted, not raised", flaky.cert_refresh_failures == failing.attempts >= 2)
+
+    off = IdTokenVerifier(FakeIdTokenIssuer(), cert_refresh_seconds=0)
+    off.start()
+    check("D: cert_refresh_seconds 0 -> no thread", off._thread is None and off.backend.cert_fetches == 0)
+
+    # ==========================================================
+    print("\n=== E: firebase backend + routes ===")
+    # ==========================================================
+    upstream = []
+
+    def fake_verify(id_token):
+        upstream.append(id_token)
+        return {"uid": "patched-uid", "exp": time.time() + 600}
+
+    real_verify = firebase_auth.verify_id_token
+    firebase_auth.verify_id_token = fake_verify
+    try:
+        results = [verify_firebase_id_token("patched-token") for _ in range(3)]
+    finally:
+        firebase_auth.verify_id_token = real_verify
+    check("E: default backend calls the (patched) firebase_admin.auth.verify_id_token",
+          results[0]["uid"] == "patched-uid" and upstream == ["patched-token"])
+
+    import modules.auth.routes_profile as routes_profile
+    import routes.routes_auth as routes_auth
+    import routes.routes_profile_bootstrap as routes_profile_bootstrap
+    import routes.routes_user as routes_user
+
+    hot = [routes_auth.register_user, routes_auth.get_backend_token, routes_user.register_or_update,
+           routes_profile_bootstrap.bootstrap_user_profile, routes_profile.update_fcm_token]
+    check("E: hot routes verify through the cache",
+          all("verify_firebase_id_token(" in inspect.getsource(f)
+              and "firebase_auth.verify_id_token(id_token)" not in inspect.getsource(f) for f in hot))
+    check("E: delete-account re-authentication still verifies directly",
+          "firebase_auth.verify_id_token(firebase_token)" in inspect.getsource(routes_auth.delete_account))
+
+    # ==========================================================
+    print("\n=== F: timing ===")
+    # ==========================================================
+    bench_issuer = FakeIdTokenIssuer()
+    bench_tokens = [bench_issuer.issue(f"bench-{i}") for i in range(200)]
+    uncached = IdTokenVerifier(bench_issuer, max_entries=0, cert_refresh_seconds=0)
+    started = time.perf_counter()
+    for t in bench_tokens:
+        uncached.verify(t)
+    full_us = (time.perf_counter() - started) * 1e6 / len(bench_tokens)
+
+    cached = IdTokenVerifier(bench_issuer, cert_refresh_seconds=0)
+    cached.verify(bench_tokens[0])
+    started = time.perf_counter()
+    for _ in range(len(bench_tokens)):
+        cached.verify(bench_tokens[0])
+    hit_us = (time.perf_counter() - started) * 1e6 / len(bench_tokens)
+    print(f"  full RS256 verify {full_us:.1f} us, cache hit {hit_us:.1f} us")
+    check("F: a cache hit is at least 10x cheaper than verifying", hit_us * 10 < full_us)
+
+    print(f"\n{'='*50}\nRESULT: {passed} passed, {failed} failed\n{'='*50}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+test_karana_intervals.py
+----------------------------------
+Exact karana / tithi intervals (services/karana_intervals.py) and the
+Holi engine built on them (services/festivals/holi_engine.py).
+
+Covers:
+  A. 60 days of karanas: contiguous, slots cycle 1..60, and every
+     boundary agrees with panchang_engine._karan_at() one second either
+     side. Same for tithis vs astro_core._tithi_number_at().
+  B. Minute-exact: 1-minute polling of _karan_at() finds every Bhadra
+     end in the minute the interval says; elongation_crossing(),
+     karana_interval_at(), bhadra_free_windows().
+  C. detect_holi() for 2022-2030 (New Delhi): same dates and methods as
+     the old polling engine, muhurtas now minute-exact.
+  D. Micro-benchmark: Bhadra end by 5-minute polling vs intervals
+     (printed; intervals must be faster).
+
+NO DATABASE -- real ephemeris.
+"""
+
+import sys
+import time
+from datetime import datetime, timedelta
+
+if hasattr(sys.stdout, "reconfigure"):
+    sys.stdout.reconfigure(encoding="utf-8")
+
+from services.astro_core import _tithi_number_at
+from services.festivals.holi_engine import _bhadra_end_in_pradosh, detect_holi
+from services.karana_intervals import (
+    BHADRA,
+    bhadra_free_windows,
+    bhadra_intervals,
+    elongation_crossing,
+    karana_interval_at,
+    karana_intervals,
+    tithi_intervals,
+)
+from services.panchang_engine import _karan_at
+
+passed = 0
+failed = 0
+
+SECOND = timedelta(seconds=1)
+
+
+def check(label, condition):
+    global passed, failed
+    if condition:
+        print(f"  PASS: {label}")
+        passed += 1
+    else:
+        print(f"  FAIL: {label}")
+        failed += 1
+
+
+def polled_bhadra_end(start_time, step_minutes):
+    """The old holi_engine loop."""
+    check_time = start_time
+    while _karan_at(check_time)[0] == BHADRA:
+        check_time += timedelta(minutes=step_minutes)
+    return check_time
+
+
+# (date, muhurta, method) -- the old 5/10/15-minute polling engine gave
+# 2028 "20:31 to 20:50" and 2029 "21:57 to 22:12" (grid rounding).
+HOLI_DELHI = {
+    2022: ("2022-03-18", "18:30 to 20:54", "Pradosh (Vedic Exception)"),
+    2023: ("2023-03-07", "18:24 to 20:48", "Pradosh (Vedic Exception)"),
+    2024: ("2024-03-24", "23:14 to 23:29", "Standard Pradosh"),
+    2025: ("2025-03-13", "23:28 to 23:43", "Standard Pradosh"),
+    2026: ("2026-03-03", "18:21 to 20:45", "Pradosh (Vedic Exception)"),
+    2027: ("2027-03-22", "18:33 to 20:57", "Pradosh (Vedic Exception)"),
+    2028: ("2028-03-10", "20:29 to 20:50", "Standard Pradosh"),
+    2029: ("2029-03-29", "21:56 to 22:11", "Standard Pradosh"),
+    2030: ("2030-03-19", "18:31 to 20:55", "Standard Pradosh"),
+}
+
+
+def main():
+    window_start = datetime(2026, 7, 1, 6, 0)
+    window_end = window_start + timedelta(days=60)
+
+    # ==========================================================
+    print("=== A: intervals agree with _karan_at / _tithi_number_at ===")
+    # ==========================================================
+    karanas = karana_intervals(window_start, window_end)
+    check(f"A: {len(karanas)} karanas cover the window",
+          karanas[0].start <= window_start < karanas[0].end and karanas[-1].start < window_end <= karanas[-1].end)
+    check("A: contiguous", all(a.end == b.start for a, b in zip(karanas, karanas[1:])))
+    check("A: slots cycle 1..60", all(b.number == a.number % 60 + 1 for a, b in zip(karanas, karanas[1:])))
+    check("A: every karana 4-15 hours",
+          all(timedelta(hours=4) < k.end - k.start < timedelta(hours=15) for k in karanas))
+    mismatched = [
+        k for k in karanas
+        if _karan_at(k.start + SECOND) != (k.name, k.number) or _karan_at(k.end - SECOND) != (k.name, k.number)
+    ]
+    check("A: _karan_at() matches one second inside both ends", not mismatched)
+
+    tithis = tithi_intervals(window_start, window_end)
+    check("A: tithis contiguous", all(a.end == b.start for a, b in zip(tithis, tithis[1:])))
+    check("A: _tithi_number_at() matches one second inside both ends",
+          all(_tithi_number_at(t.start + SECOND) == t.number == _tithi_number_at(t.end - SECOND) for t in tithis))
+    check("A: every tithi boundary is a karana boundary",
+          {t.start for t in tithis[1:]} <= {k.start for k in karanas})
+    check("A: empty window -> no intervals", karana_intervals(window_end, window_start) == [])
+
+    # ==========================================================
+    print("\n=== B: minute-exact ===")
+    # ==========================================================
+    bhadras = bhadra_intervals(window_start, window_end)
+    check(f"B: {len(bhadras)} Bhadras, all Vishti", bhadras and all(b.name == BHADRA for b in bhadras))
+    check("B: 1-minute polling lands in the interval's end minute",
+          all(b.end <= polled_bhadra_end(b.start + SECOND, 1) < b.end + timedelta(minutes=1) for b in bhadras[:6]))
+    purnima = next(t for t in tithis if t.number == 15)
+    check("B: elongation_crossing(180) == Purnima end",
+          abs(elongation_crossing(180.0, purnima.end + timedelta(hours=3)) - purnima.end) <= SECOND)
+    middle = karanas[10].start + (karanas[10].end - karanas[10].start) / 2
+    check("B: karana_interval_at() returns the containing karana", karana_interval_at(middle) == karanas[10])
+
+    first = bhadras[0]
+    span_start, span_end = first.start - timedelta(hours=2), first.end + timedelta(hours=2)
+    free = bhadra_free_windows(span_start, span_end)
+    check("B: bhadra_free_windows cuts Bhadra out",
+          free == [(span_start, first.start), (first.end, span_end)])
+    check("B: Bhadra touching Pradosh -> its end", _bhadra_end_in_pradosh(first.start - timedelta(hours=1)) == first.end)
+    after = first.end + timedelta(hours=1)
+    check("B: no Bhadra in Pradosh -> sunset returned", _bhadra_end_in_pradosh(after) == after)
+
+    # ==========================================================
+    print("\n=== C: detect_holi (New Delhi) ===")
+    # ==========================================================
+    for year, (date, muhurta, method) in HOLI_DELHI.items():
+        got = detect_holi(year, 28.6139, 77.2090)["holika_dahan"]
+        check(f"C: {year} -> {date} {muhurta} ({method})",
+              (got["date"], got["muhurta"], got["method"]) == (date, muhurta, method))
+
+    # ==========================================================
+    print("\n=== D: micro-benchmark (Bhadra end, 20 Bhadras) ===")
+    # ==========================================================
+    starts = [b.start + SECOND for b in bhadras[:20]]
+
+    started = time.perf_counter()
+    polled = [polled_bhadra_end(s, 5) for s in starts]
+    polled_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    exact = [karana_interval_at(s).end for s in starts]
+    exact_ms = (time.perf_counter() - started) * 1000
+
+    print(f"  5-minute polling : {polled_ms:8.1f} ms")
+    print(f"  intervals        : {exact_ms:8.1f} ms ({polled_ms / exact_ms:.0f}x)")
+    check("D: polling only ever late, by under 5 minutes",
+          all(timedelta(0) <= p - e < timedelta(minutes=5) for p, e in zip(polled, exact)))
+    check("D: intervals faster than polling", exact_ms < polled_ms)
+
+    print(f"\n{'='*50}\nRESULT: {passed} passed, {failed} failed\n{'='*50}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+test_llm_executor.py
+----------------------------------
+Shared LLM execution layer (services/llm_executor.py), exercised
+entirely against StubChatBackend -- NO real OpenAI call is ever made.
+
+Covers:
+  A. Coalescing: 10 identical concurrent requests -> ONE upstream call,
+     every caller gets the same text; different prompts are not merged.
+  B. Bounded concurrency: 12 distinct slow requests never exceed
+     max_concurrency in flight, and all complete.
+  C. Retries: transient failures (timeout / 5xx-style) are retried up
+     to max_retries; a non-retryable error is raised immediately.
+  D. The OpenAI-shaped facade: LLMClient().chat.completions.create()
+     returns a ChatCompletion (`.choices[0].message.content`,
+     `.model_dump()`), and services/ai_prediction_lab/openai_client
+     routes through it (generate_with_raw()).
+  E. submit() lets one sync caller fan out several requests and wait
+     once -- wall time ~one latency, not the sum.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+
+if hasattr(sys.stdout, "reconfigure"):
+    sys.stdout.reconfigure(encoding="utf-8")
+
+import services.llm_executor as llm_executor
+from services.llm_executor import LLMClient, LLMExecutor, StubChatBackend
+
+passed = 0
+failed = 0
+
+
+def check(label, condition):
+    global passed, failed
+    if condition:
+        print(f"  PASS: {label}")
+        passed += 1
+    else:
+        print(f"  FAIL: {label}")
+        failed += 1
+
+
+def request(prompt, model="gpt-test"):
+    return {"model": model, "messages": [{"role": "user", "content": prompt}]}
+
+
+def main():
+    # ==========================================================
+    print("=== A: identical in-flight requests are coalesced ===")
+    # ==========================================================
+    backend = StubChatBackend(delay_seconds=0.3)
+    executor = LLMExecutor(backend, max_concurrency=4)
+    results = []
+    barrier = threading.Barrier(10)
+
+    def same_prompt():
+        barrier.wait()
+        results.append(executor.create(**request("same question")).choices[0].message.content)
+
+    threads = [threading.Thread(target=same_prompt) for _ in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    check("A: ten callers -> one upstream call", backend.calls == 1)
+    check("A: nine coalesced", executor.coalesced == 9)
+    check("A: everyone got the same answer", len(set(results)) == 1 and len(results) == 10)
+    executor.create(**request("same question"))
+    check("A: finished call is not cached -- a later identical request calls again", backend.calls == 2)
+    executor.create(**request("another question"))
+    check("A: different prompt -> its own call", backend.calls == 3)
+    executor.shutdown()
+
+    # ==========================================================
+    print("\n=== B: bounded concurrency ===")
+    # ==========================================================
+    slow = StubChatBackend(delay_seconds=0.2)
+    bounded = LLMExecutor(slow, max_concurrency=3)
+    futures = [bounded.submit(**request(f"question {i}")) for i in range(12)]
+    texts = [f.result(timeout=30).choices[0].message.content for f in futures]
+    check("B: all twelve completed", len(texts) == 12 and slow.calls == 12)
+    check("B: never more than 3 in flight", bounded.peak_active == 3)
+    bounded.shutdown()
+
+    # ==========================================================
+    print("\n=== C: retries on transient failures only ===")
+    # ==========================================================
+    attempts = {"n": 0}
+
+    def flaky(kwargs):
+        attempts["n"] += 1
+        if attempts["n"] <= 2:
+            raise asyncio.TimeoutError()
+        return "recovered"
+
+    retrying = LLMExecutor(StubChatBackend(responder=flaky), max_retries=2, retry_backoff_seconds=0.01)
+    text = retrying.create(**request("flaky")).choices[0].message.content
+    check("C: succeeded on the third attempt", text == "recovered" and attempts["n"] == 3)
+    check("C: two retries recorded", retrying.retries == 2)
+
+    attempts["n"] = 0
+    exhausted = LLMExecutor(StubChatBackend(responder=flaky), max_retries=1, retry_backoff_seconds=0.01)
+    try:
+        exhausted.create(**request("flaky"))
+        raised = False
+    except asyncio.TimeoutError:
+        raised = True
+    check("C: gives up after max_retries and re-raises", raised and attempts["n"] == 2)
+
+    def bad_request(kwargs):
+        attempts["bad"] = attempts.get("bad", 0) + 1
+        raise ValueError("400-style: not retryable")
+
+    strict = LLMExecutor(StubChatBackend(responder=bad_request), max_retries=3, retry_backoff_seconds=0.01)
+    try:
+        strict.create(**request("bad"))
+        raised = False
+    except ValueError:
+        raised = True
+    check("C: non-retryable error raised after one attempt", raised and attempts["bad"] == 1)
+
+    timing_out = LLMExecutor(StubChatBackend(delay_seconds=1.0), timeout_seconds=0.1, max_retries=0)
+    try:
+        timing_out.create(**request("slow"))
+        raised = False
+    except asyncio.TimeoutError:
+        raised = True
+    check("C: per-attempt timeout enforced", raised)
+    for e in (retrying, exhausted, strict, timing_out):
+        e.shutdown()
+
+    # ==========================================================
+    print("\n=== D: OpenAI-shaped facade + openai_client routing ===")
+    # ==========================================================
+    stub = StubChatBackend(responder=lambda kwargs: f"answer from {kwargs['model']}")
+    shared = LLMExecutor(stub)
+    response = LLMClient(shared).chat.completions.create(**request("hi", model="gpt-facade"))
+    check("D: choices[0].message.content", response.choices[0].message.content == "answer from gpt-facade")
+    check("D: model_dump() carries model", response.model_dump()["model"] == "gpt-facade")
+
+    real_executor = llm_executor._executor
+    llm_executor._executor = shared
+    try:
+        from services.ai_prediction_lab import openai_client
+
+        text, raw = openai_client.generate_with_raw("lab prompt")
+        check("D: Lab client goes through the shared executor", text == f"answer from {openai_client._MODEL}")
+        check("D: raw dict preserved for provenance", raw.get("model") == openai_client._MODEL)
+    finally:
+        llm_executor._executor = real_executor
+        shared.shutdown()
+
+    # ==========================================================
+    print("\n=== E: sync fan-out via submit() ===")
+    # ==========================================================
+    fan = LLMExecutor(StubChatBackend(delay_seconds=0.4), max_concurrency=8)
+    started = time.monotonic()
+    pending = [fan.submit(**request(f"section {i}")) for i in range(6)]
+    done = [f.result(timeout=30) for f in pending]
+    elapsed = time.monotonic() - started
+    check("E: six results", len(done) == 6)
+    check(f"E: wall time ~one latency ({elapsed:.2f}s < 1.2s), not six", elapsed < 1.2)
+    fan.shutdown()
+
+    print(f"\n{'='*50}\nRESULT: {passed} passed, {failed} failed\n{'='*50}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
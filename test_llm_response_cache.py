@@ -0,0 +1,171 @@
+"""
+test_llm_response_cache.py
+----------------------------------
+Content-addressed LLM response cache (services/llm_response_cache.py)
+and its use by OpenAIExecutor, against the in-memory store.
+
+Covers:
+  A. Keying: whitespace-only differences share a key; model,
+     prompt_version and wording each change it.
+  B. OpenAIExecutor: the second identical (prompt, prompt_version) is
+     served from the cache with the original raw dict; a new
+     prompt_version goes upstream again.
+  C. TTL expiry and size-bounded LRU eviction.
+  D. Fail-open: a broken store is counted as an error and the live
+     call still answers; a failed live call stores nothing.
+  E. stats(): hit rate and store-wide figures.
+
+NO OPENAI CALL, NO DATABASE -- openai_client's transport is pointed at
+a StubChatBackend executor (services/llm_executor.py). The Postgres
+store is exercised separately by test_llm_response_cache_postgres.py.
+"""
+
+import sys
+from datetime import datetime, timedelta
+
+if hasattr(sys.stdout, "reconfigure"):
+    sys.stdout.reconfigure(encoding="utf-8")
+
+import services.llm_executor as llm_executor
+from modules.ai_report_engine.exceptions import OpenAICallError
+from modules.ai_report_engine.openai_executor import OpenAIExecutor
+from services.ai_prediction_lab import openai_client
+from services.llm_executor import LLMExecutor, StubChatBackend
+from services.llm_response_cache import InMemoryLLMCacheStore, LLMResponseCache, cache_key
+
+passed = 0
+failed = 0
+
+
+def check(label, condition):
+    global passed, failed
+    if condition:
+        print(f"  PASS: {label}")
+        passed += 1
+    else:
+        print(f"  FAIL: {label}")
+        failed += 1
+
+
+class _BrokenStore:
+    name = "broken"
+
+    def get(self, key, now):
+        raise RuntimeError("database unavailable")
+
+    def put(self, key, row, now, max_entries):
+        raise RuntimeError("database unavailable")
+
+    def size(self):
+        raise RuntimeError("database unavailable")
+
+    def total_hits(self):
+        raise RuntimeError("database unavailable")
+
+
+def main():
+    # ==========================================================
+    print("=== A: cache keys ===")
+    # ==========================================================
+    base = cache_key("gpt-x", "Lagna: Leo\n7th lord in 10th", "v1")
+    check("A: leading/trailing/inner whitespace runs ignored",
+          base == cache_key("gpt-x", "  Lagna:   Leo  \n7th lord in\t10th\n", "v1"))
+    check("A: 3+ blank lines collapse to one paragraph break",
+          cache_key("gpt-x", "Lagna: Leo\n\n7th lord", "v1") == cache_key("gpt-x", "Lagna: Leo\n\n\n\n7th lord", "v1"))
+    check("A: CRLF == LF", base == cache_key("gpt-x", "Lagna: Leo\r\n7th lord in 10th", "v1"))
+    check("A: model changes the key", base != cache_key("gpt-y", "Lagna: Leo\n7th lord in 10th", "v1"))
+    check("A: prompt_version changes the key", base != cache_key("gpt-x", "Lagna: Leo\n7th lord in 10th", "v2"))
+    check("A: wording/case changes the key", base != cache_key("gpt-x", "Lagna: leo\n7th lord in 10th", "v1"))
+
+    # ==========================================================
+    print("\n=== B: OpenAIExecutor consults the cache first ===")
+    # ==========================================================
+    backend = StubChatBackend(responder=lambda kwargs: f"reading #{backend.calls}")
+    stub_executor = LLMExecutor(backend)
+    real_executor = llm_executor._executor
+    llm_executor._executor = stub_executor
+    try:
+        cache = LLMResponseCache(InMemoryLLMCacheStore())
+        executor = OpenAIExecutor(cache=cache)
+        first_text, first_raw = executor.run("Career prompt for Leo lagna", prompt_version="career_dna_v1")
+        second_text, second_raw = executor.run("Career prompt for  Leo lagna\n", prompt_version="career_dna_v1")
+        check("B: one upstream call for two identical prompts", backend.calls == 1)
+        check("B: same text served", first_text == second_text == "reading #1")
+        check("B: stored raw dict replayed (model provenance intact)",
+              second_raw.get("id") == first_raw.get("id") and second_raw.get("model") == openai_client._MODEL)
+        check("B: a hit reports no token usage", "usage" not in second_raw)
+        executor.run("Career prompt for Leo lagna", prompt_version="career_dna_v2")
+        check("B: new prompt_version -> upstream again", backend.calls == 2)
+    finally:
+        llm_executor._executor = real_executor
+
+    # ==========================================================
+    print("\n=== C: TTL and LRU bounds ===")
+    # ==========================================================
+    clock = [datetime(2026, 10, 19, 12, 0, 0)]
+    bounded = LLMResponseCache(InMemoryLLMCacheStore(), ttl_seconds=3600, max_entries=2, now_fn=lambda: clock[0])
+    calls = []
+
+    def answer(label):
+        def call():
+            calls.append(label)
+            return f"text {label}", {"model": "gpt-x"}
+        return call
+
+    bounded.fetch(model="gpt-x", prompt="p1", prompt_version="v", call=answer("p1"))
+    clock[0] += timedelta(minutes=59)
+    _, _, hit = bounded.fetch(model="gpt-x", prompt="p1", prompt_version="v", call=answer("p1"))
+    check("C: within TTL -> hit", hit and calls == ["p1"])
+    clock[0] += timedelta(minutes=2)
+    _, _, hit = bounded.fetch(model="gpt-x", prompt="p1", prompt_version="v", call=answer("p1"))
+    check("C: past TTL -> miss and refetch", not hit and calls == ["p1", "p1"])
+
+    bounded.fetch(model="gpt-x", prompt="p2", prompt_version="v", call=answer("p2"))
+    bounded.fetch(model="gpt-x", prompt="p1", prompt_version="v", call=answer("p1"))  # p1 most recent
+    bounded.fetch(model="gpt-x", prompt="p3", prompt_version="v", call=answer("p3"))  # evicts p2
+    check("C: never more than max_entries", bounded.store.size() == 2)
+    _, _, p1_hit = bounded.fetch(model="gpt-x", prompt="p1", prompt_version="v", call=answer("p1"))
+    _, _, p2_hit = bounded.fetch(model="gpt-x", prompt="p2", prompt_version="v", call=answer("p2"))
+    check("C: least-recently-used entry evicted first", p1_hit and not p2_hit)
+    check("C: evictions counted", bounded.evictions >= 2)
+
+    # ==========================================================
+    print("\n=== D: fail-open ===")
+    # ==========================================================
+    broken = LLMResponseCache(_BrokenStore())
+    text, _, hit = broken.fetch(model="gpt-x", prompt="p", prompt_version="v",
+                                call=lambda: ("live", {"model": "gpt-x"}))
+    check("D: broken store -> live answer", text == "live" and not hit)
+    check("D: lookup + store errors counted", broken.errors == 2)
+
+    fresh = LLMResponseCache(InMemoryLLMCacheStore())
+
+    def failing_call():
+        raise OpenAICallError("OpenAI call failed")
+
+    try:
+        fresh.fetch(model="gpt-x", prompt="p", prompt_version="v", call=failing_call)
+        raised = False
+    except OpenAICallError:
+        raised = True
+    check("D: live failure propagates, nothing stored", raised and fresh.store.size() == 0)
+
+    # ==========================================================
+    print("\n=== E: stats ===")
+    # ==========================================================
+    stats = cache.stats()
+    check("E: hits/misses/stores", (stats.hits, stats.misses, stats.stores) == (1, 2, 2))
+    check("E: hit_rate", stats.hit_rate == round(1 / 3, 4))
+    check("E: store-wide entries and hits", (stats.entries, stats.persisted_hits) == (2, 1))
+    check("E: unreachable store -> store-wide figures None",
+          (broken.stats().entries, broken.stats().persisted_hits) == (None, None))
+    check("E: disabled cache reports backend off", LLMResponseCache(None).stats().backend == "off")
+    stub_executor.shutdown()
+
+    print(f"\n{'='*50}\nRESULT: {passed} passed, {failed} failed\n{'='*50}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
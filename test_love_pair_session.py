@@ -0,0 +1,158 @@
+"""
+test_love_pair_session.py
+----------------------------------
+Love pair sessions (modules/love/pair_session.py): both charts and the
+ashtakoot result are computed once per pair and shared by every love
+endpoint.
+
+Covers:
+  A. The four /api/love tools called in a row for the same pair run
+     calculate_full_kundali() once per person (it used to be 12 times),
+     and every response is unchanged vs the old per-request path.
+  B. Returned data is a private copy: mutating it (as
+     run_love_compatibility's status normalisation and the compilers
+     do) never leaks into the next request.
+  C. Keying: a different pair or a different kundali language computes
+     afresh; an incomplete pair raises LoveServiceError every time and
+     is never memoized.
+  D. TTL eviction and the max_sessions bound.
+
+NO DATABASE, NO OPENAI CALL -- real ephemeris charts, counted through a
+wrapper around full_kundali_api.calculate_full_kundali.
+"""
+
+import sys
+
+if hasattr(sys.stdout, "reconfigure"):
+    sys.stdout.reconfigure(encoding="utf-8")
+
+from flask import Flask
+
+import modules.love.pair_session as pair_session
+import modules.love.service_love as service_love
+from full_kundali_api import calculate_full_kundali
+from modules.love.pair_session import LovePairSessionStore, pair_fingerprint
+from modules.love.routes_love import love_bp
+from modules.love.service_love import LoveServiceError, run_love_compatibility
+
+passed = 0
+failed = 0
+
+
+def check(label, condition):
+    global passed, failed
+    if condition:
+        print(f"  PASS: {label}")
+        passed += 1
+    else:
+        print(f"  FAIL: {label}")
+        failed += 1
+
+
+USER = {"name": "Ravi", "dob": "1985-03-31", "tob": "19:45", "lat": 26.8467, "lng": 80.9462}
+PARTNER = {"name": "Meera", "dob": "1988-11-02", "tob": "06:10", "lat": 28.6139, "lng": 77.2090}
+PARTNER_DOB_ONLY = {"name": "Meera", "dob": "1988-11-02"}
+
+calls = []
+
+
+def counting_kundali(**kwargs):
+    calls.append((kwargs["name"], kwargs.get("language")))
+    return calculate_full_kundali(**kwargs)
+
+
+def main():
+    pair_session.calculate_full_kundali = counting_kundali
+    service_love.calculate_full_kundali = counting_kundali
+    store = LovePairSessionStore()
+    pair_session._store = store
+
+    app = Flask("test_love_pair_session")
+    app.register_blueprint(love_bp)
+    http = app.test_client()
+    body = {"user": USER, "partner": PARTNER, "boy_is_user": True, "language": "en"}
+
+    # ==========================================================
+    print("=== A: one chart per person across all love tools ===")
+    # ==========================================================
+    responses = {
+        path: http.post(f"/api/love/{path}", json=body)
+        for path in ("compatibility", "report", "truth-or-dare", "love-marriage-probability")
+    }
+    check("A: all four endpoints succeed", all(r.status_code == 200 and r.get_json()["ok"] for r in responses.values()))
+    check(f"A: calculate_full_kundali ran once per person ({len(calls)} calls)",
+          sorted(calls) == [("Meera", "en"), ("Ravi", "en")])
+    check("A: one session for the pair", (store.misses, store.hits) == (1, 3))
+
+    legacy = run_love_compatibility(user=USER, partner=PARTNER, boy_is_user=True)
+    check("A: compatibility identical to a fresh run_love_compatibility()",
+          responses["compatibility"].get_json()["data"] == legacy)
+    check("A: ashtakoot present", legacy["ashtakoot"]["max_score"] == 36.0)
+    again = http.post("/api/love/report", json=body).get_json()["data"]
+    earlier = responses["report"].get_json()["data"]
+    again.pop("generated_at", None)
+    earlier.pop("generated_at", None)
+    check("A: repeated report identical, no new charts",
+          again == earlier and len(calls) == 4)  # 2 above + 2 for `legacy`
+
+    # ==========================================================
+    print("\n=== B: callers get private copies ===")
+    # ==========================================================
+    session = store.session(USER, PARTNER)
+    first = session.compatibility(boy_is_user=True)
+    first["ashtakoot"]["kootas"]["nadi"]["status"] = "tampered"
+    first["case"] = "tampered"
+    kundali = session.kundali("user", "en")
+    kundali["planets"].clear()
+    check("B: compatibility unaffected by a caller's mutation",
+          session.compatibility(boy_is_user=True)["ashtakoot"]["kootas"]["nadi"]["status"] != "tampered"
+          and session.compatibility(boy_is_user=True)["case"] == "A_FULL_DUAL")
+    check("B: kundali unaffected by a caller's mutation", len(session.kundali("user", "en")["planets"]) > 0)
+
+    # ==========================================================
+    print("\n=== C: keying ===")
+    # ==========================================================
+    before = len(calls)
+    store.session(USER, PARTNER).kundali("user", "hi")
+    check("C: another language -> its own chart", len(calls) == before + 1 and calls[-1] == ("Ravi", "hi"))
+    check("C: coordinates equal to 4 decimals share a fingerprint",
+          pair_fingerprint(USER, PARTNER) == pair_fingerprint(dict(USER, lat=26.84670001), PARTNER))
+    check("C: a different partner is a different pair",
+          pair_fingerprint(USER, PARTNER) != pair_fingerprint(USER, PARTNER_DOB_ONLY))
+
+    dob_only = store.session(USER, PARTNER_DOB_ONLY).compatibility(boy_is_user=True)
+    check("C: DOB-only partner -> hybrid case with fallback",
+          dob_only["case"] == "B_DOB_ONLY_HYBRID" and dob_only["fallback"] is not None)
+
+    incomplete = store.session({"name": "Ravi", "dob": "1985-03-31"}, PARTNER)
+    outcomes = []
+    for _ in range(2):
+        try:
+            incomplete.compatibility()
+            outcomes.append("ok")
+        except LoveServiceError:
+            outcomes.append("error")
+    check("C: incomplete user -> LoveServiceError every time", outcomes == ["error", "error"])
+    check("C: incomplete user -> no chart computed", incomplete.computations == 0)
+
+    # ==========================================================
+    print("\n=== D: TTL and size bound ===")
+    # ==========================================================
+    clock = [1000.0]
+    bounded = LovePairSessionStore(ttl_seconds=60, max_sessions=2, now_fn=lambda: clock[0])
+    s1 = bounded.session(USER, PARTNER)
+    clock[0] += 59
+    check("D: within TTL -> same session", bounded.session(USER, PARTNER) is s1)
+    clock[0] += 2
+    check("D: past TTL -> new session", bounded.session(USER, PARTNER) is not s1)
+    bounded.session(USER, PARTNER_DOB_ONLY)
+    bounded.session(PARTNER, USER)
+    check("D: never more than max_sessions", len(bounded) == 2)
+
+    print(f"\n{'='*50}\nRESULT: {passed} passed, {failed} failed\n{'='*50}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+test_navratri_calendar.py
+----------------------------------
+Calendar-driven Navratri (services/festivals/navratri_engine.py) on the
+precomputed month + tithi calendar (services/lunar_calendar.py).
+
+Covers:
+  A. build_tithi_calendar() agrees with calculate_panchang() (sunrise
+     tithi, its window, kshaya / vriddhi / transition count) and
+     lunar_months() with get_amanta_month().
+  B. Navratri 2020-2030 (New Delhi): Kalash Sthapana dates unchanged;
+     every tithi Pratipada..Navami covered exactly once, in order, also
+     in kshaya (8-day) and vriddhi (10-day) years; 2026 Chaitra kshaya
+     Pratipada; Sandhi Puja on the exact Navami start; Vijayadashami on
+     the Aparahna-Dashami day.
+  C. Ephemeris cost of one /navratri build (swe.calc_ut calls, printed)
+     stays a small constant per calendar day.
+
+NO DATABASE -- real ephemeris.
+"""
+
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+if hasattr(sys.stdout, "reconfigure"):
+    sys.stdout.reconfigure(encoding="utf-8")
+
+import swisseph as swe
+
+from services.astro_core import _tithi_number_at
+from services.festivals.navratri_engine import CALENDAR_PADDING_DAYS, SEARCH_DAYS, build_full_navratri, detect_navratri
+from services.lunar_calendar import build_tithi_calendar, lunar_months
+from services.lunar_month_engine import get_amanta_month
+from services.panchang_engine import calculate_panchang
+
+passed = 0
+failed = 0
+
+LAT, LON = 28.61, 77.23
+
+
+def check(label, condition):
+    global passed, failed
+    if condition:
+        print(f"  PASS: {label}")
+        passed += 1
+    else:
+        print(f"  FAIL: {label}")
+        failed += 1
+
+
+def minutes_apart(a, b):
+    fmt = "%Y-%m-%d %H:%M"
+    return abs((datetime.strptime(a, fmt) - datetime.strptime(b, fmt)).total_seconds()) / 60
+
+
+# Kalash Sthapana dates of the previous per-day scanning engine
+KALASH_STHAPANA = {
+    (2020, "chaitra"): "2020-03-25", (2020, "sharadiya"): "2020-10-17",
+    (2021, "chaitra"): "2021-04-13", (2021, "sharadiya"): "2021-10-07",
+    (2022, "chaitra"): "2022-04-02", (2022, "sharadiya"): "2022-09-26",
+    (2023, "chaitra"): "2023-03-22", (2023, "sharadiya"): "2023-10-15",
+    (2024, "chaitra"): "2024-04-09", (2024, "sharadiya"): "2024-10-03",
+    (2025, "chaitra"): "2025-03-30", (2025, "sharadiya"): "2025-09-22",
+    (2026, "chaitra"): "2026-03-19", (2026, "sharadiya"): "2026-10-11",
+    (2027, "chaitra"): "2027-04-07", (2027, "sharadiya"): "2027-09-30",
+    (2028, "chaitra"): "2028-03-27", (2028, "sharadiya"): "2028-09-19",
+    (2029, "chaitra"): "2029-04-14", (2029, "sharadiya"): "2029-10-08",
+    (2030, "chaitra"): "2030-04-03", (2030, "sharadiya"): "2030-09-28",
+}
+
+DUSSEHRA = {2022: "2022-10-05", 2023: "2023-10-24", 2024: "2024-10-12", 2025: "2025-10-02"}
+
+
+def main():
+    # ==========================================================
+    print("=== A: calendar == calculate_panchang / get_amanta_month ===")
+    # ==========================================================
+    calendar = build_tithi_calendar(date(2025, 9, 1), date(2025, 10, 31), LAT, LON)
+    check("A: one day per date", [c.date for c in calendar] == [date(2025, 9, 1) + timedelta(days=i) for i in range(61)])
+    flags_ok, window_ok = True, True
+    for day in calendar[::3]:
+        p = calculate_panchang(day.date, LAT, LON, "en")
+        special = p["tithi_special"]
+        if (special["kshaya"], special["vriddhi"], special["transition_count"], p["tithi"]["number"]) != (
+            day.kshaya, day.vriddhi, day.transition_count, day.sunrise_tithi.number
+        ):
+            flags_ok = False
+        t = day.sunrise_tithi
+        if (minutes_apart(p["tithi"]["start_ist"], t.start.strftime("%Y-%m-%d %H:%M")) > 1
+                or minutes_apart(p["tithi"]["end_ist"], t.end.strftime("%Y-%m-%d %H:%M")) > 1):
+            window_ok = False
+    check("A: sunrise tithi + kshaya/vriddhi/transitions identical", flags_ok)
+    check("A: tithi window within a minute (old one was a binary search)", window_ok)
+    check("A: kshaya and vriddhi days present in the sample window",
+          any(c.kshaya for c in calendar) and any(c.vriddhi for c in calendar))
+
+    months = lunar_months(datetime(2025, 1, 1), datetime(2026, 1, 1))
+    check("A: months contiguous", all(a.end == b.start for a, b in zip(months, months[1:])))
+    check("A: every month == get_amanta_month() at its middle",
+          all(get_amanta_month(m.start + (m.end - m.start) / 2) == m.to_dict() for m in months))
+
+    # ==========================================================
+    print("\n=== B: Navratri 2020-2030 ===")
+    # ==========================================================
+    results = {key: build_full_navratri(key[0], LAT, LON, key[1]) for key in KALASH_STHAPANA}
+    check("B: Kalash Sthapana dates unchanged",
+          all(r.get("start_date") == KALASH_STHAPANA[key] for key, r in results.items()))
+    check("B: Pratipada..Navami each covered exactly once, in order",
+          all(
+              [n for n in sorted(set(sum((d["tithis"] for d in r["days"]), [])) - {30})] == list(range(1, 10))
+              and sum((d["tithis"] for d in r["days"]), [])[-1] == 9
+              for r in results.values()
+          ))
+    lengths = {r["total_days"] for r in results.values()}
+    check(f"B: kshaya / vriddhi years -> {sorted(lengths)} days", lengths == {8, 9, 10})
+    sharad_2025 = results[(2025, "sharadiya")]
+    check("B: 2025 Sharad: Tritiya vriddhi -> 10 days, ends 2025-10-01",
+          (sharad_2025["total_days"], sharad_2025["end_date"]) == (10, "2025-10-01")
+          and [d["tithis"] for d in sharad_2025["days"]][2:4] == [[3], [3]])
+    chaitra_2025 = results[(2025, "chaitra")]
+    check("B: 2025 Chaitra: Tritiya kshaya -> 8 days, day 2 carries 2 and 3",
+          chaitra_2025["total_days"] == 8 and chaitra_2025["days"][1]["tithis"] == [2, 3])
+    chaitra_2026 = results[(2026, "chaitra")]["days"][0]
+    check("B: 2026 Chaitra: kshaya Pratipada on the Amavasya-sunrise day",
+          (chaitra_2026["date"], chaitra_2026["tithi"], chaitra_2026["tithis"], chaitra_2026["tithi_window"]["number"])
+          == ("2026-03-19", 1, [30, 1], 30))
+    def sandhi_centre(r):
+        sandhi = r["sandhi_puja"]
+        return datetime.strptime(f"{sandhi['date']} {sandhi['start']}", "%Y-%m-%d %H:%M") + timedelta(minutes=24)
+
+    check("B: Sandhi Puja centred on the Ashtami -> Navami change",
+          all(
+              _tithi_number_at(sandhi_centre(r) - timedelta(minutes=1)) == 8
+              and _tithi_number_at(sandhi_centre(r) + timedelta(minutes=1)) == 9
+              for r in results.values()
+          ))
+    check("B: Vijayadashami (Dussehra) 2022-2025",
+          all(results[(y, "sharadiya")]["vijayadashami"]["date"] == d for y, d in DUSSEHRA.items()))
+    check("B: Vijayadashami never before Navratri ends",
+          all(r["vijayadashami"]["date"] >= r["end_date"] for r in results.values()))
+    light = detect_navratri(2024, LAT, LON, "sharadiya")
+    check("B: detect_navratri() == build_full_navratri() days",
+          [(d["date"], d["tithi"]) for d in light["days"]]
+          == [(d["date"], d["tithi"]) for d in results[(2024, "sharadiya")]["days"]])
+
+    # ==========================================================
+    print("\n=== C: ephemeris cost of one build ===")
+    # ==========================================================
+    real_calc_ut = swe.calc_ut
+    calls = [0]
+
+    def counting_calc_ut(*args, **kwargs):
+        calls[0] += 1
+        return real_calc_ut(*args, **kwargs)
+
+    swe.calc_ut = counting_calc_ut
+    try:
+        started = time.perf_counter()
+        build_full_navratri(2027, LAT, LON, "sharadiya")
+        elapsed_ms = (time.perf_counter() - started) * 1000
+    finally:
+        swe.calc_ut = real_calc_ut
+
+    days = SEARCH_DAYS + CALENDAR_PADDING_DAYS + 1
+    print(f"  {calls[0]} swe.calc_ut calls for {days} calendar days, {elapsed_ms:.1f} ms")
+    check("C: under 8 ephemeris calls per calendar day", calls[0] < 8 * days)
+
+    print(f"\n{'='*50}\nRESULT: {passed} passed, {failed} failed\n{'='*50}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
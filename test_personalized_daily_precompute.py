@@ -0,0 +1,90 @@
+"""
+test_personalized_daily_precompute.py
+----------------------------------
+Per-lagna daily precompute for /api/personalized/daily and
+/api/modern/daily (services/personalized/personalized_daily_engine.py).
+
+Covers:
+  A. Every one of the 12 precomputed lagna profiles, for today and
+     tomorrow, at the default and a non-default location, equals the
+     uncached get_today_positions() result for the same date.
+  B. Served profiles are copies -- a caller mutating one (the route
+     adds "lang") never leaks into the next request.
+  C. Day-boundary eviction: once the IST day rolls over, the previous
+     day's profiles and paksha entries are gone and the new
+     today/tomorrow pair is built.
+
+No Flask, no database -- pure ephemeris.
+"""
+
+import datetime
+import sys
+
+if hasattr(sys.stdout, "reconfigure"):
+    sys.stdout.reconfigure(encoding="utf-8")
+
+from services.personalized.personalized_daily_engine import (
+    RASHIS,
+    PersonalizedDailyPrecompute,
+    get_today_positions,
+)
+
+passed = 0
+failed = 0
+
+
+def check(label, condition):
+    global passed, failed
+    if condition:
+        print(f"  PASS: {label}")
+        passed += 1
+    else:
+        print(f"  FAIL: {label}")
+        failed += 1
+
+
+def main():
+    current = [datetime.date(2026, 10, 19)]
+    table = PersonalizedDailyPrecompute(today_fn=lambda: current[0])
+
+    # ==========================================================
+    print("=== A: precomputed profiles equal the uncached computation ===")
+    # ==========================================================
+    for lat, lon in ((28.6, 77.2), (19.07, 72.87)):
+        mismatches = [
+            lagna for lagna in RASHIS
+            if table.profile(lagna, lat, lon) != {
+                "today": get_today_positions("2026-10-19", lagna, lat, lon),
+                "tomorrow": get_today_positions("2026-10-20", lagna, lat, lon),
+            }
+        ]
+        check(f"A: all 12 lagnas match at ({lat}, {lon})", mismatches == [])
+    check("A: exactly today + tomorrow built", table.days() == ["2026-10-19", "2026-10-20"])
+
+    # ==========================================================
+    print("\n=== B: served profiles are independent copies ===")
+    # ==========================================================
+    served = table.profile("Leo")
+    served["today"]["lang"] = "hi"
+    served["today"]["moon"]["house"] = -1
+    again = table.profile("Leo")
+    check("B: added key does not leak", "lang" not in again["today"])
+    check("B: nested mutation does not leak", again["today"]["moon"]["house"] != -1)
+
+    # ==========================================================
+    print("\n=== C: day-boundary eviction ===")
+    # ==========================================================
+    current[0] = datetime.date(2026, 10, 20)
+    rolled = table.profile("Aries")
+    check("C: window moved to the new IST day", table.days() == ["2026-10-20", "2026-10-21"])
+    check("C: yesterday's paksha entries evicted", all(key[0] >= "2026-10-20" for key in table._paksha))
+    check("C: new 'today' equals the old 'tomorrow' computation",
+          rolled["today"] == get_today_positions("2026-10-20", "Aries", 28.6, 77.2))
+
+    print(f"\n{'='*50}\nRESULT: {passed} passed, {failed} failed\n{'='*50}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
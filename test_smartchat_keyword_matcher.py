@@ -0,0 +1,132 @@
+"""
+test_smartchat_keyword_matcher.py
+----------------------------------
+The compiled keyword matcher behind SmartChat's detect_house()
+(modules/smartchat/keyword_map.py).
+
+Covers:
+  A. Match parity: for every keyword and for a set of real-style
+     questions, match_houses() finds exactly the houses the old
+     per-keyword substring scan found (overlapping keywords included).
+  B. Choice: the best-scoring specific house wins, a short incidental
+     hit ("me" inside "time") no longer shadows it, house 0 only as a
+     fallback, ties by HOUSE_KEYWORDS order, always the same answer.
+  C. Micro-benchmark against the old nested-loop implementation
+     (printed; the compiled matcher must be faster on average).
+
+NO DATABASE, NO OPENAI CALL.
+"""
+
+import sys
+import time
+
+if hasattr(sys.stdout, "reconfigure"):
+    sys.stdout.reconfigure(encoding="utf-8")
+
+from modules.smartchat.keyword_map import HOUSE_KEYWORDS, detect_house, match_houses
+
+passed = 0
+failed = 0
+
+
+def check(label, condition):
+    global passed, failed
+    if condition:
+        print(f"  PASS: {label}")
+        passed += 1
+    else:
+        print(f"  FAIL: {label}")
+        failed += 1
+
+
+def legacy_detect_house(question):
+    """The pre-compiled implementation, kept verbatim for comparison."""
+    if not question:
+        return 0
+
+    q = question.lower()
+
+    for house, words in HOUSE_KEYWORDS.items():
+        for w in words:
+            if w.lower() in q:
+                return house
+    return 0
+
+
+def legacy_matched_houses(question):
+    q = question.lower()
+    return {house for house, words in HOUSE_KEYWORDS.items() if any(w.lower() in q for w in words)}
+
+
+QUESTIONS = [
+    "When will I get married?",
+    "What time will my job change happen?",
+    "Meri shaadi kab hogi?",
+    "Mera business kaisa chalega is saal?",
+    "क्या मुझे विदेश यात्रा का योग है?",
+    "मेरी नौकरी कब लगेगी",
+    "Will my health improve after the surgery?",
+    "Should I buy a new house or a car this year?",
+    "Will he come back to me after the breakup?",
+    "Kya mujhe santaan sukh milega?",
+    "My future looks dark, what to do?",
+    "Tell me about my father and his property",
+    "Is there any government job in my kundli for 2027?",
+    "Mann nahi lagta, overthinking bahut hai",
+    "My future in this job, what to do?",
+    "Hello",
+    "",
+]
+
+
+def main():
+    # ==========================================================
+    print("=== A: same matches as the per-keyword scan ===")
+    # ==========================================================
+    every_keyword_ok = all(
+        house in match_houses(w) for house, words in HOUSE_KEYWORDS.items() for w in words
+    )
+    check("A: every keyword, on its own, matches its house", every_keyword_ok)
+    check("A: keyword in upper case still matches", 7 in match_houses("MERI SHAADI KAB HOGI"))
+    check("A: real questions -> identical matched-house sets",
+          all(set(match_houses(q)) == (legacy_matched_houses(q) if q else set()) for q in QUESTIONS))
+
+    # ==========================================================
+    print("\n=== B: deterministic choice ===")
+    # ==========================================================
+    question = "What time will my job change happen?"
+    check("B: old scan returned house 1 via 'me' inside 'time'", legacy_detect_house(question) == 1)
+    check("B: scored choice picks the career house", detect_house(question) == 10)
+    scores = match_houses("My future in this job, what to do?")
+    check("B: general-only question -> 0",
+          detect_house("Kya hoga aage?") == 0 and 0 in match_houses("Kya hoga aage?"))
+    check("B: house 0 never beats a specific house",
+          scores[0] > scores[10] and detect_house("My future in this job, what to do?") == 10)
+    check("B: nothing matched -> 0", detect_house("Hello") == 0 and detect_house("") == 0)
+    check("B: same answer every time", all(detect_house(q) == detect_house(q) for q in QUESTIONS * 3))
+
+    # ==========================================================
+    print("\n=== C: micro-benchmark ===")
+    # ==========================================================
+    rounds = 300
+
+    def bench(fn):
+        started = time.perf_counter()
+        for _ in range(rounds):
+            for q in QUESTIONS:
+                fn(q)
+        return (time.perf_counter() - started) / (rounds * len(QUESTIONS)) * 1e6
+
+    legacy_us = bench(legacy_detect_house)
+    compiled_us = bench(detect_house)
+    print(f"  nested loop : {legacy_us:8.1f} us / question")
+    print(f"  compiled    : {compiled_us:8.1f} us / question ({legacy_us / compiled_us:.1f}x)")
+    check("C: compiled matcher faster than the nested loop", compiled_us < legacy_us)
+
+    print(f"\n{'='*50}\nRESULT: {passed} passed, {failed} failed\n{'='*50}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+test_transit_snapshot.py
+----------------------------------
+Time-bucketed "now" transit snapshot behind
+transit_engine.get_current_positions() (TransitSnapshotProvider).
+
+Covers:
+  A. Every planet's served position equals the uncached
+     compute_positions_at() result at that planet's bucket start.
+  B. Within one bucket nothing is recomputed; crossing only the Moon's
+     5-minute bucket recomputes only the Moon.
+  C. Single-flight refresh: 16 threads hitting a cold provider at the
+     same instant produce exactly one computation per planet.
+  D. Served positions are copies -- mutating one never leaks.
+  E. daily_transit_context reads one snapshot for all four planets.
+
+No Flask, no database -- pure ephemeris.
+"""
+
+import datetime
+import sys
+import threading
+
+import pytz
+
+if hasattr(sys.stdout, "reconfigure"):
+    sys.stdout.reconfigure(encoding="utf-8")
+
+import transit_engine
+from transit_engine import CURRENT_POSITION_PLANETS, TransitSnapshotProvider, compute_positions_at
+
+passed = 0
+failed = 0
+
+
+def check(label, condition):
+    global passed, failed
+    if condition:
+        print(f"  PASS: {label}")
+        passed += 1
+    else:
+        print(f"  FAIL: {label}")
+        failed += 1
+
+
+IST = pytz.timezone("Asia/Kolkata")
+
+
+def main():
+    clock = [IST.localize(datetime.datetime(2026, 10, 19, 10, 2, 30))]
+    provider = TransitSnapshotProvider(now_fn=lambda: clock[0])
+
+    # ==========================================================
+    print("=== A: bucketed positions equal the uncached computation ===")
+    # ==========================================================
+    served = provider.current_positions()
+    mismatches = []
+    for name in CURRENT_POSITION_PLANETS:
+        start = datetime.datetime.fromtimestamp(provider.bucket_start(name, clock[0]), pytz.UTC)
+        if served["positions"][name] != compute_positions_at(start, [name])[name]:
+            mismatches.append(name)
+    check("A: all nine planets match their bucket-start computation", mismatches == [])
+    check("A: timestamp_ist is the caller's real now", served["timestamp_ist"] == "2026-10-19 10:02:30 IST")
+    check("A: nine computations on a cold provider", provider.computations == 9)
+
+    # ==========================================================
+    print("\n=== B: recompute only what crossed its bucket ===")
+    # ==========================================================
+    clock[0] = IST.localize(datetime.datetime(2026, 10, 19, 10, 4, 59))
+    provider.current_positions()
+    check("B: same bucket -> no recomputation", provider.computations == 9)
+    clock[0] = IST.localize(datetime.datetime(2026, 10, 19, 10, 5, 1))
+    provider.current_positions()
+    check("B: Moon bucket crossed -> only the Moon recomputed", provider.computations == 10)
+
+    # ==========================================================
+    print("\n=== C: single-flight refresh under concurrency ===")
+    # ==========================================================
+    shared = TransitSnapshotProvider(now_fn=lambda: clock[0])
+    barrier = threading.Barrier(16)
+    results = []
+
+    def worker():
+        barrier.wait()
+        results.append(shared.current_positions()["positions"])
+
+    threads = [threading.Thread(target=worker) for _ in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    check("C: 16 concurrent callers -> 9 computations", shared.computations == 9)
+    check("C: every caller saw the same snapshot", all(r == results[0] for r in results))
+
+    # ==========================================================
+    print("\n=== D: served positions are independent copies ===")
+    # ==========================================================
+    first = provider.current_positions()
+    first["positions"]["Moon"]["rashi"] = "Nowhere"
+    check("D: mutation does not leak", provider.current_positions()["positions"]["Moon"]["rashi"] != "Nowhere")
+
+    # ==========================================================
+    print("\n=== E: daily_transit_context reads one snapshot ===")
+    # ==========================================================
+    from services.ai_prediction_lab.astro_context import AstroContext
+    from services.ai_prediction_lab.daily_transit_context import build_daily_transit_context
+
+    calls = []
+
+    def counting():
+        calls.append(1)
+        return provider.current_positions()
+
+    context = build_daily_transit_context({"lagna_sign": "Leo"}, astro=AstroContext(positions_fn=counting))
+    check("E: one get_current_positions() call for four planets", len(calls) == 1)
+    check("E: four planets returned", sorted(context) == ["mars", "mercury", "moon", "venus"])
+    check("E: module-level get_current_positions() still serves all nine",
+          sorted(transit_engine.get_current_positions()["positions"]) == sorted(CURRENT_POSITION_PLANETS))
+
+    print(f"\n{'='*50}\nRESULT: {passed} passed, {failed} failed\n{'='*50}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@
 
 import swisseph as swe
 import datetime
+import threading
 from datetime import timedelta
 import pytz
 
@@ -32,35 +33,119 @@ def _to_julday_utc(dt_any_tz: datetime.datetime) -> float:
 def _rashi_from_sidereal_lon(sid_lon: float) -> str:
     return RASHIS[int(sid_lon // 30) % 12]
 
-def get_current_positions():
-    now_ist = _ist_now()
-    jd = _to_julday_utc(now_ist)
+CURRENT_POSITION_PLANETS = ["Sun","Moon","Mercury","Venus","Mars","Jupiter","Saturn","Rahu","Ketu"]
+
+def _position_entry(planet_name: str, jd: float, ay: float) -> dict:
+    if planet_name == "Ketu":
+        rahu_sid = (swe.calc_ut(jd, swe.MEAN_NODE)[0][0] - ay) % 360
+        ketu_sid = (rahu_sid + 180.0) % 360
+        return {
+            "rashi": _rashi_from_sidereal_lon(ketu_sid),
+            "degree": round(ketu_sid % 30, 2),
+            "motion": "Retrograde"
+        }
+    res, _ = swe.calc_ut(jd, NAME_TO_ID[planet_name])
+    lon = res[0]
+    speed = res[3] if len(res) > 3 else 0.0
+    sid_lon = (lon - ay) % 360
+    return {
+        "rashi": _rashi_from_sidereal_lon(sid_lon),
+        "degree": round(sid_lon % 30, 2),
+        "motion": "Retrograde" if speed < 0 else "Direct"
+    }
+
+def compute_positions_at(moment: datetime.datetime, planets=None) -> dict:
+    """Uncached sidereal sign/degree/motion for `planets` (default: all
+    nine) at `moment` -- the computation get_current_positions() always
+    did, now addressable at an explicit instant so the snapshot provider
+    below can compute each planet at its bucket start."""
+    jd = _to_julday_utc(moment)
     ay = swe.get_ayanamsa_ut(jd)
+    return {name: _position_entry(name, jd, ay) for name in (planets or CURRENT_POSITION_PLANETS)}
+
+# How long one computed position is served before it is recomputed, per
+# planet. A served position lags the true one by at most one bucket of
+# motion (worst-case daily speed x bucket length):
+#   Moon     5 min   <= ~0.053 deg
+#   Mercury 15 min   <= ~0.023 deg   (Venus ~0.013, Sun ~0.011, Mars ~0.008)
+#   Jupiter  1 h     <= ~0.009 deg   (Saturn ~0.005, Rahu/Ketu ~0.002)
+# So the reported 0.01-deg `degree` can be a few hundredths stale (up to
+# five for the Moon), and a sign or nakshatra change shows up at most one
+# bucket late. Shrink a planet's bucket if a caller needs tighter.
+DEFAULT_BUCKET_SECONDS = {
+    "Moon": 300,
+    "Sun": 900, "Mercury": 900, "Venus": 900, "Mars": 900,
+    "Jupiter": 3600, "Saturn": 3600, "Rahu": 3600, "Ketu": 3600,
+}
 
-    out = {}
-    for pid, name in PLANET_IDS.items():
-        res, _ = swe.calc_ut(jd, pid)
-        lon = res[0]
-        speed = res[3] if len(res) > 3 else 0.0
-        sid_lon = (lon - ay) % 360
-        out[name] = {
-            "rashi": _rashi_from_sidereal_lon(sid_lon),
-            "degree": round(sid_lon % 30, 2),
-            "motion": "Retrograde" if speed < 0 else "Direct"
+class TransitSnapshotProvider:
+    """
+    Shared "now" transit snapshot behind get_current_positions().
+
+    Every planet's position is computed at the START of its current time
+    bucket (DEFAULT_BUCKET_SECONDS, overridable per planet) and reused by
+    every caller until that bucket ends -- chat, smartchat, Ask Now,
+    /api/transit/current, report generation and every ai_prediction_lab
+    context builder read the same instant instead of each recomputing
+    all nine planets.
+
+    Computing at the bucket start rather than at "first caller's now"
+    makes the value a pure function of the bucket: two gunicorn workers
+    (each with its own in-process provider) or a report worker and a web
+    worker produce byte-identical positions for the same bucket, so
+    nothing downstream can tell which process served a request.
+
+    Refresh is single-flight: stale planets are recomputed under one
+    lock, so N concurrent requests at a bucket boundary produce one
+    computation per planet, not N. swisseph's calc_ut is not documented
+    as thread-safe, which is a second reason to serialise it here.
+
+    `timestamp_ist` stays the caller's real "now" -- chat_engine's
+    temporal grounding reads it as the moment of the question, and the
+    positions are at most one bucket older than it.
+    """
+
+    def __init__(self, bucket_seconds=None, now_fn=None):
+        self.bucket_seconds = dict(DEFAULT_BUCKET_SECONDS, **(bucket_seconds or {}))
+        self._now_fn = now_fn or _ist_now
+        self._lock = threading.Lock()
+        self._entries = {}  # planet -> (bucket_start_epoch, position dict)
+        self.computations = 0
+
+    def bucket_start(self, planet_name: str, moment: datetime.datetime) -> int:
+        size = int(self.bucket_seconds[planet_name])
+        return int(moment.timestamp()) // size * size
+
+    def current_positions(self) -> dict:
+        now_ist = self._now_fn()
+        with self._lock:
+            stale = {}
+            for name in CURRENT_POSITION_PLANETS:
+                bucket = self.bucket_start(name, now_ist)
+                entry = self._entries.get(name)
+                if entry is None or entry[0] != bucket:
+                    stale.setdefault(bucket, []).append(name)
+            # Planets whose buckets start at the same instant share one
+            # julday/ayanamsa computation.
+            for bucket, names in stale.items():
+                moment = datetime.datetime.fromtimestamp(bucket, pytz.UTC)
+                for name, position in compute_positions_at(moment, names).items():
+                    self._entries[name] = (bucket, position)
+                    self.computations += 1
+            positions = {name: dict(self._entries[name][1]) for name in CURRENT_POSITION_PLANETS}
+
+        return {
+            "timestamp_ist": now_ist.strftime("%Y-%m-%d %H:%M:%S IST"),
+            "positions": positions
         }
 
-    rahu_sid = (swe.calc_ut(jd, swe.MEAN_NODE)[0][0] - ay) % 360
-    ketu_sid = (rahu_sid + 180.0) % 360
-    out["Ketu"] = {
-        "rashi": _rashi_from_sidereal_lon(ketu_sid),
-        "degree": round(ketu_sid % 30, 2),
-        "motion": "Retrograde"
-    }
+_snapshot_provider = TransitSnapshotProvider()
 
-    return {
-        "timestamp_ist": now_ist.strftime("%Y-%m-%d %H:%M:%S IST"),
-        "positions": out
-    }
+def get_current_positions():
+    """Current sidereal positions of all nine planets, served from the
+    module's shared TransitSnapshotProvider. Each call returns fresh
+    dicts, so callers may mutate the result freely."""
+    return _snapshot_provider.current_positions()
 
 def _planet_rashi_on_day(planet_name: str, day_ist: datetime.datetime) -> str:
     jd = _to_julday_utc(day_ist)
@@ -135,7 +220,7 @@ def get_transit_events(date):
     # included by get_all_planets_next_12()'s /api/transit/current). Moon is
     # not a special product exception; it goes through the exact same
     # sign-ingress detection, personalized-house calculation
-    # (services/personalization_engine.py::get_users_for_transit(), which
+    # (services/personalization_engine.py::house_by_lagna(), which
     # already filters to houses [1,4,7,8,10,12] uniformly for every planet
     # and needed no change), and notification pipeline as every other
     # planet. Its faster ~2-3 day cadence is expected and intentional.